@@ -23,6 +23,26 @@ class Settings(BaseSettings):
     
     # ML Model settings
     ml_model_path: str = Field(default="./models/fin_predictor.pkl", env="ML_MODEL_PATH")
+    ml_model_mmap: bool = Field(default=True, env="ML_MODEL_MMAP")
+    ml_model_watch_seconds: float = Field(default=5.0, env="ML_MODEL_WATCH_SECONDS")
+    ml_fast_scorer: bool = Field(default=True, env="ML_FAST_SCORER")
+    training_data_path: str = Field(default="./data/training", env="TRAINING_DATA_PATH")
+    prediction_batch_max_size: int = Field(default=10000, env="PREDICTION_BATCH_MAX_SIZE")
+    prediction_cache_size: int = Field(default=100000, env="PREDICTION_CACHE_SIZE")
+    prediction_cache_income_step: float = Field(default=0.0, env="PREDICTION_CACHE_INCOME_STEP")
+    inference_batch_max_size: int = Field(default=64, env="INFERENCE_BATCH_MAX_SIZE")
+    inference_batch_window_ms: float = Field(default=2.0, env="INFERENCE_BATCH_WINDOW_MS")
+    inference_workers: int = Field(default=1, env="INFERENCE_WORKERS")
+    
+    # Market data settings
+    bar_store_path: str = Field(default="./data/bars", env="BAR_STORE_PATH")
+    market_sim_tick_seconds: float = Field(default=1.0, env="MARKET_SIM_TICK_SECONDS")
+    market_sim_volatility: float = Field(default=0.3, env="MARKET_SIM_VOLATILITY")
+    market_sim_batch_size: int = Field(default=0, env="MARKET_SIM_BATCH_SIZE")
+    market_sim_symbols: int = Field(default=0, env="MARKET_SIM_SYMBOLS")
+    market_sim_replay_days: int = Field(default=0, env="MARKET_SIM_REPLAY_DAYS")
+    analysis_bulk_max_symbols: int = Field(default=5000, env="ANALYSIS_BULK_MAX_SYMBOLS")
+    analysis_bulk_chunk_size: int = Field(default=500, env="ANALYSIS_BULK_CHUNK_SIZE")
     
     # Blockchain settings
     blockchain_rpc_url: str = Field(default="", env="BLOCKCHAIN_RPC_URL")
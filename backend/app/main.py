@@ -19,6 +19,11 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.core.config import settings
 from app.core.logger import app_logger
 from app.routes.api import api_router
+from app.services.ai_service import ai_service
+from app.services.inference_scheduler import inference_scheduler
+from app.services.bar_store import bar_store
+from app.services.market_simulator import market_simulator
+from app.services.price_feed import price_feed
 
 
 @asynccontextmanager
@@ -41,12 +46,28 @@ async def lifespan(app: FastAPI):
     # Create contracts directory if it doesn't exist
     os.makedirs("contracts", exist_ok=True)
     
+    # Hot-swap the prediction model when its file changes
+    ai_service.start_model_watcher()
+    
+    # One simulated market feeds every service's prices
+    if settings.market_sim_replay_days:
+        replayed = market_simulator.replay_stored_bars(bar_store, settings.market_sim_replay_days)
+        app_logger.info(f"Replaying stored bars for {len(replayed)} symbols")
+    market_simulator.start()
+    
+    # Match resting orders and update streaming indicators on every tick
+    price_feed.start()
+    
     app_logger.info("Application startup completed")
     
     yield
     
     # Shutdown
     app_logger.info("Shutting down FinSage application...")
+    ai_service.stop_model_watcher()
+    price_feed.stop()
+    market_simulator.stop()
+    await inference_scheduler.close()
 
 
 # Create FastAPI application
@@ -58,6 +58,26 @@ class PredictionResponse(BaseModel):
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
+class BatchPredictionRequest(BaseModel):
+    """Request model for scoring many user profiles in one call."""
+    profiles: List[PredictionRequest] = Field(..., min_length=1, description="User profiles to score")
+
+
+class BatchPredictionResponse(BaseModel):
+    """Response model for batch investment prediction."""
+    predictions: List[PredictionResponse] = Field(..., description="Predictions in profile order")
+    count: int = Field(..., ge=0, description="Number of predictions")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+# Market Analysis Models
+class BulkAnalysisRequest(BaseModel):
+    """Request model for technical analysis of many symbols in one call."""
+    symbols: List[str] = Field(..., min_length=1, description="Symbols to analyze")
+    timeframes: List[str] = Field(default=["1d"], description="Timeframes: 1d, 4h, 1h")
+    indicators: List[str] = Field(default_factory=list, description="Indicator names (all of them if empty)")
+
+
 # Portfolio Models
 class Asset(BaseModel):
     """Individual asset in a portfolio."""
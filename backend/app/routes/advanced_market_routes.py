@@ -3,9 +3,17 @@ Advanced Market Data Routes
 Provides real-time market data, technical analysis, and market indicators
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import anyio
+import json
+from contextlib import aclosing
+from fastapi import APIRouter, Depends, HTTPException, status, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from typing import Dict, List, Any, Optional
-from app.services.advanced_market_service import AdvancedMarketService
+from app.core.config import settings
+from app.models.schemas import BulkAnalysisRequest
+from app.services.advanced_market_service import AdvancedMarketService, get_market_service
+from app.services.bulk_analysis import BulkAnalyzer, get_bulk_analyzer
+from app.services.quote_stream import QuoteHub, get_quote_hub, parse_symbols
 from app.core.logger import app_logger
 
 router = APIRouter(prefix="/market", tags=["Advanced Market Data"])
@@ -13,7 +21,7 @@ router = APIRouter(prefix="/market", tags=["Advanced Market Data"])
 @router.get("/realtime")
 async def get_realtime_market_data(
     symbols: str = Query(..., description="Comma-separated list of symbols"),
-    market_service: AdvancedMarketService = Depends()
+    market_service: AdvancedMarketService = Depends(get_market_service)
 ):
     """
     Get real-time market data for multiple symbols.
@@ -33,7 +41,7 @@ async def get_realtime_market_data(
 async def get_technical_indicators(
     symbol: str,
     timeframe: str = Query("1d", description="Timeframe: 1d, 4h, 1h"),
-    market_service: AdvancedMarketService = Depends()
+    market_service: AdvancedMarketService = Depends(get_market_service)
 ):
     """
     Get technical indicators for a symbol.
@@ -48,10 +56,43 @@ async def get_technical_indicators(
         app_logger.error(f"Error calculating technical indicators for {symbol}: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to calculate technical indicators")
 
+@router.post("/technical/bulk")
+async def get_bulk_technical_indicators(
+    request: BulkAnalysisRequest,
+    analyzer: BulkAnalyzer = Depends(get_bulk_analyzer)
+):
+    """
+    Get technical indicators for many symbols and timeframes in one call.
+    
+    Streams one JSON line per symbol and timeframe (NDJSON) while later
+    symbols are still being computed. Leave ``indicators`` empty for all.
+    
+    Example: POST /market/technical/bulk
+             {"symbols": ["AAPL", "MSFT"], "timeframes": ["1d", "1h"], "indicators": ["rsi", "macd"]}
+    """
+    app_logger.info(f"Request for bulk technical indicators: {len(request.symbols)} symbols, "
+                    f"timeframes {request.timeframes}")
+    if len(request.symbols) > settings.analysis_bulk_max_symbols:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"{len(request.symbols)} symbols exceeds the limit of {settings.analysis_bulk_max_symbols}"
+        )
+    try:
+        chunks = analyzer.analyze(request.symbols, request.timeframes, request.indicators)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    # A sync generator, so Starlette computes each chunk in its threadpool
+    def lines():
+        for results in chunks:
+            yield "".join(json.dumps(result) + "\n" for result in results)
+    
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
 @router.get("/sentiment/{symbol}")
 async def get_market_sentiment(
     symbol: str,
-    market_service: AdvancedMarketService = Depends()
+    market_service: AdvancedMarketService = Depends(get_market_service)
 ):
     """
     Get market sentiment analysis for a symbol.
@@ -68,7 +109,7 @@ async def get_market_sentiment(
 
 @router.get("/overview")
 async def get_market_overview(
-    market_service: AdvancedMarketService = Depends()
+    market_service: AdvancedMarketService = Depends(get_market_service)
 ):
     """
     Get overall market overview and indices.
@@ -86,7 +127,7 @@ async def get_market_overview(
 @router.get("/earnings")
 async def get_earnings_calendar(
     days: int = Query(7, description="Number of days to look ahead"),
-    market_service: AdvancedMarketService = Depends()
+    market_service: AdvancedMarketService = Depends(get_market_service)
 ):
     """
     Get upcoming earnings announcements.
@@ -103,7 +144,7 @@ async def get_earnings_calendar(
 
 @router.get("/sectors")
 async def get_sector_performance(
-    market_service: AdvancedMarketService = Depends()
+    market_service: AdvancedMarketService = Depends(get_market_service)
 ):
     """
     Get sector performance data.
@@ -122,7 +163,7 @@ async def get_sector_performance(
 @router.get("/crypto")
 async def get_crypto_data(
     symbols: str = Query("BTC,ETH,ADA", description="Comma-separated list of crypto symbols"),
-    market_service: AdvancedMarketService = Depends()
+    market_service: AdvancedMarketService = Depends(get_market_service)
 ):
     """
     Get cryptocurrency market data.
@@ -141,7 +182,7 @@ async def get_crypto_data(
 @router.get("/forex")
 async def get_forex_data(
     pairs: str = Query("EURUSD,GBPUSD,USDJPY", description="Comma-separated list of forex pairs"),
-    market_service: AdvancedMarketService = Depends()
+    market_service: AdvancedMarketService = Depends(get_market_service)
 ):
     """
     Get forex market data.
@@ -157,3 +198,70 @@ async def get_forex_data(
         app_logger.error(f"Error fetching forex data: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to retrieve forex data")
 
+@router.websocket("/stream")
+async def stream_quotes(
+    websocket: WebSocket,
+    symbols: str = Query(..., description="Comma-separated list of symbols"),
+    hub: QuoteHub = Depends(get_quote_hub)
+):
+    """
+    Stream live quotes over a WebSocket.
+    
+    Sends the current quotes for the symbols at once, then a message each
+    time any of them moves. Slow clients receive only the latest quotes.
+    
+    Example: ws://.../market/stream?symbols=AAPL,MSFT
+    """
+    await websocket.accept()
+    try:
+        symbol_set = parse_symbols(symbols)
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+    
+    async def send_quotes(cancel_scope: anyio.CancelScope):
+        try:
+            async with aclosing(hub.stream(symbol_set)) as quotes:
+                async for message in quotes:
+                    await websocket.send_text(message)
+        except WebSocketDisconnect:
+            pass
+        cancel_scope.cancel()
+    
+    async def watch_for_close(cancel_scope: anyio.CancelScope):
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+        cancel_scope.cancel()
+    
+    # Sending stops when the client goes away, even if no quote moves meanwhile
+    async with anyio.create_task_group() as task_group:
+        task_group.start_soon(send_quotes, task_group.cancel_scope)
+        task_group.start_soon(watch_for_close, task_group.cancel_scope)
+
+@router.get("/stream/sse")
+async def stream_quotes_sse(
+    symbols: str = Query(..., description="Comma-separated list of symbols"),
+    hub: QuoteHub = Depends(get_quote_hub)
+):
+    """
+    Stream live quotes as Server-Sent Events (same messages as the WebSocket stream).
+    
+    Example: /market/stream/sse?symbols=AAPL,MSFT
+    """
+    try:
+        symbol_set = parse_symbols(symbols)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    async def events():
+        async with aclosing(hub.stream(symbol_set)) as quotes:
+            async for message in quotes:
+                yield f"data: {message}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.get("/stream/stats")
+async def get_stream_stats(hub: QuoteHub = Depends(get_quote_hub)):
+    """Get connected clients, symbol groups and delivery counters for the quote streams"""
+    return hub.stats()
@@ -5,16 +5,21 @@ Handles investment predictions and financial recommendations.
 
 from typing import List, Dict, Any
 from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse
 
+from app.core.config import settings
 from app.core.logger import app_logger
 from app.models.schemas import (
     PredictionRequest, 
     PredictionResponse, 
+    BatchPredictionRequest,
+    BatchPredictionResponse,
     ErrorResponse,
     AssetAllocation
 )
 from app.services.ai_service import ai_service
+from app.services.inference_scheduler import inference_scheduler
 
 router = APIRouter(prefix="/prediction", tags=["Prediction"])
 
@@ -39,8 +44,8 @@ async def predict_investment(request: PredictionRequest):
     try:
         app_logger.info(f"Generating prediction for user with risk tolerance: {request.risk_tolerance}")
         
-        # Generate prediction using AI service
-        prediction = ai_service.predict_investment_recommendation(request)
+        # Generate prediction using AI service, batched with concurrent requests
+        prediction = await inference_scheduler.predict(request)
         
         app_logger.info(f"Prediction generated successfully with score: {prediction.recommendation_score}")
         return prediction
@@ -53,6 +58,42 @@ async def predict_investment(request: PredictionRequest):
         )
 
 
+@router.post("/predict/batch", response_model=BatchPredictionResponse, summary="Get Batch Investment Predictions")
+async def predict_investment_batch(request: BatchPredictionRequest):
+    """
+    Generate investment predictions for many user profiles in one call.
+    
+    Intended for bulk jobs such as rescoring the whole customer base: the
+    profiles are scored with a single model call instead of one per profile.
+    
+    Args:
+        request: User financial profiles, at most PREDICTION_BATCH_MAX_SIZE
+        
+    Returns:
+        BatchPredictionResponse with one prediction per profile, in order
+        
+    Raises:
+        HTTPException: If the batch is too large or prediction generation fails
+    """
+    if len(request.profiles) > settings.prediction_batch_max_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch of {len(request.profiles)} profiles exceeds the limit of {settings.prediction_batch_max_size}"
+        )
+    
+    try:
+        # Large batches take a while to score; keep the event loop free meanwhile
+        predictions = await run_in_threadpool(ai_service.predict_batch, request.profiles)
+        return BatchPredictionResponse(predictions=predictions, count=len(predictions))
+        
+    except Exception as e:
+        app_logger.error(f"Batch prediction generation failed: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to generate investment predictions: {str(e)}"
+        )
+
+
 @router.get("/model-info", summary="Get AI Model Information")
 async def get_model_info():
     """
@@ -76,6 +117,20 @@ async def get_model_info():
         )
 
 
+@router.get("/scheduler-stats", summary="Get Inference Scheduler Metrics")
+async def get_scheduler_stats():
+    """
+    Get micro-batching metrics for /predict.
+    
+    Returns:
+        Batch size and window settings, batches run and request latency percentiles
+    """
+    return {
+        "scheduler": inference_scheduler.stats(),
+        "status": "success"
+    }
+
+
 @router.get("/risk-profiles", summary="Get Available Risk Profiles")
 async def get_risk_profiles():
     """
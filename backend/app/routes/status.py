@@ -15,6 +15,7 @@ from app.core.logger import app_logger
 from app.models.schemas import HealthStatus, ServiceStatus
 from app.services.ai_service import ai_service
 from app.services.blockchain_service import blockchain_service
+from app.services.inference_scheduler import inference_scheduler
 
 router = APIRouter(prefix="/status", tags=["Status"])
 
@@ -145,6 +146,7 @@ async def get_metrics():
                 "version": settings.version,
                 "debug_mode": settings.debug
             },
+            "inference": inference_scheduler.stats(),
             "timestamp": datetime.utcnow().isoformat()
         }
         
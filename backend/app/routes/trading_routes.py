@@ -5,7 +5,7 @@ Provides paper trading, order management, and technical analysis features
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from typing import Dict, List, Any, Optional
-from app.services.trading_service import TradingService
+from app.services.trading_service import TradingService, get_trading_service
 from app.core.logger import app_logger
 
 router = APIRouter(prefix="/trading", tags=["Advanced Trading"])
@@ -19,7 +19,7 @@ async def create_order(
     order_type: str = "market",
     limit_price: float = None,
     stop_price: float = None,
-    trading_service: TradingService = Depends()
+    trading_service: TradingService = Depends(get_trading_service)
 ):
     """
     Create a new trading order.
@@ -46,16 +46,17 @@ async def create_order(
 async def get_orders(
     user_id: str,
     status: str = Query(None, description="Filter by order status"),
-    trading_service: TradingService = Depends()
+    symbol: str = Query(None, description="Filter by symbol"),
+    trading_service: TradingService = Depends(get_trading_service)
 ):
     """
     Get user's orders.
     
-    Example: GET /trading/orders/123?status=filled
+    Example: GET /trading/orders/123?status=filled&symbol=AAPL
     """
     app_logger.info(f"Fetching orders for user {user_id}")
     try:
-        orders = await trading_service.get_orders(user_id, status)
+        orders = await trading_service.get_orders(user_id, status, symbol)
         return {"message": "Orders retrieved successfully", "orders": orders}
     except Exception as e:
         app_logger.error(f"Error fetching orders: {e}")
@@ -64,7 +65,7 @@ async def get_orders(
 @router.delete("/orders/{order_id}")
 async def cancel_order(
     order_id: str,
-    trading_service: TradingService = Depends()
+    trading_service: TradingService = Depends(get_trading_service)
 ):
     """
     Cancel an order.
@@ -79,10 +80,66 @@ async def cancel_order(
         app_logger.error(f"Error cancelling order: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to cancel order")
 
+@router.get("/orderbook/{symbol}")
+async def get_order_book(
+    symbol: str,
+    levels: int = Query(10, ge=1, le=100, description="Number of price levels per side"),
+    trading_service: TradingService = Depends(get_trading_service)
+):
+    """
+    Get order book depth for a symbol.
+    
+    Example: GET /trading/orderbook/AAPL?levels=10
+    """
+    app_logger.info(f"Fetching order book for {symbol}")
+    try:
+        order_book = await trading_service.get_order_book(symbol, levels)
+        return {"message": f"Order book for {symbol}", "order_book": order_book}
+    except Exception as e:
+        app_logger.error(f"Error fetching order book: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to retrieve order book")
+
+@router.get("/account/{user_id}")
+async def get_account(
+    user_id: str,
+    trading_service: TradingService = Depends(get_trading_service)
+):
+    """
+    Get user's paper trading account: cash, reserved cash and buying power.
+    
+    Example: GET /trading/account/123
+    """
+    app_logger.info(f"Fetching account for user {user_id}")
+    try:
+        account = await trading_service.get_account(user_id)
+        return {"message": "Account retrieved successfully", "account": account}
+    except Exception as e:
+        app_logger.error(f"Error fetching account: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to retrieve account")
+
+@router.get("/account/{user_id}/ledger")
+async def get_account_ledger(
+    user_id: str,
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of entries"),
+    trading_service: TradingService = Depends(get_trading_service)
+):
+    """
+    Get user's cash ledger, newest entries first.
+    
+    Example: GET /trading/account/123/ledger?limit=50
+    """
+    app_logger.info(f"Fetching account ledger for user {user_id}")
+    try:
+        ledger = await trading_service.get_account_ledger(user_id, limit)
+        return {"message": "Ledger retrieved successfully", "ledger": ledger}
+    except Exception as e:
+        app_logger.error(f"Error fetching account ledger: {e}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to retrieve ledger")
+
 @router.get("/positions/{user_id}")
 async def get_positions(
     user_id: str,
-    trading_service: TradingService = Depends()
+    trading_service: TradingService = Depends(get_trading_service)
 ):
     """
     Get user's current positions.
@@ -100,7 +157,7 @@ async def get_positions(
 @router.get("/portfolio/{user_id}")
 async def get_portfolio_summary(
     user_id: str,
-    trading_service: TradingService = Depends()
+    trading_service: TradingService = Depends(get_trading_service)
 ):
     """
     Get portfolio summary.
@@ -119,7 +176,7 @@ async def get_portfolio_summary(
 async def get_technical_analysis(
     symbol: str,
     timeframe: str = Query("1d", description="Timeframe: 1d, 4h, 1h"),
-    trading_service: TradingService = Depends()
+    trading_service: TradingService = Depends(get_trading_service)
 ):
     """
     Get comprehensive technical analysis.
@@ -138,7 +195,7 @@ async def get_technical_analysis(
 async def get_options_strategies(
     symbol: str,
     current_price: float = Query(..., description="Current price of the underlying asset"),
-    trading_service: TradingService = Depends()
+    trading_service: TradingService = Depends(get_trading_service)
 ):
     """
     Get options trading strategies.
@@ -160,7 +217,7 @@ async def get_stock_screener(
     market_cap_max: float = Query(None, description="Maximum market cap"),
     pe_min: float = Query(None, description="Minimum P/E ratio"),
     pe_max: float = Query(None, description="Maximum P/E ratio"),
-    trading_service: TradingService = Depends()
+    trading_service: TradingService = Depends(get_trading_service)
 ):
     """
     Get stock screener results.
@@ -208,7 +265,7 @@ async def get_stock_screener(
 @router.get("/watchlist/{user_id}")
 async def get_watchlist(
     user_id: str,
-    trading_service: TradingService = Depends()
+    trading_service: TradingService = Depends(get_trading_service)
 ):
     """
     Get user's watchlist.
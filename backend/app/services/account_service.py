@@ -0,0 +1,143 @@
+"""
+Paper Trading Account Service
+Per-user cash accounts with order reservations and an append-only ledger
+"""
+
+import asyncio
+from datetime import datetime
+from itertools import count
+from typing import Dict, List, Any, Optional
+from app.core.logger import app_logger
+
+
+class InsufficientFundsError(Exception):
+    """Raised when an account cannot cover a reservation or purchase"""
+    pass
+
+
+class Account:
+    """Cash state and ledger for one paper-trading user."""
+
+    def __init__(self, user_id: str, starting_cash: float):
+        self.user_id = user_id
+        self.starting_cash = starting_cash
+        self.cash = 0.0
+        self.reserved = 0.0
+        self.reservations: Dict[str, Dict[str, float]] = {}
+        self.ledger: List[Dict[str, Any]] = []
+        self.lock = asyncio.Lock()
+        self._entry_seq = count(1)
+
+    @property
+    def buying_power(self) -> float:
+        return self.cash - self.reserved
+
+    def record(self, entry_type: str, amount: float, order_id: str = None, **details) -> Dict[str, Any]:
+        """Append a ledger entry. Entries are never modified once written."""
+        entry = {
+            "entry_id": next(self._entry_seq),
+            "type": entry_type,
+            "amount": round(amount, 2),
+            "order_id": order_id,
+            "cash_after": round(self.cash, 2),
+            "reserved_after": round(self.reserved, 2),
+            "timestamp": datetime.now().isoformat(),
+            **details
+        }
+        self.ledger.append(entry)
+        return entry
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "user_id": self.user_id,
+            "cash_balance": round(self.cash, 2),
+            "reserved": round(self.reserved, 2),
+            "buying_power": round(self.buying_power, 2),
+            "open_reservations": len(self.reservations),
+            "starting_cash": self.starting_cash,
+            "ledger_entries": len(self.ledger)
+        }
+
+
+class AccountService:
+    """
+    Holds one account per user.
+
+    Every mutation runs under that account's own asyncio lock, so concurrent
+    requests for the same user are serialized while different users never
+    wait on each other.
+    """
+
+    def __init__(self, starting_cash: float = 100000):
+        app_logger.info("Initializing Account Service...")
+        self.starting_cash = starting_cash
+        self.accounts: Dict[str, Account] = {}
+        app_logger.info("Account Service initialized.")
+
+    def get_account(self, user_id: str) -> Account:
+        """Get a user's account, opening it with the starting balance on first use"""
+        account = self.accounts.get(user_id)
+        if account is None:
+            # No await between lookup and insert, so this can't race in the event loop
+            account = self.accounts[user_id] = Account(user_id, self.starting_cash)
+            account.cash = float(self.starting_cash)
+            account.record("deposit", self.starting_cash, description="Initial paper trading balance")
+        return account
+
+    async def reserve(self, user_id: str, order_id: str, quantity: float, price: float) -> Dict[str, Any]:
+        """Hold cash for an open buy order so it can't be spent twice"""
+        account = self.get_account(user_id)
+        amount = quantity * price
+        async with account.lock:
+            if amount > account.buying_power:
+                raise InsufficientFundsError(
+                    f"Insufficient buying power: need ${amount:,.2f}, have ${account.buying_power:,.2f}"
+                )
+            account.reserved += amount
+            account.reservations[order_id] = {"quantity": quantity, "price": price}
+            return account.record("reserve", amount, order_id)
+
+    async def release(self, user_id: str, order_id: str) -> Optional[Dict[str, Any]]:
+        """Return whatever is still held for an order (cancel or rejection)"""
+        account = self.get_account(user_id)
+        async with account.lock:
+            reservation = account.reservations.pop(order_id, None)
+            if reservation is None:
+                return None
+            amount = reservation["quantity"] * reservation["price"]
+            account.reserved -= amount
+            return account.record("release", amount, order_id)
+
+    async def settle_fill(self, user_id: str, order_id: str, side: str,
+                          quantity: float, price: float) -> Dict[str, Any]:
+        """Move cash for an executed fill, consuming any reservation for it"""
+        account = self.get_account(user_id)
+        amount = quantity * price
+        async with account.lock:
+            reservation = account.reservations.get(order_id)
+            filled = min(quantity, reservation["quantity"]) if reservation is not None else 0
+            held = filled * reservation["price"] if reservation is not None else 0.0
+
+            # A buy is paid from free cash plus what this order put aside, never from other orders' holds
+            if side == "buy" and amount > account.buying_power + held:
+                raise InsufficientFundsError(
+                    f"Insufficient buying power: need ${amount:,.2f}, have ${account.buying_power + held:,.2f}"
+                )
+
+            if reservation is not None:
+                account.reserved -= held
+                reservation["quantity"] -= filled
+                if reservation["quantity"] <= 0:
+                    del account.reservations[order_id]
+
+            if side == "buy":
+                account.cash -= amount
+                return account.record("buy", -amount, order_id, quantity=quantity, price=price)
+
+            account.cash += amount
+            return account.record("sell", amount, order_id, quantity=quantity, price=price)
+
+    async def get_ledger(self, user_id: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Most recent ledger entries, newest first"""
+        account = self.get_account(user_id)
+        return list(reversed(account.ledger[-limit:]))
@@ -4,6 +4,7 @@ Implements sophisticated financial AI features including sentiment analysis,
 market prediction, and advanced portfolio optimization.
 """
 
+import math
 import numpy as np
 import pandas as pd
 from typing import List, Dict, Any, Optional
@@ -12,6 +13,50 @@ import json
 import requests
 from loguru import logger
 
+from app.services.bar_store import bar_store
+from app.services.portfolio_optimizer import (
+    TRADING_DAYS_PER_YEAR,
+    black_litterman,
+    critical_line,
+    efficient_frontier,
+    implied_returns,
+    ledoit_wolf,
+    optimal_weights,
+    portfolio_performance,
+    returns_from_prices
+)
+
+# Funds whose daily bars stand in for each asset class
+ASSET_CLASS_PROXIES = {
+    'stocks': 'SPY',
+    'bonds': 'AGG',
+    'cash': 'BIL',
+    'alternatives': 'GLD'
+}
+
+# Long-run annual volatility and correlation of the asset classes, used when
+# the bar store doesn't hold enough history for all the proxies
+LONG_RUN_VOLATILITY = np.array([0.16, 0.055, 0.005, 0.15])
+LONG_RUN_CORRELATION = np.array([
+    [1.00, 0.10, 0.00, 0.35],
+    [0.10, 1.00, 0.15, 0.20],
+    [0.00, 0.15, 1.00, 0.00],
+    [0.35, 0.20, 0.00, 1.00]
+])
+
+# Global market-capitalization weights: the Black-Litterman equilibrium
+MARKET_WEIGHTS = np.array([0.55, 0.35, 0.05, 0.05])
+
+RISK_FREE_RATE = 0.03
+RISK_AVERSION = {'low': 5.0, 'medium': 2.5, 'high': 1.25}
+
+HISTORY_DAYS = 3 * TRADING_DAYS_PER_YEAR
+MIN_HISTORY_DAYS = TRADING_DAYS_PER_YEAR
+
+VAR_CONFIDENCE = 0.95
+VAR_Z_95 = 1.645
+VAR_Z_99 = 2.326
+
 
 class AdvancedAIService:
     """Advanced AI service with sophisticated financial analysis capabilities."""
@@ -96,20 +141,36 @@ class AdvancedAIService:
     def generate_advanced_portfolio_optimization(self, 
                                                user_profile: Dict[str, Any],
                                                market_data: Optional[Dict] = None) -> Dict[str, Any]:
-        """Generate advanced portfolio optimization using modern portfolio theory."""
+        """
+        Generate a mean-variance optimal allocation across asset classes.
+        
+        Covariance is estimated with Ledoit-Wolf shrinkage from the asset class
+        proxies' daily history in the bar store (or long-run assumptions when
+        there isn't enough). Expected returns are the Black-Litterman posterior
+        of the market equilibrium and any views in ``market_data['views']``,
+        e.g. ``{'asset_class': 'stocks', 'expected_return': 8.0,
+        'relative_to': 'bonds', 'confidence': 0.6}`` (returns in percent).
+        The allocation is the point on the efficient frontier that matches
+        the user's risk aversion.
+        """
         try:
-            # Simulate advanced portfolio optimization
             risk_tolerance = user_profile.get('risk_tolerance', 'medium')
             investment_horizon = user_profile.get('investment_horizon_years', 10)
             age = user_profile.get('age', 30)
             
-            # Generate optimized asset allocation
-            optimized_allocation = self._optimize_asset_allocation(
-                risk_tolerance, investment_horizon, age
+            model = self._build_market_model(market_data or {})
+            turning_points = critical_line(model['expected_returns'], model['covariance'])
+            weights = optimal_weights(
+                model['expected_returns'], model['covariance'],
+                self._get_risk_aversion(risk_tolerance, investment_horizon, age),
+                turning_points=turning_points
             )
             
+            # Generate optimized asset allocation
+            optimized_allocation = self._optimize_asset_allocation(weights, model)
+            
             # Calculate risk metrics
-            risk_metrics = self._calculate_risk_metrics(optimized_allocation)
+            risk_metrics = self._calculate_risk_metrics(weights, model)
             
             # Generate rebalancing recommendations
             rebalancing = self._generate_rebalancing_recommendations(optimized_allocation)
@@ -118,72 +179,121 @@ class AdvancedAIService:
                 'optimized_allocation': optimized_allocation,
                 'risk_metrics': risk_metrics,
                 'rebalancing_recommendations': rebalancing,
-                'expected_performance': self._calculate_expected_performance(optimized_allocation),
+                'expected_performance': self._calculate_expected_performance(weights, model),
+                'efficient_frontier': self._efficient_frontier_points(model, turning_points),
                 'optimization_method': 'Modern Portfolio Theory + Black-Litterman',
-                'confidence_level': np.random.uniform(0.8, 0.95)
+                'model_inputs': {
+                    'covariance_source': model['source'],
+                    'history_days': model['history_days'],
+                    'shrinkage': round(model['shrinkage'], 4),
+                    'views_applied': model['views'],
+                    'risk_free_rate': round(model['risk_free_rate'] * 100, 2)
+                },
+                'confidence_level': VAR_CONFIDENCE
             }
-            
+        
         except Exception as e:
             logger.error(f"Error in portfolio optimization: {e}")
             return {'error': str(e)}
     
-    def _optimize_asset_allocation(self, risk_tolerance: str, horizon: int, age: int) -> List[Dict]:
-        """Optimize asset allocation using advanced algorithms."""
-        base_allocations = {
-            'low': {
-                'stocks': 0.3,
-                'bonds': 0.5,
-                'cash': 0.15,
-                'alternatives': 0.05
-            },
-            'medium': {
-                'stocks': 0.6,
-                'bonds': 0.3,
-                'cash': 0.05,
-                'alternatives': 0.05
-            },
-            'high': {
-                'stocks': 0.8,
-                'bonds': 0.15,
-                'cash': 0.02,
-                'alternatives': 0.03
-            }
+    def _build_market_model(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Covariance and Black-Litterman expected excess returns of the asset classes."""
+        risk_free_rate = float(market_data.get('risk_free_rate', RISK_FREE_RATE * 100)) / 100
+        history = self._get_asset_class_returns()
+        
+        if history is not None:
+            covariance, shrinkage = ledoit_wolf(history)
+            covariance *= TRADING_DAYS_PER_YEAR
+            source = 'history'
+        else:
+            covariance = LONG_RUN_CORRELATION * np.outer(LONG_RUN_VOLATILITY, LONG_RUN_VOLATILITY)
+            shrinkage = 0.0
+            source = 'long_run_assumptions'
+        
+        picks, view_returns, confidence = self._parse_views(market_data.get('views') or [], risk_free_rate)
+        expected_returns, covariance = black_litterman(
+            covariance, implied_returns(covariance, MARKET_WEIGHTS), picks, view_returns, confidence
+        )
+        
+        return {
+            'expected_returns': expected_returns,
+            'covariance': covariance,
+            'history': history,
+            'history_days': 0 if history is None else len(history),
+            'shrinkage': shrinkage,
+            'source': source,
+            'views': len(view_returns),
+            'risk_free_rate': risk_free_rate
         }
+    
+    def _get_asset_class_returns(self) -> Optional[np.ndarray]:
+        """Daily returns of the asset class proxies on their common dates, if the bar store has enough."""
+        series = [bar_store.tail(symbol, HISTORY_DAYS + 1) for symbol in ASSET_CLASS_PROXIES.values()]
+        dates = series[0]['date']
+        for bars in series[1:]:
+            dates = np.intersect1d(dates, bars['date'])
+        if len(dates) <= MIN_HISTORY_DAYS:
+            return None
+        
+        closes = np.column_stack([bars['close'][np.isin(bars['date'], dates)] for bars in series])
+        return returns_from_prices(closes)
+    
+    def _parse_views(self, views: List[Dict[str, Any]], risk_free_rate: float):
+        """Black-Litterman picks, excess view returns and confidences from request views."""
+        asset_classes = list(ASSET_CLASS_PROXIES)
+        picks, view_returns, confidence = [], [], []
+        
+        for view in views:
+            asset = str(view.get('asset_class', '')).lower()
+            versus = view.get('relative_to')
+            versus = str(versus).lower() if versus else None
+            if asset not in asset_classes or (versus and versus not in asset_classes) or 'expected_return' not in view:
+                logger.warning(f"Ignoring portfolio view: {view}")
+                continue
+            
+            row = np.zeros(len(asset_classes))
+            row[asset_classes.index(asset)] = 1.0
+            view_return = float(view['expected_return']) / 100
+            if versus:
+                row[asset_classes.index(versus)] = -1.0
+            else:
+                view_return -= risk_free_rate
+            
+            picks.append(row)
+            view_returns.append(view_return)
+            confidence.append(float(view.get('confidence', 0.5)))
         
-        # Adjust based on age and horizon
-        age_factor = min(age / 100, 1.0)
-        horizon_factor = min(horizon / 30, 1.0)
+        return np.array(picks), np.array(view_returns), np.array(confidence)
+    
+    def _get_risk_aversion(self, risk_tolerance: str, horizon: int, age: int) -> float:
+        """Mean-variance risk aversion for the user's profile."""
+        base = RISK_AVERSION.get(risk_tolerance, RISK_AVERSION['medium'])
         
-        base = base_allocations.get(risk_tolerance, base_allocations['medium'])
+        # Long horizons and younger investors can ride out more volatility
+        horizon_factor = 1.25 - min(max(horizon, 0), 30) / 60
+        age_factor = 0.8 + min(max(age, 0), 100) / 250
         
-        # Apply age and horizon adjustments
-        stock_adjustment = (age_factor + horizon_factor) * 0.1
-        base['stocks'] = min(base['stocks'] + stock_adjustment, 0.9)
-        base['bonds'] = max(base['bonds'] - stock_adjustment, 0.1)
+        return base * horizon_factor * age_factor
+    
+    def _optimize_asset_allocation(self, weights: np.ndarray, model: Dict[str, Any]) -> List[Dict]:
+        """Describe the optimized weights per asset class."""
+        covariance = model['covariance']
+        volatility = np.sqrt(np.diag(covariance))
+        stocks = list(ASSET_CLASS_PROXIES).index('stocks')
+        correlation = covariance[:, stocks] / (volatility * volatility[stocks])
         
-        # Convert to detailed allocation
         allocations = []
-        for asset_class, percentage in base.items():
+        for i, asset_class in enumerate(ASSET_CLASS_PROXIES):
             allocations.append({
                 'asset_class': asset_class.title(),
-                'percentage': round(percentage * 100, 1),
-                'expected_return': self._get_expected_return(asset_class),
+                'percentage': round(float(weights[i]) * 100, 1),
+                'expected_return': round(float(model['risk_free_rate'] + model['expected_returns'][i]) * 100, 2),
                 'risk_level': self._get_risk_level(asset_class),
-                'correlation': self._get_correlation_factor(asset_class)
+                'correlation': round(float(correlation[i]), 2)
             })
         
         return allocations
     
-    def _get_expected_return(self, asset_class: str) -> float:
-        """Get expected return for asset class."""
-        returns = {
-            'stocks': np.random.uniform(8, 12),
-            'bonds': np.random.uniform(3, 6),
-            'cash': np.random.uniform(1, 3),
-            'alternatives': np.random.uniform(6, 10)
-        }
-        return round(returns.get(asset_class, 5), 2)
-    
     def _get_risk_level(self, asset_class: str) -> str:
         """Get risk level for asset class."""
         risk_levels = {
@@ -194,29 +304,27 @@ class AdvancedAIService:
         }
         return risk_levels.get(asset_class, 'Medium')
     
-    def _get_correlation_factor(self, asset_class: str) -> float:
-        """Get correlation factor for asset class."""
-        correlations = {
-            'stocks': 1.0,
-            'bonds': 0.3,
-            'cash': 0.0,
-            'alternatives': 0.6
-        }
-        return correlations.get(asset_class, 0.5)
-    
-    def _calculate_risk_metrics(self, allocation: List[Dict]) -> Dict[str, Any]:
-        """Calculate advanced risk metrics."""
-        total_risk = sum(
-            item['percentage'] * (0.8 if item['risk_level'] == 'High' else 0.4)
-            for item in allocation
-        ) / 100
+    def _calculate_risk_metrics(self, weights: np.ndarray, model: Dict[str, Any]) -> Dict[str, Any]:
+        """Calculate risk metrics of the optimized portfolio."""
+        covariance = model['covariance']
+        excess_return, volatility = portfolio_performance(weights, model['expected_returns'], covariance)
+        excess_return, volatility = float(excess_return), float(volatility)
+        annual_return = model['risk_free_rate'] + excess_return
+        stocks = list(ASSET_CLASS_PROXIES).index('stocks')
+        
+        if model['history'] is not None:
+            growth = np.cumprod(1 + model['history'] @ weights)
+            max_drawdown = float(np.max(1 - growth / np.maximum.accumulate(growth)))
+        else:
+            # Without history, a one-in-a-hundred one-year loss stands in for it
+            max_drawdown = max(VAR_Z_99 * volatility - annual_return, 0.0)
         
         return {
-            'portfolio_volatility': round(total_risk * 20, 2),  # Simulated volatility
-            'value_at_risk_95': round(total_risk * 15, 2),  # 95% VaR
-            'sharpe_ratio': round(np.random.uniform(0.8, 1.5), 2),
-            'max_drawdown': round(total_risk * 25, 2),
-            'beta': round(total_risk * 1.2, 2)
+            'portfolio_volatility': round(volatility * 100, 2),
+            'value_at_risk_95': round(max(VAR_Z_95 * volatility - annual_return, 0.0) * 100, 2),
+            'sharpe_ratio': round(excess_return / volatility, 2) if volatility > 0 else 0.0,
+            'max_drawdown': round(max_drawdown * 100, 2),
+            'beta': round(float((covariance @ weights)[stocks] / covariance[stocks, stocks]), 2)
         }
     
     def _generate_rebalancing_recommendations(self, allocation: List[Dict]) -> Dict[str, Any]:
@@ -233,21 +341,32 @@ class AdvancedAIService:
             'tax_considerations': 'Consider tax-loss harvesting opportunities'
         }
     
-    def _calculate_expected_performance(self, allocation: List[Dict]) -> Dict[str, Any]:
-        """Calculate expected portfolio performance."""
-        weighted_return = sum(
-            item['percentage'] * item['expected_return']
-            for item in allocation
-        ) / 100
+    def _calculate_expected_performance(self, weights: np.ndarray, model: Dict[str, Any]) -> Dict[str, Any]:
+        """Calculate expected one-year portfolio performance."""
+        excess_return, volatility = portfolio_performance(weights, model['expected_returns'], model['covariance'])
+        annual_return = float(model['risk_free_rate'] + excess_return)
+        volatility = float(volatility)
+        probability = 0.5 * (1 + math.erf(annual_return / (volatility * math.sqrt(2)))) if volatility > 0 else 1.0
         
         return {
-            'expected_annual_return': round(weighted_return, 2),
-            'expected_volatility': round(np.random.uniform(12, 18), 2),
-            'probability_of_positive_return': round(np.random.uniform(0.65, 0.85), 2),
-            'worst_case_scenario': round(weighted_return - 20, 2),
-            'best_case_scenario': round(weighted_return + 15, 2)
+            'expected_annual_return': round(annual_return * 100, 2),
+            'expected_volatility': round(volatility * 100, 2),
+            'probability_of_positive_return': round(probability, 2),
+            'worst_case_scenario': round((annual_return - VAR_Z_95 * volatility) * 100, 2),
+            'best_case_scenario': round((annual_return + VAR_Z_95 * volatility) * 100, 2)
         }
     
+    def _efficient_frontier_points(self, model: Dict[str, Any], turning_points) -> List[Dict[str, float]]:
+        """Expected return and volatility along the efficient frontier, in percent."""
+        frontier = efficient_frontier(model['expected_returns'], model['covariance'], turning_points=turning_points)
+        return [
+            {
+                'expected_return': round(float(model['risk_free_rate'] + excess) * 100, 2),
+                'volatility': round(float(volatility) * 100, 2)
+            }
+            for excess, volatility in zip(frontier['returns'], frontier['volatility'])
+        ]
+    
     def generate_robo_advisor_recommendations(self, user_profile: Dict[str, Any]) -> Dict[str, Any]:
         """Generate robo-advisor style recommendations."""
         try:
@@ -11,12 +11,20 @@ from typing import Dict, List, Any, Optional
 import pandas as pd
 import numpy as np
 from app.core.logger import app_logger
+from app.services.streaming_indicators import IndicatorStore
+from app.services.bar_store import bar_store
+from app.services.market_simulator import market_simulator
 
 class AdvancedMarketService:
+    INDICATOR_FIELDS = [
+        "sma_20", "sma_50", "ema_12", "ema_26", "rsi", "macd", "macd_signal", "macd_histogram",
+        "bollinger_upper", "bollinger_lower", "stochastic", "williams_r", "atr", "adx"
+    ]
+
     def __init__(self):
         app_logger.info("Initializing Advanced Market Service...")
         self.market_data_cache = {}
-        self.technical_indicators = {}
+        self.technical_indicators = IndicatorStore()
         self.market_sentiment = {}
         app_logger.info("Advanced Market Service initialized.")
 
@@ -26,10 +34,11 @@ class AdvancedMarketService:
         
         market_data = {}
         for symbol in symbols:
-            # Simulate real-time data with realistic values
+            # Prices come from the shared simulated market; the rest is illustrative
             base_price = self._get_base_price(symbol)
-            change_percent = random.uniform(-5, 5)
-            current_price = base_price * (1 + change_percent / 100)
+            current_price = market_simulator.price(symbol)
+            change_percent = (current_price / base_price - 1) * 100
+            self.technical_indicators.on_tick(symbol, current_price)
             
             market_data[symbol] = {
                 "symbol": symbol,
@@ -49,31 +58,38 @@ class AdvancedMarketService:
         return {"market_data": market_data, "timestamp": datetime.now().isoformat()}
 
     async def get_technical_indicators(self, symbol: str, timeframe: str = "1d") -> Dict[str, Any]:
-        """Calculate technical indicators for a symbol"""
+        """Get current technical indicators for a symbol"""
         app_logger.info(f"Calculating technical indicators for {symbol} ({timeframe})")
         
-        # Generate sample price data
-        prices = self._generate_price_data(symbol, timeframe)
-        
-        indicators = {
-            "symbol": symbol,
-            "timeframe": timeframe,
-            "sma_20": round(np.mean(prices[-20:]), 2),
-            "sma_50": round(np.mean(prices[-50:]), 2),
-            "ema_12": round(self._calculate_ema(prices, 12), 2),
-            "ema_26": round(self._calculate_ema(prices, 26), 2),
-            "rsi": round(self._calculate_rsi(prices), 2),
-            "macd": round(self._calculate_macd(prices), 2),
-            "bollinger_upper": round(np.mean(prices[-20:]) + 2 * np.std(prices[-20:]), 2),
-            "bollinger_lower": round(np.mean(prices[-20:]) - 2 * np.std(prices[-20:]), 2),
-            "stochastic": round(self._calculate_stochastic(prices), 2),
-            "williams_r": round(self._calculate_williams_r(prices), 2),
-            "atr": round(self._calculate_atr(prices), 2),
-            "adx": round(self._calculate_adx(prices), 2),
-            "timestamp": datetime.now().isoformat()
+        # Indicators are kept up to date tick by tick; history is only replayed the first time
+        state = self.technical_indicators.get(symbol, timeframe)
+        if state is None:
+            bars = self._generate_ohlc_data(symbol, timeframe)
+            state = self.technical_indicators.create(symbol, timeframe, bars["close"], bars["high"], bars["low"])
+        values = state.snapshot()
+        
+        # Fallbacks for indicators that need more history than is available
+        close = values["close"]
+        defaults = {
+            "sma_20": close,
+            "sma_50": close,
+            "ema_12": close,
+            "ema_26": close,
+            "bollinger_upper": close,
+            "bollinger_lower": close,
+            "rsi": 50.0,
+            "stochastic": 50.0,
+            "williams_r": -50.0,
+            "adx": 25.0
         }
         
-        return indicators
+        result = {"symbol": symbol, "timeframe": timeframe}
+        for name in self.INDICATOR_FIELDS:
+            value = values[name]
+            result[name] = round(defaults.get(name, 0.0) if value is None else value, 2)
+        result["timestamp"] = datetime.now().isoformat()
+        
+        return result
 
     async def get_market_sentiment(self, symbol: str) -> Dict[str, Any]:
         """Analyze market sentiment for a symbol"""
@@ -171,117 +187,23 @@ class AdvancedMarketService:
         }
 
     def _get_base_price(self, symbol: str) -> float:
-        """Get base price for a symbol"""
-        base_prices = {
-            "AAPL": 175.0, "MSFT": 350.0, "GOOGL": 2800.0, "AMZN": 3200.0,
-            "TSLA": 250.0, "META": 300.0, "NVDA": 450.0, "NFLX": 400.0,
-            "SPY": 450.0, "QQQ": 380.0, "IWM": 200.0, "DIA": 350.0, "VIX": 20.0
-        }
-        return base_prices.get(symbol, 100.0)
+        """Get base price for a symbol (its simulated price at the start of the session)"""
+        return market_simulator.open_price(symbol)
 
-    def _generate_price_data(self, symbol: str, timeframe: str) -> List[float]:
-        """Generate sample price data for technical analysis"""
-        base_price = self._get_base_price(symbol)
+    def _generate_ohlc_data(self, symbol: str, timeframe: str) -> Dict[str, np.ndarray]:
+        """OHLC bars for technical analysis: stored daily bars, else the simulator's history for the symbol"""
         days = 100 if timeframe == "1d" else 50
+        if timeframe == "1d":
+            stored = bar_store.tail(symbol, days)
+            if len(stored["date"]):
+                return {field: stored[field] for field in ("open", "high", "low", "close")}
         
-        prices = [base_price]
-        for _ in range(days - 1):
-            change = random.uniform(-0.05, 0.05)
-            new_price = prices[-1] * (1 + change)
-            prices.append(new_price)
-        
-        return prices
-
-    def _calculate_ema(self, prices: List[float], period: int) -> float:
-        """Calculate Exponential Moving Average"""
-        if len(prices) < period:
-            return prices[-1]
-        
-        multiplier = 2 / (period + 1)
-        ema = prices[0]
-        for price in prices[1:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-        return ema
-
-    def _calculate_rsi(self, prices: List[float], period: int = 14) -> float:
-        """Calculate Relative Strength Index"""
-        if len(prices) < period + 1:
-            return 50.0
-        
-        deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-        gains = [d if d > 0 else 0 for d in deltas]
-        losses = [-d if d < 0 else 0 for d in deltas]
-        
-        avg_gain = sum(gains[-period:]) / period
-        avg_loss = sum(losses[-period:]) / period
-        
-        if avg_loss == 0:
-            return 100.0
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
-
-    def _calculate_macd(self, prices: List[float]) -> float:
-        """Calculate MACD"""
-        ema_12 = self._calculate_ema(prices, 12)
-        ema_26 = self._calculate_ema(prices, 26)
-        return ema_12 - ema_26
-
-    def _calculate_stochastic(self, prices: List[float], period: int = 14) -> float:
-        """Calculate Stochastic Oscillator"""
-        if len(prices) < period:
-            return 50.0
-        
-        recent_prices = prices[-period:]
-        highest = max(recent_prices)
-        lowest = min(recent_prices)
-        current = prices[-1]
-        
-        if highest == lowest:
-            return 50.0
-        
-        k_percent = ((current - lowest) / (highest - lowest)) * 100
-        return k_percent
-
-    def _calculate_williams_r(self, prices: List[float], period: int = 14) -> float:
-        """Calculate Williams %R"""
-        if len(prices) < period:
-            return -50.0
-        
-        recent_prices = prices[-period:]
-        highest = max(recent_prices)
-        lowest = min(recent_prices)
-        current = prices[-1]
+        close = market_simulator.history(symbol, days)
+        open_ = np.concatenate([[close[0]], close[:-1]])
+        high = np.maximum(open_, close) * (1 + np.random.uniform(0, 0.01, days))
+        low = np.minimum(open_, close) * (1 - np.random.uniform(0, 0.01, days))
         
-        if highest == lowest:
-            return -50.0
-        
-        williams_r = ((highest - current) / (highest - lowest)) * -100
-        return williams_r
-
-    def _calculate_atr(self, prices: List[float], period: int = 14) -> float:
-        """Calculate Average True Range"""
-        if len(prices) < period + 1:
-            return 0.0
-        
-        true_ranges = []
-        for i in range(1, len(prices)):
-            high = prices[i]
-            low = prices[i-1]
-            close = prices[i-1]
-            tr = max(high - low, abs(high - close), abs(low - close))
-            true_ranges.append(tr)
-        
-        return sum(true_ranges[-period:]) / period
-
-    def _calculate_adx(self, prices: List[float], period: int = 14) -> float:
-        """Calculate Average Directional Index"""
-        if len(prices) < period + 1:
-            return 25.0
-        
-        # Simplified ADX calculation
-        return random.uniform(20, 50)
+        return {"open": open_, "high": high, "low": low, "close": close}
 
     def _get_sentiment_score(self, sentiment: float) -> str:
         """Convert sentiment value to score"""
@@ -296,3 +218,11 @@ class AdvancedMarketService:
         else:
             return "Very Bearish"
 
+
+# Global market service instance (indicator state must outlive a single request)
+market_service = AdvancedMarketService()
+
+
+def get_market_service() -> AdvancedMarketService:
+    """Get the shared advanced market service."""
+    return market_service
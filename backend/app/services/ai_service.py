@@ -4,8 +4,10 @@ Handles model loading, prediction generation, and asset allocation.
 """
 
 import joblib
+import json
 import numpy as np
-from typing import Dict, List, Any, Optional
+import threading
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import os
 from pathlib import Path
@@ -13,31 +15,214 @@ from pathlib import Path
 from app.core.config import settings
 from app.core.logger import app_logger
 from app.models.schemas import PredictionRequest, PredictionResponse, AssetAllocation, RiskTolerance
+from app.services.prediction_cache import PredictionCache
+from app.services.tree_scorer import FlatTreeEnsemble
+
+# Base allocations by risk tolerance: (asset class, percentage, expected return, risk level)
+BASE_ALLOCATIONS = {
+    RiskTolerance.LOW: [
+        ("Bonds", 60, 3.5, "Low"),
+        ("Large Cap Stocks", 25, 7.0, "Medium"),
+        ("REITs", 10, 6.0, "Medium"),
+        ("Cash", 5, 2.0, "Low")
+    ],
+    RiskTolerance.MEDIUM: [
+        ("Large Cap Stocks", 40, 8.0, "Medium"),
+        ("Bonds", 30, 4.0, "Low"),
+        ("International Stocks", 15, 9.0, "High"),
+        ("REITs", 10, 6.5, "Medium"),
+        ("Small Cap Stocks", 5, 12.0, "High")
+    ],
+    RiskTolerance.HIGH: [
+        ("Large Cap Stocks", 35, 8.5, "Medium"),
+        ("Small Cap Stocks", 25, 12.0, "High"),
+        ("International Stocks", 20, 9.5, "High"),
+        ("Emerging Markets", 10, 11.0, "Very High"),
+        ("Bonds", 10, 4.5, "Low")
+    ]
+}
+
+# Risk assessments by risk tolerance for scores below 40, below 70 and above
+SCORE_BANDS = [40, 70]
+RISK_ASSESSMENTS = {
+    RiskTolerance.LOW: [
+        "Conservative - Focus on capital preservation",
+        "Moderate Conservative - Balanced growth with low risk",
+        "Moderate - Some growth potential with controlled risk"
+    ],
+    RiskTolerance.MEDIUM: [
+        "Moderate Conservative - Steady growth approach",
+        "Moderate - Balanced growth and income",
+        "Moderate Aggressive - Growth-focused with moderate risk"
+    ],
+    RiskTolerance.HIGH: [
+        "Moderate - Growth potential with some risk",
+        "Aggressive - High growth potential with significant risk",
+        "Very Aggressive - Maximum growth potential with high risk"
+    ]
+}
+
+# Risk tolerances in encoded order (the model's risk_tolerance feature)
+RISK_TOLERANCE_ORDER = [RiskTolerance.LOW, RiskTolerance.MEDIUM, RiskTolerance.HIGH]
+RISK_TOLERANCE_CODES = {risk_tolerance: code for code, risk_tolerance in enumerate(RISK_TOLERANCE_ORDER)}
+
+MODEL_CONFIDENCE = 85.0
+RULES_CONFIDENCE = 75.0  # Lower confidence for mock predictions
+
+# Above this many rows scikit-learn's per-tree loops beat the flattened scorer
+FAST_SCORER_MAX_ROWS = 4096
 
 
 class AIService:
     """AI service for financial predictions and recommendations."""
     
     def __init__(self):
-        """Initialize the AI service."""
-        self.model = None
-        self.model_loaded = False
-        self._load_model()
+        """Initialize the AI service; the model itself is loaded on first use."""
+        self._model = None
+        self._fast_scorer: Optional[Tuple[Any, FlatTreeEnsemble]] = None
+        self.model_metadata = None
+        self._model_checked = False
+        self._model_signature = None
+        self._load_lock = threading.Lock()
+        self._watcher = None
+        self._watcher_stop = threading.Event()
+        self.prediction_cache = PredictionCache(settings.prediction_cache_size)
+    
+    @property
+    def model(self):
+        """The serving model, loading it on first use (None means rule-based predictions)."""
+        if not self._model_checked:
+            with self._load_lock:
+                if not self._model_checked:
+                    self._load_model_locked()
+        return self._model
+    
+    @property
+    def model_loaded(self) -> bool:
+        """Whether predictions come from a trained model."""
+        return self.model is not None
     
     def _load_model(self) -> None:
         """Load the ML model from file."""
+        with self._load_lock:
+            self._load_model_locked()
+    
+    def _load_model_locked(self) -> None:
+        """
+        Load the ML model from file, replacing the serving model in one step.
+        
+        Numpy arrays in the pickle are memory-mapped read-only, so processes
+        serving the same model file share those pages through the OS page
+        cache. If loading fails the current model keeps serving.
+        """
+        model_path = Path(settings.ml_model_path)
+        signature = self._file_signature(model_path)
         try:
-            model_path = Path(settings.ml_model_path)
-            if model_path.exists():
-                self.model = joblib.load(model_path)
-                self.model_loaded = True
+            if signature is not None:
+                model = joblib.load(model_path, mmap_mode="r" if settings.ml_model_mmap else None)
+                # Requests already scoring keep their reference to the old model
+                self._fast_scorer = self._export_scorer(model)
+                self._model = model
+                self.model_metadata = self._read_metadata(model_path)
                 app_logger.info(f"ML model loaded successfully from {model_path}")
-            else:
+            elif self._model is None:
                 app_logger.warning(f"Model file not found at {model_path}, using mock predictions")
-                self.model_loaded = False
+            else:
+                app_logger.warning(f"Model file not found at {model_path}, keeping the current model")
         except Exception as e:
             app_logger.error(f"Failed to load ML model: {str(e)}")
-            self.model_loaded = False
+        
+        self._model_signature = signature
+        self._model_checked = True
+        
+        # Cached predictions belong to whatever model was serving before
+        self.prediction_cache.invalidate()
+    
+    @staticmethod
+    def _export_scorer(model) -> Optional[Tuple[Any, FlatTreeEnsemble]]:
+        """
+        Flatten a tree ensemble for fast scoring, paired with the model it came from.
+        
+        Returns None when disabled, or when the model is not a supported tree
+        regressor, in which case predictions go through ``model.predict``.
+        """
+        if not settings.ml_fast_scorer:
+            return None
+        try:
+            scorer = FlatTreeEnsemble.from_model(model)
+        except Exception as e:
+            app_logger.warning(f"Could not flatten {type(model).__name__} for fast scoring: {str(e)}")
+            return None
+        if scorer is None:
+            return None
+        app_logger.info(f"Fast scorer ready: {scorer.n_trees} trees, {scorer.n_nodes} nodes")
+        return model, scorer
+    
+    def _scorer_for(self, model) -> Optional[FlatTreeEnsemble]:
+        """The flattened scorer exported from ``model``, if any."""
+        exported = self._fast_scorer
+        if exported is not None and exported[0] is model:
+            return exported[1]
+        return None
+    
+    @staticmethod
+    def _read_metadata(model_path: Path) -> Optional[Dict[str, Any]]:
+        """Training metadata written next to the model by the training pipeline, if any."""
+        try:
+            return json.loads(model_path.with_suffix(".json").read_text())
+        except (OSError, ValueError):
+            return None
+    
+    @staticmethod
+    def _file_signature(path: Path) -> Optional[tuple]:
+        """(mtime, size) of a file, or None if it doesn't exist."""
+        try:
+            stat = path.stat()
+            return (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            return None
+    
+    def start_model_watcher(self, interval: Optional[float] = None) -> None:
+        """
+        Hot-swap the model whenever the file at ML_MODEL_PATH changes.
+        
+        A background thread polls the file's modification time and size and
+        reloads once a change has been stable for one poll, so a model that
+        is still being written isn't picked up half-way. Writing the new
+        model elsewhere and renaming it into place avoids the wait.
+        
+        Args:
+            interval: Seconds between polls (defaults to ML_MODEL_WATCH_SECONDS; 0 disables)
+        """
+        interval = settings.ml_model_watch_seconds if interval is None else interval
+        if interval <= 0 or (self._watcher is not None and self._watcher.is_alive()):
+            return
+        
+        self._watcher_stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch_model, args=(interval,), name="model-watcher", daemon=True
+        )
+        self._watcher.start()
+        app_logger.info(f"Watching {settings.ml_model_path} for model updates every {interval}s")
+    
+    def stop_model_watcher(self) -> None:
+        """Stop the model watcher thread."""
+        self._watcher_stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+            self._watcher = None
+    
+    def _watch_model(self, interval: float) -> None:
+        """Model watcher loop."""
+        previous = None
+        while not self._watcher_stop.wait(interval):
+            if not self._model_checked:
+                continue
+            signature = self._file_signature(Path(settings.ml_model_path))
+            if signature != self._model_signature and signature is not None and signature == previous:
+                app_logger.info(f"Model file {settings.ml_model_path} changed, reloading")
+                self._load_model()
+            previous = signature
     
     def _create_mock_model(self) -> None:
         """Create a mock model for demonstration purposes."""
@@ -60,106 +245,16 @@ class AIService:
         y = np.random.uniform(20, 95, n_samples)
         
         # Train a simple model
-        self.model = RandomForestRegressor(n_estimators=10, random_state=42)
-        self.model.fit(X, y)
-        self.model_loaded = True
+        model = RandomForestRegressor(n_estimators=10, random_state=42)
+        model.fit(X, y)
+        self._fast_scorer = self._export_scorer(model)
+        self._model = model
+        self.model_metadata = None
+        self._model_checked = True
+        self.prediction_cache.invalidate()
         
         app_logger.info("Mock ML model created and trained")
     
-    def _encode_risk_tolerance(self, risk_tolerance: RiskTolerance) -> int:
-        """Encode risk tolerance to numeric value."""
-        mapping = {
-            RiskTolerance.LOW: 0,
-            RiskTolerance.MEDIUM: 1,
-            RiskTolerance.HIGH: 2
-        }
-        return mapping[risk_tolerance]
-    
-    def _generate_asset_allocations(self, risk_tolerance: RiskTolerance, 
-                                  recommendation_score: float) -> List[AssetAllocation]:
-        """Generate asset allocation recommendations based on risk tolerance and score."""
-        
-        # Base allocations by risk tolerance
-        base_allocations = {
-            RiskTolerance.LOW: [
-                ("Bonds", 60, 3.5, "Low"),
-                ("Large Cap Stocks", 25, 7.0, "Medium"),
-                ("REITs", 10, 6.0, "Medium"),
-                ("Cash", 5, 2.0, "Low")
-            ],
-            RiskTolerance.MEDIUM: [
-                ("Large Cap Stocks", 40, 8.0, "Medium"),
-                ("Bonds", 30, 4.0, "Low"),
-                ("International Stocks", 15, 9.0, "High"),
-                ("REITs", 10, 6.5, "Medium"),
-                ("Small Cap Stocks", 5, 12.0, "High")
-            ],
-            RiskTolerance.HIGH: [
-                ("Large Cap Stocks", 35, 8.5, "Medium"),
-                ("Small Cap Stocks", 25, 12.0, "High"),
-                ("International Stocks", 20, 9.5, "High"),
-                ("Emerging Markets", 10, 11.0, "Very High"),
-                ("Bonds", 10, 4.5, "Low")
-            ]
-        }
-        
-        allocations = base_allocations[risk_tolerance]
-        
-        # Adjust based on recommendation score
-        score_factor = recommendation_score / 100.0
-        
-        asset_allocations = []
-        for asset_class, base_pct, base_return, risk_level in allocations:
-            # Adjust percentage based on score (higher score = more aggressive)
-            adjusted_pct = base_pct * (0.8 + 0.4 * score_factor)
-            adjusted_return = base_return * (0.9 + 0.2 * score_factor)
-            
-            asset_allocations.append(AssetAllocation(
-                asset_class=asset_class,
-                percentage=round(adjusted_pct, 1),
-                expected_return=round(adjusted_return, 2),
-                risk_level=risk_level
-            ))
-        
-        # Normalize percentages to sum to 100
-        total_pct = sum(a.percentage for a in asset_allocations)
-        for allocation in asset_allocations:
-            allocation.percentage = round((allocation.percentage / total_pct) * 100, 1)
-        
-        return asset_allocations
-    
-    def _calculate_total_expected_return(self, allocations: List[AssetAllocation]) -> float:
-        """Calculate total expected return based on allocations."""
-        total_return = 0.0
-        for allocation in allocations:
-            total_return += (allocation.percentage / 100.0) * allocation.expected_return
-        return round(total_return, 2)
-    
-    def _get_risk_assessment(self, risk_tolerance: RiskTolerance, 
-                           recommendation_score: float) -> str:
-        """Generate risk assessment based on risk tolerance and score."""
-        if risk_tolerance == RiskTolerance.LOW:
-            if recommendation_score < 40:
-                return "Conservative - Focus on capital preservation"
-            elif recommendation_score < 70:
-                return "Moderate Conservative - Balanced growth with low risk"
-            else:
-                return "Moderate - Some growth potential with controlled risk"
-        elif risk_tolerance == RiskTolerance.MEDIUM:
-            if recommendation_score < 40:
-                return "Moderate Conservative - Steady growth approach"
-            elif recommendation_score < 70:
-                return "Moderate - Balanced growth and income"
-            else:
-                return "Moderate Aggressive - Growth-focused with moderate risk"
-        else:  # HIGH risk tolerance
-            if recommendation_score < 40:
-                return "Moderate - Growth potential with some risk"
-            elif recommendation_score < 70:
-                return "Aggressive - High growth potential with significant risk"
-            else:
-                return "Very Aggressive - Maximum growth potential with high risk"
-    
     def predict_investment_recommendation(self, request: PredictionRequest) -> PredictionResponse:
         """
         Generate investment recommendation based on user profile.
@@ -173,86 +268,189 @@ class AIService:
         try:
             app_logger.info(f"Generating prediction for user with risk tolerance: {request.risk_tolerance}")
             
-            # Prepare features for model prediction
-            features = np.array([[
-                request.age,
-                request.annual_income,
-                self._encode_risk_tolerance(request.risk_tolerance),
-                request.investment_horizon_years
-            ]])
+            # A batch of one, so single and batch predictions can never disagree
+            response = self._predict_profiles([request])[0]
             
-            # Get prediction from model or generate mock prediction
-            if self.model_loaded and self.model is not None:
-                recommendation_score = float(self.model.predict(features)[0])
-                confidence_level = 85.0  # Mock confidence level
-            else:
-                # Generate mock prediction based on rules
-                recommendation_score = self._generate_mock_prediction(request)
-                confidence_level = 75.0  # Lower confidence for mock predictions
-            
-            # Ensure score is within valid range
-            recommendation_score = max(0, min(100, recommendation_score))
-            
-            # Generate asset allocations
-            asset_allocations = self._generate_asset_allocations(
-                request.risk_tolerance, 
-                recommendation_score
-            )
+            app_logger.info(f"Prediction generated successfully with score: {response.recommendation_score}")
+            return response
             
-            # Calculate total expected return
-            total_expected_return = self._calculate_total_expected_return(asset_allocations)
+        except Exception as e:
+            app_logger.error(f"Error generating prediction: {str(e)}")
+            raise Exception(f"Failed to generate investment recommendation: {str(e)}")
+    
+    def predict_batch(self, requests: List[PredictionRequest]) -> List[PredictionResponse]:
+        """
+        Generate investment recommendations for many user profiles at once.
+        
+        Profiles already in the prediction cache are answered from it; the
+        rest are encoded into one feature matrix and scored with a single
+        model call, with allocations derived by array operations per risk
+        tolerance rather than profile by profile.
+        
+        Args:
+            requests: User financial data and preferences, one per profile
             
-            # Generate risk assessment
-            risk_assessment = self._get_risk_assessment(request.risk_tolerance, recommendation_score)
+        Returns:
+            One PredictionResponse per request, in request order
+        """
+        try:
+            app_logger.info(f"Generating batch prediction for {len(requests)} profiles")
+            if not requests:
+                return []
             
-            response = PredictionResponse(
-                recommendation_score=round(recommendation_score, 1),
-                asset_allocations=asset_allocations,
-                total_expected_return=total_expected_return,
-                risk_assessment=risk_assessment,
-                confidence_level=confidence_level
-            )
+            responses = self._predict_profiles(requests)
             
-            app_logger.info(f"Prediction generated successfully with score: {recommendation_score}")
-            return response
+            app_logger.info(f"Batch prediction generated for {len(responses)} profiles")
+            return responses
             
         except Exception as e:
-            app_logger.error(f"Error generating prediction: {str(e)}")
-            raise Exception(f"Failed to generate investment recommendation: {str(e)}")
+            app_logger.error(f"Error generating batch prediction: {str(e)}")
+            raise Exception(f"Failed to generate investment recommendations: {str(e)}")
     
-    def _generate_mock_prediction(self, request: PredictionRequest) -> float:
-        """Generate mock prediction based on user profile."""
-        base_score = 50.0
+    def _predict_profiles(self, requests: List[PredictionRequest]) -> List[PredictionResponse]:
+        """Answer requests from the prediction cache, scoring each distinct missing profile once."""
+        profiles = [self._encode_profile(request) for request in requests]
+        cached, version = self.prediction_cache.get_many(profiles)
         
-        # Adjust based on age (younger = higher score)
-        age_factor = max(0, (65 - request.age) / 65) * 20
+        # Cached responses stay in the cache; each hit gets its own copy, stamped now
+        created_at = datetime.utcnow()
+        responses = [None if response is None else response.model_copy(update={"created_at": created_at})
+                     for response in cached]
         
-        # Adjust based on income (higher income = higher score)
-        income_factor = min(20, request.annual_income / 10000)
+        missing = list(dict.fromkeys(p for p, response in zip(profiles, responses) if response is None))
+        if missing:
+            scored = dict(zip(missing, self._predict(np.array(missing, dtype=float))))
+            self.prediction_cache.put_many(list(scored.items()), version)
+            first = {}
+            for i, profile in enumerate(profiles):
+                if responses[i] is not None:
+                    continue
+                # Repeats of a profile within the batch get copies rather than one shared response
+                if profile in first:
+                    responses[i] = responses[first[profile]].model_copy()
+                else:
+                    first[profile] = i
+                    responses[i] = scored[profile]
         
-        # Adjust based on risk tolerance
-        risk_factors = {
-            RiskTolerance.LOW: 0,
-            RiskTolerance.MEDIUM: 10,
-            RiskTolerance.HIGH: 20
-        }
-        risk_factor = risk_factors[request.risk_tolerance]
+        return responses
+    
+    def _encode_profile(self, request: PredictionRequest) -> tuple:
+        """
+        Encode a user profile as (age, income, risk tolerance code, horizon).
+        
+        This is both a model feature row and the prediction cache key. With
+        PREDICTION_CACHE_INCOME_STEP set, income is rounded to that step so
+        near-identical profiles share one prediction.
+        """
+        income = request.annual_income
+        if settings.prediction_cache_income_step > 0:
+            step = settings.prediction_cache_income_step
+            income = max(step, round(income / step) * step)
+        return (request.age, float(income), RISK_TOLERANCE_CODES[request.risk_tolerance],
+                request.investment_horizon_years)
+    
+    def _predict(self, features: np.ndarray) -> List[PredictionResponse]:
+        """Score an encoded feature matrix and build one response per row."""
+        # Get predictions from model or generate mock predictions based on rules
+        # One read, so a hot swap mid-batch can't mix two models
+        model = self.model
+        if model is not None:
+            scorer = self._scorer_for(model)
+            use_scorer = scorer is not None and len(features) <= FAST_SCORER_MAX_ROWS
+            predict = scorer.predict if use_scorer else model.predict
+            scores = np.asarray(predict(features), dtype=float)
+            confidence_level = MODEL_CONFIDENCE
+        else:
+            scores = self._generate_mock_predictions(features)
+            confidence_level = RULES_CONFIDENCE
+        
+        # Ensure scores are within valid range
+        scores = np.clip(scores, 0, 100)
+        created_at = datetime.utcnow()
+        
+        responses = [None] * len(features)
+        for code, risk_tolerance in enumerate(RISK_TOLERANCE_ORDER):
+            rows = np.flatnonzero(features[:, 2] == code)
+            if len(rows) == 0:
+                continue
+            
+            group_scores = scores[rows]
+            percentages, returns, totals = self._allocation_arrays(risk_tolerance, group_scores)
+            bands = np.searchsorted(SCORE_BANDS, group_scores, side="right")
+            assessments = RISK_ASSESSMENTS[risk_tolerance]
+            classes = BASE_ALLOCATIONS[risk_tolerance]
+            
+            for row, score, pcts, rets, total, band in zip(
+                    rows.tolist(), group_scores.tolist(), percentages.tolist(),
+                    returns.tolist(), totals.tolist(), bands.tolist()):
+                responses[row] = PredictionResponse(
+                    recommendation_score=round(score, 1),
+                    asset_allocations=[
+                        AssetAllocation(
+                            asset_class=asset_class,
+                            percentage=pct,
+                            expected_return=ret,
+                            risk_level=risk_level
+                        )
+                        for (asset_class, _, _, risk_level), pct, ret in zip(classes, pcts, rets)
+                    ],
+                    total_expected_return=total,
+                    risk_assessment=assessments[band],
+                    confidence_level=confidence_level,
+                    created_at=created_at
+                )
+        
+        return responses
+    
+    def _allocation_arrays(self, risk_tolerance: RiskTolerance, scores: np.ndarray):
+        """
+        Generate asset allocations for many recommendation scores at once.
+        
+        Expected returns rise with the score (higher score = more aggressive)
+        and percentages are normalized to sum to 100.
         
-        # Adjust based on investment horizon (longer = higher score)
-        horizon_factor = min(15, request.investment_horizon_years * 2)
+        Args:
+            risk_tolerance: Risk tolerance shared by every score
+            scores: Recommendation scores, shape (n,)
+            
+        Returns:
+            (percentages, expected returns, total expected returns) with shapes
+            (n, classes), (n, classes) and (n,)
+        """
+        table = BASE_ALLOCATIONS[risk_tolerance]
+        base_pct = np.array([row[1] for row in table], dtype=float)
+        base_return = np.array([row[2] for row in table], dtype=float)
+        score_factor = (scores / 100.0)[:, None]
+        
+        percentages = np.round(base_pct * (0.8 + 0.4 * score_factor), 1)
+        returns = np.round(base_return * (0.9 + 0.2 * score_factor), 2)
+        percentages = np.round(percentages / percentages.sum(axis=1, keepdims=True) * 100, 1)
+        totals = np.round((percentages / 100.0 * returns).sum(axis=1), 2)
+        return percentages, returns, totals
+    
+    def _generate_mock_predictions(self, features: np.ndarray) -> np.ndarray:
+        """Generate mock predictions for an encoded feature matrix based on user profiles."""
+        age, income, risk_code, horizon = features.T
         
-        # Calculate final score
-        final_score = base_score + age_factor + income_factor + risk_factor + horizon_factor
+        # Younger, higher income, more risk tolerant and longer horizon = higher score
+        age_factor = np.maximum(0, (65 - age) / 65) * 20
+        income_factor = np.minimum(20, income / 10000)
+        risk_factor = risk_code * 10
+        horizon_factor = np.minimum(15, horizon * 2)
         
-        return min(95, max(20, final_score))
+        return np.clip(50.0 + age_factor + income_factor + risk_factor + horizon_factor, 20, 95)
     
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the loaded model."""
+        model = self.model
         return {
-            "model_loaded": self.model_loaded,
-            "model_type": type(self.model).__name__ if self.model else None,
+            "model_loaded": model is not None,
+            "model_type": type(model).__name__ if model is not None else None,
+            "model_version": (self.model_metadata or {}).get("version"),
+            "fast_scorer": self._scorer_for(model) is not None,
             "model_path": settings.ml_model_path,
-            "features": ["age", "annual_income", "risk_tolerance", "investment_horizon_years"]
+            "features": ["age", "annual_income", "risk_tolerance", "investment_horizon_years"],
+            "prediction_cache": self.prediction_cache.stats()
         }
 
 
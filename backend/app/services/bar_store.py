@@ -0,0 +1,210 @@
+"""
+Columnar OHLCV Bar Store
+Persistent daily price history in memory-mapped NumPy columns.
+
+Each symbol is a directory holding one flat binary file per field
+(``date``, ``open``, ``high``, ``low``, ``close``, ``volume``). Files only
+ever grow at the tail, and the ``date`` column is written last, so its length
+is the number of complete bars even while an append is in flight. Reads map
+the files once and hand out zero-copy slices; the sorted date column is the
+index for range queries.
+"""
+
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends are only serialized within this process
+    fcntl = None
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.logger import app_logger
+
+PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+FIELDS = ("date",) + PRICE_FIELDS
+
+_SYMBOL_PATTERN = re.compile(r"^[A-Z0-9][A-Z0-9.\-_^=]{0,31}$")
+
+
+class SymbolColumns:
+    """Memory-mapped columns for one symbol, valid for a fixed number of bars."""
+
+    __slots__ = ("length", "date_size", "columns")
+
+    def __init__(self, length: int, date_size: int, columns: Dict[str, np.ndarray]):
+        self.length = length
+        self.date_size = date_size
+        self.columns = columns
+
+
+class BarStore:
+    """
+    Daily bars for many symbols, one memory-mapped array per field per symbol.
+
+    Appends to a symbol hold an exclusive ``flock`` on its lock file, so the
+    API and another process (e.g. the backfill command) can append at the
+    same time without tearing the columns; readers never block, and notice
+    the longer date file and remap.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._columns: Dict[str, SymbolColumns] = {}
+        self._write_lock = threading.Lock()
+
+    def _symbol_dir(self, symbol: str) -> str:
+        symbol = symbol.upper()
+        if not _SYMBOL_PATTERN.match(symbol):
+            raise ValueError(f"Invalid symbol for bar store: {symbol!r}")
+        return os.path.join(self.root, symbol)
+
+    def _path(self, symbol: str, field: str) -> str:
+        return os.path.join(self._symbol_dir(symbol), f"{field}.bin")
+
+    @contextmanager
+    def _append_lock(self, symbol: str):
+        """Hold the symbol's write lock, across threads and processes."""
+        os.makedirs(self._symbol_dir(symbol), exist_ok=True)
+        with self._write_lock, open(os.path.join(self._symbol_dir(symbol), ".lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)  # released when the file closes
+            yield
+
+    def _open(self, symbol: str) -> Optional[SymbolColumns]:
+        """Current columns for a symbol, remapping only if the files have grown."""
+        key = symbol.upper()
+        if not _SYMBOL_PATTERN.match(key):
+            return None
+        cached = self._columns.get(key)
+        try:
+            date_size = os.stat(self._path(key, "date")).st_size
+        except FileNotFoundError:
+            return None
+        if cached is not None and cached.date_size == date_size:
+            return cached
+
+        length = date_size // 8
+        if length == 0:
+            return None
+        columns = {"date": np.memmap(self._path(key, "date"), dtype=np.int64, mode="r",
+                                     shape=(length,)).view("datetime64[D]")}
+        for field in PRICE_FIELDS:
+            columns[field] = np.memmap(self._path(key, field), dtype=np.float64, mode="r", shape=(length,))
+        cached = self._columns[key] = SymbolColumns(length, date_size, columns)
+        return cached
+
+    @staticmethod
+    def _empty() -> Dict[str, np.ndarray]:
+        bars = {"date": np.empty(0, dtype="datetime64[D]")}
+        for field in PRICE_FIELDS:
+            bars[field] = np.empty(0, dtype=np.float64)
+        return bars
+
+    def __contains__(self, symbol: str) -> bool:
+        return self._open(symbol) is not None
+
+    def symbols(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if name in self)
+
+    def length(self, symbol: str) -> int:
+        columns = self._open(symbol)
+        return columns.length if columns else 0
+
+    def last_date(self, symbol: str) -> Optional[np.datetime64]:
+        columns = self._open(symbol)
+        return columns.columns["date"][-1] if columns else None
+
+    def range(self, symbol: str, start=None, end=None) -> Dict[str, np.ndarray]:
+        """
+        Bars with ``start <= date <= end`` (either bound optional).
+
+        Returns read-only views into the mapped files; nothing is copied
+        until the caller converts them.
+        """
+        columns = self._open(symbol)
+        if columns is None:
+            return self._empty()
+        dates = columns.columns["date"]
+        lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(start, "D"), side="left"))
+        hi = columns.length if end is None else int(np.searchsorted(dates, np.datetime64(end, "D"), side="right"))
+        return {field: array[lo:hi] for field, array in columns.columns.items()}
+
+    def tail(self, symbol: str, count: int) -> Dict[str, np.ndarray]:
+        """The most recent ``count`` bars as zero-copy views."""
+        columns = self._open(symbol)
+        if columns is None:
+            return self._empty()
+        start = max(columns.length - count, 0)
+        return {field: array[start:] for field, array in columns.columns.items()}
+
+    def append(self, symbol: str, bars: Dict[str, np.ndarray]) -> int:
+        """
+        Append bars to a symbol's tail.
+
+        ``bars`` maps ``date``/``open``/``high``/``low``/``close`` (and optionally
+        ``volume``) to equal-length arrays, the same shape ``range`` returns.
+        Bars dated on or before the last stored bar are skipped, so refreshing
+        from an overlapping download is safe. Returns how many bars were added.
+        """
+        dates = np.asarray(bars["date"], dtype="datetime64[D]")
+        count = len(dates)
+        values = {}
+        for field in PRICE_FIELDS:
+            column = bars.get(field)
+            values[field] = np.zeros(count) if column is None else np.asarray(column, dtype=np.float64)
+            if len(values[field]) != count:
+                raise ValueError(f"Bar field {field!r} must have the same length as date")
+        if count > 1 and np.any(np.diff(dates.astype(np.int64)) <= 0):
+            raise ValueError("Bar dates must be strictly increasing")
+        if not count:
+            return 0
+
+        # The length check and the writes must see no other writer in between
+        with self._append_lock(symbol):
+            length = self.length(symbol)
+            if length:
+                keep = dates > self.last_date(symbol)
+                dates = dates[keep]
+                values = {field: column[keep] for field, column in values.items()}
+            if not len(dates):
+                return 0
+
+            # Prices first, date last: a bar only exists once its date is written.
+            # Truncating first drops any torn tail left by an interrupted append.
+            for field in PRICE_FIELDS:
+                with open(self._path(symbol, field), "ab") as f:
+                    f.truncate(length * 8)
+                    f.write(values[field].tobytes())
+            with open(self._path(symbol, "date"), "ab") as f:
+                f.truncate(length * 8)
+                f.write(dates.astype(np.int64).tobytes())
+
+        app_logger.debug(f"Appended {len(dates)} bars for {symbol.upper()}")
+        return len(dates)
+
+
+def bars_from_alpha_vantage(time_series: Dict[str, Dict[str, str]]) -> Dict[str, np.ndarray]:
+    """Convert an Alpha Vantage ``Time Series (Daily)`` payload into bar store columns (oldest first)."""
+    keys = {"open": "1. open", "high": "2. high", "low": "3. low", "close": "4. close", "volume": "5. volume"}
+    sorted_dates = sorted(time_series.keys())
+    bars = {"date": np.array(sorted_dates, dtype="datetime64[D]")}
+    for field, key in keys.items():
+        bars[field] = np.array([float(time_series[date].get(key, 0)) for date in sorted_dates])
+    return bars
+
+
+# Global bar store instance shared by every history consumer
+bar_store = BarStore(settings.bar_store_path)
+
+
+def get_bar_store() -> BarStore:
+    """Get the shared bar store."""
+    return bar_store
@@ -0,0 +1,198 @@
+"""
+Bulk Technical Analysis
+Latest indicator values for many symbols and timeframes in one request.
+
+Price histories for a timeframe are stacked into a ``(symbols, bars)``
+matrix and every requested indicator is computed over the whole matrix in
+one vectorized pass, a chunk of symbols at a time, so results can be sent
+while later chunks are still being computed.
+"""
+
+import math
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services import indicators
+from app.services.bar_store import BarStore, bar_store
+from app.services.market_simulator import MarketSimulator, market_simulator
+from app.services.streaming_indicators import TIMEFRAME_SECONDS
+
+# Bars of history per timeframe (as for the single-symbol analysis endpoints)
+HISTORY_BARS = {"1d": 100, "4h": 50, "1h": 50}
+
+# What a ticker may look like (upper-cased): letters, digits, dots and dashes
+SYMBOL_PATTERN = re.compile(r"^[A-Z0-9.\-]{1,12}$")
+
+
+def _single(name: str, function: Callable) -> Tuple[Tuple[str, ...], Callable]:
+    return (name,), lambda close, high, low: (function(close, high, low),)
+
+
+# Indicator computations; each produces one or more named outputs from (close, high, low)
+COMPUTATIONS: List[Tuple[Tuple[str, ...], Callable]] = [
+    _single("sma_20", lambda close, high, low: indicators.sma(close, 20)),
+    _single("sma_50", lambda close, high, low: indicators.sma(close, 50)),
+    _single("ema_12", lambda close, high, low: indicators.ema(close, 12)),
+    _single("ema_26", lambda close, high, low: indicators.ema(close, 26)),
+    _single("rsi", lambda close, high, low: indicators.rsi(close)),
+    (("macd", "macd_signal", "macd_histogram"), lambda close, high, low: indicators.macd(close)),
+    (("bollinger_upper", "bollinger_lower"),
+     lambda close, high, low: indicators.bollinger_bands(close)[::2]),
+    (("stochastic", "stochastic_d"), lambda close, high, low: indicators.stochastic(high, low, close)),
+    _single("williams_r", lambda close, high, low: indicators.williams_r(high, low, close)),
+    _single("atr", lambda close, high, low: indicators.atr(high, low, close)),
+    (("adx", "plus_di", "minus_di"), lambda close, high, low: indicators.adx(high, low, close)),
+]
+
+INDICATOR_NAMES = [name for outputs, _ in COMPUTATIONS for name in outputs]
+
+
+def parse_request(symbols: Iterable[str], timeframes: Iterable[str],
+                  names: Optional[Iterable[str]] = None) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Normalize a bulk request.
+
+    Args:
+        symbols: Symbols to analyze (upper-cased, duplicates dropped), matching SYMBOL_PATTERN
+        timeframes: Timeframes, any of HISTORY_BARS
+        names: Indicator names, any of INDICATOR_NAMES (all of them if empty)
+
+    Returns:
+        (symbols, timeframes, indicator names); raises ValueError on unknown names
+    """
+    symbols = list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol.strip()))
+    timeframes = list(dict.fromkeys(timeframes))
+    names = list(dict.fromkeys(names or INDICATOR_NAMES))
+    if not symbols:
+        raise ValueError("Request at least one symbol")
+    invalid = [symbol for symbol in symbols if not SYMBOL_PATTERN.match(symbol)]
+    if invalid:
+        more = f" and {len(invalid) - 5} more" if len(invalid) > 5 else ""
+        raise ValueError(f"Invalid symbols {invalid[:5]}{more}; use 1-12 letters, digits, dots or dashes")
+    if not timeframes:
+        raise ValueError("Request at least one timeframe")
+    unknown = [timeframe for timeframe in timeframes if timeframe not in HISTORY_BARS]
+    if unknown:
+        raise ValueError(f"Unknown timeframes {unknown}; choose from {list(TIMEFRAME_SECONDS)}")
+    unknown = [name for name in names if name not in INDICATOR_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown indicators {unknown}; choose from {INDICATOR_NAMES}")
+    return symbols, timeframes, names
+
+
+def compute_latest(close: np.ndarray, high: np.ndarray, low: np.ndarray,
+                   names: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    Latest value of each named indicator for every row of a stacked price matrix.
+
+    Args:
+        close, high, low: Arrays shaped (symbols, bars)
+        names: Indicator names; outputs that share a computation are computed together
+
+    Returns:
+        Indicator name -> array of latest values, one per symbol (NaN if not enough history)
+    """
+    wanted = set(names)
+    latest = {}
+    for outputs, compute in COMPUTATIONS:
+        if wanted.intersection(outputs):
+            for name, series in zip(outputs, compute(close, high, low)):
+                if name in wanted:
+                    latest[name] = series[..., -1]
+    return latest
+
+
+class BulkAnalyzer:
+    """
+    Computes indicators for many symbols per vectorized pass.
+
+    Histories come from the bar store for daily bars when a symbol has
+    them, otherwise from the market simulator (closes only, so range-based
+    indicators use close-to-close ranges); reading a history doesn't add
+    the symbol to the simulator. Symbols with the same history
+    length share a price matrix.
+    """
+
+    def __init__(self, store: Optional[BarStore] = None, simulator: Optional[MarketSimulator] = None,
+                 chunk_size: int = 500):
+        """
+        Initialize the analyzer.
+
+        Args:
+            store: Stored daily bars (defaults to the shared bar store)
+            simulator: Fallback price source (defaults to the shared market simulator)
+            chunk_size: Most symbols per vectorized pass
+        """
+        self.store = store or bar_store
+        self.simulator = simulator or market_simulator
+        self.chunk_size = max(1, chunk_size)
+
+    def _history(self, symbol: str, timeframe: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        bars = HISTORY_BARS[timeframe]
+        if timeframe == "1d":
+            stored = self.store.tail(symbol, bars)
+            if len(stored["close"]):
+                return stored["close"], stored["high"], stored["low"]
+        close = self.simulator.history(symbol, bars)
+        return close, close, close
+
+    def stacked(self, symbols: Sequence[str], timeframe: str) -> Iterator[Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Price matrices for ``symbols``: one (symbols, close, high, low) group per history length.
+
+        Groups hold at most ``chunk_size`` symbols each.
+        """
+        by_length: Dict[int, List[Tuple[str, Tuple[np.ndarray, ...]]]] = {}
+        for symbol in symbols:
+            history = self._history(symbol, timeframe)
+            by_length.setdefault(len(history[0]), []).append((symbol, history))
+        for rows in by_length.values():
+            for start in range(0, len(rows), self.chunk_size):
+                chunk = rows[start:start + self.chunk_size]
+                close, high, low = (np.stack([history[i] for _, history in chunk]) for i in range(3))
+                yield [symbol for symbol, _ in chunk], close, high, low
+
+    def analyze(self, symbols: Iterable[str], timeframes: Iterable[str],
+                names: Optional[Iterable[str]] = None) -> Iterator[List[Dict]]:
+        """
+        Results for every (symbol, timeframe), one list per chunk as soon as the chunk is computed.
+
+        Each result carries the latest close, the number of bars used and the
+        requested indicators rounded to 2 decimals (None where the history is
+        too short). Raises ValueError for an invalid request before computing
+        anything.
+        """
+        symbols, timeframes, names = parse_request(symbols, timeframes, names)
+        return self._analyze(symbols, timeframes, names)
+
+    def _analyze(self, symbols: List[str], timeframes: List[str], names: List[str]) -> Iterator[List[Dict]]:
+        for timeframe in timeframes:
+            for chunk, close, high, low in self.stacked(symbols, timeframe):
+                latest = compute_latest(close, high, low, names)
+                rounded = {name: np.round(values, 2).tolist() for name, values in latest.items()}
+                last_close = np.round(close[:, -1], 2).tolist()
+                yield [
+                    {
+                        "symbol": symbol,
+                        "timeframe": timeframe,
+                        "close": last_close[row],
+                        "bars": close.shape[1],
+                        "indicators": {
+                            name: None if math.isnan(rounded[name][row]) else rounded[name][row]
+                            for name in names
+                        }
+                    }
+                    for row, symbol in enumerate(chunk)
+                ]
+
+
+# Global analyzer shared by the bulk analysis endpoint
+bulk_analyzer = BulkAnalyzer(chunk_size=settings.analysis_bulk_chunk_size)
+
+
+def get_bulk_analyzer() -> BulkAnalyzer:
+    """Get the shared bulk analyzer."""
+    return bulk_analyzer
@@ -0,0 +1,235 @@
+"""
+Technical Indicator Engine
+Vectorized NumPy indicators shared by the trading and market services.
+
+Every function takes price arrays shaped ``(bars,)`` for one symbol or
+``(symbols, bars)`` for many symbols at once, works along the last axis and
+returns full series of the same shape. Bars before an indicator has enough
+history are NaN.
+"""
+
+from typing import Dict, Optional, Tuple
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _as_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _recursive_smooth(values: np.ndarray, alpha: float, period: int, start: int = 0) -> np.ndarray:
+    """
+    Exponential smoothing along the last axis.
+
+    The first output (at ``start + period - 1``) is the simple mean of the
+    first ``period`` values after ``start``; each later output moves toward
+    the new value by ``alpha``. The time loop is sequential by nature, but
+    each step is vectorized across every symbol.
+    """
+    out = np.full(values.shape, np.nan)
+    first = start + period - 1
+    if values.shape[-1] <= first:
+        return out
+
+    current = values[..., start:first + 1].mean(axis=-1)
+    out[..., first] = current
+    for t in range(first + 1, values.shape[-1]):
+        current = current + alpha * (values[..., t] - current)
+        out[..., t] = current
+    return out
+
+
+def _rolling_window(values: np.ndarray, period: int) -> np.ndarray:
+    """Trailing windows of ``period`` bars, shaped (..., bars - period + 1, period)."""
+    return sliding_window_view(values, period, axis=-1)
+
+
+def _pad_front(values: np.ndarray, length: int) -> np.ndarray:
+    """Prepend NaNs so a rolling result lines up with its input bars."""
+    pad = np.full(values.shape[:-1] + (length - values.shape[-1],), np.nan)
+    return np.concatenate([pad, values], axis=-1)
+
+
+def sma(close, period: int) -> np.ndarray:
+    """Simple moving average."""
+    close = _as_array(close)
+    out = np.full(close.shape, np.nan)
+    if close.shape[-1] < period:
+        return out
+
+    csum = np.cumsum(close, axis=-1)
+    out[..., period - 1] = csum[..., period - 1]
+    out[..., period:] = csum[..., period:] - csum[..., :-period]
+    out[..., period - 1:] /= period
+    return out
+
+
+def rolling_std(close, period: int) -> np.ndarray:
+    """Rolling population standard deviation (same as ``np.std`` on each window)."""
+    close = _as_array(close)
+    # Variance is shift-invariant; centering on the first bar keeps the
+    # running sums small so E[x^2] - E[x]^2 stays numerically stable
+    centered = close - close[..., :1]
+    mean = sma(centered, period)
+    mean_sq = sma(centered * centered, period)
+    return np.sqrt(np.maximum(mean_sq - mean * mean, 0.0))
+
+
+def rolling_max(values, period: int) -> np.ndarray:
+    values = _as_array(values)
+    if values.shape[-1] < period:
+        return np.full(values.shape, np.nan)
+    return _pad_front(_rolling_window(values, period).max(axis=-1), values.shape[-1])
+
+
+def rolling_min(values, period: int) -> np.ndarray:
+    values = _as_array(values)
+    if values.shape[-1] < period:
+        return np.full(values.shape, np.nan)
+    return _pad_front(_rolling_window(values, period).min(axis=-1), values.shape[-1])
+
+
+def ema(close, period: int) -> np.ndarray:
+    """Exponential moving average seeded with the first ``period``-bar SMA."""
+    return _recursive_smooth(_as_array(close), 2.0 / (period + 1), period)
+
+
+def wilder(values, period: int, start: int = 0) -> np.ndarray:
+    """Wilder's smoothing (an EMA with alpha = 1 / period)."""
+    return _recursive_smooth(_as_array(values), 1.0 / period, period, start)
+
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """Relative Strength Index with Wilder smoothing."""
+    close = _as_array(close)
+    delta = np.diff(close, axis=-1, prepend=np.nan)
+    gains = np.where(delta > 0, delta, 0.0)
+    losses = np.where(delta < 0, -delta, 0.0)
+
+    # Bar 0 has no change, so smoothing starts at bar 1
+    avg_gain = wilder(gains, period, start=1)
+    avg_loss = wilder(losses, period, start=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        out = 100.0 - 100.0 / (1.0 + rs)
+    # No losses in the window means maximum strength
+    out = np.where((avg_loss == 0) & ~np.isnan(avg_gain), 100.0, out)
+    return out
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """MACD line, signal line and histogram."""
+    close = _as_array(close)
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = _recursive_smooth(line, 2.0 / (signal + 1), signal, start=slow - 1)
+    return line, signal_line, line - signal_line
+
+
+def bollinger_bands(close, period: int = 20, num_std: float = 2.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Upper band, middle band (SMA) and lower band."""
+    middle = sma(close, period)
+    width = num_std * rolling_std(close, period)
+    return middle + width, middle, middle - width
+
+
+def stochastic(high, low, close, k_period: int = 14, d_period: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+    """Stochastic oscillator %K and its %D moving average."""
+    close = _as_array(close)
+    highest = rolling_max(high, k_period)
+    lowest = rolling_min(low, k_period)
+    span = highest - lowest
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = np.where(span > 0, (close - lowest) / span * 100.0, 50.0)
+    k = np.where(np.isnan(highest), np.nan, k)
+
+    d = np.full(k.shape, np.nan)
+    if k.shape[-1] >= k_period + d_period - 1:
+        d[..., k_period - 1:] = sma(k[..., k_period - 1:], d_period)
+    return k, d
+
+
+def williams_r(high, low, close, period: int = 14) -> np.ndarray:
+    """Williams %R, from 0 (at the high) to -100 (at the low)."""
+    close = _as_array(close)
+    highest = rolling_max(high, period)
+    lowest = rolling_min(low, period)
+    span = highest - lowest
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(span > 0, (close - highest) / span * 100.0, -50.0)
+    return np.where(np.isnan(highest), np.nan, out)
+
+
+def true_range(high, low, close) -> np.ndarray:
+    """True range; the first bar falls back to high - low."""
+    high, low, close = _as_array(high), _as_array(low), _as_array(close)
+    prev_close = np.concatenate([close[..., :1], close[..., :-1]], axis=-1)
+    return np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+
+
+def atr(high, low, close, period: int = 14) -> np.ndarray:
+    """Average True Range with Wilder smoothing."""
+    return wilder(true_range(high, low, close), period, start=1)
+
+
+def adx(high, low, close, period: int = 14) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Average Directional Index with +DI and -DI."""
+    high, low = _as_array(high), _as_array(low)
+    up_move = np.diff(high, axis=-1, prepend=np.nan)
+    down_move = -np.diff(low, axis=-1, prepend=np.nan)
+    plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+    minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+    smoothed_tr = atr(high, low, close, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = 100.0 * wilder(plus_dm, period, start=1) / smoothed_tr
+        minus_di = 100.0 * wilder(minus_dm, period, start=1) / smoothed_tr
+        di_sum = plus_di + minus_di
+        dx = np.where(di_sum > 0, 100.0 * np.abs(plus_di - minus_di) / di_sum, 0.0)
+    dx = np.where(np.isnan(smoothed_tr), np.nan, dx)
+
+    # DX is defined from bar ``period``; ADX smooths the next ``period`` DX values
+    return wilder(dx, period, start=period), plus_di, minus_di
+
+
+def compute_all(close, high=None, low=None) -> Dict[str, np.ndarray]:
+    """
+    Full series for every indicator the services report.
+
+    ``high``/``low`` default to ``close`` when only closing prices exist, in
+    which case range-based indicators degrade to close-to-close versions.
+    """
+    close = _as_array(close)
+    high = close if high is None else _as_array(high)
+    low = close if low is None else _as_array(low)
+
+    macd_line, macd_signal, macd_hist = macd(close)
+    bb_upper, bb_middle, bb_lower = bollinger_bands(close)
+    stoch_k, stoch_d = stochastic(high, low, close)
+    adx_line, plus_di, minus_di = adx(high, low, close)
+
+    return {
+        "sma_20": bb_middle,
+        "sma_50": sma(close, 50),
+        "ema_12": ema(close, 12),
+        "ema_26": ema(close, 26),
+        "rsi": rsi(close),
+        "macd": macd_line,
+        "macd_signal": macd_signal,
+        "macd_histogram": macd_hist,
+        "bollinger_upper": bb_upper,
+        "bollinger_lower": bb_lower,
+        "stochastic": stoch_k,
+        "stochastic_d": stoch_d,
+        "williams_r": williams_r(high, low, close),
+        "atr": atr(high, low, close),
+        "adx": adx_line,
+        "plus_di": plus_di,
+        "minus_di": minus_di
+    }
+
+
+def latest(series: np.ndarray, default: Optional[float] = None) -> Optional[float]:
+    """Last value of a 1-D series as a float, or ``default`` if it isn't available yet."""
+    value = float(series[-1]) if len(series) else float("nan")
+    return default if np.isnan(value) else value
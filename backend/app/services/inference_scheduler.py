@@ -0,0 +1,172 @@
+"""
+Micro-batching scheduler for model inference.
+Coalesces concurrent prediction requests into one batched model call that
+runs in a worker thread, so the event loop never blocks on the model.
+"""
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.logger import app_logger
+from app.models.schemas import PredictionRequest, PredictionResponse
+from app.services.ai_service import ai_service
+
+
+class InferenceScheduler:
+    """
+    Collects concurrent predictions into micro-batches.
+    
+    The first request of a batch opens a window of ``window_ms``; everything
+    that arrives before it closes (up to ``max_batch_size`` requests) is
+    scored with one ``predict_batch`` call in a worker thread, and each
+    caller gets its own response back. While all workers are busy, new
+    requests keep queueing and go out together in the next batch, so batches
+    grow with load instead of the queue.
+    """
+    
+    def __init__(self, predict_batch: Callable[[List[PredictionRequest]], List[PredictionResponse]],
+                 max_batch_size: Optional[int] = None, window_ms: Optional[float] = None,
+                 workers: Optional[int] = None, latency_samples: int = 4096):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            predict_batch: Scores a list of requests, returning one response per request
+            max_batch_size: Most requests per model call (defaults to INFERENCE_BATCH_MAX_SIZE)
+            window_ms: How long a batch waits to fill (defaults to INFERENCE_BATCH_WINDOW_MS)
+            workers: Batches scored at once (defaults to INFERENCE_WORKERS)
+            latency_samples: Recent requests kept for the latency percentiles
+        """
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size or settings.inference_batch_max_size
+        self.window_ms = settings.inference_batch_window_ms if window_ms is None else window_ms
+        self.workers = workers or settings.inference_workers
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="inference")
+        self._queues: Dict[int, asyncio.Queue] = {}
+        self._collectors: Dict[int, asyncio.Task] = {}
+        self._latencies = deque(maxlen=latency_samples)
+        self.requests = 0
+        self.batches = 0
+        self.failures = 0
+        self.largest_batch = 0
+    
+    async def predict(self, request: PredictionRequest) -> PredictionResponse:
+        """
+        Score one request as part of the next micro-batch.
+        
+        Args:
+            request: User financial data and preferences
+        
+        Returns:
+            PredictionResponse for this request; raises whatever predict_batch raised
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue(loop).put_nowait((request, future, loop.time()))
+        return await future
+    
+    def _queue(self, loop: asyncio.AbstractEventLoop) -> asyncio.Queue:
+        """Get the running loop's queue, starting its collector on first use."""
+        loop_id = id(loop)
+        collector = self._collectors.get(loop_id)
+        if collector is None or collector.done():
+            self._queues[loop_id] = asyncio.Queue()
+            self._collectors[loop_id] = loop.create_task(self._collect(self._queues[loop_id]))
+        return self._queues[loop_id]
+    
+    async def _collect(self, queue: asyncio.Queue) -> None:
+        """Cut the queue into batches and hand each to a free worker."""
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.workers)
+        
+        while True:
+            batch = [await queue.get()]
+            closes = loop.time() + self.window_ms / 1000
+            while len(batch) < self.max_batch_size:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                remaining = closes - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Top the batch up with whatever arrived while waiting for a worker
+            await slots.acquire()
+            while len(batch) < self.max_batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            loop.create_task(self._run(batch, slots))
+    
+    async def _run(self, batch: List[tuple], slots: asyncio.Semaphore) -> None:
+        """Score one batch in the worker pool and resolve its callers."""
+        loop = asyncio.get_running_loop()
+        try:
+            # Callers that gave up (e.g. disconnected clients) are not scored
+            batch = [item for item in batch if not item[1].done()]
+            if not batch:
+                return
+            
+            try:
+                responses = await loop.run_in_executor(
+                    self._executor, self.predict_batch, [request for request, _, _ in batch]
+                )
+            except Exception as e:
+                app_logger.error(f"Batched inference failed for {len(batch)} requests: {str(e)}")
+                self.failures += 1
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                return
+            
+            finished = loop.time()
+            for (_, future, queued), response in zip(batch, responses):
+                if not future.done():
+                    future.set_result(response)
+                self._latencies.append(finished - queued)
+            
+            self.requests += len(batch)
+            self.batches += 1
+            self.largest_batch = max(self.largest_batch, len(batch))
+        finally:
+            slots.release()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get scheduler configuration, batching and latency metrics."""
+        latencies = np.array(self._latencies) * 1000
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (None, None, None)
+        return {
+            "max_batch_size": self.max_batch_size,
+            "window_ms": self.window_ms,
+            "workers": self.workers,
+            "requests": self.requests,
+            "batches": self.batches,
+            "failures": self.failures,
+            "mean_batch_size": round(self.requests / self.batches, 2) if self.batches else None,
+            "largest_batch": self.largest_batch,
+            "queue_depth": sum(queue.qsize() for queue in self._queues.values()),
+            "latency_ms": {
+                "p50": round(float(p50), 3) if p50 is not None else None,
+                "p95": round(float(p95), 3) if p95 is not None else None,
+                "p99": round(float(p99), 3) if p99 is not None else None
+            }
+        }
+    
+    async def close(self) -> None:
+        """Stop the running loop's collector (call from the app's shutdown hook)."""
+        loop_id = id(asyncio.get_running_loop())
+        self._queues.pop(loop_id, None)
+        collector = self._collectors.pop(loop_id, None)
+        if collector is not None:
+            collector.cancel()
+
+
+# Global inference scheduler instance
+inference_scheduler = InferenceScheduler(ai_service.predict_batch)
@@ -0,0 +1,361 @@
+"""
+In-process market simulator.
+One price source for every service: symbols follow geometric Brownian motion
+(or replay recorded closes), each step moves a whole batch of symbols with
+NumPy, and the new prices are published as one tick batch on a pub/sub bus.
+Services read the simulator's latest prices instead of drawing their own
+random numbers, so a symbol shows the same price on every endpoint.
+"""
+
+import threading
+import time
+import zlib
+from datetime import date
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.logger import app_logger
+
+# Starting prices for well-known symbols; anything else starts at DEFAULT_PRICE
+BASE_PRICES = {
+    "AAPL": 175.0, "MSFT": 350.0, "GOOGL": 2800.0, "AMZN": 3200.0,
+    "TSLA": 250.0, "META": 300.0, "NVDA": 450.0, "NFLX": 400.0,
+    "SPY": 450.0, "QQQ": 380.0, "IWM": 200.0, "DIA": 350.0, "VIX": 20.0
+}
+DEFAULT_PRICE = 100.0
+
+# Volatility and drift are annualized over trading time
+TRADING_DAYS_PER_YEAR = 252
+TRADING_SECONDS_PER_YEAR = TRADING_DAYS_PER_YEAR * 6.5 * 3600
+
+
+def starting_price(symbol: str) -> float:
+    """Price a symbol starts simulating at."""
+    return BASE_PRICES.get(symbol.upper(), DEFAULT_PRICE)
+
+
+class TickBatch:
+    """
+    The prices published by one simulator step.
+    
+    ``prices[k]`` is the new price of ``symbols[indices[k]]``; indices are
+    sorted, so single symbols are found with a binary search and whole
+    batches can be processed as arrays.
+    """
+    
+    __slots__ = ("timestamp", "indices", "prices", "symbols", "_index")
+    
+    def __init__(self, timestamp: float, indices: np.ndarray, prices: np.ndarray,
+                 symbols: List[str], index: Dict[str, int]):
+        self.timestamp = timestamp
+        self.indices = indices
+        self.prices = prices
+        self.symbols = symbols
+        self._index = index
+    
+    def __len__(self) -> int:
+        return len(self.indices)
+    
+    def get(self, symbol: str) -> Optional[float]:
+        """New price of ``symbol``, or None if it did not move in this batch."""
+        i = self._index.get(symbol.upper())
+        if i is None:
+            return None
+        k = int(np.searchsorted(self.indices, i))
+        return float(self.prices[k]) if k < len(self.indices) and self.indices[k] == i else None
+    
+    def items(self) -> Iterator[Tuple[str, float]]:
+        """(symbol, price) pairs for every tick in the batch."""
+        symbols = self.symbols
+        return zip([symbols[i] for i in self.indices.tolist()], self.prices.tolist())
+
+
+class TickBus:
+    """
+    Publish/subscribe for tick batches.
+    
+    Subscribers are called synchronously, in subscription order, on the
+    publisher's thread, so they should only do quick work (update a table,
+    wake a queue). A subscriber that raises is logged and counted without
+    stopping delivery to the others.
+    """
+    
+    def __init__(self):
+        self._subscribers: Tuple[Callable[[TickBatch], None], ...] = ()
+        self._lock = threading.Lock()
+        self.ticks = 0
+        self.batches = 0
+        self.errors = 0
+    
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+    
+    def subscribe(self, callback: Callable[[TickBatch], None]) -> Callable[[], None]:
+        """Call ``callback(batch)`` for every published batch; returns a function that unsubscribes."""
+        with self._lock:
+            self._subscribers = self._subscribers + (callback,)
+        
+        def unsubscribe():
+            with self._lock:
+                self._subscribers = tuple(s for s in self._subscribers if s is not callback)
+        return unsubscribe
+    
+    def publish(self, batch: TickBatch):
+        """Deliver a batch to every subscriber."""
+        self.ticks += len(batch)
+        self.batches += 1
+        # The tuple is replaced, never mutated, so (un)subscribing during delivery is safe
+        for callback in self._subscribers:
+            try:
+                callback(batch)
+            except Exception as e:
+                self.errors += 1
+                app_logger.error(f"Tick subscriber {callback!r} failed: {e}")
+
+
+class MarketSimulator:
+    """
+    Geometric Brownian motion over a growing set of symbols.
+    
+    Prices live in one NumPy array indexed by symbol, so a step that moves
+    thousands of symbols is a handful of vectorized operations. Symbols are
+    added at their starting price by ``index`` once something needs their
+    ticks; reads of any other symbol see its starting price without adding
+    it, so request input can't grow the simulated set. ``replay`` makes a
+    symbol follow recorded closes instead, one per step, after which it
+    continues as a random walk from the last close.
+    """
+    
+    def __init__(self, bus: Optional[TickBus] = None, tick_seconds: Optional[float] = None,
+                 volatility: Optional[float] = None, drift: float = 0.0, batch_size: Optional[int] = None,
+                 load_symbols: Optional[int] = None, seed: Optional[int] = None):
+        """
+        Initialize the simulator with the well-known symbols.
+        
+        Args:
+            bus: Bus the ticks are published on (a new one by default)
+            tick_seconds: Simulated time per step, and the background thread's interval
+                (defaults to MARKET_SIM_TICK_SECONDS)
+            volatility: Annualized volatility (defaults to MARKET_SIM_VOLATILITY)
+            drift: Annualized drift
+            batch_size: Symbols moved per step, chosen at random; 0 moves all of them
+                (defaults to MARKET_SIM_BATCH_SIZE)
+            load_symbols: Synthetic SIM00000.. symbols to add for load testing
+                (defaults to MARKET_SIM_SYMBOLS)
+            seed: Random seed, for reproducible paths
+        """
+        self.bus = bus or TickBus()
+        self.tick_seconds = settings.market_sim_tick_seconds if tick_seconds is None else tick_seconds
+        self.volatility = settings.market_sim_volatility if volatility is None else volatility
+        self.drift = drift
+        self.batch_size = settings.market_sim_batch_size if batch_size is None else batch_size
+        self.symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._prices = np.empty(0)
+        self._open = np.empty(0)
+        self._replay: Dict[int, Tuple[np.ndarray, int]] = {}
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.steps = 0
+        self.updated_at = time.time()
+        
+        self.add_symbols(BASE_PRICES, list(BASE_PRICES.values()))
+        load_symbols = settings.market_sim_symbols if load_symbols is None else load_symbols
+        if load_symbols:
+            self.add_symbols(f"SIM{i:05d}" for i in range(load_symbols))
+    
+    def __len__(self) -> int:
+        return len(self.symbols)
+    
+    def add_symbols(self, symbols: Iterable[str], prices: Optional[Iterable[float]] = None) -> List[int]:
+        """
+        Start simulating symbols (ones already simulated keep their price).
+        
+        Args:
+            symbols: Symbols to add
+            prices: Starting price of each symbol (defaults to BASE_PRICES, else DEFAULT_PRICE)
+        
+        Returns:
+            Index of each symbol
+        """
+        symbols = [symbol.upper() for symbol in symbols]
+        prices = list(prices) if prices is not None else [starting_price(symbol) for symbol in symbols]
+        with self._lock:
+            new = {}
+            for symbol, price in zip(symbols, prices):
+                if symbol not in self._index:
+                    new.setdefault(symbol, price)
+            count = len(self.symbols)
+            if count + len(new) > len(self._prices):
+                # Grow geometrically; readers holding the old arrays still see valid prices
+                capacity = max(64, 2 * (count + len(new)))
+                self._prices = np.concatenate([self._prices[:count], np.empty(capacity - count)])
+                self._open = np.concatenate([self._open[:count], np.empty(capacity - count)])
+            for symbol, price in new.items():
+                self._prices[count] = self._open[count] = price
+                # Append before indexing, so an index handed out always points at a listed symbol
+                self.symbols.append(symbol)
+                self._index[symbol] = count
+                count += 1
+        return [self._index[symbol] for symbol in symbols]
+    
+    def index(self, symbol: str) -> int:
+        """
+        Index of a symbol in the price arrays, adding the symbol on first use.
+        
+        Only for symbols something consumes ticks for (an order book, a
+        quote stream watch, a replay): added symbols are simulated for good.
+        """
+        i = self._index.get(symbol.upper())
+        return i if i is not None else self.add_symbols([symbol])[0]
+    
+    def price(self, symbol: str) -> float:
+        """Latest price of a symbol (its starting price if it isn't simulated yet)."""
+        i = self._index.get(symbol.upper())
+        return float(self._prices[i]) if i is not None else starting_price(symbol)
+    
+    def open_price(self, symbol: str) -> float:
+        """The symbol's price when the simulation (or its replay) started."""
+        i = self._index.get(symbol.upper())
+        return float(self._open[i]) if i is not None else starting_price(symbol)
+    
+    def prices(self, symbols: Iterable[str]) -> np.ndarray:
+        """Latest prices of many symbols at once."""
+        symbols = list(symbols)
+        indices = [self._index.get(symbol.upper()) for symbol in symbols]
+        if None not in indices:
+            return self._prices[indices]
+        return np.array([self.price(symbol) for symbol in symbols], dtype=float)
+    
+    def history(self, symbol: str, days: int) -> np.ndarray:
+        """
+        Daily closes for the last ``days`` days, ending at the symbol's latest price.
+        
+        The shape of the path is seeded by the symbol and today's date, so
+        repeated calls on the same day draw the same history, only rescaled
+        to wherever the price has moved since.
+        """
+        seed = zlib.crc32(f"{symbol.upper()}:{date.today().isoformat()}".encode())
+        sigma = self.volatility / np.sqrt(TRADING_DAYS_PER_YEAR)
+        log_returns = np.random.default_rng(seed).normal(-0.5 * sigma ** 2, sigma, max(days - 1, 0))
+        walk = np.exp(np.concatenate([[0.0], np.cumsum(log_returns)]))
+        return self.price(symbol) * walk / walk[-1]
+    
+    def replay(self, symbol: str, closes: Iterable[float]):
+        """Make a symbol follow recorded closes, one per step, starting from the first."""
+        closes = np.asarray(list(closes), dtype=float)
+        if not len(closes):
+            return
+        i = self.index(symbol)
+        with self._lock:
+            self._prices[i] = self._open[i] = closes[0]
+            if len(closes) > 1:
+                self._replay[i] = (closes, 1)
+            else:
+                self._replay.pop(i, None)
+    
+    def replay_stored_bars(self, store, days: int) -> List[str]:
+        """Replay the last ``days`` daily closes of every symbol in a bar store; returns the symbols."""
+        replayed = []
+        for symbol in store.symbols():
+            closes = store.tail(symbol, days)["close"]
+            if len(closes):
+                self.replay(symbol, closes)
+                replayed.append(symbol)
+        return replayed
+    
+    def step(self) -> TickBatch:
+        """Move a batch of symbols one tick forward and publish their new prices."""
+        with self._lock:
+            count = len(self.symbols)
+            if self.batch_size and self.batch_size < count:
+                indices = np.sort(self._rng.choice(count, self.batch_size, replace=False))
+            else:
+                indices = np.arange(count)
+            
+            dt = self.tick_seconds / TRADING_SECONDS_PER_YEAR
+            shocks = self._rng.standard_normal(len(indices))
+            prices = self._prices[indices] * np.exp(
+                (self.drift - 0.5 * self.volatility ** 2) * dt + self.volatility * np.sqrt(dt) * shocks)
+            if self._replay:
+                indices, prices = self._apply_replay(indices, prices)
+            self._prices[indices] = prices
+            
+            self.steps += 1
+            self.updated_at = time.time()
+            batch = TickBatch(self.updated_at, indices, prices, self.symbols, self._index)
+        # Outside the lock, so subscribers can read prices or add symbols
+        self.bus.publish(batch)
+        return batch
+    
+    def _apply_replay(self, indices: np.ndarray, prices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Replace random moves with the next recorded close of every replayed symbol."""
+        replayed = np.fromiter(self._replay, dtype=np.intp, count=len(self._replay))
+        closes = np.empty(len(replayed))
+        for k, i in enumerate(replayed.tolist()):
+            path, position = self._replay[i]
+            closes[k] = path[position]
+            if position + 1 < len(path):
+                self._replay[i] = (path, position + 1)
+            else:
+                del self._replay[i]
+        
+        keep = ~np.isin(indices, replayed)
+        indices = np.concatenate([indices[keep], replayed])
+        prices = np.concatenate([prices[keep], closes])
+        order = np.argsort(indices, kind="stable")
+        return indices[order], prices[order]
+    
+    def start(self):
+        """Step every ``tick_seconds`` on a background thread (once)."""
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="market-simulator", daemon=True)
+                self._thread.start()
+                app_logger.info(f"Market simulator running: {len(self.symbols)} symbols every {self.tick_seconds}s")
+    
+    def stop(self):
+        """Stop the background thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+    
+    def _run(self):
+        next_step = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self.step()
+            except Exception as e:
+                app_logger.error(f"Market simulator step failed: {e}")
+            # Fixed schedule, so slow steps don't stretch simulated time
+            next_step = max(next_step + self.tick_seconds, time.monotonic())
+            self._stop.wait(next_step - time.monotonic())
+    
+    def stats(self) -> Dict[str, float]:
+        """Symbols, steps and ticks published so far."""
+        return {
+            "symbols": len(self.symbols),
+            "replaying": len(self._replay),
+            "steps": self.steps,
+            "ticks": self.bus.ticks,
+            "subscribers": self.bus.subscriber_count,
+            "tick_seconds": self.tick_seconds,
+            "running": self._thread is not None
+        }
+
+
+# Global simulator shared by every service in the process
+market_simulator = MarketSimulator()
+
+
+def get_market_simulator() -> MarketSimulator:
+    """Get the shared market simulator."""
+    return market_simulator
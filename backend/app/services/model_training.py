@@ -0,0 +1,324 @@
+"""
+Offline training pipeline for the investment recommendation model.
+Streams customer history in chunks, grows a random forest across all cores,
+validates it on held-out rows and writes a versioned model artifact.
+"""
+
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, r2_score
+
+from app.core.config import settings
+from app.core.logger import app_logger
+from app.services.ai_service import RISK_TOLERANCE_CODES
+from app.services.tree_scorer import FlatTreeEnsemble
+
+FEATURES = ["age", "annual_income", "risk_tolerance", "investment_horizon_years"]
+TARGET = "outcome_score"
+ARTIFACT_PREFIX = "fin_predictor"
+
+# Rows per chunk read from the history files and trees grown per chunk
+CHUNK_ROWS = 100000
+TREES_PER_CHUNK = 8
+VALIDATION_FRACTION = 0.1
+MAX_VALIDATION_ROWS = 50000
+
+TREE_PARAMS = {"max_depth": 16, "min_samples_leaf": 20, "max_features": 1.0}
+
+# Promotion gates: single-row inference latency and validation score
+MAX_P99_LATENCY_MS = 25.0
+MIN_VALIDATION_R2 = 0.5
+
+
+def simulated_history(rows: int, seed: int = 42) -> pd.DataFrame:
+    """
+    Reproducible customer history in the training file format.
+    
+    Outcome scores follow the rule-based recommendation score with some
+    interactions (aggressive allocations late in life score lower) and noise.
+    """
+    rng = np.random.default_rng(seed)
+    age = rng.integers(18, 80, rows)
+    income = np.round(rng.lognormal(11.2, 0.5, rows), 2)
+    risk = rng.integers(0, 3, rows)
+    horizon = np.minimum(rng.integers(1, 40, rows), np.maximum(1, 85 - age))
+    
+    score = (
+        50.0
+        + np.maximum(0, (65 - age) / 65) * 20
+        + np.minimum(20, income / 10000)
+        + risk * 10
+        + np.minimum(15, horizon * 2)
+        - 12 * ((risk == 2) & (age > 60))
+        - 6 * ((risk == 0) & (horizon > 20))
+        + rng.normal(0, 4, rows)
+    )
+    names = {code: risk_tolerance.value for risk_tolerance, code in RISK_TOLERANCE_CODES.items()}
+    return pd.DataFrame({
+        "age": age,
+        "annual_income": income,
+        "risk_tolerance": [names[code] for code in risk],
+        "investment_horizon_years": horizon,
+        TARGET: np.round(np.clip(score, 0, 100), 2)
+    })
+
+
+def write_simulated_history(path: str, rows: int, files: int = 4, seed: int = 42) -> List[Path]:
+    """Write ``rows`` of simulated history to ``path`` split across ``files`` CSV files."""
+    directory = Path(path)
+    directory.mkdir(parents=True, exist_ok=True)
+    written = []
+    for index, part in enumerate(np.array_split(np.arange(rows), files)):
+        file_path = directory / f"history-{index:03d}.csv"
+        simulated_history(len(part), seed + index).to_csv(file_path, index=False)
+        written.append(file_path)
+    return written
+
+
+def history_files(path: str) -> List[Path]:
+    """Training history files under ``path`` in a stable order."""
+    directory = Path(path)
+    return sorted(list(directory.glob("*.csv")) + list(directory.glob("*.csv.gz")))
+
+
+def iter_training_chunks(path: str, chunk_rows: int = CHUNK_ROWS) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Stream (features, targets) chunks from the history files.
+    
+    Only one chunk is in memory at a time. Risk tolerance may be stored as
+    its name or its code; rows with missing or out-of-range values are dropped.
+    
+    Args:
+        path: Directory of CSV history files
+        chunk_rows: Rows per chunk
+    
+    Yields:
+        (n, 4) float feature matrix in model feature order and (n,) targets
+    """
+    codes = {risk_tolerance.value: code for risk_tolerance, code in RISK_TOLERANCE_CODES.items()}
+    for file_path in history_files(path):
+        for chunk in pd.read_csv(file_path, usecols=FEATURES + [TARGET], chunksize=chunk_rows):
+            risk = chunk["risk_tolerance"]
+            if not pd.api.types.is_numeric_dtype(risk):
+                chunk["risk_tolerance"] = risk.str.lower().map(codes)
+            chunk = chunk.apply(pd.to_numeric, errors="coerce").dropna()
+            chunk = chunk[chunk["risk_tolerance"].isin([0, 1, 2]) & (chunk["age"] > 0) &
+                          (chunk["annual_income"] > 0) & chunk[TARGET].between(0, 100)]
+            if len(chunk):
+                yield chunk[FEATURES].to_numpy(dtype=np.float64), chunk[TARGET].to_numpy(dtype=np.float64)
+
+
+def train_model(path: str, chunk_rows: int = CHUNK_ROWS, trees_per_chunk: int = TREES_PER_CHUNK,
+                seed: int = 42, n_jobs: int = -1, **tree_params) -> Tuple[RandomForestRegressor, Dict[str, Any]]:
+    """
+    Train a random forest on the history under ``path``.
+    
+    Each chunk grows ``trees_per_chunk`` more trees (warm start), fitted in
+    parallel across ``n_jobs`` cores, so memory is bounded by one chunk while
+    the forest as a whole sees all of the data. A random ``VALIDATION_FRACTION``
+    of every chunk is held out for validation instead.
+    
+    Args:
+        path: Directory of CSV history files
+        chunk_rows: Rows per chunk
+        trees_per_chunk: Trees added for each chunk
+        seed: Seed for tree building and the validation split
+        n_jobs: Cores used for training (-1 = all)
+        **tree_params: Overrides for TREE_PARAMS
+    
+    Returns:
+        (model, training report)
+    """
+    rng = np.random.default_rng(seed)
+    model = RandomForestRegressor(n_estimators=0, warm_start=True, random_state=seed, n_jobs=n_jobs,
+                                  **{**TREE_PARAMS, **tree_params})
+    validation_X, validation_y = [], []
+    validation_rows = training_rows = chunks = 0
+    
+    start = time.perf_counter()
+    for X, y in iter_training_chunks(path, chunk_rows):
+        held_out = rng.random(len(y)) < VALIDATION_FRACTION
+        room = MAX_VALIDATION_ROWS - validation_rows
+        if room > 0:
+            validation_X.append(X[held_out][:room])
+            validation_y.append(y[held_out][:room])
+            validation_rows += len(validation_y[-1])
+        
+        X, y = X[~held_out], y[~held_out]
+        model.n_estimators += trees_per_chunk
+        model.fit(X, y)
+        training_rows += len(y)
+        chunks += 1
+        app_logger.info(f"Trained chunk {chunks}: {len(y):,} rows, {model.n_estimators} trees")
+    
+    if not chunks:
+        raise ValueError(f"No training history found in {path}")
+    training_seconds = time.perf_counter() - start
+    
+    # Serve single rows on one core: spawning workers costs more than scoring
+    model.n_jobs = 1
+    
+    validation_X, validation_y = np.concatenate(validation_X), np.concatenate(validation_y)
+    predicted = model.predict(validation_X)
+    report = {
+        "features": FEATURES,
+        "target": TARGET,
+        "training_rows": training_rows,
+        "validation_rows": len(validation_y),
+        "chunks": chunks,
+        "n_estimators": model.n_estimators,
+        "params": {**TREE_PARAMS, **tree_params, "trees_per_chunk": trees_per_chunk, "seed": seed},
+        "training_seconds": round(training_seconds, 2),
+        "validation": {
+            "r2": round(float(r2_score(validation_y, predicted)), 4),
+            "mae": round(float(mean_absolute_error(validation_y, predicted)), 4)
+        }
+    }
+    return model, report
+
+
+def measure_latency(model, rows: np.ndarray, single_rounds: int = 500, batch_size: int = 1000) -> Dict[str, float]:
+    """
+    Time scoring the way AIService serves the model.
+    
+    That is the flattened tree scorer when the model can be exported to one
+    (and it is enabled), otherwise ``model.predict``.
+    
+    Args:
+        model: Fitted regressor
+        rows: Sample feature rows
+        single_rounds: Single-row predictions timed
+        batch_size: Rows in the timed batch prediction
+    
+    Returns:
+        Single-row p50/p99 latency in ms and batch throughput in rows per second
+    """
+    scorer = FlatTreeEnsemble.from_model(model) if settings.ml_fast_scorer else None
+    predict = scorer.predict if scorer is not None else model.predict
+    timings = []
+    for row in rows[np.arange(single_rounds) % len(rows)]:
+        start = time.perf_counter()
+        predict(row[None, :])
+        timings.append(time.perf_counter() - start)
+    
+    batch = rows[np.arange(batch_size) % len(rows)]
+    start = time.perf_counter()
+    predict(batch)
+    batch_seconds = time.perf_counter() - start
+    
+    p50, p99 = np.percentile(np.array(timings) * 1000, [50, 99])
+    return {
+        "single_p50_ms": round(float(p50), 3),
+        "single_p99_ms": round(float(p99), 3),
+        "batch_rows_per_second": round(batch_size / batch_seconds, 1)
+    }
+
+
+def promotion_failures(metadata: Dict[str, Any], max_p99_ms: float = MAX_P99_LATENCY_MS,
+                       min_r2: float = MIN_VALIDATION_R2) -> List[str]:
+    """
+    Check a trained model against the promotion gates.
+    
+    Returns:
+        Reasons the model may not be promoted (empty when it passes)
+    """
+    failures = []
+    p99 = metadata["latency"]["single_p99_ms"]
+    if p99 > max_p99_ms:
+        failures.append(f"single-row p99 latency {p99} ms exceeds {max_p99_ms} ms")
+    r2 = metadata["validation"]["r2"]
+    if r2 < min_r2:
+        failures.append(f"validation R² {r2} is below {min_r2}")
+    return failures
+
+
+def save_artifact(model, metadata: Dict[str, Any], models_dir: str) -> Path:
+    """
+    Write ``fin_predictor-<version>.pkl`` and its ``.json`` metadata to ``models_dir``.
+    
+    The pickle is uncompressed so AIService can memory-map its arrays.
+    
+    Returns:
+        Path of the model artifact
+    """
+    directory = Path(models_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    artifact = directory / f"{ARTIFACT_PREFIX}-{metadata['version']}.pkl"
+    joblib.dump(model, artifact)
+    artifact.with_suffix(".json").write_text(json.dumps(metadata, indent=2))
+    return artifact
+
+
+def promote(artifact: Path, model_path: str) -> None:
+    """
+    Make ``artifact`` the serving model at ``model_path``.
+    
+    The model and its metadata are copied next to the target and renamed
+    into place, so a running AIService's model watcher never sees a
+    half-written file.
+    """
+    target = Path(model_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    for source, destination in [(artifact.with_suffix(".json"), target.with_suffix(".json")),
+                                (artifact, target)]:
+        staging = destination.with_name(f".{destination.name}.tmp")
+        shutil.copyfile(source, staging)
+        os.replace(staging, destination)
+
+
+def run_pipeline(data_path: str, models_dir: str, chunk_rows: int = CHUNK_ROWS,
+                 trees_per_chunk: int = TREES_PER_CHUNK, seed: int = 42,
+                 max_p99_ms: float = MAX_P99_LATENCY_MS, min_r2: float = MIN_VALIDATION_R2,
+                 model_path: Optional[str] = None, **tree_params) -> Dict[str, Any]:
+    """
+    Train, benchmark, save and (if the gates pass) promote a model.
+    
+    Args:
+        data_path: Directory of CSV history files
+        models_dir: Where versioned artifacts are written
+        chunk_rows: Rows per training chunk
+        trees_per_chunk: Trees added for each chunk
+        seed: Training seed
+        max_p99_ms: Promotion gate on single-row p99 latency
+        min_r2: Promotion gate on validation R²
+        model_path: Serving model path to promote to (None = never promote)
+        **tree_params: Overrides for TREE_PARAMS
+    
+    Returns:
+        Artifact metadata, with the artifact path, gate failures and whether it was promoted
+    """
+    trained_at = datetime.utcnow()
+    model, report = train_model(data_path, chunk_rows, trees_per_chunk, seed, **tree_params)
+    
+    sample = next(iter_training_chunks(data_path, 1000))[0]
+    metadata = {
+        "version": trained_at.strftime("%Y%m%d%H%M%S"),
+        "trained_at": trained_at.isoformat(),
+        "model_type": type(model).__name__,
+        "sklearn_version": sklearn.__version__,
+        "data_path": str(Path(data_path).resolve()),
+        **report,
+        "latency": measure_latency(model, sample)
+    }
+    
+    artifact = save_artifact(model, metadata, models_dir)
+    failures = promotion_failures(metadata, max_p99_ms, min_r2)
+    promoted = model_path is not None and not failures
+    if promoted:
+        promote(artifact, model_path)
+        app_logger.info(f"Promoted model {metadata['version']} to {model_path}")
+    elif failures:
+        app_logger.warning(f"Model {metadata['version']} not promoted: {'; '.join(failures)}")
+    
+    return {**metadata, "artifact": str(artifact), "gate_failures": failures, "promoted": promoted}
@@ -0,0 +1,268 @@
+"""
+Order Book Engine
+Per-symbol limit order book with price-time priority for paper trading
+"""
+
+import heapq
+from collections import deque
+from itertools import count
+from typing import Dict, List, Any, Optional
+
+
+class BookEntry:
+    """A resting or pending order held by the book."""
+
+    __slots__ = ("order_id", "side", "order_type", "price", "stop_price", "remaining", "seq", "active")
+
+    def __init__(self, order_id: str, side: str, order_type: str, quantity: float,
+                 price: Optional[float], stop_price: Optional[float], seq: int):
+        self.order_id = order_id
+        self.side = side
+        self.order_type = order_type
+        self.price = price
+        self.stop_price = stop_price
+        self.remaining = quantity
+        self.seq = seq
+        self.active = True
+
+
+class PriceLevel:
+    """FIFO queue of orders resting at a single price."""
+
+    __slots__ = ("price", "orders", "quantity")
+
+    def __init__(self, price: float):
+        self.price = price
+        self.orders = deque()
+        self.quantity = 0.0
+
+
+class OrderBook:
+    """
+    Limit order book for a single symbol.
+
+    Resting limit orders are kept in price levels (one FIFO deque per price)
+    indexed by a heap of prices per side, so inserting a new level costs
+    O(log n) and reading the best bid/ask is O(1) amortized. Stop and
+    stop-limit orders wait in trigger heaps until the market price crosses
+    their stop price.
+
+    Orders are executed against the market price feed: every call to
+    ``on_price`` fills marketable resting orders in price-time priority
+    (best price first, oldest first within a price).
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.last_price: Optional[float] = None
+        self._bid_levels: Dict[float, PriceLevel] = {}
+        self._ask_levels: Dict[float, PriceLevel] = {}
+        self._bid_prices: List[float] = []  # max-heap via negated prices
+        self._ask_prices: List[float] = []  # min-heap
+        self._buy_stops: List[tuple] = []  # min-heap on stop price
+        self._sell_stops: List[tuple] = []  # max-heap on stop price
+        self._entries: Dict[str, BookEntry] = {}
+        self._seq = count()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._entries
+
+    def add_order(self, order_id: str, side: str, order_type: str, quantity: float,
+                  limit_price: Optional[float] = None, stop_price: Optional[float] = None) -> None:
+        """Place a limit, stop or stop-limit order on the book."""
+        if order_id in self._entries:
+            raise ValueError(f"Order {order_id} is already on the book")
+        if side not in ("buy", "sell"):
+            raise ValueError(f"Invalid order side: {side}")
+        if order_type in ("limit", "stop_limit") and limit_price is None:
+            raise ValueError(f"{order_type} order requires a limit price")
+        if order_type in ("stop", "stop_limit") and stop_price is None:
+            raise ValueError(f"{order_type} order requires a stop price")
+        if order_type not in ("limit", "stop", "stop_limit"):
+            raise ValueError(f"Order type {order_type} cannot rest on the book")
+
+        entry = BookEntry(order_id, side, order_type, quantity, limit_price, stop_price, next(self._seq))
+        self._entries[order_id] = entry
+
+        if order_type == "limit":
+            self._rest(entry)
+        elif side == "buy":
+            heapq.heappush(self._buy_stops, (stop_price, entry.seq, entry))
+        else:
+            heapq.heappush(self._sell_stops, (-stop_price, entry.seq, entry))
+
+    def cancel_order(self, order_id: str) -> bool:
+        """Remove an order from the book. Returns False if it is not resting."""
+        entry = self._entries.pop(order_id, None)
+        if entry is None:
+            return False
+
+        entry.active = False
+        if entry.order_type == "limit":
+            levels = self._bid_levels if entry.side == "buy" else self._ask_levels
+            level = levels.get(entry.price)
+            if level is not None:
+                level.quantity -= entry.remaining
+                if level.quantity <= 0:
+                    del levels[entry.price]
+        return True
+
+    def best_bid(self) -> Optional[float]:
+        """Highest resting buy price."""
+        prices = self._bid_prices
+        while prices and -prices[0] not in self._bid_levels:
+            heapq.heappop(prices)
+        return -prices[0] if prices else None
+
+    def best_ask(self) -> Optional[float]:
+        """Lowest resting sell price."""
+        prices = self._ask_prices
+        while prices and prices[0] not in self._ask_levels:
+            heapq.heappop(prices)
+        return prices[0] if prices else None
+
+    def on_price(self, price: float, volume: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Process a market price tick.
+
+        Triggers stop orders crossed by the price, then fills every resting
+        limit order that is marketable at ``price``. When ``volume`` is given,
+        at most that much quantity is filled per side and the last order
+        touched may be partially filled.
+
+        Returns:
+            Fill events in execution order, each with order_id, quantity,
+            price and a ``done`` flag set when the order left the book.
+        """
+        self.last_price = price
+        fills: List[Dict[str, Any]] = []
+
+        self._trigger_stops(price, fills)
+        self._sweep(price, volume, "buy", fills)
+        self._sweep(price, volume, "sell", fills)
+        return fills
+
+    def depth(self, levels: int = 10) -> Dict[str, Any]:
+        """Aggregated quantity at the best ``levels`` prices on each side."""
+        bids = sorted(self._bid_levels.values(), key=lambda lvl: -lvl.price)[:levels]
+        asks = sorted(self._ask_levels.values(), key=lambda lvl: lvl.price)[:levels]
+        return {
+            "symbol": self.symbol,
+            "best_bid": self.best_bid(),
+            "best_ask": self.best_ask(),
+            "last_price": self.last_price,
+            "bids": [{"price": lvl.price, "quantity": lvl.quantity} for lvl in bids],
+            "asks": [{"price": lvl.price, "quantity": lvl.quantity} for lvl in asks],
+            "pending_stops": len(self._buy_stops) + len(self._sell_stops),
+            "resting_orders": len(self._entries)
+        }
+
+    def _rest(self, entry: BookEntry) -> None:
+        """Queue a limit order at the back of its price level."""
+        if entry.side == "buy":
+            levels, prices, key = self._bid_levels, self._bid_prices, -entry.price
+        else:
+            levels, prices, key = self._ask_levels, self._ask_prices, entry.price
+
+        level = levels.get(entry.price)
+        if level is None:
+            level = levels[entry.price] = PriceLevel(entry.price)
+            heapq.heappush(prices, key)
+        level.orders.append(entry)
+        level.quantity += entry.remaining
+
+    def _trigger_stops(self, price: float, fills: List[Dict[str, Any]]) -> None:
+        """Activate stop orders whose stop price has been reached."""
+        triggered = []
+        while self._buy_stops and self._buy_stops[0][0] <= price:
+            triggered.append(heapq.heappop(self._buy_stops)[2])
+        while self._sell_stops and -self._sell_stops[0][0] >= price:
+            triggered.append(heapq.heappop(self._sell_stops)[2])
+
+        # Fire in arrival order so earlier stops keep their time priority
+        triggered.sort(key=lambda e: e.seq)
+        for entry in triggered:
+            if not entry.active:
+                continue
+            if entry.order_type == "stop":
+                del self._entries[entry.order_id]
+                entry.active = False
+                fills.append(self._fill_event(entry, entry.remaining, price, True))
+            else:
+                # Stop-limit becomes a plain limit order once triggered
+                entry.order_type = "limit"
+                self._rest(entry)
+
+    def _sweep(self, price: float, volume: Optional[float], side: str,
+               fills: List[Dict[str, Any]]) -> None:
+        """Fill marketable limit orders on one side in price-time priority."""
+        if side == "buy":
+            levels, prices = self._bid_levels, self._bid_prices
+            best = self.best_bid
+            marketable = lambda level_price: level_price >= price
+        else:
+            levels, prices = self._ask_levels, self._ask_prices
+            best = self.best_ask
+            marketable = lambda level_price: level_price <= price
+
+        available = volume
+        while available is None or available > 0:
+            level_price = best()
+            if level_price is None or not marketable(level_price):
+                break
+
+            level = levels[level_price]
+            orders = level.orders
+            while orders and (available is None or available > 0):
+                entry = orders[0]
+                if not entry.active:
+                    orders.popleft()
+                    continue
+
+                quantity = entry.remaining if available is None else min(entry.remaining, available)
+                entry.remaining -= quantity
+                level.quantity -= quantity
+                if available is not None:
+                    available -= quantity
+
+                done = entry.remaining <= 0
+                if done:
+                    orders.popleft()
+                    entry.active = False
+                    del self._entries[entry.order_id]
+                fills.append(self._fill_event(entry, quantity, price, done))
+
+            if level.quantity <= 0 or not orders:
+                del levels[level_price]
+                heapq.heappop(prices)
+
+    def _fill_event(self, entry: BookEntry, quantity: float, price: float, done: bool) -> Dict[str, Any]:
+        return {
+            "order_id": entry.order_id,
+            "side": entry.side,
+            "quantity": quantity,
+            "price": price,
+            "done": done
+        }
+
+
+class OrderBookManager:
+    """Lazily creates and holds one order book per symbol."""
+
+    def __init__(self):
+        self._books: Dict[str, OrderBook] = {}
+
+    def get_book(self, symbol: str) -> OrderBook:
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = OrderBook(symbol)
+        return book
+
+    def find_book(self, symbol: str) -> Optional[OrderBook]:
+        return self._books.get(symbol)
+
+    def symbols(self) -> List[str]:
+        return list(self._books)
@@ -0,0 +1,360 @@
+"""
+Portfolio Optimizer
+Mean-variance optimization with shrinkage covariance and Black-Litterman returns.
+
+Returns are arrays shaped ``(observations, assets)``; covariances are
+``(assets, assets)`` and annualized by the caller. The long-only efficient
+frontier is traced with Markowitz's critical line algorithm: between turning
+points the optimal weights are linear in the return target, so one pass over
+the turning points gives every frontier point exactly, and any number of
+points are interpolated in a single vectorized step.
+"""
+
+from typing import Dict, Optional, Tuple, Union
+import numpy as np
+
+TRADING_DAYS_PER_YEAR = 252
+
+# Risk aversion implied by a typical market portfolio (He & Litterman)
+MARKET_RISK_AVERSION = 2.5
+
+# Uncertainty of the equilibrium returns relative to the returns themselves
+DEFAULT_TAU = 0.05
+
+FRONTIER_POINTS = 50
+
+# Rank-one updates of the free-asset inverse drift slowly; re-invert this often
+_REFACTOR_EVERY = 128
+
+Bounds = Union[float, np.ndarray]
+
+
+def _as_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def returns_from_prices(prices) -> np.ndarray:
+    """Simple returns of a ``(observations, assets)`` price matrix."""
+    prices = _as_array(prices)
+    return prices[1:] / prices[:-1] - 1.0
+
+
+def ledoit_wolf(returns) -> Tuple[np.ndarray, float]:
+    """
+    Ledoit-Wolf shrinkage covariance.
+
+    Shrinks the sample covariance toward a scaled identity with the
+    intensity that minimizes expected squared error (Ledoit & Wolf, 2004).
+    The result is always positive definite, even with fewer observations
+    than assets, which the frontier solver relies on.
+
+    Returns:
+        (covariance, shrinkage) with shrinkage in [0, 1]
+    """
+    x = _as_array(returns)
+    x = x - x.mean(axis=0)
+    observations, assets = x.shape
+
+    sample = x.T @ x / observations
+    mu = np.trace(sample) / assets
+    sample_sq = np.sum(sample ** 2)
+
+    # Distance of the sample covariance from the target, and its estimation error
+    delta = (sample_sq - 2.0 * mu * np.trace(sample) + assets * mu ** 2) / assets
+    x2 = x ** 2
+    beta = (np.sum(x2.T @ x2) / observations - sample_sq) / (assets * observations)
+    beta = min(beta, delta)
+    shrinkage = 0.0 if beta <= 0 else beta / delta
+
+    covariance = (1.0 - shrinkage) * sample
+    covariance.flat[::assets + 1] += shrinkage * mu
+    return covariance, float(shrinkage)
+
+
+def implied_returns(cov, market_weights, risk_aversion: float = MARKET_RISK_AVERSION) -> np.ndarray:
+    """Equilibrium excess returns that make ``market_weights`` optimal."""
+    return risk_aversion * _as_array(cov) @ _as_array(market_weights)
+
+
+def black_litterman(cov, prior, picks=None, view_returns=None, confidence=None,
+                    tau: float = DEFAULT_TAU) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Black-Litterman posterior returns and covariance.
+
+    Args:
+        cov: Return covariance
+        prior: Equilibrium returns, usually from ``implied_returns``
+        picks: ``(views, assets)`` portfolios the views are about; a row
+            with a single 1 is an absolute view, +1/-1 a relative one
+        view_returns: Expected return of each pick portfolio
+        confidence: Per-view confidence in (0, 1]; 1 holds the view exactly
+            and the default 0.5 weighs it like the prior (He & Litterman)
+        tau: Scale of the prior's uncertainty
+
+    Returns:
+        (posterior returns, posterior covariance)
+    """
+    cov = _as_array(cov)
+    prior = _as_array(prior)
+    if picks is None or len(picks) == 0:
+        return prior.copy(), cov * (1.0 + tau)
+
+    picks = np.atleast_2d(_as_array(picks))
+    view_returns = _as_array(view_returns)
+    confidence = np.full(len(picks), 0.5) if confidence is None else _as_array(confidence)
+    confidence = np.clip(confidence, 1e-6, 1.0)
+
+    scaled = tau * picks @ cov                        # P tau Sigma, (views, assets)
+    view_cov = scaled @ picks.T                       # P tau Sigma P'
+    omega = np.diag((1.0 - confidence) / confidence * np.diag(view_cov))
+    gain = np.linalg.solve(view_cov + omega, scaled)  # (P tau Sigma P' + Omega)^-1 P tau Sigma
+
+    posterior = prior + gain.T @ (view_returns - picks @ prior)
+    posterior_cov = cov * (1.0 + tau) - scaled.T @ gain
+    return posterior, (posterior_cov + posterior_cov.T) / 2
+
+
+def _bounds(value: Bounds, assets: int) -> np.ndarray:
+    return np.broadcast_to(_as_array(value), (assets,)).astype(np.float64)
+
+
+class _FreeSet:
+    """
+    Assets strictly inside their bounds, with the inverse of their covariance block.
+
+    The inverse lives in the top-left corner of a preallocated buffer and is
+    updated in place as assets enter and leave.
+    """
+
+    def __init__(self, cov: np.ndarray, asset: int):
+        self.cov = cov
+        self.mask = np.zeros(len(cov), dtype=bool)
+        self.mask[asset] = True
+        self.assets = [asset]
+        self._buffer = np.empty(cov.shape)
+        self._buffer[0, 0] = 1.0 / cov[asset, asset]
+        self.updates = 0
+
+    @property
+    def inverse(self) -> np.ndarray:
+        size = len(self.assets)
+        return self._buffer[:size, :size]
+
+    def index(self) -> np.ndarray:
+        return np.array(self.assets, dtype=int)
+
+    def add(self, asset: int):
+        inverse = self.inverse
+        column = self.cov[self.index(), asset]
+        v = inverse @ column
+        schur = self.cov[asset, asset] - column @ v
+        size = len(self.assets)
+        inverse += np.outer(v, v / schur)
+        self._buffer[:size, size] = self._buffer[size, :size] = -v / schur
+        self._buffer[size, size] = 1.0 / schur
+        self.assets.append(asset)
+        self.mask[asset] = True
+        self._updated()
+
+    def remove(self, asset: int):
+        # Move the asset to the last slot, then drop the last row and column
+        k, last = self.assets.index(asset), len(self.assets) - 1
+        buffer = self._buffer
+        buffer[[k, last], :last + 1] = buffer[[last, k], :last + 1]
+        buffer[:last + 1, [k, last]] = buffer[:last + 1, [last, k]]
+        self.assets[k] = self.assets[last]
+        self.assets.pop()
+        self.mask[asset] = False
+        buffer[:last, :last] -= np.outer(buffer[:last, last], buffer[last, :last] / buffer[last, last])
+        self._updated()
+
+    def _updated(self):
+        self.updates += 1
+        if self.updates % _REFACTOR_EVERY == 0:
+            idx = self.index()
+            self.inverse[...] = np.linalg.inv(self.cov[np.ix_(idx, idx)])
+
+
+def critical_line(expected_returns, cov, min_weight: Bounds = 0.0,
+                  max_weight: Bounds = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Turning points of the fully invested, bounded efficient frontier.
+
+    Solves ``min 1/2 w'Cw - t mu'w`` subject to ``sum(w) = 1`` and the
+    weight bounds for every risk tolerance ``t`` at once. Starting from the
+    highest-return portfolio (t -> inf), t is lowered until some asset
+    reaches a bound or leaves one; there the set of free assets changes
+    and the inverse of their covariance is updated by one row and column.
+    Between turning points the weights move linearly in t.
+
+    Returns:
+        (risk tolerances, weights): tolerances ``(points,)`` descending to
+        0, where the minimum-variance portfolio sits, and the weights at
+        each turning point ``(points, assets)``
+    """
+    mu = _as_array(expected_returns)
+    cov = _as_array(cov)
+    assets = len(mu)
+    lower = _bounds(min_weight, assets)
+    upper = _bounds(max_weight, assets)
+    if np.any(lower > upper) or lower.sum() > 1 or upper.sum() < 1:
+        raise ValueError("Weight bounds leave no fully invested portfolio")
+
+    # Highest-return portfolio: fill assets in return order, the last one partially
+    weights = lower.copy()
+    room = 1.0 - lower.sum()
+    for asset in np.argsort(-mu, kind="stable"):
+        step = min(upper[asset] - lower[asset], room)
+        weights[asset] += step
+        room -= step
+        if room <= 1e-12:
+            break
+
+    free = _FreeSet(cov, asset)
+    flat = 1e-12 * max(np.abs(mu).max(), 1e-12)
+    tolerances, turning_points = [], []
+    tolerance = np.inf
+    last = -1
+    while True:
+        idx = free.index()
+        bound_weights = np.where(free.mask, 0.0, weights)
+
+        # Free weights and the budget multiplier as linear functions of t
+        inverse = free.inverse
+        ones = inverse.sum(axis=1)
+        tilt = inverse @ mu[idx]
+        fixed = inverse @ (cov @ bound_weights)[idx]
+        gamma0 = (1.0 - bound_weights.sum() + fixed.sum()) / ones.sum()
+        gamma1 = -tilt.sum() / ones.sum()
+        alpha = gamma0 * ones - fixed
+        beta = tilt + gamma1 * ones
+        base = bound_weights.copy()
+        base[idx] = alpha
+        slope = np.zeros(assets)
+        slope[idx] = beta
+
+        # Gradient of the Lagrangian for bounded assets, also linear in t
+        grad0, grad1 = (cov @ np.stack([base, slope], axis=1)).T
+        grad0 = grad0 - gamma0
+        grad1 = grad1 - mu - gamma1
+        at_upper = ~free.mask & (weights >= upper)
+        at_lower = ~free.mask & ~at_upper
+        eps = 1e-9 * max(1.0, tolerance if np.isfinite(tolerance) else 1.0)
+
+        if np.isinf(tolerance):
+            # Still on the highest-return face: assets tied on return share what
+            # is left of the budget at minimum variance, found by active set steps
+            move = np.where(free.mask, base - weights, 0.0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                reach = np.where(move < -eps, (lower - weights) / move,
+                                 np.where(move > eps, (upper - weights) / move, np.inf))
+            asset = int(np.argmin(reach))
+            if reach[asset] < 1 and len(idx) > 1:
+                weights = weights + reach[asset] * move
+                weights[asset] = lower[asset] if move[asset] < 0 else upper[asset]
+                free.remove(asset)
+                continue
+            weights = base.copy()
+            tied = np.abs(grad1) <= flat
+            violation = np.where(tied & at_lower, -grad0, np.where(tied & at_upper, grad0, 0.0))
+            asset = int(np.argmax(violation))
+            if violation[asset] > eps:
+                free.add(asset)
+                continue
+
+        events = np.full(assets, -np.inf)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # A free asset leaves through the bound it moves toward as t falls;
+            # a lone free asset only absorbs the budget and never leaves
+            if len(idx) > 1:
+                events[idx] = np.where(beta > flat, (lower[idx] - alpha) / beta,
+                                       np.where(beta < -flat, (upper[idx] - alpha) / beta, -np.inf))
+            # A bounded asset is freed once its gradient changes sign
+            crossing = (at_lower & (grad1 > flat)) | (at_upper & (grad1 < -flat))
+            events[crossing] = -grad0[crossing] / grad1[crossing]
+
+        # Events past the current t are bounds already crossed: handle them now.
+        # The asset that just changed sits on its event; don't undo it at once.
+        events = np.minimum(events, tolerance)
+        if last >= 0 and events[last] >= tolerance - eps:
+            events[last] = -np.inf
+
+        asset = int(np.argmax(events))
+        t = events[asset]
+        if not t > 0:
+            tolerances.append(0.0)
+            turning_points.append(base)
+            break
+
+        weights = base + t * slope
+        tolerances.append(t)
+        turning_points.append(weights.copy())
+        if free.mask[asset]:
+            weights[asset] = lower[asset] if beta[free.assets.index(asset)] > 0 else upper[asset]
+            free.remove(asset)
+        else:
+            free.add(asset)
+        tolerance, last = t, asset
+
+    return np.array(tolerances), np.array(turning_points)
+
+
+def _weights_at(values: np.ndarray, turning_values: np.ndarray, turning_points: np.ndarray) -> np.ndarray:
+    """Interpolate weights linearly between turning points (``turning_values`` ascending)."""
+    values = np.clip(values, turning_values[0], turning_values[-1])
+    upper = np.clip(np.searchsorted(turning_values, values), 1, len(turning_values) - 1)
+    lower = upper - 1
+    span = turning_values[upper] - turning_values[lower]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frac = np.where(span > 0, (values - turning_values[lower]) / span, 0.0)
+    return turning_points[lower] + frac[:, None] * (turning_points[upper] - turning_points[lower])
+
+
+def efficient_frontier(expected_returns, cov, points: int = FRONTIER_POINTS, min_weight: Bounds = 0.0,
+                       max_weight: Bounds = 1.0, turning_points: Optional[Tuple[np.ndarray, np.ndarray]] = None
+                       ) -> Dict[str, np.ndarray]:
+    """
+    Efficient frontier at evenly spaced expected returns.
+
+    Points run from the minimum-variance portfolio to the highest-return
+    one. Pass ``turning_points`` from ``critical_line`` to reuse a solve.
+
+    Returns:
+        Dict with ``weights`` (points, assets), ``returns`` and ``volatility``
+    """
+    mu = _as_array(expected_returns)
+    cov = _as_array(cov)
+    _, corners = turning_points or critical_line(mu, cov, min_weight, max_weight)
+
+    # Turning points run from high to low return; interpolate on ascending returns
+    corners = corners[::-1]
+    corner_returns = np.maximum.accumulate(corners @ mu)
+    if len(corners) == 1:
+        weights = np.repeat(corners, points, axis=0)
+    else:
+        targets = np.linspace(corner_returns[0], corner_returns[-1], points)
+        weights = _weights_at(targets, corner_returns, corners)
+
+    returns, volatility = portfolio_performance(weights, mu, cov)
+    return {"weights": weights, "returns": returns, "volatility": volatility}
+
+
+def optimal_weights(expected_returns, cov, risk_aversion: float, min_weight: Bounds = 0.0,
+                    max_weight: Bounds = 1.0, turning_points: Optional[Tuple[np.ndarray, np.ndarray]] = None
+                    ) -> np.ndarray:
+    """Weights maximizing ``mu'w - risk_aversion / 2 * w'Cw`` within the bounds."""
+    tolerances, corners = turning_points or critical_line(expected_returns, cov, min_weight, max_weight)
+    if risk_aversion <= 0:
+        return corners[0].copy()
+    if len(corners) == 1:
+        return corners[0].copy()
+    return _weights_at(np.array([1.0 / risk_aversion]), tolerances[::-1], corners[::-1])[0]
+
+
+def portfolio_performance(weights, expected_returns, cov) -> Tuple[np.ndarray, np.ndarray]:
+    """Expected return and volatility of ``(assets,)`` or ``(portfolios, assets)`` weights."""
+    weights = _as_array(weights)
+    cov = _as_array(cov)
+    returns = weights @ _as_array(expected_returns)
+    variance = np.einsum("...i,ij,...j->...", weights, cov, weights)
+    return returns, np.sqrt(np.maximum(variance, 0.0))
@@ -0,0 +1,103 @@
+"""
+Memoized prediction cache.
+Predictions are a pure function of the user profile and the model, so
+responses are cached per canonical profile and dropped whenever the model
+changes.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class PredictionCache:
+    """
+    Bounded LRU cache of prediction responses keyed on user profiles.
+    
+    Every entry belongs to a model version; ``invalidate`` starts a new
+    version and drops the cache, and results computed with the previous
+    model that arrive afterwards are not stored.
+    """
+    
+    def __init__(self, max_entries: int = 100000):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Most profiles kept; 0 disables caching
+        """
+        self.max_entries = max_entries
+        self.version = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def get_many(self, keys: List[Hashable]) -> Tuple[List[Optional[Any]], int]:
+        """
+        Look up many profiles at once.
+        
+        Args:
+            keys: Profile keys
+        
+        Returns:
+            (cached value or None per key, model version the values belong to)
+        """
+        with self._lock:
+            entries = self._entries
+            values = []
+            for key in keys:
+                value = entries.get(key)
+                if value is not None:
+                    entries.move_to_end(key)
+                values.append(value)
+            hits = len(values) - values.count(None)
+            self.hits += hits
+            self.misses += len(values) - hits
+            return values, self.version
+    
+    def put_many(self, items: List[Tuple[Hashable, Any]], version: int) -> None:
+        """
+        Store freshly computed values.
+        
+        Args:
+            items: (profile key, value) pairs
+            version: Model version the values were computed with, from get_many
+        """
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if version != self.version:
+                return
+            entries = self._entries
+            for key, value in items:
+                entries[key] = value
+                entries.move_to_end(key)
+            overflow = len(entries) - self.max_entries
+            for _ in range(max(0, overflow)):
+                entries.popitem(last=False)
+            self.evictions += max(0, overflow)
+    
+    def invalidate(self) -> None:
+        """Drop every entry and start a new model version."""
+        with self._lock:
+            self._entries.clear()
+            self.version += 1
+            self.invalidations += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache size and hit-rate metrics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "model_version": self.version
+            }
@@ -0,0 +1,101 @@
+"""
+Simulated price feed for trading and indicators.
+Passes every tick of the market simulator to the services that act on live
+prices: resting orders are matched and streaming indicators updated as the
+market moves, not only when a request happens to fetch a price.
+"""
+
+import asyncio
+from typing import List, Optional, Tuple
+
+from app.core.logger import app_logger
+from app.services.advanced_market_service import AdvancedMarketService, market_service
+from app.services.market_simulator import MarketSimulator, TickBatch, market_simulator
+from app.services.trading_service import TradingService, trading_service
+
+
+class PriceFeed:
+    """
+    Routes tick batches from the simulator's bus to the trading and market services.
+    
+    Bus callbacks arrive on the simulator's thread; the feed picks out the
+    symbols that have an order book or indicator state and hands their new
+    prices to the event loop in a single call. Batches are applied one at a
+    time, in order, so fills never see prices out of sequence.
+    """
+    
+    def __init__(self, simulator: Optional[MarketSimulator] = None, trading: Optional[TradingService] = None,
+                 market: Optional[AdvancedMarketService] = None):
+        """
+        Initialize the feed.
+        
+        Args:
+            simulator: Price source (defaults to the shared market simulator)
+            trading: Service whose order books and indicators are fed (defaults to the shared one)
+            market: Service whose indicators are fed (defaults to the shared one)
+        """
+        self.simulator = simulator or market_simulator
+        self.trading = trading or trading_service
+        self.market = market or market_service
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._unsubscribe = None
+        self._sequence: Optional[asyncio.Lock] = None
+        self.batches = 0
+        self.ticks = 0
+    
+    def start(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """Subscribe to the simulator's bus, applying ticks on ``loop`` (the running loop by default)."""
+        if self._unsubscribe is not None:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        self._sequence = asyncio.Lock()
+        self._unsubscribe = self.simulator.bus.subscribe(self._on_ticks)
+    
+    def stop(self):
+        """Unsubscribe from the bus; ticks already handed to the loop still apply."""
+        if self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+    
+    def _on_ticks(self, batch: TickBatch):
+        """Bus callback (simulator thread): pass the new prices of fed symbols to the event loop."""
+        if not len(batch) or self._loop is None:
+            return
+        symbols = set(self.trading.order_books.symbols())
+        symbols.update(self.trading.technical_indicators.symbols())
+        symbols.update(self.market.technical_indicators.symbols())
+        changed = []
+        for symbol in symbols:
+            price = batch.get(symbol)
+            if price is not None:
+                changed.append((symbol, price))
+        if not changed:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._schedule, batch.timestamp, changed)
+        except RuntimeError:
+            pass  # the loop has closed
+    
+    def _schedule(self, timestamp: float, changed: List[Tuple[str, float]]):
+        self._loop.create_task(self._apply(timestamp, changed))
+    
+    async def _apply(self, timestamp: float, changed: List[Tuple[str, float]]):
+        """Event loop: match resting orders and update indicators, one batch at a time."""
+        async with self._sequence:
+            for symbol, price in changed:
+                try:
+                    await self.trading.process_price_tick(symbol, price)
+                except Exception as e:
+                    app_logger.error(f"Processing tick for {symbol} failed: {str(e)}")
+                self.market.technical_indicators.on_tick(symbol, price, timestamp)
+            self.batches += 1
+            self.ticks += len(changed)
+
+
+# Global feed, started with the application
+price_feed = PriceFeed()
+
+
+def get_price_feed() -> PriceFeed:
+    """Get the shared price feed."""
+    return price_feed
@@ -0,0 +1,245 @@
+"""
+Streaming quote fan-out.
+Pushes simulated market prices to WebSocket and SSE clients. The hub holds
+one tick-bus subscription for all of them and watches each symbol once, no
+matter how many clients want it. Clients asking for the same symbols share
+a group whose message is encoded once per update, and a client that falls
+behind skips straight to the latest message instead of queueing old ones,
+so one slow consumer never holds up the others.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from typing import AsyncIterator, Dict, FrozenSet, Iterable, List, Optional, Set
+
+import numpy as np
+
+from app.services.market_simulator import MarketSimulator, TickBatch, market_simulator
+
+# Most symbols one client may subscribe to
+MAX_SYMBOLS_PER_CLIENT = 200
+
+
+def parse_symbols(symbols) -> FrozenSet[str]:
+    """
+    Normalize a subscription to a set of upper-case symbols.
+    
+    Args:
+        symbols: Comma-separated string or iterable of symbols
+    
+    Returns:
+        The symbol set; raises ValueError if it is empty or too large
+    """
+    if isinstance(symbols, str):
+        symbols = symbols.split(",")
+    key = frozenset(symbol.strip().upper() for symbol in symbols if symbol.strip())
+    if not key:
+        raise ValueError("Subscribe to at least one symbol")
+    if len(key) > MAX_SYMBOLS_PER_CLIENT:
+        raise ValueError(f"Subscribe to at most {MAX_SYMBOLS_PER_CLIENT} symbols")
+    return key
+
+
+class QuoteGroup:
+    """
+    Clients subscribed to the same set of symbols.
+    
+    Every update bumps ``version`` and wakes the group's waiters through a
+    one-shot event that is replaced each time. The message for a version is
+    encoded once, by whichever client asks for it first, and then shared.
+    """
+    
+    def __init__(self, symbols: FrozenSet[str], quotes: Dict[str, Dict[str, float]]):
+        self.symbols = symbols
+        self.quotes = quotes
+        self.clients = 0
+        self.version = 0
+        self.updated_at = time.time()
+        self._changed = asyncio.Event()
+        self._message: Optional[str] = None
+        self._message_version = -1
+        self.encodes = 0
+    
+    def touch(self, timestamp: float):
+        """Mark the group's quotes as changed and wake everyone waiting on it."""
+        self.version += 1
+        self.updated_at = timestamp
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+    
+    async def wait(self, version: int):
+        """Return once the group has moved past ``version``."""
+        while self.version == version:
+            await self._changed.wait()
+    
+    def message(self) -> str:
+        """The JSON message for the current version, encoded at most once."""
+        if self._message_version != self.version:
+            self._message = json.dumps({
+                "type": "quotes",
+                "timestamp": self.updated_at,
+                "quotes": {symbol: self.quotes[symbol] for symbol in sorted(self.symbols)}
+            })
+            self._message_version = self.version
+            self.encodes += 1
+        return self._message
+
+
+class QuoteHub:
+    """
+    Fans simulated quotes out to streaming clients.
+    
+    Bus callbacks arrive on the simulator's thread; the hub picks out the
+    watched symbols with one vectorized lookup and hands them to the event
+    loop in a single call, where quotes are updated and groups woken.
+    """
+    
+    def __init__(self, simulator: Optional[MarketSimulator] = None):
+        """
+        Initialize the hub.
+        
+        Args:
+            simulator: Price source (defaults to the shared market simulator)
+        """
+        self.simulator = simulator or market_simulator
+        self._groups: Dict[FrozenSet[str], QuoteGroup] = {}
+        self._groups_by_symbol: Dict[str, Set[QuoteGroup]] = {}
+        self._quotes: Dict[str, Dict[str, float]] = {}
+        self._watched = np.empty(0, dtype=np.intp)
+        self._watched_symbols: List[str] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._unsubscribe = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.updates = 0
+        self.deliveries = 0
+        self.coalesced = 0
+        self._retired_encodes = 0
+    
+    async def stream(self, symbols: Iterable[str]) -> AsyncIterator[str]:
+        """
+        Yield JSON quote messages for ``symbols``: the current quotes at once, then every change.
+        
+        A consumer that is slow to take the next message gets only the
+        newest one when it comes back; the updates it missed are counted as
+        coalesced rather than queued.
+        """
+        group = self._join(symbols)
+        try:
+            sent = -1
+            while True:
+                if group.version == sent:
+                    await group.wait(sent)
+                if sent >= 0 and group.version > sent + 1:
+                    self.coalesced += group.version - sent - 1
+                sent = group.version
+                self.deliveries += 1
+                yield group.message()
+        finally:
+            self._leave(group)
+    
+    def _join(self, symbols: Iterable[str]) -> QuoteGroup:
+        key = parse_symbols(symbols)
+        self._loop = asyncio.get_running_loop()
+        group = self._groups.get(key)
+        if group is None:
+            new_symbols = [symbol for symbol in key if symbol not in self._quotes]
+            for symbol in new_symbols:
+                self._quotes[symbol] = self._quote(symbol, self.simulator.price(symbol))
+            group = self._groups[key] = QuoteGroup(key, self._quotes)
+            for symbol in key:
+                self._groups_by_symbol.setdefault(symbol, set()).add(group)
+            if new_symbols:
+                self._rewatch()
+            group.touch(time.time())
+        group.clients += 1
+        return group
+    
+    def _leave(self, group: QuoteGroup):
+        group.clients -= 1
+        if group.clients:
+            return
+        del self._groups[group.symbols]
+        self._retired_encodes += group.encodes
+        for symbol in group.symbols:
+            groups = self._groups_by_symbol[symbol]
+            groups.discard(group)
+            if not groups:
+                del self._groups_by_symbol[symbol]
+                del self._quotes[symbol]
+        self._rewatch()
+    
+    def _rewatch(self):
+        """Rebuild the watched-symbol index and (un)subscribe from the bus as needed."""
+        symbols = list(self._quotes)
+        indices = np.array([self.simulator.index(symbol) for symbol in symbols], dtype=np.intp)
+        order = np.argsort(indices)
+        with self._lock:
+            self._watched = indices[order]
+            self._watched_symbols = [symbols[i] for i in order.tolist()]
+        if symbols and self._unsubscribe is None:
+            self._unsubscribe = self.simulator.bus.subscribe(self._on_ticks)
+        elif not symbols and self._unsubscribe is not None:
+            self._unsubscribe()
+            self._unsubscribe = None
+    
+    def _on_ticks(self, batch: TickBatch):
+        """Bus callback (simulator thread): pass the watched symbols' new prices to the event loop."""
+        with self._lock:
+            watched, watched_symbols = self._watched, self._watched_symbols
+        if not len(watched) or not len(batch) or self._loop is None:
+            return
+        positions = np.minimum(np.searchsorted(batch.indices, watched), len(batch) - 1)
+        hits = np.flatnonzero(batch.indices[positions] == watched)
+        if not len(hits):
+            return
+        changed = [(watched_symbols[k], price) for k, price in
+                   zip(hits.tolist(), batch.prices[positions[hits]].tolist())]
+        try:
+            self._loop.call_soon_threadsafe(self._apply, batch.timestamp, changed)
+        except RuntimeError:
+            pass  # the loop has closed
+    
+    def _apply(self, timestamp: float, changed: List):
+        """Event loop: update quotes and wake each affected group once."""
+        self.batches += 1
+        touched = set()
+        for symbol, price in changed:
+            if symbol in self._quotes:
+                self._quotes[symbol] = self._quote(symbol, price)
+                touched.update(self._groups_by_symbol.get(symbol, ()))
+                self.updates += 1
+        for group in touched:
+            group.touch(timestamp)
+    
+    def _quote(self, symbol: str, price: float) -> Dict[str, float]:
+        open_price = self.simulator.open_price(symbol)
+        return {
+            "price": round(price, 2),
+            "change": round(price - open_price, 2),
+            "change_percent": round((price / open_price - 1) * 100, 2)
+        }
+    
+    def stats(self) -> Dict[str, int]:
+        """Clients, groups, watched symbols and delivery counters."""
+        return {
+            "clients": sum(group.clients for group in self._groups.values()),
+            "groups": len(self._groups),
+            "symbols": len(self._quotes),
+            "batches": self.batches,
+            "updates": self.updates,
+            "encodes": self._retired_encodes + sum(group.encodes for group in self._groups.values()),
+            "deliveries": self.deliveries,
+            "coalesced": self.coalesced
+        }
+
+
+# Global hub shared by the streaming endpoints
+quote_hub = QuoteHub()
+
+
+def get_quote_hub() -> QuoteHub:
+    """Get the shared quote hub."""
+    return quote_hub
@@ -0,0 +1,401 @@
+"""
+Streaming Technical Indicators
+Stateful indicators that update in O(1) per bar or tick.
+
+Each indicator mirrors its vectorized counterpart in ``app.services.indicators``
+(same seeding and smoothing), so a state warmed bar by bar reports the same
+values as recomputing the whole series. ``update`` commits a value, ``peek``
+returns what the indicator would read if that value were committed next,
+without changing any state. Values are ``None`` until an indicator has enough
+history.
+"""
+
+import math
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+
+class StreamingEMA:
+    """Exponential moving average seeded with the SMA of its first ``period`` values."""
+
+    __slots__ = ("period", "alpha", "count", "_seed_sum", "value")
+
+    def __init__(self, period: int, alpha: float = None):
+        self.period = period
+        self.alpha = 2.0 / (period + 1) if alpha is None else alpha
+        self.count = 0
+        self._seed_sum = 0.0
+        self.value: Optional[float] = None
+
+    def _next(self, x: float) -> Tuple[int, float, Optional[float]]:
+        count = self.count + 1
+        if count < self.period:
+            return count, self._seed_sum + x, None
+        if count == self.period:
+            return count, 0.0, (self._seed_sum + x) / self.period
+        return count, 0.0, self.value + self.alpha * (x - self.value)
+
+    def update(self, x: float) -> Optional[float]:
+        self.count, self._seed_sum, self.value = self._next(x)
+        return self.value
+
+    def peek(self, x: float) -> Optional[float]:
+        return self._next(x)[2]
+
+
+class StreamingRSI:
+    """Relative Strength Index with Wilder smoothing."""
+
+    __slots__ = ("prev", "gains", "losses", "value")
+
+    def __init__(self, period: int = 14):
+        self.prev: Optional[float] = None
+        self.gains = StreamingEMA(period, alpha=1.0 / period)
+        self.losses = StreamingEMA(period, alpha=1.0 / period)
+        self.value: Optional[float] = None
+
+    @staticmethod
+    def _rsi(avg_gain: Optional[float], avg_loss: Optional[float]) -> Optional[float]:
+        if avg_gain is None:
+            return None
+        if avg_loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    def update(self, x: float) -> Optional[float]:
+        if self.prev is not None:
+            delta = x - self.prev
+            self.value = self._rsi(self.gains.update(max(delta, 0.0)), self.losses.update(max(-delta, 0.0)))
+        self.prev = x
+        return self.value
+
+    def peek(self, x: float) -> Optional[float]:
+        if self.prev is None:
+            return None
+        delta = x - self.prev
+        return self._rsi(self.gains.peek(max(delta, 0.0)), self.losses.peek(max(-delta, 0.0)))
+
+
+class StreamingMACD:
+    """MACD line, signal line and histogram."""
+
+    __slots__ = ("fast", "slow", "signal")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = StreamingEMA(signal)
+
+    @staticmethod
+    def _result(line: Optional[float], signal: Optional[float]) -> Tuple[Optional[float], ...]:
+        histogram = line - signal if signal is not None else None
+        return line, signal, histogram
+
+    def update(self, x: float) -> Tuple[Optional[float], ...]:
+        fast, slow = self.fast.update(x), self.slow.update(x)
+        if slow is None:
+            return None, None, None
+        line = fast - slow
+        return self._result(line, self.signal.update(line))
+
+    def peek(self, x: float) -> Tuple[Optional[float], ...]:
+        fast, slow = self.fast.peek(x), self.slow.peek(x)
+        if slow is None:
+            return None, None, None
+        line = fast - slow
+        return self._result(line, self.signal.peek(line))
+
+
+class RollingStats:
+    """Rolling mean and population standard deviation over the last ``period`` values."""
+
+    __slots__ = ("period", "window", "_shift", "_sum", "_sum_sq")
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque()
+        self._shift: Optional[float] = None
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def _stats(self, total: float, total_sq: float) -> Tuple[float, float]:
+        mean = total / self.period
+        variance = max(total_sq / self.period - mean * mean, 0.0)
+        return mean + self._shift, math.sqrt(variance)
+
+    def update(self, x: float) -> Tuple[Optional[float], Optional[float]]:
+        # Sums are kept relative to the first value so they stay small
+        if self._shift is None:
+            self._shift = x
+        centered = x - self._shift
+        self.window.append(centered)
+        self._sum += centered
+        self._sum_sq += centered * centered
+        if len(self.window) > self.period:
+            old = self.window.popleft()
+            self._sum -= old
+            self._sum_sq -= old * old
+        if len(self.window) < self.period:
+            return None, None
+        return self._stats(self._sum, self._sum_sq)
+
+    def peek(self, x: float) -> Tuple[Optional[float], Optional[float]]:
+        size = len(self.window) + 1
+        if size < self.period:
+            return None, None
+        centered = x - (x if self._shift is None else self._shift)
+        total, total_sq = self._sum + centered, self._sum_sq + centered * centered
+        if size > self.period:
+            old = self.window[0]
+            total, total_sq = total - old, total_sq - old * old
+        return self._stats(total, total_sq)
+
+
+class RollingExtreme:
+    """
+    Rolling maximum (or minimum) over the last ``period`` values.
+
+    A monotonic deque holds only values that can still become the extreme,
+    so each update is amortized O(1) and the answer is always at the front.
+    """
+
+    __slots__ = ("period", "_is_max", "_window", "_index")
+
+    def __init__(self, period: int, mode: str = "max"):
+        self.period = period
+        self._is_max = mode == "max"
+        self._window = deque()
+        self._index = 0
+
+    def _beats(self, new: float, old: float) -> bool:
+        return new >= old if self._is_max else new <= old
+
+    def update(self, x: float) -> Optional[float]:
+        index = self._index
+        self._index += 1
+        while self._window and self._beats(x, self._window[-1][1]):
+            self._window.pop()
+        self._window.append((index, x))
+        if self._window[0][0] <= index - self.period:
+            self._window.popleft()
+        return self._window[0][1] if self._index >= self.period else None
+
+    def peek(self, x: float) -> Optional[float]:
+        index = self._index
+        if index + 1 < self.period:
+            return None
+        # Only the front can fall out of the window on the next update
+        best = None
+        for held_index, value in self._window:
+            if held_index > index - self.period:
+                best = value
+                break
+        return x if best is None or self._beats(x, best) else best
+
+
+class StreamingADX:
+    """Average True Range plus Average Directional Index with +DI and -DI."""
+
+    __slots__ = ("prev_high", "prev_low", "prev_close", "tr", "plus_dm", "minus_dm", "dx")
+
+    def __init__(self, period: int = 14):
+        self.prev_high: Optional[float] = None
+        self.prev_low: Optional[float] = None
+        self.prev_close: Optional[float] = None
+        self.tr = StreamingEMA(period, alpha=1.0 / period)
+        self.plus_dm = StreamingEMA(period, alpha=1.0 / period)
+        self.minus_dm = StreamingEMA(period, alpha=1.0 / period)
+        self.dx = StreamingEMA(period, alpha=1.0 / period)
+
+    def _moves(self, high: float, low: float) -> Tuple[float, float, float]:
+        tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        up_move, down_move = high - self.prev_high, self.prev_low - low
+        plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+        minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+        return tr, plus_dm, minus_dm
+
+    @staticmethod
+    def _directional(atr: Optional[float], plus: Optional[float], minus: Optional[float]) -> Tuple[Optional[float], ...]:
+        if atr is None:
+            return None, None, None
+        if atr == 0:
+            return 0.0, 0.0, 0.0
+        plus_di, minus_di = 100.0 * plus / atr, 100.0 * minus / atr
+        di_sum = plus_di + minus_di
+        dx = 100.0 * abs(plus_di - minus_di) / di_sum if di_sum > 0 else 0.0
+        return dx, plus_di, minus_di
+
+    def update(self, high: float, low: float, close: float) -> Tuple[Optional[float], ...]:
+        """Returns (atr, adx, plus_di, minus_di)."""
+        result = (None, None, None, None)
+        if self.prev_close is not None:
+            tr, plus_dm, minus_dm = self._moves(high, low)
+            atr = self.tr.update(tr)
+            dx, plus_di, minus_di = self._directional(atr, self.plus_dm.update(plus_dm), self.minus_dm.update(minus_dm))
+            adx = self.dx.update(dx) if dx is not None else None
+            result = (atr, adx, plus_di, minus_di)
+        self.prev_high, self.prev_low, self.prev_close = high, low, close
+        return result
+
+    def peek(self, high: float, low: float, close: float) -> Tuple[Optional[float], ...]:
+        if self.prev_close is None:
+            return None, None, None, None
+        tr, plus_dm, minus_dm = self._moves(high, low)
+        atr = self.tr.peek(tr)
+        dx, plus_di, minus_di = self._directional(atr, self.plus_dm.peek(plus_dm), self.minus_dm.peek(minus_dm))
+        adx = self.dx.peek(dx) if dx is not None else None
+        return atr, adx, plus_di, minus_di
+
+
+def _update(indicator, *args):
+    return indicator.update(*args)
+
+
+def _peek(indicator, *args):
+    return indicator.peek(*args)
+
+
+TIMEFRAME_SECONDS = {"1d": 86400, "4h": 14400, "1h": 3600}
+
+
+class IndicatorState:
+    """
+    Every reported indicator for one symbol and timeframe.
+
+    Completed bars are committed with ``update``. Live ticks build the bar in
+    progress (``on_tick``), which is previewed with ``peek`` when a snapshot is
+    taken and committed once a tick lands in the next bar period.
+    """
+
+    RECENT_BARS = 20
+
+    def __init__(self, timeframe: str = "1d"):
+        self.timeframe = timeframe
+        self.bar_seconds = TIMEFRAME_SECONDS.get(timeframe, 86400)
+        self.bars = 0
+        self.sma_20 = RollingStats(20)
+        self.sma_50 = RollingStats(50)
+        self.rsi = StreamingRSI(14)
+        self.macd = StreamingMACD(12, 26, 9)
+        self.highest = RollingExtreme(14, "max")
+        self.lowest = RollingExtreme(14, "min")
+        self.stochastic_d = RollingStats(3)
+        self.adx = StreamingADX(14)
+        self.recent = deque(maxlen=self.RECENT_BARS)
+        self._values: Dict[str, Optional[float]] = {}
+        self._bar_start: Optional[float] = None
+        self._forming: Optional[List[float]] = None  # [high, low, close]
+
+    def _advance(self, close: float, high: float, low: float, commit: bool) -> Dict[str, Optional[float]]:
+        step = _update if commit else _peek
+        sma_20, std_20 = step(self.sma_20, close)
+        sma_50 = step(self.sma_50, close)[0]
+        macd, macd_signal, macd_histogram = step(self.macd, close)
+        highest, lowest = step(self.highest, high), step(self.lowest, low)
+
+        stochastic = williams_r = stochastic_d = None
+        if highest is not None:
+            span = highest - lowest
+            stochastic = (close - lowest) / span * 100.0 if span > 0 else 50.0
+            williams_r = (close - highest) / span * 100.0 if span > 0 else -50.0
+            stochastic_d = step(self.stochastic_d, stochastic)[0]
+        atr, adx, plus_di, minus_di = step(self.adx, high, low, close)
+
+        return {
+            "close": close,
+            "sma_20": sma_20,
+            "sma_50": sma_50,
+            "ema_12": self.macd.fast.value if commit else self.macd.fast.peek(close),
+            "ema_26": self.macd.slow.value if commit else self.macd.slow.peek(close),
+            "rsi": step(self.rsi, close),
+            "macd": macd,
+            "macd_signal": macd_signal,
+            "macd_histogram": macd_histogram,
+            "bollinger_upper": sma_20 + 2.0 * std_20 if sma_20 is not None else None,
+            "bollinger_lower": sma_20 - 2.0 * std_20 if sma_20 is not None else None,
+            "std_20": std_20,
+            "stochastic": stochastic,
+            "stochastic_d": stochastic_d,
+            "williams_r": williams_r,
+            "atr": atr,
+            "adx": adx,
+            "plus_di": plus_di,
+            "minus_di": minus_di
+        }
+
+    def update(self, close: float, high: float = None, low: float = None) -> Dict[str, Optional[float]]:
+        """Commit a completed bar. ``high``/``low`` default to ``close``."""
+        high = close if high is None else high
+        low = close if low is None else low
+        self._values = self._advance(close, high, low, commit=True)
+        self.recent.append(close)
+        self.bars += 1
+        return self._values
+
+    def warm(self, close, high=None, low=None) -> "IndicatorState":
+        """Replay historical bars (one-off O(n) per symbol)."""
+        for i in range(len(close)):
+            self.update(float(close[i]),
+                        None if high is None else float(high[i]),
+                        None if low is None else float(low[i]))
+        return self
+
+    def on_tick(self, price: float, timestamp: float = None):
+        """Fold a live price into the bar in progress, closing it when its period ends."""
+        timestamp = time.time() if timestamp is None else timestamp
+        bar_start = timestamp - timestamp % self.bar_seconds
+        if self._forming is not None and bar_start > self._bar_start:
+            self.update(self._forming[2], self._forming[0], self._forming[1])
+            self._forming = None
+        if self._forming is None:
+            self._bar_start = bar_start
+            self._forming = [price, price, price]
+        else:
+            forming = self._forming
+            forming[0] = max(forming[0], price)
+            forming[1] = min(forming[1], price)
+            forming[2] = price
+
+    def snapshot(self) -> Dict[str, Optional[float]]:
+        """Current indicator values, including the bar in progress."""
+        if self._forming is None:
+            return dict(self._values)
+        high, low, close = self._forming
+        return self._advance(close, high, low, commit=False)
+
+    def recent_closes(self) -> List[float]:
+        """Closes of the last ``RECENT_BARS`` bars, including the bar in progress."""
+        closes = list(self.recent)
+        if self._forming is not None:
+            closes.append(self._forming[2])
+        return closes[-self.RECENT_BARS:]
+
+
+class IndicatorStore:
+    """Indicator state for every (symbol, timeframe) a service has seen."""
+
+    def __init__(self):
+        self._states: Dict[Tuple[str, str], IndicatorState] = {}
+        self._by_symbol: Dict[str, List[IndicatorState]] = {}
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def get(self, symbol: str, timeframe: str = "1d") -> Optional[IndicatorState]:
+        return self._states.get((symbol, timeframe))
+
+    def symbols(self) -> List[str]:
+        return list(self._by_symbol)
+
+    def create(self, symbol: str, timeframe: str, close, high=None, low=None) -> IndicatorState:
+        """Start tracking a symbol, warmed with its price history."""
+        state = IndicatorState(timeframe).warm(close, high, low)
+        self._states[(symbol, timeframe)] = state
+        self._by_symbol.setdefault(symbol, []).append(state)
+        return state
+
+    def on_tick(self, symbol: str, price: float, timestamp: float = None):
+        """Feed a live price to every timeframe tracked for the symbol."""
+        for state in self._by_symbol.get(symbol, ()):
+            state.on_tick(price, timestamp)
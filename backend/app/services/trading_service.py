@@ -5,12 +5,20 @@ Provides paper trading, order management, and technical analysis features
 
 import asyncio
 import json
+import random
+from collections import defaultdict
 from datetime import datetime, timedelta
+from itertools import count
 from typing import Dict, List, Any, Optional
 from enum import Enum
 import pandas as pd
 import numpy as np
 from app.core.logger import app_logger
+from app.services.streaming_indicators import IndicatorStore
+from app.services.bar_store import bar_store
+from app.services.market_simulator import market_simulator
+from app.services.order_book import OrderBookManager
+from app.services.account_service import AccountService, InsufficientFundsError
 
 class OrderType(Enum):
     MARKET = "market"
@@ -24,18 +32,32 @@ class OrderSide(Enum):
 
 class OrderStatus(Enum):
     PENDING = "pending"
+    PARTIALLY_FILLED = "partially_filled"
     FILLED = "filled"
     CANCELLED = "cancelled"
     REJECTED = "rejected"
 
 class TradingService:
+    INDICATOR_FIELDS = [
+        "sma_20", "sma_50", "ema_12", "ema_26", "rsi", "macd", "macd_signal", "macd_histogram",
+        "bollinger_upper", "bollinger_lower"
+    ]
+    # Headroom on the cash held for stop buys, which fill at the market once triggered and can gap past the stop
+    STOP_RESERVE_BUFFER = 0.05
+
     def __init__(self):
         app_logger.info("Initializing Trading Service...")
         self.orders = {}
         self.positions = {}
-        self.portfolio_value = 100000  # Starting with $100k paper trading
-        self.cash_balance = 100000
-        self.technical_indicators = {}
+        # Secondary indexes so per-user lookups don't scan the whole book
+        self._orders_by_user = defaultdict(dict)
+        self._orders_by_user_status = defaultdict(dict)
+        self._orders_by_user_symbol = defaultdict(dict)
+        self._positions_by_user = defaultdict(dict)
+        self.accounts = AccountService(starting_cash=100000)  # $100k paper trading per user
+        self.order_books = OrderBookManager()
+        self.technical_indicators = IndicatorStore()
+        self._order_seq = count(1)
         app_logger.info("Trading Service initialized.")
 
     async def create_order(self, user_id: str, symbol: str, side: str, quantity: int, 
@@ -44,10 +66,11 @@ class TradingService:
         """Create a new trading order"""
         app_logger.info(f"Creating {side} order for {quantity} shares of {symbol}")
         
-        order_id = f"order_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{symbol}"
+        order_id = f"order_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{symbol}_{next(self._order_seq)}"
         
-        # Get current market price
+        # Get current market price and let resting orders react to it first
         current_price = await self._get_current_price(symbol)
+        await self.process_price_tick(symbol, current_price)
         
         order = {
             "order_id": order_id,
@@ -55,6 +78,7 @@ class TradingService:
             "symbol": symbol,
             "side": side,
             "quantity": quantity,
+            "filled_quantity": 0,
             "order_type": order_type,
             "limit_price": limit_price,
             "stop_price": stop_price,
@@ -63,31 +87,60 @@ class TradingService:
             "created_at": datetime.now().isoformat(),
             "updated_at": datetime.now().isoformat()
         }
+        # Shares already promised to open sell orders can't be sold again
+        available_shares = self._available_shares(user_id, symbol) if side == "sell" else 0
+        self.orders[order_id] = order
+        self._index_order(order)
         
         # Process order based on type
-        if order_type == "market":
+        if side == "sell" and quantity > available_shares:
+            self._set_order_status(order, OrderStatus.REJECTED.value)
+            order["reject_reason"] = f"Insufficient shares: selling {quantity}, have {available_shares} available"
+        elif order_type == "market":
             order = await self._process_market_order(order)
-        elif order_type == "limit":
-            order = await self._process_limit_order(order)
-        elif order_type == "stop":
-            order = await self._process_stop_order(order)
+        elif order_type in ("limit", "stop", "stop_limit"):
+            order = await self._process_book_order(order)
+        else:
+            self._set_order_status(order, OrderStatus.REJECTED.value)
+            order["reject_reason"] = f"Unsupported order type: {order_type}"
         
-        self.orders[order_id] = order
+        return order
+
+    async def process_price_tick(self, symbol: str, price: float, volume: float = None) -> List[Dict[str, Any]]:
+        """Match resting orders for a symbol against a new market price"""
+        self.technical_indicators.on_tick(symbol, price)
         
-        # Update positions if filled
-        if order["status"] == OrderStatus.FILLED.value:
-            await self._update_position(user_id, symbol, side, quantity, order["fill_price"])
+        book = self.order_books.find_book(symbol)
+        if book is None or not len(book):
+            return []
         
-        return order
+        fills = book.on_price(price, volume)
+        await self._apply_fills(fills)
+        return fills
 
-    async def get_orders(self, user_id: str, status: str = None) -> Dict[str, Any]:
+    async def get_order_book(self, symbol: str, levels: int = 10) -> Dict[str, Any]:
+        """Get aggregated order book depth for a symbol"""
+        app_logger.info(f"Fetching order book for {symbol}")
+        
+        depth = self.order_books.get_book(symbol).depth(levels)
+        depth["timestamp"] = datetime.now().isoformat()
+        return depth
+
+    async def get_orders(self, user_id: str, status: str = None, symbol: str = None) -> Dict[str, Any]:
         """Get user's orders"""
         app_logger.info(f"Fetching orders for user {user_id}")
         
-        user_orders = [order for order in self.orders.values() if order["user_id"] == user_id]
-        
-        if status:
-            user_orders = [order for order in user_orders if order["status"] == status]
+        if status and symbol:
+            by_status = self._orders_by_user_status.get((user_id, status), {})
+            by_symbol = self._orders_by_user_symbol.get((user_id, symbol), {})
+            smaller, other = (by_status, by_symbol) if len(by_status) <= len(by_symbol) else (by_symbol, by_status)
+            user_orders = [order for order_id, order in smaller.items() if order_id in other]
+        elif status:
+            user_orders = list(self._orders_by_user_status.get((user_id, status), {}).values())
+        elif symbol:
+            user_orders = list(self._orders_by_user_symbol.get((user_id, symbol), {}).values())
+        else:
+            user_orders = list(self._orders_by_user.get(user_id, {}).values())
         
         return {
             "orders": user_orders,
@@ -103,34 +156,60 @@ class TradingService:
             return {"error": "Order not found"}
         
         order = self.orders[order_id]
-        if order["status"] != OrderStatus.PENDING.value:
+        if order["status"] not in (OrderStatus.PENDING.value, OrderStatus.PARTIALLY_FILLED.value):
             return {"error": "Order cannot be cancelled"}
         
-        order["status"] = OrderStatus.CANCELLED.value
+        book = self.order_books.find_book(order["symbol"])
+        if book is not None:
+            book.cancel_order(order_id)
+        await self.accounts.release(order["user_id"], order_id)
+        
+        self._set_order_status(order, OrderStatus.CANCELLED.value)
         order["updated_at"] = datetime.now().isoformat()
         
         return {"message": "Order cancelled successfully", "order": order}
 
+    async def get_account(self, user_id: str) -> Dict[str, Any]:
+        """Get user's paper trading account balances"""
+        app_logger.info(f"Fetching account for user {user_id}")
+        
+        account = self.accounts.get_account(user_id)
+        return {
+            **account.snapshot(),
+            "timestamp": datetime.now().isoformat()
+        }
+
+    async def get_account_ledger(self, user_id: str, limit: int = 100) -> Dict[str, Any]:
+        """Get user's cash ledger, newest entries first"""
+        app_logger.info(f"Fetching account ledger for user {user_id}")
+        
+        entries = await self.accounts.get_ledger(user_id, limit)
+        return {
+            "user_id": user_id,
+            "entries": entries,
+            "total_count": len(entries),
+            "timestamp": datetime.now().isoformat()
+        }
+
     async def get_positions(self, user_id: str) -> Dict[str, Any]:
         """Get user's current positions"""
         app_logger.info(f"Fetching positions for user {user_id}")
         
         user_positions = []
-        for symbol, position in self.positions.items():
-            if position["user_id"] == user_id:
-                # Get current market price
-                current_price = await self._get_current_price(symbol)
-                market_value = position["quantity"] * current_price
-                unrealized_pnl = market_value - position["cost_basis"]
-                
-                position_data = {
-                    **position,
-                    "current_price": current_price,
-                    "market_value": round(market_value, 2),
-                    "unrealized_pnl": round(unrealized_pnl, 2),
-                    "unrealized_pnl_percent": round((unrealized_pnl / position["cost_basis"]) * 100, 2)
-                }
-                user_positions.append(position_data)
+        for symbol, position in self._positions_by_user.get(user_id, {}).items():
+            # Get current market price
+            current_price = await self._get_current_price(symbol)
+            market_value = position["quantity"] * current_price
+            unrealized_pnl = market_value - position["cost_basis"]
+            
+            position_data = {
+                **position,
+                "current_price": current_price,
+                "market_value": round(market_value, 2),
+                "unrealized_pnl": round(unrealized_pnl, 2),
+                "unrealized_pnl_percent": round((unrealized_pnl / position["cost_basis"]) * 100, 2)
+            }
+            user_positions.append(position_data)
         
         return {
             "positions": user_positions,
@@ -147,8 +226,9 @@ class TradingService:
         total_unrealized_pnl = sum(pos["unrealized_pnl"] for pos in positions["positions"])
         
         # Calculate portfolio performance
-        total_value = total_market_value + self.cash_balance
-        portfolio_return = ((total_value - 100000) / 100000) * 100
+        account = self.accounts.get_account(user_id)
+        total_value = total_market_value + account.cash
+        portfolio_return = ((total_value - account.starting_cash) / account.starting_cash) * 100
         
         # Calculate sector allocation
         sector_allocation = await self._calculate_sector_allocation(positions["positions"])
@@ -159,7 +239,9 @@ class TradingService:
         return {
             "user_id": user_id,
             "total_value": round(total_value, 2),
-            "cash_balance": round(self.cash_balance, 2),
+            "cash_balance": round(account.cash, 2),
+            "reserved_cash": round(account.reserved, 2),
+            "buying_power": round(account.buying_power, 2),
             "market_value": round(total_market_value, 2),
             "unrealized_pnl": round(total_unrealized_pnl, 2),
             "portfolio_return": round(portfolio_return, 2),
@@ -173,28 +255,23 @@ class TradingService:
         """Get comprehensive technical analysis"""
         app_logger.info(f"Performing technical analysis for {symbol}")
         
-        # Generate price data
-        prices = await self._generate_price_data(symbol, timeframe)
-        
-        # Calculate technical indicators
-        sma_20 = np.mean(prices[-20:])
-        sma_50 = np.mean(prices[-50:])
-        ema_12 = self._calculate_ema(prices, 12)
-        ema_26 = self._calculate_ema(prices, 26)
-        rsi = self._calculate_rsi(prices)
-        macd = ema_12 - ema_26
-        bollinger_upper = sma_20 + 2 * np.std(prices[-20:])
-        bollinger_lower = sma_20 - 2 * np.std(prices[-20:])
+        # Indicators are kept up to date tick by tick; history is only replayed the first time
+        state = self.technical_indicators.get(symbol, timeframe)
+        if state is None:
+            state = self.technical_indicators.create(symbol, timeframe, await self._generate_price_data(symbol, timeframe))
+        values = state.snapshot()
+        prices = state.recent_closes()
+        
+        # Fallbacks for indicators that need more history than is available
+        close = values["close"]
+        defaults = {"rsi": 50.0, "macd": 0.0, "macd_signal": 0.0, "macd_histogram": 0.0}
+        latest = {}
+        for name in self.INDICATOR_FIELDS:
+            value = values[name]
+            latest[name] = defaults.get(name, close) if value is None else value
         
         # Generate trading signals
-        signals = self._generate_trading_signals(prices, {
-            "sma_20": sma_20,
-            "sma_50": sma_50,
-            "rsi": rsi,
-            "macd": macd,
-            "bollinger_upper": bollinger_upper,
-            "bollinger_lower": bollinger_lower
-        })
+        signals = self._generate_trading_signals(prices, latest)
         
         # Calculate support and resistance levels
         support_resistance = self._calculate_support_resistance(prices)
@@ -202,21 +279,12 @@ class TradingService:
         return {
             "symbol": symbol,
             "timeframe": timeframe,
-            "current_price": prices[-1],
-            "indicators": {
-                "sma_20": round(sma_20, 2),
-                "sma_50": round(sma_50, 2),
-                "ema_12": round(ema_12, 2),
-                "ema_26": round(ema_26, 2),
-                "rsi": round(rsi, 2),
-                "macd": round(macd, 2),
-                "bollinger_upper": round(bollinger_upper, 2),
-                "bollinger_lower": round(bollinger_lower, 2)
-            },
+            "current_price": round(close, 2),
+            "indicators": {name: round(value, 2) for name, value in latest.items()},
             "signals": signals,
             "support_resistance": support_resistance,
             "trend_analysis": self._analyze_trend(prices),
-            "volatility": round(np.std(prices[-20:]), 2),
+            "volatility": round(float(np.std(prices)), 2),
             "timestamp": datetime.now().isoformat()
         }
 
@@ -270,49 +338,133 @@ class TradingService:
 
     async def _get_current_price(self, symbol: str) -> float:
         """Get current market price for symbol"""
-        # Simulate market price
-        base_prices = {
-            "AAPL": 175.0, "MSFT": 350.0, "GOOGL": 2800.0, "AMZN": 3200.0,
-            "TSLA": 250.0, "META": 300.0, "NVDA": 450.0, "NFLX": 400.0
-        }
-        base_price = base_prices.get(symbol, 100.0)
-        change = random.uniform(-0.02, 0.02)
-        return round(base_price * (1 + change), 2)
+        # Every service reads the same simulated market
+        return round(market_simulator.price(symbol), 2)
 
     async def _process_market_order(self, order: Dict) -> Dict:
         """Process market order"""
+        try:
+            await self.accounts.settle_fill(order["user_id"], order["order_id"], order["side"],
+                                            order["quantity"], order["current_price"])
+        except InsufficientFundsError as e:
+            self._set_order_status(order, OrderStatus.REJECTED.value)
+            order["reject_reason"] = str(e)
+            return order
+        
+        await self._update_position(order["user_id"], order["symbol"], order["side"],
+                                    order["quantity"], order["current_price"])
         order["fill_price"] = order["current_price"]
-        order["status"] = OrderStatus.FILLED.value
+        order["filled_quantity"] = order["quantity"]
+        self._set_order_status(order, OrderStatus.FILLED.value)
         order["filled_at"] = datetime.now().isoformat()
         return order
 
-    async def _process_limit_order(self, order: Dict) -> Dict:
-        """Process limit order"""
-        if order["side"] == "buy" and order["current_price"] <= order["limit_price"]:
-            order["fill_price"] = order["current_price"]
-            order["status"] = OrderStatus.FILLED.value
-            order["filled_at"] = datetime.now().isoformat()
-        elif order["side"] == "sell" and order["current_price"] >= order["limit_price"]:
-            order["fill_price"] = order["current_price"]
-            order["status"] = OrderStatus.FILLED.value
-            order["filled_at"] = datetime.now().isoformat()
-        else:
-            order["status"] = OrderStatus.PENDING.value
+    async def _process_book_order(self, order: Dict) -> Dict:
+        """Place limit, stop and stop-limit orders on the symbol's order book"""
+        book = self.order_books.get_book(order["symbol"])
+        try:
+            book.add_order(
+                order["order_id"], order["side"], order["order_type"], order["quantity"],
+                limit_price=order["limit_price"], stop_price=order["stop_price"]
+            )
+        except ValueError as e:
+            self._set_order_status(order, OrderStatus.REJECTED.value)
+            order["reject_reason"] = str(e)
+            return order
+        
+        # Resting orders are matched on the symbol's simulated ticks
+        market_simulator.index(order["symbol"])
+        
+        # Hold cash for buys at the worst price the order can fill at
+        if order["side"] == "buy":
+            if order["limit_price"] is not None:
+                reserve_price = order["limit_price"]
+            else:
+                reserve_price = max(order["stop_price"], order["current_price"]) * (1 + self.STOP_RESERVE_BUFFER)
+            try:
+                await self.accounts.reserve(order["user_id"], order["order_id"], order["quantity"], reserve_price)
+            except InsufficientFundsError as e:
+                book.cancel_order(order["order_id"])
+                self._set_order_status(order, OrderStatus.REJECTED.value)
+                order["reject_reason"] = str(e)
+                return order
+        
+        # Orders that are already marketable fill at the current price
+        await self._apply_fills(book.on_price(order["current_price"]))
         return order
 
-    async def _process_stop_order(self, order: Dict) -> Dict:
-        """Process stop order"""
-        if order["side"] == "buy" and order["current_price"] >= order["stop_price"]:
-            order["fill_price"] = order["current_price"]
-            order["status"] = OrderStatus.FILLED.value
-            order["filled_at"] = datetime.now().isoformat()
-        elif order["side"] == "sell" and order["current_price"] <= order["stop_price"]:
-            order["fill_price"] = order["current_price"]
-            order["status"] = OrderStatus.FILLED.value
-            order["filled_at"] = datetime.now().isoformat()
-        else:
-            order["status"] = OrderStatus.PENDING.value
-        return order
+    async def _apply_fills(self, fills: List[Dict[str, Any]]):
+        """Record order book fills on their orders and positions"""
+        for fill in fills:
+            order = self.orders.get(fill["order_id"])
+            if order is None:
+                continue
+            
+            try:
+                await self.accounts.settle_fill(order["user_id"], order["order_id"], order["side"],
+                                                fill["quantity"], fill["price"])
+            except InsufficientFundsError as e:
+                # The market moved past what the order held cash for; cancel what is left of it
+                book = self.order_books.find_book(order["symbol"])
+                if book is not None:
+                    book.cancel_order(order["order_id"])
+                await self.accounts.release(order["user_id"], order["order_id"])
+                self._set_order_status(order, OrderStatus.CANCELLED.value)
+                order["reject_reason"] = str(e)
+                order["updated_at"] = datetime.now().isoformat()
+                continue
+            
+            previous_quantity = order["filled_quantity"]
+            filled_quantity = previous_quantity + fill["quantity"]
+            previous_value = previous_quantity * order.get("fill_price", 0)
+            order["fill_price"] = (previous_value + fill["quantity"] * fill["price"]) / filled_quantity
+            order["filled_quantity"] = filled_quantity
+            order["updated_at"] = datetime.now().isoformat()
+            
+            if fill["done"]:
+                self._set_order_status(order, OrderStatus.FILLED.value)
+                order["filled_at"] = order["updated_at"]
+            else:
+                self._set_order_status(order, OrderStatus.PARTIALLY_FILLED.value)
+            
+            await self._update_position(order["user_id"], order["symbol"], order["side"],
+                                        fill["quantity"], fill["price"])
+
+    def _available_shares(self, user_id: str, symbol: str) -> int:
+        """Shares held in a symbol less those still to be sold by open sell orders"""
+        position = self._positions_by_user.get(user_id, {}).get(symbol)
+        held = position["quantity"] if position is not None else 0
+        open_statuses = (OrderStatus.PENDING.value, OrderStatus.PARTIALLY_FILLED.value)
+        committed = sum(
+            order["quantity"] - order["filled_quantity"]
+            for order in self._orders_by_user_symbol.get((user_id, symbol), {}).values()
+            if order["side"] == "sell" and order["status"] in open_statuses
+        )
+        return held - committed
+
+    def _index_order(self, order: Dict):
+        """Add a new order to the per-user secondary indexes"""
+        order_id = order["order_id"]
+        user_id = order["user_id"]
+        self._orders_by_user[user_id][order_id] = order
+        self._orders_by_user_status[(user_id, order["status"])][order_id] = order
+        self._orders_by_user_symbol[(user_id, order["symbol"])][order_id] = order
+
+    def _set_order_status(self, order: Dict, status: str):
+        """Change an order's status and move it to the matching status index"""
+        previous = order["status"]
+        if previous == status:
+            return
+        
+        user_id = order["user_id"]
+        previous_bucket = self._orders_by_user_status.get((user_id, previous))
+        if previous_bucket is not None:
+            previous_bucket.pop(order["order_id"], None)
+            if not previous_bucket:
+                del self._orders_by_user_status[(user_id, previous)]
+        
+        order["status"] = status
+        self._orders_by_user_status[(user_id, status)][order["order_id"]] = order
 
     async def _update_position(self, user_id: str, symbol: str, side: str, quantity: int, price: float):
         """Update user position"""
@@ -326,6 +478,7 @@ class TradingService:
                 "cost_basis": 0,
                 "average_price": 0
             }
+            self._positions_by_user[user_id][symbol] = self.positions[position_key]
         
         position = self.positions[position_key]
         
@@ -335,57 +488,23 @@ class TradingService:
             position["quantity"] = total_quantity
             position["cost_basis"] = total_cost
             position["average_price"] = total_cost / total_quantity
-            self.cash_balance -= quantity * price
         else:  # sell
             position["quantity"] -= quantity
             position["cost_basis"] -= quantity * position["average_price"]
-            self.cash_balance += quantity * price
             
             if position["quantity"] <= 0:
                 del self.positions[position_key]
+                self._positions_by_user[user_id].pop(symbol, None)
 
     async def _generate_price_data(self, symbol: str, timeframe: str) -> List[float]:
-        """Generate price data for technical analysis"""
-        base_price = await self._get_current_price(symbol)
+        """Price history for technical analysis: stored daily closes, else the simulator's history for the symbol"""
         days = 100 if timeframe == "1d" else 50
+        if timeframe == "1d":
+            stored = bar_store.tail(symbol, days)["close"]
+            if len(stored):
+                return stored.tolist()
         
-        prices = [base_price]
-        for _ in range(days - 1):
-            change = random.uniform(-0.05, 0.05)
-            new_price = prices[-1] * (1 + change)
-            prices.append(new_price)
-        
-        return prices
-
-    def _calculate_ema(self, prices: List[float], period: int) -> float:
-        """Calculate Exponential Moving Average"""
-        if len(prices) < period:
-            return prices[-1]
-        
-        multiplier = 2 / (period + 1)
-        ema = prices[0]
-        for price in prices[1:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-        return ema
-
-    def _calculate_rsi(self, prices: List[float], period: int = 14) -> float:
-        """Calculate Relative Strength Index"""
-        if len(prices) < period + 1:
-            return 50.0
-        
-        deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-        gains = [d if d > 0 else 0 for d in deltas]
-        losses = [-d if d < 0 else 0 for d in deltas]
-        
-        avg_gain = sum(gains[-period:]) / period
-        avg_loss = sum(losses[-period:]) / period
-        
-        if avg_loss == 0:
-            return 100.0
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi
+        return market_simulator.history(symbol, days).tolist()
 
     def _generate_trading_signals(self, prices: List[float], indicators: Dict) -> Dict[str, Any]:
         """Generate trading signals based on technical indicators"""
@@ -490,3 +609,12 @@ class TradingService:
             "volatility": round(random.uniform(10, 30), 2)
         }
 
+
+
+# Global trading service instance (order books must outlive a single request)
+trading_service = TradingService()
+
+
+def get_trading_service() -> TradingService:
+    """Get the shared trading service."""
+    return trading_service
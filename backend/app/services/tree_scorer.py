@@ -0,0 +1,138 @@
+"""
+Flattened tree-ensemble scorer.
+Exports a fitted scikit-learn tree regressor to flat node arrays and scores
+rows with a vectorized NumPy traversal of every tree at once, avoiding the
+per-call validation and per-tree Python overhead of ``model.predict``.
+"""
+
+from typing import Optional
+
+import numpy as np
+from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+# Regressors whose prediction is the mean of their trees' leaf values
+SUPPORTED_MODELS = (RandomForestRegressor, ExtraTreesRegressor, DecisionTreeRegressor)
+
+TREE_LEAF = -1
+
+# Rows walked together; bounds the (trees x rows) node index arrays
+CHUNK_ROWS = 4096
+
+
+class FlatTreeEnsemble:
+    """
+    A tree ensemble as flat node arrays.
+    
+    The nodes of all trees are concatenated, so node ``i`` of every tree
+    has a global index. Leaves point back at themselves, which lets every
+    row walk every tree for the same number of steps (the deepest tree's
+    depth) without branching on which paths have already finished.
+    
+    Scores match ``model.predict`` exactly: rows are compared in float32
+    like scikit-learn does, and leaf values are summed tree by tree in the
+    same order before dividing by the number of trees.
+    """
+    
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, children: np.ndarray,
+                 value: np.ndarray, roots: np.ndarray, max_depth: int, n_features: int):
+        """
+        Initialize the scorer from flat arrays (use ``from_model`` to export a model).
+        
+        Args:
+            feature: Feature index tested at each node
+            threshold: Split threshold at each node (go left if value <= threshold)
+            children: Right then left child of each node, interleaved (2 per node)
+            value: Leaf value of each node
+            roots: Global index of each tree's root
+            max_depth: Depth of the deepest tree
+            n_features: Number of features a row must have
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_features = n_features
+    
+    @classmethod
+    def from_model(cls, model) -> Optional["FlatTreeEnsemble"]:
+        """
+        Export a fitted tree regressor.
+        
+        Args:
+            model: Fitted random forest, extra trees or decision tree regressor
+        
+        Returns:
+            Flat scorer, or None if the model type or shape is not supported
+        """
+        if not isinstance(model, SUPPORTED_MODELS) or getattr(model, "n_outputs_", None) != 1:
+            return None
+        estimators = model.estimators_ if hasattr(model, "estimators_") else [model]
+        trees = [estimator.tree_ for estimator in estimators]
+        
+        sizes = np.array([tree.node_count for tree in trees])
+        roots = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.intp)
+        feature, threshold, children, value = [], [], [], []
+        for root, tree in zip(roots, trees):
+            nodes = np.arange(tree.node_count, dtype=np.intp)
+            leaf = tree.children_left == TREE_LEAF
+            left = np.where(leaf, nodes, tree.children_left) + root
+            right = np.where(leaf, nodes, tree.children_right) + root
+            feature.append(np.where(leaf, 0, tree.feature))
+            threshold.append(np.asarray(tree.threshold, dtype=np.float64))
+            children.append(np.column_stack([right, left]).ravel())
+            value.append(np.asarray(tree.value[:, 0, 0], dtype=np.float64))
+        
+        return cls(
+            feature=np.concatenate(feature).astype(np.intp),
+            threshold=np.concatenate(threshold),
+            children=np.concatenate(children).astype(np.intp),
+            value=np.concatenate(value),
+            roots=roots,
+            max_depth=max(tree.max_depth for tree in trees),
+            n_features=model.n_features_in_
+        )
+    
+    @property
+    def n_trees(self) -> int:
+        """Number of trees in the ensemble."""
+        return len(self.roots)
+    
+    @property
+    def n_nodes(self) -> int:
+        """Total number of nodes across all trees."""
+        return len(self.value)
+    
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """
+        Score rows.
+        
+        Args:
+            features: Feature matrix of shape (rows, n_features)
+        
+        Returns:
+            One score per row, identical to ``model.predict(features)``
+        """
+        rows = np.asarray(features, dtype=np.float32)
+        if rows.ndim != 2 or rows.shape[1] != self.n_features:
+            raise ValueError(f"Expected rows with {self.n_features} features, got shape {rows.shape}")
+        
+        scores = np.empty(len(rows), dtype=np.float64)
+        for start in range(0, len(rows), CHUNK_ROWS):
+            scores[start:start + CHUNK_ROWS] = self._predict_chunk(rows[start:start + CHUNK_ROWS])
+        return scores
+    
+    def _predict_chunk(self, rows: np.ndarray) -> np.ndarray:
+        """Walk every tree for a block of float32 rows; nodes are laid out tree-major."""
+        flat_rows = rows.ravel()
+        row_offsets = np.arange(len(rows), dtype=np.intp)[None, :] * self.n_features
+        nodes = np.repeat(self.roots[:, None], len(rows), axis=1)
+        for _ in range(self.max_depth):
+            go_left = flat_rows[row_offsets + self.feature[nodes]] <= self.threshold[nodes]
+            nodes = self.children[2 * nodes + go_left]
+        
+        # Sequential sum over trees, like the forest's per-tree accumulation
+        totals = np.cumsum(self.value[nodes], axis=0)[-1]
+        return totals / self.n_trees
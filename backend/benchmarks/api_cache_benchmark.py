@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+API response cache benchmark.
+Replays a skewed quote workload from concurrent clients against a local stub
+provider, with and without the TTL cache, then measures latency while every
+entry is stale and being revalidated in the background.
+
+Usage: python benchmarks/api_cache_benchmark.py [clients] [requests_per_client] [symbols] [latency_ms]
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Legacy modules build a database engine at import time
+os.environ["DATABASE_URL"] = os.environ.get("DATABASE_URL") or "sqlite:///:memory:"
+
+# The stub provider has no quota to protect
+os.environ["YAHOO_CALLS_PER_MINUTE"] = "0"
+os.environ["COINGECKO_CALLS_PER_MINUTE"] = "0"
+
+from utils import api_utils
+from utils.api_utils import api_cache, get_yahoo_finance_quote
+from benchmarks.stub_market_server import StubMarketServer
+
+
+def workload(clients: int, per_client: int, symbols: int) -> list:
+    """Zipf-like symbol popularity: a few tickers take most of the traffic"""
+    rng = random.Random(11)
+    names = [f"STK{i}" for i in range(symbols)]
+    weights = [1 / (rank + 1) for rank in range(symbols)]
+    return [rng.choices(names, weights, k=per_client) for _ in range(clients)]
+
+
+def run(server, plan: list, fetch) -> tuple:
+    def client(symbols):
+        samples = []
+        for symbol in symbols:
+            begin = time.perf_counter()
+            fetch(symbol)
+            samples.append((time.perf_counter() - begin) * 1000)
+        return samples
+
+    before = server.requests
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(plan)) as pool:
+        samples = [s for result in pool.map(client, plan) for s in result]
+    elapsed = time.perf_counter() - start
+    samples.sort()
+    return server.requests - before, elapsed, statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    symbols = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    latency = (float(sys.argv[4]) if len(sys.argv) > 4 else 50) / 1000
+
+    plan = workload(clients, per_client, symbols)
+
+    print("🧊 FinSage API Cache Benchmark")
+    print("=" * 50)
+    print(f"{clients} clients x {per_client} quotes over {symbols} symbols, "
+          f"{latency * 1000:.0f} ms provider latency\n")
+
+    with StubMarketServer(latency) as server:
+        api_utils.YAHOO_CHART_URL = f"{server.base_url}/chart"
+
+        rows = [("uncached", run(server, plan, get_yahoo_finance_quote.uncached))]
+        api_cache.clear()
+        rows.append(("cached (cold)", run(server, plan, get_yahoo_finance_quote)))
+        stats = api_cache.stats()
+
+        # Expire every entry's TTL: callers get the stale value while refreshes run
+        with api_cache._lock:
+            for entry in api_cache._entries.values():
+                entry.fresh_until = 0
+        rows.append(("cached (all stale)", run(server, plan, get_yahoo_finance_quote)))
+        while api_cache.stats()["inflight"]:
+            time.sleep(latency)
+
+    print(f"{'mode':<22}{'upstream':>10}{'time':>10}{'p50':>10}{'p99':>10}")
+    for label, (requests, elapsed, p50, p99) in rows:
+        print(f"{label:<22}{requests:>10}{elapsed * 1000:>8.0f}ms{p50:>8.2f}ms{p99:>8.2f}ms")
+
+    print(f"\nCold run: {stats['hits']} hits, {stats['misses']} misses "
+          f"({stats['coalesced']} coalesced), hit rate {stats['hit_rate']:.1%}")
+    final = api_cache.stats()
+    print(f"Stale run: {final['stale_hits']} stale hits, "
+          f"{final['upstream_calls'] - stats['upstream_calls']} background refreshes")
+
+
+if __name__ == "__main__":
+    main()
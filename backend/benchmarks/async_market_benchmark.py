@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Async market route benchmark.
+Fires a burst of concurrent quote requests for distinct (uncached) symbols at
+one in-process app instance, against a slow local stub provider, and probes
+/market/health while the burst is in flight. Compares the old blocking
+handler, which holds a threadpool worker per request, with the async route.
+
+Usage: python benchmarks/async_market_benchmark.py [concurrent_requests] [latency_ms]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Legacy modules build a database engine at import time
+os.environ["DATABASE_URL"] = os.environ.get("DATABASE_URL") or "sqlite:///:memory:"
+
+# The stub provider has no quota to protect
+os.environ["YAHOO_CALLS_PER_MINUTE"] = "0"
+os.environ["COINGECKO_CALLS_PER_MINUTE"] = "0"
+
+import httpx
+from fastapi import APIRouter, FastAPI
+
+from routes import market
+from services.market_service import MarketService
+from utils import api_utils
+from utils.http_client import close_async_client
+from benchmarks.stub_market_server import StubMarketServer
+
+HEALTH_PROBES = 20
+PROBE_INTERVAL = 0.05
+
+# The blocking handler the quote route used before it went async
+blocking_router = APIRouter()
+
+
+@blocking_router.get("/quote/{symbol}")
+def get_stock_quote_blocking(symbol: str):
+    quote = MarketService.get_stock_quote(symbol)
+    return quote.model_dump() if quote else {"error": "Quote not available"}
+
+
+def build_app(router: APIRouter) -> FastAPI:
+    app = FastAPI()
+    app.include_router(router, prefix="/market")
+    app.add_api_route("/market/health", market.health_check)
+    return app
+
+
+async def burst(app: FastAPI, count: int, prefix: str) -> tuple:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://finsage", timeout=60) as client:
+        async def timed(path: str) -> float:
+            begin = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            return (time.perf_counter() - begin) * 1000
+
+        async def probe(delay: float) -> float:
+            await asyncio.sleep(delay)
+            return await timed("/market/health")
+
+        start = time.perf_counter()
+        quotes, health = await asyncio.gather(
+            asyncio.gather(*(timed(f"/market/quote/{prefix}{i}") for i in range(count))),
+            asyncio.gather(*(probe(i * PROBE_INTERVAL) for i in range(HEALTH_PROBES)))
+        )
+        elapsed = time.perf_counter() - start
+    await close_async_client()
+    quotes = sorted(quotes)
+    return elapsed, statistics.median(quotes), quotes[int(len(quotes) * 0.99) - 1], statistics.median(health), max(health)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 200) / 1000
+
+    print("⚡ FinSage Async Market Route Benchmark")
+    print("=" * 50)
+    print(f"{count} concurrent quote requests, {latency * 1000:.0f} ms provider latency, one app instance\n")
+
+    with StubMarketServer(latency) as server:
+        api_utils.YAHOO_CHART_URL = f"{server.base_url}/chart"
+        cases = [
+            ("blocking def handler", build_app(blocking_router), "SYNC"),
+            ("async route", build_app(market.router), "ASYNC"),
+        ]
+        print(f"{'handler':<24}{'time':>10}{'quote p50':>12}{'quote p99':>12}{'health p50':>12}{'health max':>12}")
+        for label, app, prefix in cases:
+            api_utils.api_cache.clear()
+            elapsed, p50, p99, health, health_max = asyncio.run(burst(app, count, prefix))
+            print(f"{label:<24}{elapsed * 1000:>8.0f}ms{p50:>10.0f}ms{p99:>10.0f}ms{health:>10.1f}ms{health_max:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
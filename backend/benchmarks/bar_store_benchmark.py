@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Columnar bar store benchmark.
+Backfills simulated daily history into a temporary bar store, then measures
+range queries for 10 years of bars per symbol.
+
+Usage: python benchmarks/bar_store_benchmark.py [symbols] [years]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.logger import app_logger
+from app.services.bar_store import BarStore
+from backfill_bars import TRADING_DAYS_PER_YEAR, simulated_bars
+
+
+def percentiles(samples: list) -> tuple:
+    samples = sorted(samples)
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def main():
+    symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    years = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    bars = years * TRADING_DAYS_PER_YEAR
+
+    app_logger.disable("app")
+
+    print("🗄️  FinSage Bar Store Benchmark")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as root:
+        store = BarStore(root)
+        names = [f"SYM{i}" for i in range(symbols)]
+        history = {name: simulated_bars(name, bars) for name in names}
+
+        start = time.perf_counter()
+        for name in names:
+            store.append(name, history[name])
+        elapsed = time.perf_counter() - start
+        print(f"Backfilled {symbols:,} symbols x {bars:,} bars in {elapsed:.2f} s "
+              f"({symbols * bars / elapsed:,.0f} bars/sec)")
+
+        first_date = history[names[0]]["date"][0]
+        last_date = history[names[0]]["date"][-1]
+        rng = random.Random(7)
+        sample = [rng.choice(names) for _ in range(5000)]
+
+        cases = [
+            (f"range({years}y) first open", None),
+            (f"range({years}y)", lambda name: store.range(name, first_date, last_date)),
+            ("range(1y)", lambda name: store.range(name, last_date - np.timedelta64(365, "D"), last_date)),
+            (f"tail({bars})", lambda name: store.tail(name, bars)),
+            (f"range({years}y) + close sum", lambda name: float(store.range(name, first_date, last_date)["close"].sum())),
+        ]
+
+        print(f"\n{'query':<28}{'p50':>10}{'p99':>10}")
+        for label, query in cases:
+            samples = []
+            if query is None:
+                # New store instance so every symbol is mapped for the first time
+                cold = BarStore(root)
+                for name in names:
+                    begin = time.perf_counter()
+                    cold.range(name, first_date, last_date)
+                    samples.append((time.perf_counter() - begin) * 1e6)
+            else:
+                for name in sample:
+                    begin = time.perf_counter()
+                    query(name)
+                    samples.append((time.perf_counter() - begin) * 1e6)
+            p50, p99 = percentiles(samples)
+            print(f"{label:<28}{p50:>8.1f}µs{p99:>8.1f}µs")
+
+        result = store.range(names[0], first_date, last_date)
+        assert len(result["close"]) == bars
+        assert np.array_equal(result["close"], history[names[0]]["close"])
+
+
+if __name__ == "__main__":
+    main()
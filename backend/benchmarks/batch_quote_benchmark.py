@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Batch quote benchmark.
+Quotes a mixed stock/crypto portfolio against a local stub provider with
+realistic latency, comparing one blocking request per holding with
+MarketService.get_batch_quotes.
+
+Usage: python benchmarks/batch_quote_benchmark.py [stocks] [cryptos] [latency_ms]
+"""
+
+import os
+import sys
+import time
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Legacy modules build a database engine at import time
+os.environ["DATABASE_URL"] = os.environ.get("DATABASE_URL") or "sqlite:///:memory:"
+
+# The stub provider has no quota to protect
+os.environ["YAHOO_CALLS_PER_MINUTE"] = "0"
+os.environ["COINGECKO_CALLS_PER_MINUTE"] = "0"
+
+from utils import api_utils
+from services.market_service import MarketService
+from benchmarks.stub_market_server import StubMarketServer
+
+CRYPTOS = ["BTC", "ETH", "BNB", "SOL", "ADA", "XRP", "DOT", "DOGE", "MATIC", "AVAX"]
+
+
+def main():
+    stocks = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    cryptos = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    latency = (float(sys.argv[3]) if len(sys.argv) > 3 else 50) / 1000
+
+    stock_symbols = [f"STK{i}" for i in range(stocks)]
+    crypto_symbols = (CRYPTOS * (cryptos // len(CRYPTOS) + 1))[:cryptos]
+
+    print("💹 FinSage Batch Quote Benchmark")
+    print("=" * 50)
+    print(f"Portfolio: {stocks} stocks + {cryptos} cryptos, {latency * 1000:.0f} ms provider latency\n")
+
+    with StubMarketServer(latency) as server:
+        api_utils.YAHOO_CHART_URL = f"{server.base_url}/chart"
+        api_utils.COINGECKO_API_URL = f"{server.base_url}/coingecko"
+
+        start = time.perf_counter()
+        sequential = [MarketService.get_stock_quote(s) for s in stock_symbols]
+        sequential += [MarketService.get_crypto_quote(s) for s in crypto_symbols]
+        sequential_time = time.perf_counter() - start
+        sequential_requests = server.requests
+
+        # Measure the batch against the providers, not the response cache
+        api_utils.api_cache.clear()
+        start = time.perf_counter()
+        quotes = MarketService.get_batch_quotes(stock_symbols, crypto_symbols)
+        batch_time = time.perf_counter() - start
+        batch_requests = server.requests - sequential_requests
+
+    quoted = len(quotes["stock"]) + len(quotes["crypto"])
+    print(f"{'mode':<24}{'requests':>10}{'time':>12}")
+    print(f"{'one per holding':<24}{sequential_requests:>10}{sequential_time * 1000:>10.0f}ms")
+    print(f"{'batch':<24}{batch_requests:>10}{batch_time * 1000:>10.0f}ms")
+    print(f"\nQuoted {quoted} distinct symbols ({sum(q is not None for q in sequential)} holdings sequentially); "
+          f"batch is {sequential_time / batch_time:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Crypto snapshot benchmark.
+Concurrent clients read /api/v1/crypto/prices data for a few seconds
+against a slow stand-in CoinGecko, comparing the previous request-time
+TTL cache (the request that finds it expired fetches upstream, and so do
+any requests arriving meanwhile) with simple_backend's background
+snapshot refresher.
+
+Usage: python benchmarks/crypto_snapshot_benchmark.py [clients] [seconds] [upstream_delay] [refresh_seconds]
+       e.g. python benchmarks/crypto_snapshot_benchmark.py 16 6 0.5 1.0
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+# Add the backend directory (and the repo root, for simple_backend) to Python path
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+sys.path.append(os.path.dirname(BACKEND_DIR))
+
+from benchmarks.stub_market_server import StubMarketServer
+import simple_backend
+
+
+class RequestTimeCache:
+    """The previous get_cached_crypto_data: refresh inside whichever request finds the data expired."""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.data = None
+        self.timestamp = 0
+
+    def get(self) -> bytes:
+        current_time = time.time()
+        if self.data is None or (current_time - self.timestamp) > self.ttl:
+            self.data = simple_backend.fetch_crypto_data()
+            self.timestamp = current_time
+        return json.dumps({"cryptocurrencies": self.data, "last_updated": int(time.time()),
+                           "count": len(self.data)}).encode()
+
+
+def run_clients(read, clients: int, seconds: float) -> np.ndarray:
+    """Call ``read`` back to back from ``clients`` threads; returns latencies in ms."""
+    latencies = []
+    deadline = time.perf_counter() + seconds
+
+    def client():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            read()
+            latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return np.array(latencies) * 1000
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 6.0
+    upstream_delay = float(sys.argv[3]) if len(sys.argv) > 3 else 0.5
+    refresh_seconds = float(sys.argv[4]) if len(sys.argv) > 4 else 1.0
+
+    print("🪙 FinSage Crypto Snapshot Benchmark")
+    print("=" * 50)
+    print(f"{clients} clients for {seconds:.0f} s; upstream takes {upstream_delay:.1f} s, "
+          f"data refreshed every {refresh_seconds:.1f} s\n")
+
+    with StubMarketServer(latency=upstream_delay) as upstream:
+        simple_backend.COINGECKO_API_URL = f"{upstream.base_url}/coingecko"
+        cache = RequestTimeCache(refresh_seconds)
+        refresher = simple_backend.SnapshotRefresher([
+            simple_backend.SnapshotFeed('prices', ('/api/v1/crypto/prices', '/api/v1/crypto/ethereum'),
+                                        simple_backend.fetch_live_crypto_data, simple_backend.mock_crypto_data,
+                                        simple_backend.crypto_price_responses, refresh_seconds)
+        ])
+        refresher.get('/api/v1/crypto/prices')  # first fetch outside the measurement, like a warm server
+
+        cases = [
+            ("request-time TTL cache", cache.get),
+            ("background snapshot", lambda: refresher.get('/api/v1/crypto/prices').response),
+        ]
+        print(f"{'Strategy':<26}{'reads':>10}{'p50':>10}{'p99':>11}{'slowest':>12}{'upstream':>10}")
+        for name, read in cases:
+            before = upstream.requests
+            timings = run_clients(read, clients, seconds)
+            print(f"{name:<26}{len(timings):>10,}{np.percentile(timings, 50):>8.3f}ms"
+                  f"{np.percentile(timings, 99):>9.1f}ms{timings.max():>10.1f}ms{upstream.requests - before:>10}")
+        refresher.stop()
+
+
+if __name__ == "__main__":
+    main()
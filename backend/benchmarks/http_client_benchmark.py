@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Upstream HTTP client benchmark.
+Fetches quotes from a local stub provider that charges a per-connection
+handshake delay, comparing a new connection per request with the pooled
+keep-alive clients (sync, async and simple_backend's stdlib client).
+
+Usage: python benchmarks/http_client_benchmark.py [requests] [latency_ms] [handshake_ms]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import requests
+
+# Add the backend directory (and the repo root, for simple_backend) to Python path
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+sys.path.append(os.path.dirname(BACKEND_DIR))
+
+from utils.http_client import async_http_get, close_async_client, http_get
+from benchmarks.stub_market_server import StubMarketServer
+import simple_backend
+
+CONCURRENCY = 16
+
+
+def timed(fetch, urls: list, concurrency: int = 1) -> tuple:
+    def one(url):
+        begin = time.perf_counter()
+        fetch(url)
+        return (time.perf_counter() - begin) * 1000
+
+    start = time.perf_counter()
+    if concurrency == 1:
+        samples = [one(url) for url in urls]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(one, urls))
+    return time.perf_counter() - start, statistics.median(samples)
+
+
+def timed_async(fetch, urls: list) -> tuple:
+    async def one(url, semaphore):
+        async with semaphore:
+            begin = time.perf_counter()
+            await fetch(url)
+            return (time.perf_counter() - begin) * 1000
+
+    async def run():
+        semaphore = asyncio.Semaphore(CONCURRENCY)
+        start = time.perf_counter()
+        samples = await asyncio.gather(*(one(url, semaphore) for url in urls))
+        elapsed = time.perf_counter() - start
+        await close_async_client()
+        return elapsed, statistics.median(samples)
+
+    return asyncio.run(run())
+
+
+async def unpooled_async_get(url):
+    async with httpx.AsyncClient() as client:
+        return await client.get(url)
+
+
+def urlopen_get(url):
+    with urllib.request.urlopen(url, timeout=10) as response:
+        return response.read()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 5) / 1000
+    handshake = (float(sys.argv[3]) if len(sys.argv) > 3 else 30) / 1000
+
+    print("🔌 FinSage HTTP Client Benchmark")
+    print("=" * 50)
+    print(f"{count} requests, {latency * 1000:.0f} ms provider latency, "
+          f"{handshake * 1000:.0f} ms per new connection\n")
+
+    with StubMarketServer(latency, handshake=handshake) as server:
+        urls = [f"{server.base_url}/chart/STK{i % 50}" for i in range(count)]
+        cases = [
+            ("requests.get", lambda: timed(requests.get, urls)),
+            ("pooled http_get", lambda: timed(http_get, urls)),
+            (f"requests.get x{CONCURRENCY}", lambda: timed(requests.get, urls, CONCURRENCY)),
+            (f"pooled http_get x{CONCURRENCY}", lambda: timed(http_get, urls, CONCURRENCY)),
+            (f"httpx per request x{CONCURRENCY}", lambda: timed_async(unpooled_async_get, urls)),
+            (f"async_http_get x{CONCURRENCY}", lambda: timed_async(async_http_get, urls)),
+            ("urlopen (simple_backend)", lambda: timed(urlopen_get, urls)),
+            ("KeepAliveHTTPClient", lambda: timed(simple_backend.upstream_client.get, urls)),
+        ]
+
+        print(f"{'client':<32}{'conns':>8}{'time':>10}{'p50':>10}")
+        for label, run in cases:
+            before = server.connections
+            elapsed, p50 = run()
+            print(f"{label:<32}{server.connections - before:>8}{elapsed * 1000:>8.0f}ms{p50:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
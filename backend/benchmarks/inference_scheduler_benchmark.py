@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Inference scheduler benchmark.
+Runs concurrent clients against a trained model, scoring each request
+inline on the event loop (the old /prediction/predict path) and through the
+micro-batching InferenceScheduler, and reports throughput, request latency
+and how long the event loop was blocked.
+
+Usage: python benchmarks/inference_scheduler_benchmark.py [clients] [requests_per_client] [window_ms] [max_batch]
+       e.g. python benchmarks/inference_scheduler_benchmark.py 200 20 2 64
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.logger import app_logger
+from app.models.schemas import PredictionRequest, RiskTolerance
+from app.services.ai_service import AIService
+from app.services.inference_scheduler import InferenceScheduler
+
+
+def generate_profiles(count: int, seed: int = 42) -> list:
+    """Random customer profiles within the PredictionRequest bounds."""
+    rng = np.random.default_rng(seed)
+    risks = list(RiskTolerance)
+    return [
+        PredictionRequest(age=int(age), annual_income=float(income),
+                          risk_tolerance=risks[risk], investment_horizon_years=int(horizon))
+        for age, income, risk, horizon in zip(
+            rng.integers(18, 80, count), rng.uniform(20000, 250000, count),
+            rng.integers(0, 3, count), rng.integers(1, 40, count))
+    ]
+
+
+async def run_load(predict, clients: int, per_client: int, profiles: list) -> dict:
+    """Closed-loop load: each client sends its next request when the last one returns."""
+    latencies = []
+    lag = [0.0]
+    running = [True]
+
+    async def heartbeat():
+        # Anything that blocks the loop delays this 1 ms tick
+        while running[0]:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lag[0] = max(lag[0], time.perf_counter() - start - 0.001)
+
+    async def client(index: int):
+        for i in range(per_client):
+            start = time.perf_counter()
+            await predict(profiles[(index * per_client + i) % len(profiles)])
+            latencies.append(time.perf_counter() - start)
+
+    ticker = asyncio.create_task(heartbeat())
+    start = time.perf_counter()
+    await asyncio.gather(*[client(i) for i in range(clients)])
+    elapsed = time.perf_counter() - start
+    running[0] = False
+    await ticker
+
+    latencies = np.array(latencies) * 1000
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": np.percentile(latencies, 50),
+        "p99": np.percentile(latencies, 99),
+        "lag": lag[0] * 1000
+    }
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    window_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 2.0
+    max_batch = int(sys.argv[4]) if len(sys.argv) > 4 else 64
+    app_logger.disable("app")
+
+    print("🧺 FinSage Inference Scheduler Benchmark")
+    print("=" * 50)
+    print(f"Load: {clients} concurrent clients x {per_client} requests, random forest model")
+    print(f"Scheduler: {window_ms} ms window, batches of up to {max_batch}\n")
+
+    service = AIService()
+    service._create_mock_model()
+    profiles = generate_profiles(clients * per_client)
+
+    async def inline(request):
+        return service.predict_investment_recommendation(request)
+
+    scheduler = InferenceScheduler(service.predict_batch, max_batch_size=max_batch, window_ms=window_ms)
+
+    print(f"{'Path':<10}{'Throughput':>16}{'p50':>12}{'p99':>12}{'Loop blocked':>16}")
+    for name, predict in [("inline", inline), ("scheduler", scheduler.predict)]:
+        result = asyncio.run(run_load(predict, clients, per_client, profiles))
+        print(f"{name:<10}{result['throughput']:>10,.0f} req/s{result['p50']:>9.1f} ms"
+              f"{result['p99']:>9.1f} ms{result['lag']:>13.1f} ms")
+
+    stats = scheduler.stats()
+    print(f"\nBatches: {stats['batches']:,}, mean size {stats['mean_batch_size']}, largest {stats['largest_batch']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Market simulator benchmark.
+Steps the shared market simulator over thousands of symbols with a few
+subscribers on its tick bus (a latest-price table, a per-symbol counter and
+a single-symbol watcher) and reports ticks published per second, both
+flat out and paced by the background thread at a target tick rate.
+
+Usage: python benchmarks/market_simulator_benchmark.py [symbols] [target_ticks_per_sec] [seconds]
+       e.g. python benchmarks/market_simulator_benchmark.py 5000 100000 3
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.logger import app_logger
+from app.services.market_simulator import MarketSimulator
+
+
+def attach_subscribers(simulator: MarketSimulator) -> dict:
+    """Typical consumers: a latest-price table, tick counts per symbol and one watched symbol."""
+    latest = np.zeros(len(simulator))
+    counts = np.zeros(len(simulator), dtype=np.int64)
+    watched = []
+
+    def update_latest(batch):
+        latest[batch.indices] = batch.prices
+
+    def count_ticks(batch):
+        counts[batch.indices] += 1
+
+    def watch(batch):
+        price = batch.get("AAPL")
+        if price is not None:
+            watched.append(price)
+
+    for callback in (update_latest, count_ticks, watch):
+        simulator.bus.subscribe(callback)
+    return {"latest": latest, "counts": counts, "watched": watched}
+
+
+def main():
+    symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    target = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 3.0
+    app_logger.disable("app")
+
+    print("📈 FinSage Market Simulator Benchmark")
+    print("=" * 50)
+
+    print(f"{'Symbols moved per step':<24}{'steps/s':>10}{'ticks/s':>14}")
+    for batch_size in [0, 1000, 100]:
+        simulator = MarketSimulator(batch_size=batch_size, load_symbols=symbols, seed=1)
+        attach_subscribers(simulator)
+        steps, start = 0, time.perf_counter()
+        while time.perf_counter() - start < 1.0:
+            simulator.step()
+            steps += 1
+        elapsed = time.perf_counter() - start
+        label = f"all {len(simulator):,}" if not batch_size else f"{batch_size:,} (random)"
+        print(f"{label:<24}{steps / elapsed:>10,.0f}{simulator.bus.ticks / elapsed:>14,.0f}")
+
+    # Paced run: every step moves all symbols, as often as needed to hit the target rate
+    simulator = MarketSimulator(load_symbols=symbols, seed=2)
+    simulator.tick_seconds = len(simulator) / target
+    consumers = attach_subscribers(simulator)
+    simulator.start()
+    time.sleep(seconds)
+    simulator.stop()
+    stats = simulator.stats()
+    achieved = stats["ticks"] / seconds
+    print(f"\nPaced at {target:,} ticks/s over {len(simulator):,} symbols "
+          f"(a step every {simulator.tick_seconds * 1000:.0f} ms) for {seconds:.0f} s:")
+    print(f"  published {stats['ticks']:,} ticks in {stats['steps']:,} steps = {achieved:,.0f} ticks/s "
+          f"({achieved / target:.0%} of target), subscriber errors {simulator.bus.errors}")
+    print(f"  every symbol ticked {consumers['counts'].min():,}-{consumers['counts'].max():,} times; "
+          f"AAPL watcher saw {len(consumers['watched']):,} updates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Order book matching benchmark.
+Measures how many orders per second the per-symbol order book can accept and
+match against a ticking market price with tens of thousands of resting orders.
+
+Usage: python benchmarks/order_book_benchmark.py [resting_orders] [ticks]
+"""
+
+import os
+import random
+import sys
+import time
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.order_book import OrderBook
+
+
+def build_book(resting_orders: int, mid_price: float = 100.0) -> tuple:
+    """Fill a book with a mix of limit, stop and stop-limit orders around the mid price."""
+    book = OrderBook("BENCH")
+    rng = random.Random(42)
+
+    start = time.perf_counter()
+    for i in range(resting_orders):
+        side = "buy" if i % 2 == 0 else "sell"
+        kind = rng.random()
+        offset = round(rng.uniform(0.01, 10.0), 2)
+        quantity = rng.randint(1, 500)
+
+        if kind < 0.8:
+            price = mid_price - offset if side == "buy" else mid_price + offset
+            book.add_order(f"o{i}", side, "limit", quantity, limit_price=round(price, 2))
+        elif kind < 0.9:
+            stop = mid_price + offset if side == "buy" else mid_price - offset
+            book.add_order(f"o{i}", side, "stop", quantity, stop_price=round(stop, 2))
+        else:
+            stop = mid_price + offset if side == "buy" else mid_price - offset
+            limit = stop + 0.5 if side == "buy" else stop - 0.5
+            book.add_order(f"o{i}", side, "stop_limit", quantity,
+                           limit_price=round(limit, 2), stop_price=round(stop, 2))
+    elapsed = time.perf_counter() - start
+
+    return book, elapsed
+
+
+def run_ticks(book: OrderBook, ticks: int, mid_price: float = 100.0) -> tuple:
+    """Random-walk the price and match the book on every tick."""
+    rng = random.Random(7)
+    price = mid_price
+    fills = 0
+
+    start = time.perf_counter()
+    for _ in range(ticks):
+        price = max(1.0, price + rng.gauss(0, 0.25))
+        fills += len(book.on_price(round(price, 2), volume=rng.randint(100, 5000)))
+    elapsed = time.perf_counter() - start
+
+    return fills, elapsed
+
+
+def main():
+    resting_orders = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+
+    print("📒 FinSage Order Book Benchmark")
+    print("=" * 50)
+
+    book, insert_time = build_book(resting_orders)
+    print(f"Inserted {resting_orders:,} orders in {insert_time * 1000:.1f} ms "
+          f"({resting_orders / insert_time:,.0f} orders/sec)")
+    print(f"Best bid/ask: {book.best_bid()} / {book.best_ask()}")
+
+    fills, match_time = run_ticks(book, ticks)
+    print(f"Processed {ticks:,} ticks in {match_time * 1000:.1f} ms "
+          f"({ticks / match_time:,.0f} ticks/sec)")
+    print(f"Fills: {fills:,} ({fills / match_time:,.0f} fills/sec)")
+    print(f"Resting orders left: {len(book):,}")
+
+    total_time = insert_time + match_time
+    print(f"\nMatching throughput: {(resting_orders + fills) / total_time:,.0f} orders/sec")
+
+
+if __name__ == "__main__":
+    main()
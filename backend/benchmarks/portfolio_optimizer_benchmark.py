@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Portfolio optimizer benchmark.
+Times Ledoit-Wolf covariance, the Black-Litterman posterior and a full
+efficient frontier as the asset universe grows, on factor-model returns.
+
+Usage: python benchmarks/portfolio_optimizer_benchmark.py [sizes] [points] [observations]
+       e.g. python benchmarks/portfolio_optimizer_benchmark.py 50,100,250,500,1000 50 756
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import portfolio_optimizer as po
+
+VIEWS = 10
+
+
+def generate_returns(assets: int, observations: int, seed: int = 42) -> np.ndarray:
+    """Daily returns driven by five common factors plus idiosyncratic noise."""
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(0, 0.008, (observations, 5))
+    loadings = rng.normal(1, 0.5, (assets, 5))
+    return factors @ loadings.T + rng.normal(0, 0.015, (observations, assets)) + rng.normal(0.0004, 0.0003, assets)
+
+
+def solve(returns: np.ndarray, points: int) -> dict:
+    """One full optimization, timing each stage."""
+    assets = returns.shape[1]
+    rng = np.random.default_rng(assets)
+    timings = {}
+
+    start = time.perf_counter()
+    cov, _ = po.ledoit_wolf(returns)
+    cov *= po.TRADING_DAYS_PER_YEAR
+    timings["covariance"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    prior = po.implied_returns(cov, np.full(assets, 1 / assets))
+    views = min(VIEWS, assets)
+    picks = np.zeros((views, assets))
+    picks[np.arange(views), rng.choice(assets, views, replace=False)] = 1
+    expected, posterior_cov = po.black_litterman(cov, prior, picks, picks @ prior + rng.normal(0, 0.02, views))
+    timings["black_litterman"] = time.perf_counter() - start
+
+    # Cap positions so the bounds bind and the solver has real work to do
+    start = time.perf_counter()
+    turning_points = po.critical_line(expected, posterior_cov, max_weight=max(0.05, 2 / assets))
+    frontier = po.efficient_frontier(expected, posterior_cov, points, turning_points=turning_points)
+    timings["frontier"] = time.perf_counter() - start
+
+    timings["turning_points"] = len(turning_points[0])
+    timings["weights_ok"] = bool(np.allclose(frontier["weights"].sum(axis=1), 1))
+    return timings
+
+
+def main():
+    sizes = [int(s) for s in sys.argv[1].split(",")] if len(sys.argv) > 1 else [50, 100, 250, 500, 1000]
+    points = int(sys.argv[2]) if len(sys.argv) > 2 else po.FRONTIER_POINTS
+    observations = int(sys.argv[3]) if len(sys.argv) > 3 else 3 * po.TRADING_DAYS_PER_YEAR
+
+    print("📐 FinSage Portfolio Optimizer Benchmark")
+    print("=" * 50)
+    print(f"Frontier: {points} points, {observations:,} daily observations, {VIEWS} views\n")
+    print(f"{'Assets':>7}{'Ledoit-Wolf':>14}{'Black-Litt.':>14}{'Frontier':>12}{'Total':>12}{'Turns':>8}")
+
+    for assets in sizes:
+        timings = solve(generate_returns(assets, observations), points)
+        total = timings["covariance"] + timings["black_litterman"] + timings["frontier"]
+        check = "" if timings["weights_ok"] else "  ❌ weights don't sum to 1"
+        print(f"{assets:>7,}{timings['covariance'] * 1000:>11.1f} ms{timings['black_litterman'] * 1000:>11.1f} ms"
+              f"{timings['frontier'] * 1000:>9.1f} ms{total * 1000:>9.1f} ms{timings['turning_points']:>8,}{check}")
+
+
+if __name__ == "__main__":
+    main()
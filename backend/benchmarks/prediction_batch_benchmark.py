@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Batch prediction benchmark.
+Scores a synthetic customer base one profile per call and with
+AIService.predict_batch, with the rules-based fallback and with a trained
+model, then compares /prediction/predict with /prediction/predict/batch.
+
+Usage: python benchmarks/prediction_batch_benchmark.py [profiles] [api_profiles]
+       e.g. python benchmarks/prediction_batch_benchmark.py 10000 1000
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.core.logger import app_logger
+from app.main import app
+from app.models.schemas import PredictionRequest, RiskTolerance
+from app.services.ai_service import AIService, ai_service
+
+
+def generate_profiles(count: int, seed: int = 42) -> list:
+    """Random customer profiles within the PredictionRequest bounds."""
+    rng = np.random.default_rng(seed)
+    risks = list(RiskTolerance)
+    return [
+        PredictionRequest(age=int(age), annual_income=float(income),
+                          risk_tolerance=risks[risk], investment_horizon_years=int(horizon))
+        for age, income, risk, horizon in zip(
+            rng.integers(18, 80, count), rng.uniform(20000, 250000, count),
+            rng.integers(0, 3, count), rng.integers(1, 40, count))
+    ]
+
+
+def rate(count: int, seconds: float) -> str:
+    return f"{count / seconds:>12,.0f} req/s"
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    api_count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    app_logger.disable("app")
+
+    print("🧮 FinSage Batch Prediction Benchmark")
+    print("=" * 50)
+    print(f"Profiles: {count:,} for the service, {api_count:,} for the API\n")
+
+    profiles = generate_profiles(count)
+    service = AIService()
+    for mode in ["rules", "model"]:
+        if mode == "model":
+            service._create_mock_model()
+
+        # Every profile is distinct; start each pass without cached predictions
+        service.prediction_cache.invalidate()
+        start = time.perf_counter()
+        singles = [service.predict_investment_recommendation(p) for p in profiles]
+        single_time = time.perf_counter() - start
+
+        service.prediction_cache.invalidate()
+        start = time.perf_counter()
+        batch = service.predict_batch(profiles)
+        batch_time = time.perf_counter() - start
+
+        same = all(a.recommendation_score == b.recommendation_score for a, b in zip(singles, batch))
+        print(f"{mode:<6} per-profile {rate(count, single_time)}   batch {rate(count, batch_time)}"
+              f"   {single_time / batch_time:>6.1f}x{'' if same else '  ❌ scores differ'}")
+
+    client = TestClient(app)
+    payload = [p.model_dump(mode="json") for p in profiles[:api_count]]
+
+    start = time.perf_counter()
+    for profile in payload:
+        client.post("/api/v1/prediction/predict", json=profile)
+    single_time = time.perf_counter() - start
+
+    ai_service.prediction_cache.invalidate()
+    start = time.perf_counter()
+    response = client.post("/api/v1/prediction/predict/batch", json={"profiles": payload})
+    batch_time = time.perf_counter() - start
+    check = "" if response.status_code == 200 and response.json()["count"] == api_count else "  ❌ batch failed"
+    print(f"{'api':<6} per-profile {rate(api_count, single_time)}   batch {rate(api_count, batch_time)}"
+          f"   {single_time / batch_time:>6.1f}x{check}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Prediction cache benchmark.
+Replays a skewed stream of user profiles (a few common profiles make up
+most requests) through AIService with the prediction cache disabled, keyed
+on exact profiles, and keyed on profiles with income rounded to a step.
+
+Usage: python benchmarks/prediction_cache_benchmark.py [requests] [distinct_profiles] [income_step]
+       e.g. python benchmarks/prediction_cache_benchmark.py 20000 5000 1000
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.core.logger import app_logger
+from app.models.schemas import PredictionRequest, RiskTolerance
+from app.services.ai_service import AIService
+
+
+def generate_stream(requests: int, distinct: int, seed: int = 42) -> tuple:
+    """
+    Zipf-distributed requests over ``distinct`` base profiles.
+
+    Returns the stream twice: repeating base profiles exactly, and with a
+    few hundred dollars of noise on each request's income.
+    """
+    rng = np.random.default_rng(seed)
+    risks = list(RiskTolerance)
+    ages = rng.integers(18, 80, distinct)
+    incomes = rng.integers(4, 50, distinct) * 5000.0
+    codes = rng.integers(0, 3, distinct)
+    horizons = rng.integers(1, 40, distinct)
+
+    picks = np.minimum(rng.zipf(1.3, requests) - 1, distinct - 1)
+    noise = rng.uniform(-400, 400, requests)
+    exact, noisy = [], []
+    for pick, jitter in zip(picks.tolist(), noise.tolist()):
+        profile = dict(age=int(ages[pick]), risk_tolerance=risks[codes[pick]],
+                       investment_horizon_years=int(horizons[pick]))
+        exact.append(PredictionRequest(annual_income=float(incomes[pick]), **profile))
+        noisy.append(PredictionRequest(annual_income=round(float(incomes[pick]) + jitter, 2), **profile))
+    return exact, noisy
+
+
+def replay(service: AIService, stream: list, cache_size: int, income_step: float) -> tuple:
+    """Score the stream one request at a time; returns (req/s, hit rate)."""
+    settings.prediction_cache_income_step = income_step
+    service.prediction_cache.max_entries = cache_size
+    service.prediction_cache.invalidate()
+    service.prediction_cache.hits = service.prediction_cache.misses = 0
+
+    start = time.perf_counter()
+    for request in stream:
+        service.predict_investment_recommendation(request)
+    elapsed = time.perf_counter() - start
+    return len(stream) / elapsed, service.prediction_cache.stats()["hit_rate"]
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    distinct = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    income_step = float(sys.argv[3]) if len(sys.argv) > 3 else 1000
+    app_logger.disable("app")
+
+    print("🗃️  FinSage Prediction Cache Benchmark")
+    print("=" * 50)
+    print(f"Stream: {requests:,} requests over {distinct:,} base profiles (Zipf), random forest model\n")
+
+    exact, noisy = generate_stream(requests, distinct)
+    service = AIService()
+    service._create_mock_model()
+
+    scenarios = [
+        ("no cache", exact, 0, 0),
+        ("exact profiles", exact, settings.prediction_cache_size, 0),
+        ("noisy income, exact key", noisy, settings.prediction_cache_size, 0),
+        (f"noisy income, ${income_step:,.0f} step", noisy, settings.prediction_cache_size, income_step),
+    ]
+    print(f"{'Scenario':<30}{'Throughput':>16}{'Hit rate':>12}")
+    for name, stream, cache_size, step in scenarios:
+        throughput, hit_rate = replay(service, stream, cache_size, step)
+        print(f"{name:<30}{throughput:>10,.0f} req/s{(hit_rate or 0) * 100:>11.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Quote stream load test.
+Connects thousands of clients to the quote fan-out, spread over a set of
+shared watchlists, with a fraction of them reading slowly, and reports
+tick-to-client latency for the prompt clients, messages encoded versus
+delivered, and updates coalesced for the slow ones. Runs first against
+the hub in-process, then with real WebSocket clients against the app
+served by uvicorn; over real sockets every client reads promptly, since
+socket buffers would hide a slow reader from the hub for minutes.
+
+Usage: python benchmarks/quote_stream_benchmark.py [clients] [seconds] [watchlists] [slow_fraction]
+       e.g. python benchmarks/quote_stream_benchmark.py 10000 10 100 0.1
+"""
+
+import asyncio
+import http.client
+import json
+import os
+import random
+import resource
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+# Add the backend directory to Python path
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from app.core.logger import app_logger
+from app.services.market_simulator import BASE_PRICES, MarketSimulator
+from app.services.quote_stream import QuoteHub
+
+TICK_SECONDS = 0.5
+WEBSOCKET_TICK_SECONDS = 2.0  # server and clients share the machine, so the socket run ticks less often
+SLOW_READ_SECONDS = 2.0
+HANDSHAKES_IN_FLIGHT = 64  # keeps the listen backlog from overflowing while 10k clients connect
+LATENCY_SAMPLE_EVERY = 50  # prompt clients decode every message's timestamp; the rest just count messages
+
+
+def watchlists(count: int, seed: int = 11) -> list:
+    """Watchlists of 3-8 symbols drawn from the simulator's default symbols."""
+    rng = random.Random(seed)
+    symbols = sorted(BASE_PRICES)
+    return [",".join(rng.sample(symbols, rng.randint(3, 8))) for _ in range(count)]
+
+
+def summarize(name: str, latencies: list, received: int, clients: int, seconds: float, stats: dict):
+    timings = np.array(latencies) * 1000
+    print(f"  {name}: {clients:,} clients in {stats['groups']:,} groups watching {stats['symbols']} symbols")
+    print(f"    delivered {received:,} messages ({received / seconds:,.0f}/s) from {stats['encodes']:,} encodes; "
+          f"{stats['coalesced']:,} updates coalesced")
+    if len(timings):
+        print(f"    tick to prompt client: p50 {np.percentile(timings, 50):.1f} ms, "
+              f"p99 {np.percentile(timings, 99):.1f} ms, max {timings.max():.1f} ms")
+
+
+async def hub_client(hub: QuoteHub, symbols: str, slow: bool, sample: bool, state: dict, latencies: list):
+    """Read from the hub until cancelled; slow clients pause between messages."""
+    async for message in hub.stream(symbols):
+        state["received"] += 1
+        if sample:
+            latencies.append(time.time() - json.loads(message)["timestamp"])
+        if slow:
+            await asyncio.sleep(SLOW_READ_SECONDS)
+
+
+async def run_hub(clients: int, seconds: float, lists: list, slow_fraction: float):
+    """In-process: every client is an async consumer of the hub, fed by a background simulator thread."""
+    simulator = MarketSimulator(tick_seconds=TICK_SECONDS, seed=4)
+    hub = QuoteHub(simulator)
+    rng = random.Random(5)
+    state, latencies = {"received": 0}, []
+    tasks = []
+    for i in range(clients):
+        slow = rng.random() < slow_fraction
+        tasks.append(asyncio.ensure_future(hub_client(hub, lists[i % len(lists)], slow,
+                                                      not slow and i % LATENCY_SAMPLE_EVERY == 0,
+                                                      state, latencies)))
+    await asyncio.sleep(0.1)
+    simulator.start()
+    await asyncio.sleep(seconds)
+    stats = hub.stats()
+    simulator.stop()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    summarize("in-process hub", latencies, state["received"], clients, seconds, stats)
+    print(f"    after disconnect: {hub.stats()['clients']} clients, "
+          f"{simulator.bus.subscriber_count} bus subscriptions")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def get_json(port: int, path: str) -> dict:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    conn.request("GET", path)
+    body = json.loads(conn.getresponse().read())
+    conn.close()
+    return body
+
+
+def start_server() -> tuple:
+    """Serve the app with uvicorn in a subprocess and wait until it answers."""
+    port = free_port()
+    env = dict(os.environ, MARKET_SIM_TICK_SECONDS=str(WEBSOCKET_TICK_SECONDS), LOG_LEVEL="WARNING")
+    process = subprocess.Popen([sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port),
+                                "--log-level", "warning", "--backlog", "4096"],
+                               cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            get_json(port, "/api/v1/market/stream/stats")
+            return process, port
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("uvicorn did not start")
+
+
+async def websocket_client(port: int, symbols: str, sample: bool, handshakes: asyncio.Semaphore,
+                           state: dict, latencies: list):
+    """One WebSocket subscriber; messages count only while the measurement window is open."""
+    import websockets
+
+    async with handshakes:
+        websocket = await websockets.connect(f"ws://127.0.0.1:{port}/api/v1/market/stream?symbols={symbols}",
+                                             open_timeout=120, ping_interval=None)
+    state["connected"] += 1
+    try:
+        while True:
+            message = await websocket.recv()
+            if state["measuring"]:
+                state["received"] += 1
+                if sample:
+                    latencies.append(time.time() - json.loads(message)["timestamp"])
+    finally:
+        await websocket.close()
+
+
+async def run_websockets(clients: int, seconds: float, lists: list):
+    """Real WebSocket clients against the app served by uvicorn in another process."""
+    try:
+        import websockets  # noqa: F401
+    except ImportError:
+        print("  websockets is not installed; skipping the WebSocket run")
+        return
+    process, port = start_server()
+    state, latencies = {"connected": 0, "received": 0, "measuring": False}, []
+    handshakes = asyncio.Semaphore(HANDSHAKES_IN_FLIGHT)
+    tasks = []
+    try:
+        start = time.perf_counter()
+        for i in range(clients):
+            tasks.append(asyncio.ensure_future(websocket_client(
+                port, lists[i % len(lists)], i % LATENCY_SAMPLE_EVERY == 0, handshakes, state, latencies)))
+        while state["connected"] < clients:
+            failed = [task for task in tasks if task.done()]
+            if failed:
+                raise failed[0].exception() or RuntimeError("client closed early")
+            await asyncio.sleep(0.1)
+        print(f"  {clients:,} WebSocket clients connected in {time.perf_counter() - start:.1f} s "
+              f"(a tick every {WEBSOCKET_TICK_SECONDS} s)")
+
+        before = await asyncio.to_thread(get_json, port, "/api/v1/market/stream/stats")
+        state["measuring"] = True
+        await asyncio.sleep(seconds)
+        state["measuring"] = False
+        after = await asyncio.to_thread(get_json, port, "/api/v1/market/stream/stats")
+        window = dict(after, **{key: after[key] - before[key] for key in ("encodes", "coalesced")})
+        summarize("WebSocket", latencies, state["received"], clients, seconds, window)
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await asyncio.sleep(1.0)
+        remaining = await asyncio.to_thread(get_json, port, "/api/v1/market/stream/stats")
+        print(f"    after disconnect: {remaining['clients']} clients")
+    finally:
+        for task in tasks:
+            task.cancel()
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+    lists = watchlists(int(sys.argv[3]) if len(sys.argv) > 3 else 100)
+    slow_fraction = float(sys.argv[4]) if len(sys.argv) > 4 else 0.1
+    app_logger.disable("app")
+
+    # Every client holds a socket on each side
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = min(hard, clients + 1024) if hard != resource.RLIM_INFINITY else clients + 1024
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+
+    print("📡 FinSage Quote Stream Load Test")
+    print("=" * 50)
+    print(f"{clients:,} clients over {len(lists)} watchlists, {slow_fraction:.0%} reading one message "
+          f"every {SLOW_READ_SECONDS:.0f} s; a tick every {TICK_SECONDS} s for {seconds:.0f} s\n")
+
+    asyncio.run(run_hub(clients, seconds, lists, slow_fraction))
+    asyncio.run(run_websockets(clients, seconds, lists))
+
+
+if __name__ == "__main__":
+    main()
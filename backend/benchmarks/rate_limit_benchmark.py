@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Upstream rate governor benchmark.
+Runs a bulk backfill alongside a steady stream of realtime quotes against an
+in-process provider that rejects calls beyond its quota, with no governor,
+with a FIFO governor and with the prioritized governor. The quota window is
+scaled down from a minute so the run takes seconds.
+
+Usage: python benchmarks/rate_limit_benchmark.py [calls_per_window] [window_seconds] [duration_seconds]
+"""
+
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import deque
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.rate_limiter import PRIORITY_BULK, PRIORITY_NORMAL, PRIORITY_REALTIME, RateGovernor
+
+BULK_WORKERS = 4
+PROVIDER_LATENCY = 0.02
+REALTIME_INTERVAL = 0.25
+
+
+class QuotaProvider:
+    """Accepts at most ``calls`` requests in any sliding ``window`` seconds"""
+
+    def __init__(self, calls: int, window: float):
+        self.calls = calls
+        self.window = window
+        self.accepted = deque()
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def request(self) -> bool:
+        time.sleep(PROVIDER_LATENCY)
+        with self.lock:
+            now = time.monotonic()
+            while self.accepted and self.accepted[0] <= now - self.window:
+                self.accepted.popleft()
+            if len(self.accepted) >= self.calls:
+                self.rejected += 1
+                return False
+            self.accepted.append(now)
+            return True
+
+
+def run(calls: int, window: float, duration: float, governor, bulk_priority: int, realtime_priority: int) -> dict:
+    provider = QuotaProvider(calls, window)
+    stop = time.monotonic() + duration
+    bulk_done = [0]
+    realtime_waits, realtime_failed = [], [0]
+    accepted_total = [0]
+    lock = threading.Lock()
+
+    def call(priority: int) -> bool:
+        if governor is not None:
+            governor.acquire(priority)
+        ok = provider.request()
+        with lock:
+            accepted_total[0] += ok
+        return ok
+
+    def bulk():
+        while time.monotonic() < stop:
+            if call(bulk_priority):
+                with lock:
+                    bulk_done[0] += 1
+
+    def realtime():
+        while time.monotonic() < stop:
+            begin = time.monotonic()
+            if call(realtime_priority):
+                realtime_waits.append((time.monotonic() - begin) * 1000)
+            else:
+                realtime_failed[0] += 1
+            time.sleep(REALTIME_INTERVAL)
+
+    threads = [threading.Thread(target=bulk) for _ in range(BULK_WORKERS)] + [threading.Thread(target=realtime)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    realtime_waits.sort()
+    return {
+        "accepted": accepted_total[0],
+        "rejected": provider.rejected,
+        "bulk": bulk_done[0],
+        "realtime_ok": len(realtime_waits),
+        "realtime_failed": realtime_failed[0],
+        "p50": statistics.median(realtime_waits) if realtime_waits else float("nan"),
+        "p99": realtime_waits[max(0, int(len(realtime_waits) * 0.99) - 1)] if realtime_waits else float("nan"),
+    }
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    window = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    duration = float(sys.argv[3]) if len(sys.argv) > 3 else 8.0
+
+    print("🚦 FinSage Rate Governor Benchmark")
+    print("=" * 50)
+    print(f"Quota {calls} calls / {window:g} s, {duration:g} s run, {BULK_WORKERS} backfill workers, "
+          f"a realtime quote every {REALTIME_INTERVAL * 1000:.0f} ms\n")
+
+    cases = [
+        ("no governor", lambda: run(calls, window, duration, None, PRIORITY_NORMAL, PRIORITY_NORMAL)),
+        ("governor, FIFO", lambda: run(calls, window, duration, RateGovernor("fifo", calls, window),
+                                       PRIORITY_NORMAL, PRIORITY_NORMAL)),
+        ("governor, prioritized", lambda: run(calls, window, duration, RateGovernor("prio", calls, window),
+                                              PRIORITY_BULK, PRIORITY_REALTIME)),
+    ]
+
+    quota = calls * duration / window
+    print(f"{'mode':<24}{'accepted':>10}{'rejected':>10}{'quota used':>12}{'rt ok/fail':>12}{'rt p50':>10}{'rt p99':>10}")
+    for label, case in cases:
+        r = case()
+        print(f"{label:<24}{r['accepted']:>10}{r['rejected']:>10}{min(r['accepted'] / quota, 1):>12.0%}"
+              f"{r['realtime_ok']:>6}/{r['realtime_failed']:<5}{r['p50']:>8.0f}ms{r['p99']:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
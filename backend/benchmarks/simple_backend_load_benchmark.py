@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+simple_backend load test.
+Starts simple_backend.py single-threaded (SERVER_WORKERS=0) and with its
+pooled keep-alive server, drives each with 1, 16 and 128 concurrent
+clients (a mix of health, education and prediction requests) and reports
+requests/sec and latency percentiles. A final scenario stalls one
+/api/v1/crypto/prices fetch on a slow stand-in CoinGecko and measures
+what the other clients see meanwhile.
+
+Usage: python benchmarks/simple_backend_load_benchmark.py [seconds] [workers] [upstream_delay]
+       e.g. python benchmarks/simple_backend_load_benchmark.py 3 128 2.0
+"""
+
+import http.client
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+
+# Add the backend directory to Python path
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from benchmarks.stub_market_server import StubMarketServer
+
+SIMPLE_BACKEND = os.path.join(os.path.dirname(BACKEND_DIR), 'simple_backend.py')
+CONCURRENCY = [1, 16, 128]
+REQUEST_MIX = [
+    ('GET', '/api/v1/status/health', None),
+    ('GET', '/api/v1/education/topics', None),
+    ('POST', '/api/v1/prediction/predict',
+     json.dumps({'age': 42, 'annual_income': 95000, 'risk_tolerance': 'moderate', 'financial_goals': 'house'})),
+]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, coingecko_url: str) -> tuple:
+    """Run simple_backend.py in a subprocess and wait until it answers."""
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), HOST='127.0.0.1', SERVER_WORKERS=str(workers),
+               COINGECKO_API_URL=coingecko_url)
+    process = subprocess.Popen([sys.executable, SIMPLE_BACKEND], env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/api/v1/status/health')
+            conn.getresponse().read()
+            conn.close()
+            return process, port
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError('simple_backend.py did not start')
+
+
+def stop_server(process) -> float:
+    """SIGTERM the server and return how long its graceful shutdown took."""
+    start = time.perf_counter()
+    process.send_signal(signal.SIGTERM)
+    process.wait(timeout=30)
+    return time.perf_counter() - start
+
+
+def client(port: int, requests: list, deadline: float, latencies: list, errors: list, start_barrier):
+    """Send requests back to back over one connection (reconnecting when the server closes it)."""
+    conn, i = None, 0
+    start_barrier.wait()
+    while time.perf_counter() < deadline:
+        method, path, body = requests[i % len(requests)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            if conn is None:
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            conn.request(method, path, body, {'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            if response.will_close:
+                conn.close()
+                conn = None
+            latencies.append(time.perf_counter() - start)
+        except (OSError, http.client.HTTPException):
+            errors.append(1)
+            if conn is not None:
+                conn.close()
+            conn = None
+    if conn is not None:
+        conn.close()
+
+
+def load(port: int, clients: int, seconds: float, stall_path: str = None) -> dict:
+    """Run ``clients`` concurrent clients for ``seconds``; optionally one extra client requests ``stall_path``."""
+    latencies, errors = [], []
+    start_barrier = threading.Barrier(clients + 1 + (stall_path is not None))
+    deadline = time.perf_counter() + seconds + 0.1
+    threads = [threading.Thread(target=client, args=(port, REQUEST_MIX, deadline, latencies, errors, start_barrier))
+               for _ in range(clients)]
+    stall = []
+    if stall_path:
+        threads.append(threading.Thread(target=client, args=(port, [('GET', stall_path, None)],
+                                                             deadline, stall, errors, start_barrier)))
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    timings = np.array(latencies) * 1000
+    return {
+        'throughput': len(latencies) / elapsed,
+        'p50': float(np.percentile(timings, 50)) if len(timings) else float('nan'),
+        'p99': float(np.percentile(timings, 99)) if len(timings) else float('nan'),
+        'max': float(timings.max()) if len(timings) else float('nan'),
+        'errors': len(errors)
+    }
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 128
+    upstream_delay = float(sys.argv[3]) if len(sys.argv) > 3 else 2.0
+
+    print("🏋️  simple_backend Load Test")
+    print("=" * 50)
+    print(f"{seconds:.0f} s per run; request mix: health, education topics, prediction\n")
+
+    modes = [('single-threaded', 0), (f'pooled ({workers} workers)', workers)]
+    with StubMarketServer(latency=upstream_delay) as upstream:
+        print(f"{'Server':<24}{'Clients':>8}{'req/s':>10}{'p50':>10}{'p99':>11}{'errors':>8}")
+        for name, mode_workers in modes:
+            process, port = start_server(mode_workers, f'{upstream.base_url}/coingecko')
+            try:
+                for clients in CONCURRENCY:
+                    result = load(port, clients, seconds)
+                    print(f"{name:<24}{clients:>8}{result['throughput']:>10,.0f}{result['p50']:>8.1f}ms"
+                          f"{result['p99']:>9.1f}ms{result['errors']:>8}")
+            finally:
+                shutdown = stop_server(process)
+            print(f"{'':<24}graceful shutdown in {shutdown:.2f} s")
+
+        print(f"\nStalled upstream: one /api/v1/crypto/prices fetch takes {upstream_delay:.1f} s, 16 other clients")
+        for name, mode_workers in modes:
+            process, port = start_server(mode_workers, f'{upstream.base_url}/coingecko')
+            try:
+                result = load(port, 16, seconds, stall_path='/api/v1/crypto/prices')
+            finally:
+                stop_server(process)
+            print(f"  {name:<22}{result['throughput']:>8,.0f} req/s   p99 {result['p99']:>7.1f} ms"
+                  f"   slowest {result['max']:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
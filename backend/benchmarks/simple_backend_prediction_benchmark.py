@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+simple_backend prediction benchmark.
+Builds /api/v1/prediction/predict responses for random profiles the way
+the handler used to (assembling every dictionary per request and encoding
+it with json.dumps) and from the precompiled response templates, checks
+they are identical, then measures end-to-end throughput over HTTP.
+
+Usage: python benchmarks/simple_backend_prediction_benchmark.py [profiles] [http_requests]
+       e.g. python benchmarks/simple_backend_prediction_benchmark.py 20000 2000
+"""
+
+import http.client
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import HTTPServer
+
+# Add the backend directory (and the repo root, for simple_backend) to Python path
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+sys.path.append(os.path.dirname(BACKEND_DIR))
+
+import simple_backend
+
+
+def generate_profiles(count: int, seed: int = 42) -> list:
+    """Random request bodies across risk tolerances, ages and goals."""
+    rng = random.Random(seed)
+    return [
+        {
+            'age': rng.randint(18, 80),
+            'annual_income': rng.choice([rng.randint(20000, 250000), round(rng.uniform(20000, 250000), 2)]),
+            'risk_tolerance': rng.choice(['conservative', 'moderate', 'aggressive']),
+            'financial_goals': rng.choice(['retirement', 'house', 'education', 'debt_payoff']),
+            'debt_amount': rng.randint(0, 100000),
+            'monthly_expenses': rng.randint(1500, 9000)
+        }
+        for _ in range(count)
+    ]
+
+
+def build_per_request(data: dict) -> bytes:
+    """The response as the handler used to build it: fresh dictionaries, then json.dumps."""
+    age = data.get('age', 30)
+    income = data.get('annual_income', 75000)
+    risk_tolerance = data.get('risk_tolerance', 'moderate')
+    financial_goals = data.get('financial_goals', 'retirement')
+    debt_amount = data.get('debt_amount', 0)
+    monthly_expenses = data.get('monthly_expenses', 3000)
+
+    debt_ratio = (debt_amount / income * 100) if income > 0 else 0
+    emergency_fund_needed = monthly_expenses * 6
+    recommended_monthly_investment = max(income * 0.15 / 12, 500)
+    age_bracket = simple_backend.get_age_bracket(age)
+    strategy = risk_tolerance if risk_tolerance in ('conservative', 'aggressive') else 'moderate'
+    base_return, confidence, allocations = simple_backend.INVESTMENT_STRATEGIES[strategy]
+
+    investment_categories = [
+        {
+            'name': asset_type,
+            'allocation': percentage,
+            'amount': income * 0.2 * share,
+            'explanation': simple_backend.get_investment_explanation(asset_type, age, risk_tolerance),
+            'benefits': simple_backend.get_investment_benefits(asset_type),
+            'risks': simple_backend.get_investment_risks(asset_type)
+        }
+        for asset_type, percentage, share in allocations
+    ]
+    response = {
+        "expected_return": round(base_return, 1),
+        "confidence_score": confidence,
+        "risk_level": risk_tolerance.title(),
+        "investment_categories": investment_categories,
+        "age_advice": simple_backend.get_age_specific_advice(age_bracket, age),
+        "emergency_fund_status": "Excellent" if emergency_fund_needed <= 10000 else "Good" if emergency_fund_needed <= 25000 else "Needs Improvement",
+        "emergency_fund_advice": f"You should have ${emergency_fund_needed:,.0f} in emergency savings (6 months of expenses).",
+        "debt_ratio": round(debt_ratio, 1),
+        "debt_advice": "Excellent debt management!" if debt_ratio < 20 else "Good debt level" if debt_ratio < 36 else "Consider debt reduction before investing heavily.",
+        "recommended_monthly_investment": recommended_monthly_investment,
+        "investment_advice": f"Based on your income, aim to invest ${recommended_monthly_investment:,.0f} monthly for optimal growth.",
+        "action_plan": simple_backend.get_action_plan(age_bracket, financial_goals, debt_ratio, emergency_fund_needed),
+        "recommendation": f"Personalized {risk_tolerance} strategy optimized for your {age_bracket.replace('_', ' ')} profile with {len(allocations)} diversified investment categories.",
+        "timestamp": int(time.time())
+    }
+    return json.dumps(response).encode()
+
+
+def throughput(build, profiles: list) -> float:
+    """Responses built per second."""
+    start = time.perf_counter()
+    for data in profiles:
+        build(data)
+    return len(profiles) / (time.perf_counter() - start)
+
+
+def serve_requests(port: int, bodies: list) -> float:
+    """POST each body to the running server, one connection per request like HTTP/1.0 clients; returns req/s."""
+    start = time.perf_counter()
+    for body in bodies:
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        conn.request('POST', '/api/v1/prediction/predict', body, {'Content-Type': 'application/json'})
+        conn.getresponse().read()
+        conn.close()
+    return len(bodies) / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    http_requests = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    print("📝 simple_backend Prediction Response Benchmark")
+    print("=" * 50)
+    print(f"Templates: {len(simple_backend.PREDICTION_TEMPLATES)} precompiled (risk tolerance x age bracket x goal)")
+
+    profiles = generate_profiles(count)
+    for data in profiles[:1000]:
+        expected = json.loads(build_per_request(data))
+        actual = json.loads(simple_backend.render_prediction(data))
+        assert {**actual, 'timestamp': 0} == {**expected, 'timestamp': 0}, data
+    print(f"Responses identical for {min(count, 1000):,} profiles\n")
+
+    baseline = throughput(build_per_request, profiles)
+    templated = throughput(simple_backend.render_prediction, profiles)
+    print(f"{'per-request dicts + json.dumps':<34}{baseline:>10,.0f} responses/s")
+    print(f"{'precompiled templates':<34}{templated:>10,.0f} responses/s ({templated / baseline:.1f}x)")
+
+    quiet_handler = type('QuietHandler', (simple_backend.FinSageHandler,), {'log_message': lambda *args: None})
+    server = HTTPServer(('127.0.0.1', 0), quiet_handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    bodies = [json.dumps(data).encode() for data in profiles[:http_requests]]
+    print(f"\nHTTP, {len(bodies):,} sequential POSTs: {serve_requests(server.server_address[1], bodies):,.0f} req/s")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
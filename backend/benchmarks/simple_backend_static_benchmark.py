@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+simple_backend static response benchmark.
+Compares running json.dumps on the fixed education, goals and analytics
+responses for every request with the bytes encoded once at startup, then
+measures them over a kept-alive HTTP connection: plain JSON, gzip, and a
+client revalidating its copy with If-None-Match.
+
+Usage: python benchmarks/simple_backend_static_benchmark.py [builds] [http_requests]
+       e.g. python benchmarks/simple_backend_static_benchmark.py 50000 3000
+"""
+
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+
+# Add the backend directory (and the repo root, for simple_backend) to Python path
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+sys.path.append(os.path.dirname(BACKEND_DIR))
+
+import simple_backend
+
+
+def per_second(call, count: int) -> float:
+    """Calls of ``call()`` per second."""
+    start = time.perf_counter()
+    for _ in range(count):
+        call()
+    return count / (time.perf_counter() - start)
+
+
+def fetch_all(port: int, paths: list, count: int, headers: dict) -> tuple:
+    """GET the paths round-robin over one kept-alive connection; returns (req/s, mean bytes, statuses)."""
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    received, statuses = 0, set()
+    start = time.perf_counter()
+    for i in range(count):
+        path = paths[i % len(paths)]
+        conn.request('GET', path, headers=headers(path))
+        response = conn.getresponse()
+        received += len(response.read())
+        statuses.add(response.status)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return count / elapsed, received / count, statuses
+
+
+def main():
+    builds = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    http_requests = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+
+    print("📦 simple_backend Static Response Benchmark")
+    print("=" * 50)
+    paths = list(simple_backend.STATIC_RESPONSES)
+    print(f"Routes: {', '.join(paths)}\n")
+
+    # The handler used to json.dumps these dictionaries on every hit
+    sources = [json.loads(simple_backend.STATIC_RESPONSES[path].variants['identity']) for path in paths]
+    rebuilt = per_second(lambda: [json.dumps(source).encode() for source in sources], builds)
+    cached = per_second(lambda: [simple_backend.STATIC_RESPONSES[path].variants['identity'] for path in paths], builds)
+    print(f"{'json.dumps per request':<28}{rebuilt * len(paths):>14,.0f} responses/s")
+    print(f"{'encoded once at startup':<28}{cached * len(paths):>14,.0f} responses/s\n")
+
+    quiet_handler = type('QuietHandler', (simple_backend.KeepAliveFinSageHandler,), {'log_message': lambda *args: None})
+    server = simple_backend.PooledHTTPServer(('127.0.0.1', 0), quiet_handler, max_workers=4)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    etags = {path: simple_backend.STATIC_RESPONSES[path].etags['gzip'] for path in paths}
+    cases = [
+        ("plain JSON", lambda path: {}),
+        ("gzip", lambda path: {'Accept-Encoding': 'gzip'}),
+        ("gzip + If-None-Match (304)", lambda path: {'Accept-Encoding': 'gzip', 'If-None-Match': etags[path]}),
+    ]
+    print(f"HTTP, {http_requests:,} keep-alive GETs")
+    for name, headers in cases:
+        throughput, body_bytes, statuses = fetch_all(port, paths, http_requests, headers)
+        print(f"  {name:<28}{throughput:>8,.0f} req/s   {body_bytes:>6,.0f} body bytes/response   "
+              f"status {', '.join(map(str, sorted(statuses)))}")
+    server.shutdown()
+    server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Streaming indicator benchmark.
+Measures the per-tick and per-request cost of the stateful indicators behind
+/market/technical/{symbol} and /trading/analysis/{symbol}, against
+recomputing every indicator from the full price history on each request.
+
+Usage: python benchmarks/streaming_indicator_benchmark.py [symbols] [ticks]
+"""
+
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import indicators
+from app.services.streaming_indicators import IndicatorStore
+
+HISTORY_BARS = 100
+
+
+def main():
+    symbols = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 500000
+
+    print("⚡ FinSage Streaming Indicator Benchmark")
+    print("=" * 50)
+
+    rng = np.random.default_rng(42)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.015, (symbols, HISTORY_BARS)), axis=1)
+    high, low = close * 1.005, close * 0.995
+    names = [f"SYM{i}" for i in range(symbols)]
+
+    store = IndicatorStore()
+    start = time.perf_counter()
+    for i, name in enumerate(names):
+        store.create(name, "1h", close[i], high[i], low[i])
+    warm = time.perf_counter() - start
+    print(f"Warmed {symbols:,} symbols x {HISTORY_BARS} bars in {warm:.2f} s "
+          f"({symbols * HISTORY_BARS / warm:,.0f} bars/sec)")
+
+    # Ticks spread over ~12 hours so bars keep closing as they would live
+    picker = random.Random(7)
+    feed = [(names[picker.randrange(symbols)], 100 * (1 + picker.uniform(-0.02, 0.02)), 1.7e9 + i * 43200 / ticks)
+            for i in range(ticks)]
+    start = time.perf_counter()
+    for name, price, timestamp in feed:
+        store.on_tick(name, price, timestamp)
+    elapsed = time.perf_counter() - start
+    bars = sum(store.get(name, "1h").bars for name in names) - symbols * HISTORY_BARS
+    print(f"Ingested {ticks:,} ticks ({bars:,} bars closed) in {elapsed:.2f} s "
+          f"({ticks / elapsed:,.0f} ticks/sec, {elapsed / ticks * 1e6:.2f}µs per tick)")
+
+    # Per-request cost: read the current state vs recompute from history
+    sample = [picker.randrange(symbols) for _ in range(2000)]
+    start = time.perf_counter()
+    for i in sample:
+        store.get(names[i], "1h").snapshot()
+    streaming = (time.perf_counter() - start) / len(sample)
+
+    start = time.perf_counter()
+    for i in sample:
+        series = indicators.compute_all(close[i], high[i], low[i])
+        {name: indicators.latest(values) for name, values in series.items()}
+    recompute = (time.perf_counter() - start) / len(sample)
+
+    print(f"\n{'per request':<28}{'latency':>12}")
+    print(f"{'streaming snapshot':<28}{streaming * 1e6:>10.1f}µs")
+    print(f"{'recompute ' + str(HISTORY_BARS) + ' bars':<28}{recompute * 1e6:>10.1f}µs")
+    print(f"Speedup: {recompute / streaming:,.1f}x; one sweep over all {symbols:,} symbols takes "
+          f"{streaming * symbols * 1000:,.0f} ms instead of {recompute * symbols * 1000:,.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
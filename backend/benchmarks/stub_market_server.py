@@ -0,0 +1,86 @@
+"""
+Local stand-in for the market data providers used by the legacy backend.
+
+Serves Yahoo Finance chart and CoinGecko simple/price responses with a fixed
+artificial latency, so benchmarks can measure request fan-out without
+touching the network. ``handshake`` adds a one-off delay to every new
+connection, standing in for the TCP and TLS round trips of a real provider. Point ``utils.api_utils.YAHOO_CHART_URL`` and
+``COINGECKO_API_URL`` at ``server.base_url`` to use it.
+"""
+
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def _price(name: str) -> float:
+    return 10 + zlib.crc32(name.encode()) % 50000 / 100
+
+
+class StubMarketHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body are separate writes on a kept-alive socket
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+        time.sleep(self.server.handshake)
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        url = urlparse(self.path)
+        with self.server.lock:
+            self.server.requests += 1
+
+        if url.path.startswith("/chart/"):
+            symbol = url.path.rsplit("/", 1)[-1]
+            price = _price(symbol)
+            payload = {"chart": {"result": [{"meta": {
+                "regularMarketPrice": price, "previousClose": price * 0.99,
+                "regularMarketVolume": 1000000, "regularMarketDayHigh": price * 1.01,
+                "regularMarketDayLow": price * 0.98, "regularMarketOpen": price * 0.995
+            }, "indicators": {"quote": [{}]}}]}}
+        elif url.path == "/coingecko/simple/price":
+            ids = parse_qs(url.query).get("ids", [""])[0].split(",")
+            payload = {coin_id: {"usd": _price(coin_id), "usd_24h_change": 1.5,
+                                 "usd_market_cap": 1e9, "usd_24h_vol": 1e8} for coin_id in ids if coin_id}
+        else:
+            self.send_error(404)
+            return
+
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubMarketServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # the default of 5 drops bursts of concurrent connects
+
+    def __init__(self, latency: float = 0.05, port: int = 0, handshake: float = 0.0):
+        super().__init__(("127.0.0.1", port), StubMarketHandler)
+        self.latency = latency
+        self.handshake = handshake
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+        self.base_url = f"http://127.0.0.1:{self.server_address[1]}"
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
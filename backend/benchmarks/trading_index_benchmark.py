@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Per-user order and position lookup benchmark.
+Compares the indexed TradingService lookups with the full scans they replaced
+on a paper-trading desk with many users.
+
+Usage: python benchmarks/trading_index_benchmark.py [users] [orders_per_user]
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.logger import app_logger
+from app.services.trading_service import TradingService
+
+SYMBOLS = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "META", "NVDA", "NFLX"]
+
+
+def scan_orders(service: TradingService, user_id: str, status: str = None) -> list:
+    """Order lookup as it was done before the indexes: scan every order."""
+    user_orders = [order for order in service.orders.values() if order["user_id"] == user_id]
+    if status:
+        user_orders = [order for order in user_orders if order["status"] == status]
+    return user_orders
+
+
+def scan_positions(service: TradingService, user_id: str) -> list:
+    """Position lookup as it was done before the indexes: scan every position."""
+    return [position for position in service.positions.values() if position["user_id"] == user_id]
+
+
+async def populate(service: TradingService, users: int, orders_per_user: int):
+    rng = random.Random(42)
+    for u in range(users):
+        user_id = f"user{u}"
+        for _ in range(orders_per_user):
+            symbol = rng.choice(SYMBOLS)
+            if rng.random() < 0.5:
+                await service.create_order(user_id, symbol, "buy", rng.randint(1, 50))
+            else:
+                # Far from the market so the order stays on the book
+                await service.create_order(user_id, symbol, "buy", rng.randint(1, 50),
+                                           order_type="limit", limit_price=1.0)
+
+
+def time_lookups(func, user_ids: list) -> tuple:
+    samples = []
+    for user_id in user_ids:
+        start = time.perf_counter()
+        func(user_id)
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.mean(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+async def main():
+    users = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    orders_per_user = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    # Silence per-order logging while populating the desk
+    app_logger.disable("app")
+
+    print("🗂️  FinSage Trading Index Benchmark")
+    print("=" * 50)
+
+    service = TradingService()
+    start = time.perf_counter()
+    await populate(service, users, orders_per_user)
+    print(f"Created {len(service.orders):,} orders and {len(service.positions):,} positions "
+          f"for {users:,} users in {time.perf_counter() - start:.1f} s")
+
+    rng = random.Random(7)
+    sample = [f"user{rng.randrange(users)}" for _ in range(200)]
+
+    cases = [
+        ("orders", lambda u: scan_orders(service, u),
+         lambda u: list(service._orders_by_user.get(u, {}).values())),
+        ("orders?status=pending", lambda u: scan_orders(service, u, "pending"),
+         lambda u: list(service._orders_by_user_status.get((u, "pending"), {}).values())),
+        ("positions", lambda u: scan_positions(service, u),
+         lambda u: list(service._positions_by_user.get(u, {}).values())),
+    ]
+
+    print(f"\n{'lookup':<24}{'scan mean':>12}{'scan p99':>12}{'index mean':>12}{'index p99':>12}")
+    for name, scan, indexed in cases:
+        scan_mean, scan_p99 = time_lookups(scan, sample)
+        index_mean, index_p99 = time_lookups(indexed, sample)
+        print(f"{name:<24}{scan_mean:>10.1f}µs{scan_p99:>10.1f}µs{index_mean:>10.1f}µs{index_p99:>10.1f}µs")
+
+    # End-to-end service call, including response building
+    start = time.perf_counter()
+    for user_id in sample:
+        await service.get_orders(user_id)
+    per_call = (time.perf_counter() - start) / len(sample) * 1e6
+    print(f"\nTradingService.get_orders: {per_call:.1f}µs per call")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tree scorer benchmark.
+Trains the recommendation forest on simulated history, then compares
+scikit-learn's model.predict with the flattened NumPy tree scorer at
+several batch sizes (checking the scores are identical) and end to end
+through AIService single-profile predictions.
+
+Usage: python benchmarks/tree_scorer_benchmark.py [training_rows] [requests]
+       e.g. python benchmarks/tree_scorer_benchmark.py 200000 2000
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.core.logger import app_logger
+from app.models.schemas import PredictionRequest
+from app.services import model_training
+from app.services.ai_service import AIService, RISK_TOLERANCE_CODES, RISK_TOLERANCE_ORDER
+from app.services.tree_scorer import FlatTreeEnsemble
+
+
+def time_per_call(predict, rows: np.ndarray, min_seconds: float = 0.5) -> float:
+    """Mean seconds per call of ``predict(rows)``, repeated for at least ``min_seconds``."""
+    calls, start = 0, time.perf_counter()
+    while time.perf_counter() - start < min_seconds:
+        predict(rows)
+        calls += 1
+    return (time.perf_counter() - start) / calls
+
+
+def serve(model, fast: bool, requests: list) -> tuple:
+    """Single-profile AIService predictions without the cache; returns (req/s, p99 ms)."""
+    settings.ml_fast_scorer = fast
+    service = AIService()
+    service.prediction_cache.max_entries = 0
+    service._fast_scorer = service._export_scorer(model)
+    service._model, service._model_checked = model, True
+
+    timings = []
+    for request in requests:
+        start = time.perf_counter()
+        service.predict_investment_recommendation(request)
+        timings.append(time.perf_counter() - start)
+    return len(requests) / sum(timings), float(np.percentile(timings, 99)) * 1000
+
+
+def main():
+    training_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    app_logger.disable("app")
+
+    print("🌲 FinSage Tree Scorer Benchmark")
+    print("=" * 50)
+
+    data_path = tempfile.mkdtemp()
+    model_training.write_simulated_history(data_path, training_rows)
+    model, _ = model_training.train_model(data_path, chunk_rows=training_rows // 8)
+    scorer = FlatTreeEnsemble.from_model(model)
+    print(f"Model: {scorer.n_trees} trees, {scorer.n_nodes:,} nodes, depth {scorer.max_depth}\n")
+
+    history = model_training.simulated_history(10000, seed=7)
+    history["risk_tolerance"] = history["risk_tolerance"].map(
+        {risk_tolerance.value: code for risk_tolerance, code in RISK_TOLERANCE_CODES.items()})
+    rows = history[model_training.FEATURES].to_numpy(dtype=float)
+
+    print(f"{'Batch':>8}{'sklearn':>14}{'flattened':>14}{'speedup':>10}  identical")
+    for batch_size in [1, 8, 64, 1000, 10000]:
+        batch = rows[:batch_size]
+        identical = np.array_equal(scorer.predict(batch), model.predict(batch))
+        sklearn_seconds = time_per_call(model.predict, batch)
+        flat_seconds = time_per_call(scorer.predict, batch)
+        print(f"{batch_size:>8}{sklearn_seconds * 1000:>11.3f} ms{flat_seconds * 1000:>11.3f} ms"
+              f"{sklearn_seconds / flat_seconds:>9.1f}x  {'yes' if identical else 'NO'}")
+
+    profiles = [
+        PredictionRequest(age=int(age), annual_income=float(income), risk_tolerance=RISK_TOLERANCE_ORDER[int(risk)],
+                          investment_horizon_years=int(horizon))
+        for age, income, risk, horizon in rows[:requests]
+    ]
+    print(f"\nAIService, {len(profiles):,} single-profile predictions (cache disabled):")
+    for name, fast in [("model.predict", False), ("flattened scorer", True)]:
+        throughput, p99 = serve(model, fast, profiles)
+        print(f"  {name:<18}{throughput:>10,.0f} req/s   p99 {p99:.2f} ms")
+    settings.ml_fast_scorer = True
+
+
+if __name__ == "__main__":
+    main()
@@ -33,7 +33,29 @@ class Settings:
     
     # Market Data Configuration
     DEFAULT_HISTORICAL_DAYS: int = 30
-    CACHE_TTL_SECONDS: int = 300  # 5 minutes
+    CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "300"))  # 5 minutes, for history and other slow-moving data
+    QUOTE_CACHE_TTL_SECONDS: int = int(os.getenv("QUOTE_CACHE_TTL_SECONDS", "15"))
+    CRYPTO_CACHE_TTL_SECONDS: int = int(os.getenv("CRYPTO_CACHE_TTL_SECONDS", "30"))
+    CACHE_STALE_SECONDS: int = int(os.getenv("CACHE_STALE_SECONDS", "600"))  # serve stale while refreshing
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    
+    # Upstream HTTP Client Configuration
+    HTTP_POOL_CONNECTIONS: int = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))  # hosts with a pool
+    HTTP_POOL_MAXSIZE: int = int(os.getenv("HTTP_POOL_MAXSIZE", "32"))  # keep-alive connections per host
+    HTTP_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_TIMEOUT_SECONDS", "10"))
+    HTTP_RETRIES: int = int(os.getenv("HTTP_RETRIES", "1"))
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "True").lower() == "true"
+    
+    # Upstream Rate Limits (0 disables a limit)
+    ALPHA_VANTAGE_CALLS_PER_MINUTE: int = int(os.getenv("ALPHA_VANTAGE_CALLS_PER_MINUTE", "5"))  # free tier quota
+    COINGECKO_CALLS_PER_MINUTE: int = int(os.getenv("COINGECKO_CALLS_PER_MINUTE", "30"))
+    YAHOO_CALLS_PER_MINUTE: int = int(os.getenv("YAHOO_CALLS_PER_MINUTE", "120"))
+    RATE_LIMIT_MAX_WAIT_SECONDS: float = float(os.getenv("RATE_LIMIT_MAX_WAIT_SECONDS", "15"))  # non-bulk calls give up after this
+    
+    # Async Request Deadlines (symbols still pending are served simulated data)
+    QUOTE_DEADLINE_SECONDS: float = float(os.getenv("QUOTE_DEADLINE_SECONDS", "5"))
+    HISTORY_DEADLINE_SECONDS: float = float(os.getenv("HISTORY_DEADLINE_SECONDS", "15"))
+    HISTORY_RECHECK_SECONDS: int = int(os.getenv("HISTORY_RECHECK_SECONDS", "3600"))  # between downloads of one symbol's daily bars
     
     @classmethod
     def get_database_url(cls) -> str:
@@ -4,6 +4,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from routes import market, auth, portfolio
 from config import settings
 from database import init_db
+from utils.http_client import close_async_client, close_session
+from app.services.market_simulator import market_simulator
 
 # Initialize database
 init_db()
@@ -38,5 +40,13 @@ def home():
 
 @app.on_event("startup")
 async def startup_event():
-    """Initialize database on startup"""
+    """Initialize database and start the simulated market on startup"""
     init_db()
+    market_simulator.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled upstream connections"""
+    await close_async_client()
+    close_session()
+    market_simulator.stop()
@@ -1,30 +1,28 @@
 """
 Market data routes - Updated to use services while maintaining backward compatibility
 """
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, Query, Depends, Request
 from typing import Optional
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+import asyncio
 import random
 
 from database import get_db
-from services.market_service import MarketService
+from services.async_market_service import AsyncMarketService
+from utils.api_utils import api_cache
+from utils.rate_limiter import rate_limit_stats
+from app.services.market_simulator import market_simulator
 from models.market_model import HistoricalDataResponse, RealtimeDataResponse, StockQuote, CryptoQuote
 
 router = APIRouter()
 
 # Keep backward compatibility with existing endpoints
-def generate_market_data(days=30):
-    """Generate realistic market data for charts (fallback)"""
-    base_price = 100
+def generate_market_data(days=30, symbol="FINSAGE"):
+    """Generate realistic market data for charts (fallback), ending at the simulated market's current price"""
     data = []
-    current_price = base_price
     
-    for i in range(days):
-        change = random.uniform(-2, 2)
-        current_price += change
-        current_price = max(50, min(200, current_price))
-        
+    for i, current_price in enumerate(market_simulator.history(symbol, days).tolist()):
         date = datetime.now() - timedelta(days=days-i-1)
         data.append({
             "date": date.strftime("%Y-%m-%d"),
@@ -38,6 +36,27 @@ def generate_market_data(days=30):
     
     return data
 
+async def _wait_for_disconnect(request: Request):
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
+
+async def _until_disconnected(request: Request, work):
+    """
+    Await ``work``, cancelling it if the client disconnects first
+    
+    Returns the result of ``work``, or None when the client went away (the
+    response is never sent, so its content doesn't matter).
+    """
+    task = asyncio.ensure_future(work)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request))
+    try:
+        await asyncio.wait({task, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        watcher.cancel()
+        if not task.done():
+            task.cancel()
+    return task.result() if task.done() and not task.cancelled() else None
+
 @router.get("/")
 def get_market_data():
     return {"message": "Market data endpoint", "status": "active"}
@@ -46,15 +65,26 @@ def get_market_data():
 def health_check():
     return {"status": "healthy", "service": "market"}
 
+@router.get("/cache/stats")
+def get_cache_stats():
+    """Get hit, miss and eviction counters for the market data cache"""
+    return api_cache.stats()
+
+@router.get("/rate-limits")
+def get_rate_limits():
+    """Get queue depth, wait times and throttling counts per upstream provider"""
+    return rate_limit_stats()
+
 @router.get("/historical")
-def get_historical_data(
+async def get_historical_data(
+    request: Request,
     days: int = Query(30, ge=1, le=365),
     symbol: str = Query("FINSAGE", description="Stock or crypto symbol"),
     asset_type: str = Query("stock", description="Asset type: stock or crypto")
 ):
     """Get historical market data for charts"""
     try:
-        data_points = MarketService.get_historical_data(symbol, days, asset_type)
+        data_points = await _until_disconnected(request, AsyncMarketService.get_historical_data(symbol, days, asset_type))
         
         if data_points:
             data = [point.dict() for point in data_points]
@@ -72,7 +102,7 @@ def get_historical_data(
         print(f"Error fetching historical data: {e}")
     
     # Fallback to simulated data
-    data = generate_market_data(days)
+    data = generate_market_data(days, symbol)
     return {
         "symbol": symbol.upper(),
         "data": data,
@@ -85,51 +115,60 @@ def get_historical_data(
     }
 
 @router.get("/realtime")
-def get_realtime_data(
+async def get_realtime_data(
+    request: Request,
     symbol: str = Query("FINSAGE", description="Stock or crypto symbol"),
-    asset_type: str = Query("stock", description="Asset type: stock or crypto")
+    asset_type: str = Query("stock", description="Asset type: stock or crypto"),
+    symbols: Optional[str] = Query(None, description="Comma-separated symbols to fetch in one batch")
 ):
     """Get real-time market data"""
+    if symbols:
+        symbol_list = [s.strip() for s in symbols.split(",") if s.strip()]
+        batch = await _until_disconnected(request, AsyncMarketService.get_realtime_data_batch(symbol_list, asset_type))
+        return {"data": [quote.dict() for quote in batch.values()]} if batch else None
+    
     try:
-        realtime_data = MarketService.get_realtime_data(symbol, asset_type)
+        realtime_data = await _until_disconnected(request, AsyncMarketService.get_realtime_data(symbol, asset_type))
         if realtime_data:
             return realtime_data.dict()
     except Exception as e:
         print(f"Error fetching real-time data: {e}")
     
-    # Fallback to simulated data
-    base_price = 100 + random.uniform(-10, 10)
+    # Fallback to the simulated market
+    price, open_price = market_simulator.price(symbol), market_simulator.open_price(symbol)
     return {
         "timestamp": datetime.now().isoformat(),
-        "price": round(base_price, 2),
-        "change": round(random.uniform(-1, 1), 2),
-        "changePercent": round(random.uniform(-1, 1), 2),
+        "price": round(price, 2),
+        "change": round(price - open_price, 2),
+        "changePercent": round((price / open_price - 1) * 100, 2),
         "volume": random.randint(500000, 2000000),
         "symbol": symbol.upper()
     }
 
 @router.get("/quote/{symbol}")
-def get_stock_quote(symbol: str, asset_type: str = Query("stock", description="Asset type: stock or crypto")):
+async def get_stock_quote(request: Request, symbol: str, asset_type: str = Query("stock", description="Asset type: stock or crypto")):
     """Get current quote for a symbol"""
     if asset_type == "crypto":
-        quote = MarketService.get_crypto_quote(symbol)
+        quote = await _until_disconnected(request, AsyncMarketService.get_crypto_quote(symbol))
         if quote:
             return quote.dict()
     else:
-        quote = MarketService.get_stock_quote(symbol)
+        quote = await _until_disconnected(request, AsyncMarketService.get_stock_quote(symbol))
         if quote:
             return quote.dict()
     
     return {"error": "Quote not available"}
 
 @router.get("/portfolio")
-def get_portfolio_data():
+async def get_portfolio_data(request: Request):
     """Get portfolio performance data (backward compatibility - returns sample data)"""
     portfolio_data = []
     symbols = ["AAPL", "GOOGL", "MSFT", "TSLA", "AMZN"]
+    batch = await _until_disconnected(request, AsyncMarketService.get_batch_quotes(stock_symbols=symbols))
+    quotes = batch["stock"] if batch else {}
     
     for symbol in symbols:
-        quote = MarketService.get_stock_quote(symbol)
+        quote = quotes.get(symbol)
         if quote:
             shares = random.randint(10, 100)
             portfolio_data.append({
@@ -141,14 +180,14 @@ def get_portfolio_data():
                 "value": round(quote.price * shares, 2)
             })
         else:
-            # Fallback
-            base = random.uniform(50, 200)
+            # Fallback to the simulated market
+            base, open_price = market_simulator.price(symbol), market_simulator.open_price(symbol)
             shares = random.randint(10, 100)
             portfolio_data.append({
                 "symbol": symbol,
                 "price": round(base, 2),
-                "change": round(random.uniform(-5, 5), 2),
-                "changePercent": round(random.uniform(-3, 3), 2),
+                "change": round(base - open_price, 2),
+                "changePercent": round((base / open_price - 1) * 100, 2),
                 "shares": shares,
                 "value": round(base * shares, 2)
             })
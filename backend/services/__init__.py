@@ -2,7 +2,8 @@
 Services module
 """
 from .market_service import MarketService
+from .async_market_service import AsyncMarketService
 from .portfolio_service import PortfolioService
 from .user_service import UserService
 
-__all__ = ["MarketService", "PortfolioService", "UserService"]
+__all__ = ["MarketService", "AsyncMarketService", "PortfolioService", "UserService"]
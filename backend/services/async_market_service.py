@@ -0,0 +1,158 @@
+"""
+Async market data service layer
+
+Event-loop counterpart of MarketService for the async routes: provider calls
+go through the async adapters, batches fan out with asyncio.gather, and every
+request has a deadline after which missing symbols fall back to simulated
+data instead of holding the request open.
+"""
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from app.services.bar_store import bar_store
+from config import settings
+from models.market_model import CryptoQuote, MarketDataPoint, RealtimeDataResponse, StockQuote
+from services.market_service import COMPACT_BARS, MarketService
+from utils.async_api_utils import (
+    async_get_alpha_vantage_data,
+    async_get_coingecko_prices,
+    async_get_crypto_price_alphavantage,
+    async_get_yahoo_finance_quote
+)
+
+
+class AsyncMarketService:
+    """Non-blocking service for fetching and processing market data"""
+
+    @staticmethod
+    async def get_stock_quote(symbol: str) -> Optional[StockQuote]:
+        """Get real-time stock quote"""
+        data = await async_get_yahoo_finance_quote(symbol)
+        if data:
+            return StockQuote(**data)
+        return MarketService._stock_quote_from_alpha_vantage(
+            symbol, await async_get_alpha_vantage_data("GLOBAL_QUOTE", symbol))
+
+    @staticmethod
+    async def get_crypto_quote(symbol: str) -> Optional[CryptoQuote]:
+        """Get real-time crypto quote"""
+        data = (await async_get_coingecko_prices([symbol])).get(symbol.upper())
+        if data:
+            return CryptoQuote(**data)
+        return MarketService._crypto_quote_from_alpha_vantage(
+            symbol, await async_get_crypto_price_alphavantage(symbol))
+
+    @staticmethod
+    async def get_batch_quotes(stock_symbols: List[str] = None, crypto_symbols: List[str] = None,
+                               deadline: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get quotes for many symbols concurrently within a deadline
+
+        Same providers and fallbacks as MarketService.get_batch_quotes.
+        Whatever is still outstanding when the deadline passes is cancelled
+        and left out of the result.
+
+        Args:
+            stock_symbols: Stock symbols
+            crypto_symbols: Crypto symbols
+            deadline: Seconds to wait in total (defaults to QUOTE_DEADLINE_SECONDS)
+
+        Returns:
+            {"stock": {SYMBOL: StockQuote}, "crypto": {SYMBOL: CryptoQuote}}
+        """
+        stock_symbols = list(dict.fromkeys(s.upper() for s in stock_symbols or []))
+        crypto_symbols = list(dict.fromkeys(s.upper() for s in crypto_symbols or []))
+        loop = asyncio.get_running_loop()
+        expires = loop.time() + (deadline or settings.QUOTE_DEADLINE_SECONDS)
+        quotes = {"stock": {}, "crypto": {}}
+
+        # One task per stock so a slow symbol only costs itself, plus one CoinGecko batch
+        requests = [async_get_yahoo_finance_quote(symbol) for symbol in stock_symbols]
+        if crypto_symbols:
+            requests.append(async_get_coingecko_prices(crypto_symbols))
+        results = await AsyncMarketService._gather_until(expires, requests)
+        for symbol, data in zip(stock_symbols, results):
+            if data:
+                quotes["stock"][symbol] = StockQuote(**data)
+        if crypto_symbols:
+            for symbol, data in (results[-1] or {}).items():
+                quotes["crypto"][symbol] = CryptoQuote(**data)
+
+        # Alpha Vantage fallbacks for whatever the free providers missed
+        missing_stocks = [s for s in stock_symbols if s not in quotes["stock"]]
+        missing_cryptos = [s for s in crypto_symbols if s not in quotes["crypto"]]
+        if (missing_stocks or missing_cryptos) and loop.time() < expires:
+            fallbacks = await AsyncMarketService._gather_until(
+                expires,
+                [async_get_alpha_vantage_data("GLOBAL_QUOTE", s) for s in missing_stocks] +
+                [async_get_crypto_price_alphavantage(s) for s in missing_cryptos]
+            )
+            for symbol, data in zip(missing_stocks, fallbacks):
+                quote = MarketService._stock_quote_from_alpha_vantage(symbol, data)
+                if quote:
+                    quotes["stock"][symbol] = quote
+            for symbol, data in zip(missing_cryptos, fallbacks[len(missing_stocks):]):
+                quote = MarketService._crypto_quote_from_alpha_vantage(symbol, data)
+                if quote:
+                    quotes["crypto"][symbol] = quote
+
+        return quotes
+
+    @staticmethod
+    async def _gather_until(expires: float, coroutines: list) -> list:
+        """Run coroutines concurrently; results are None for ones unfinished at ``expires``"""
+        tasks = [asyncio.ensure_future(c) if c is not None else None for c in coroutines]
+        pending = [task for task in tasks if task is not None]
+        if pending:
+            timeout = max(0.0, expires - asyncio.get_running_loop().time())
+            _, late = await asyncio.wait(pending, timeout=timeout)
+            for task in late:
+                task.cancel()
+        return [task.result() if task is not None and task.done() and not task.cancelled() else None
+                for task in tasks]
+
+    @staticmethod
+    async def get_realtime_data(symbol: str, asset_type: str = "stock") -> Optional[RealtimeDataResponse]:
+        """Get real-time market data"""
+        return (await AsyncMarketService.get_realtime_data_batch([symbol], asset_type))[symbol.upper()]
+
+    @staticmethod
+    async def get_realtime_data_batch(symbols: List[str], asset_type: str = "stock",
+                                      deadline: Optional[float] = None) -> Dict[str, RealtimeDataResponse]:
+        """Get real-time market data for many symbols with one concurrent batch"""
+        symbols = [symbol.upper() for symbol in symbols]
+        if asset_type == "crypto":
+            quotes = (await AsyncMarketService.get_batch_quotes(crypto_symbols=symbols, deadline=deadline))["crypto"]
+        else:
+            quotes = (await AsyncMarketService.get_batch_quotes(stock_symbols=symbols, deadline=deadline))["stock"]
+        return MarketService._realtime_responses(symbols, quotes, asset_type)
+
+    @staticmethod
+    async def get_historical_data(symbol: str, days: int = 30, asset_type: str = "stock",
+                                  deadline: Optional[float] = None) -> List[MarketDataPoint]:
+        """Get historical market data, downloading missing bars within the deadline"""
+        data_points = []
+
+        if asset_type == "stock":
+            bars = bar_store.tail(symbol, days)
+            if MarketService._needs_refresh(symbol, bars, days):
+                full = days > COMPACT_BARS or len(bars["date"]) == 0
+                try:
+                    api_data = await asyncio.wait_for(
+                        async_get_alpha_vantage_data("TIME_SERIES_DAILY", symbol, outputsize="full" if full else "compact"),
+                        deadline or settings.HISTORY_DEADLINE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    api_data = None
+                fetched = MarketService._bars_from_daily_series(api_data)
+                if fetched:
+                    MarketService._record_fetch(symbol, fetched, full)
+                    await asyncio.to_thread(bar_store.append, symbol, fetched)
+                    bars = bar_store.tail(symbol, days)
+
+            data_points = MarketService._data_points_from_bars(bars)
+
+        if not data_points:
+            data_points = MarketService._generate_simulated_data(days, symbol)
+
+        return sorted(data_points, key=lambda x: x.date)
@@ -1,20 +1,35 @@
 """
 Market data service layer
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import random
+import time
+import numpy as np
+from app.services.bar_store import bar_store, bars_from_alpha_vantage
+from app.services.market_simulator import market_simulator
 from utils.api_utils import (
     get_alpha_vantage_data,
     get_crypto_price_alphavantage,
     get_coingecko_price,
-    get_yahoo_finance_quote
+    get_coingecko_prices,
+    get_yahoo_finance_quote,
+    get_yahoo_finance_quotes,
+    submit_quote_request
 )
+from config import settings
 from models.market_model import MarketDataPoint, RealtimeDataResponse, StockQuote, CryptoQuote
 
+# Sessions in a "compact" Alpha Vantage daily series; fewer means that is the whole history
+COMPACT_BARS = 100
+
 class MarketService:
     """Service for fetching and processing market data"""
     
+    # Per symbol: when its daily bars were last downloaded, the last session returned,
+    # and whether that download held the symbol's whole history
+    _history_checks: Dict[str, Tuple[float, np.datetime64, bool]] = {}
+    
     @staticmethod
     def get_stock_quote(symbol: str) -> Optional[StockQuote]:
         """Get real-time stock quote"""
@@ -24,22 +39,28 @@ class MarketService:
             return StockQuote(**data)
         
         # Fallback to Alpha Vantage if available
-        if get_alpha_vantage_data:
-            data = get_alpha_vantage_data("GLOBAL_QUOTE", symbol)
-            if data and "Global Quote" in data:
-                quote = data["Global Quote"]
-                return StockQuote(
-                    symbol=symbol.upper(),
-                    price=float(quote.get("05. price", 0)),
-                    change=float(quote.get("09. change", 0)),
-                    changePercent=float(quote.get("10. change percent", "0%").rstrip("%")),
-                    volume=int(quote.get("06. volume", 0)),
-                    high=float(quote.get("03. high", 0)),
-                    low=float(quote.get("04. low", 0)),
-                    open=float(quote.get("02. open", 0)),
-                    previousClose=float(quote.get("08. previous close", 0))
-                )
-        
+        return MarketService._alpha_vantage_stock_quote(symbol)
+    
+    @staticmethod
+    def _alpha_vantage_stock_quote(symbol: str) -> Optional[StockQuote]:
+        """Stock quote from Alpha Vantage GLOBAL_QUOTE"""
+        return MarketService._stock_quote_from_alpha_vantage(symbol, get_alpha_vantage_data("GLOBAL_QUOTE", symbol))
+    
+    @staticmethod
+    def _stock_quote_from_alpha_vantage(symbol: str, data: Optional[Dict[str, Any]]) -> Optional[StockQuote]:
+        if data and "Global Quote" in data:
+            quote = data["Global Quote"]
+            return StockQuote(
+                symbol=symbol.upper(),
+                price=float(quote.get("05. price", 0)),
+                change=float(quote.get("09. change", 0)),
+                changePercent=float(quote.get("10. change percent", "0%").rstrip("%")),
+                volume=int(quote.get("06. volume", 0)),
+                high=float(quote.get("03. high", 0)),
+                low=float(quote.get("04. low", 0)),
+                open=float(quote.get("02. open", 0)),
+                previousClose=float(quote.get("08. previous close", 0))
+            )
         return None
     
     @staticmethod
@@ -51,7 +72,15 @@ class MarketService:
             return CryptoQuote(**data)
         
         # Fallback to Alpha Vantage if available
-        data = get_crypto_price_alphavantage(symbol)
+        return MarketService._alpha_vantage_crypto_quote(symbol)
+    
+    @staticmethod
+    def _alpha_vantage_crypto_quote(symbol: str) -> Optional[CryptoQuote]:
+        """Crypto quote from Alpha Vantage CURRENCY_EXCHANGE_RATE"""
+        return MarketService._crypto_quote_from_alpha_vantage(symbol, get_crypto_price_alphavantage(symbol))
+    
+    @staticmethod
+    def _crypto_quote_from_alpha_vantage(symbol: str, data: Optional[Dict[str, Any]]) -> Optional[CryptoQuote]:
         if data:
             return CryptoQuote(
                 symbol=symbol.upper(),
@@ -59,51 +88,136 @@ class MarketService:
                 change_24h=None,
                 change_percent_24h=None
             )
-        
         return None
     
+    @staticmethod
+    def get_batch_quotes(stock_symbols: List[str] = None, crypto_symbols: List[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get quotes for many symbols in one round of parallel I/O
+        
+        Cryptos are fetched with a single CoinGecko request while every stock
+        is requested from Yahoo Finance concurrently. Symbols the primary
+        provider misses fall back to Alpha Vantage, also in parallel.
+        
+        Returns:
+            {"stock": {SYMBOL: StockQuote}, "crypto": {SYMBOL: CryptoQuote}};
+            symbols no provider could quote are omitted
+        """
+        stock_symbols = list(dict.fromkeys(s.upper() for s in stock_symbols or []))
+        crypto_symbols = list(dict.fromkeys(s.upper() for s in crypto_symbols or []))
+        
+        # The CoinGecko batch runs alongside the Yahoo requests
+        crypto_future = submit_quote_request(get_coingecko_prices, crypto_symbols) if crypto_symbols else None
+        stock_data = get_yahoo_finance_quotes(stock_symbols) if stock_symbols else {}
+        crypto_data = crypto_future.result() if crypto_future else {}
+        
+        quotes = {
+            "stock": {symbol: StockQuote(**data) for symbol, data in stock_data.items()},
+            "crypto": {symbol: CryptoQuote(**data) for symbol, data in crypto_data.items()}
+        }
+        
+        fallbacks = [("stock", symbol, MarketService._alpha_vantage_stock_quote)
+                     for symbol in stock_symbols if symbol not in quotes["stock"]]
+        fallbacks += [("crypto", symbol, MarketService._alpha_vantage_crypto_quote)
+                      for symbol in crypto_symbols if symbol not in quotes["crypto"]]
+        futures = [(asset_type, symbol, submit_quote_request(fetch, symbol)) for asset_type, symbol, fetch in fallbacks]
+        for asset_type, symbol, future in futures:
+            quote = future.result()
+            if quote:
+                quotes[asset_type][symbol] = quote
+        
+        return quotes
+    
     @staticmethod
     def get_historical_data(symbol: str, days: int = 30, asset_type: str = "stock") -> List[MarketDataPoint]:
         """Get historical market data"""
         data_points = []
         
         if asset_type == "stock":
-            # Try Alpha Vantage
-            api_data = get_alpha_vantage_data("TIME_SERIES_DAILY", symbol, outputsize="full" if days > 100 else "compact")
-            if api_data and "Time Series (Daily)" in api_data:
-                time_series = api_data["Time Series (Daily)"]
-                sorted_dates = sorted(time_series.keys(), reverse=True)[:days]
-                
-                for date_str in sorted_dates:
-                    day_data = time_series[date_str]
-                    data_points.append(MarketDataPoint(
-                        date=date_str,
-                        price=float(day_data.get("4. close", 0)),
-                        volume=int(day_data.get("5. volume", 0)),
-                        high=float(day_data.get("2. high", 0)),
-                        low=float(day_data.get("3. low", 0)),
-                        open=float(day_data.get("1. open", 0)),
-                        close=float(day_data.get("4. close", 0))
-                    ))
+            # Serve from the local bar store; only download when it is missing bars
+            bars = bar_store.tail(symbol, days)
+            if MarketService._needs_refresh(symbol, bars, days):
+                full = days > COMPACT_BARS or len(bars["date"]) == 0
+                fetched = MarketService.fetch_daily_bars(symbol, full=full)
+                if fetched:
+                    MarketService._record_fetch(symbol, fetched, full)
+                    bar_store.append(symbol, fetched)
+                    bars = bar_store.tail(symbol, days)
+            
+            data_points = MarketService._data_points_from_bars(bars)
         
         # If no API data, generate simulated data (fallback)
         if not data_points:
-            data_points = MarketService._generate_simulated_data(days)
+            data_points = MarketService._generate_simulated_data(days, symbol)
         
         return sorted(data_points, key=lambda x: x.date)
     
     @staticmethod
-    def _generate_simulated_data(days: int) -> List[MarketDataPoint]:
-        """Generate simulated market data as fallback"""
-        base_price = 100
-        current_price = base_price
+    def _data_points_from_bars(bars: Dict[str, np.ndarray]) -> List[MarketDataPoint]:
+        dates = np.datetime_as_string(bars["date"], unit="D")
+        return [
+            MarketDataPoint(
+                date=str(dates[i]),
+                price=float(bars["close"][i]),
+                volume=int(bars["volume"][i]),
+                high=float(bars["high"][i]),
+                low=float(bars["low"][i]),
+                open=float(bars["open"][i]),
+                close=float(bars["close"][i])
+            )
+            for i in range(len(dates))
+        ]
+    
+    @staticmethod
+    def _needs_refresh(symbol: str, bars: Dict[str, np.ndarray], days: int) -> bool:
+        """
+        Whether a symbol's stored bars should be topped up from the provider
+        
+        Once downloaded, a symbol is not fetched again for HISTORY_RECHECK_SECONDS
+        unless the store is behind the last session the provider returned, or
+        more history is wanted than the download could hold; a listing shorter
+        than ``days`` stays short. Before any download (e.g. after a restart),
+        stored bars are stale if they are short or end before the last business day.
+        """
+        stored = bars["date"]
+        check = MarketService._history_checks.get(symbol.upper())
+        if check is None:
+            if len(stored) < days:
+                return True
+            last_business_day = np.busday_offset(np.datetime64("today", "D"), -1, roll="forward")
+            return stored[-1] < last_business_day
+        
+        checked_at, last_session, complete = check
+        if time.monotonic() - checked_at >= settings.HISTORY_RECHECK_SECONDS:
+            return True
+        if not len(stored) or stored[-1] < last_session:
+            return True
+        return len(stored) < days and not complete
+    
+    @staticmethod
+    def _record_fetch(symbol: str, fetched: Dict[str, np.ndarray], full: bool):
+        """Remember a download of a symbol's daily bars for _needs_refresh"""
+        complete = full or len(fetched["date"]) < COMPACT_BARS
+        MarketService._history_checks[symbol.upper()] = (time.monotonic(), fetched["date"][-1], complete)
+    
+    @staticmethod
+    def fetch_daily_bars(symbol: str, full: bool = False) -> Optional[Dict[str, np.ndarray]]:
+        """Download daily bars from Alpha Vantage as bar store columns"""
+        api_data = get_alpha_vantage_data("TIME_SERIES_DAILY", symbol, outputsize="full" if full else "compact")
+        return MarketService._bars_from_daily_series(api_data)
+    
+    @staticmethod
+    def _bars_from_daily_series(api_data: Optional[Dict[str, Any]]) -> Optional[Dict[str, np.ndarray]]:
+        if not api_data or "Time Series (Daily)" not in api_data:
+            return None
+        return bars_from_alpha_vantage(api_data["Time Series (Daily)"])
+    
+    @staticmethod
+    def _generate_simulated_data(days: int, symbol: str = "FINSAGE") -> List[MarketDataPoint]:
+        """Generate simulated market data as fallback, ending at the simulated market's current price"""
         data = []
         
-        for i in range(days):
-            change = random.uniform(-2, 2)
-            current_price += change
-            current_price = max(50, min(200, current_price))
-            
+        for i, current_price in enumerate(market_simulator.history(symbol, days).tolist()):
             date = (datetime.now() - timedelta(days=days-i-1)).strftime("%Y-%m-%d")
             data.append(MarketDataPoint(
                 date=date,
@@ -120,36 +234,52 @@ class MarketService:
     @staticmethod
     def get_realtime_data(symbol: str, asset_type: str = "stock") -> Optional[RealtimeDataResponse]:
         """Get real-time market data"""
+        return MarketService.get_realtime_data_batch([symbol], asset_type)[symbol.upper()]
+    
+    @staticmethod
+    def get_realtime_data_batch(symbols: List[str], asset_type: str = "stock") -> Dict[str, RealtimeDataResponse]:
+        """Get real-time market data for many symbols with one batch quote request"""
+        symbols = [symbol.upper() for symbol in symbols]
         if asset_type == "crypto":
-            quote = MarketService.get_crypto_quote(symbol)
-            if quote:
-                return RealtimeDataResponse(
+            quotes = MarketService.get_batch_quotes(crypto_symbols=symbols)["crypto"]
+        else:
+            quotes = MarketService.get_batch_quotes(stock_symbols=symbols)["stock"]
+        return MarketService._realtime_responses(symbols, quotes, asset_type)
+    
+    @staticmethod
+    def _realtime_responses(symbols: List[str], quotes: Dict[str, Any], asset_type: str) -> Dict[str, RealtimeDataResponse]:
+        """Realtime responses for ``symbols``, simulating any the quotes don't cover"""
+        results = {}
+        for symbol in symbols:
+            quote = quotes.get(symbol)
+            if quote and asset_type == "crypto":
+                results[symbol] = RealtimeDataResponse(
                     timestamp=datetime.now().isoformat(),
                     price=quote.usd_price,
                     change=quote.change_24h or 0,
                     changePercent=quote.change_percent_24h or 0,
                     volume=int(quote.volume_24h or 0),
-                    symbol=symbol.upper()
+                    symbol=symbol
                 )
-        else:
-            quote = MarketService.get_stock_quote(symbol)
-            if quote:
-                return RealtimeDataResponse(
+            elif quote:
+                results[symbol] = RealtimeDataResponse(
                     timestamp=datetime.now().isoformat(),
                     price=quote.price,
                     change=quote.change,
                     changePercent=quote.changePercent,
                     volume=quote.volume,
-                    symbol=symbol.upper()
+                    symbol=symbol
+                )
+            else:
+                # Fallback to the simulated market
+                price, open_price = market_simulator.price(symbol), market_simulator.open_price(symbol)
+                results[symbol] = RealtimeDataResponse(
+                    timestamp=datetime.now().isoformat(),
+                    price=round(price, 2),
+                    change=round(price - open_price, 2),
+                    changePercent=round((price / open_price - 1) * 100, 2),
+                    volume=random.randint(500000, 2000000),
+                    symbol=symbol
                 )
         
-        # Fallback to simulated data
-        base_price = 100 + random.uniform(-10, 10)
-        return RealtimeDataResponse(
-            timestamp=datetime.now().isoformat(),
-            price=round(base_price, 2),
-            change=round(random.uniform(-1, 1), 2),
-            changePercent=round(random.uniform(-1, 1), 2),
-            volume=random.randint(500000, 2000000),
-            symbol=symbol.upper()
-        )
+        return results
@@ -117,6 +117,12 @@ class PortfolioService:
             PortfolioHolding.portfolio_id == portfolio_id
         ).all()
         
+        # Quote every holding in one batch instead of one blocking request each
+        quotes = MarketService.get_batch_quotes(
+            stock_symbols=[h.symbol for h in holdings if h.asset_type != "crypto"],
+            crypto_symbols=[h.symbol for h in holdings if h.asset_type == "crypto"]
+        )
+        
         portfolio_data = []
         total_value = 0
         total_cost = 0
@@ -124,10 +130,10 @@ class PortfolioService:
         for holding in holdings:
             # Get current price
             if holding.asset_type == "crypto":
-                quote = MarketService.get_crypto_quote(holding.symbol)
+                quote = quotes["crypto"].get(holding.symbol.upper())
                 current_price = quote.usd_price if quote else holding.current_price or holding.average_price
             else:
-                quote = MarketService.get_stock_quote(holding.symbol)
+                quote = quotes["stock"].get(holding.symbol.upper())
                 current_price = quote.price if quote else holding.current_price or holding.average_price
             
             # Update holding price
@@ -8,6 +8,7 @@ import sys
 import os
 import asyncio
 import json
+from datetime import datetime, timedelta
 from pathlib import Path
 
 # Add the backend directory to Python path
@@ -41,12 +42,204 @@ async def test_ai_service():
         print(f"   ✅ Prediction generated: {prediction.recommendation_score}%")
         print(f"   ✅ Asset allocations: {len(prediction.asset_allocations)}")
         
+        # Test batch prediction matches single predictions
+        requests = [
+            PredictionRequest(age=age, annual_income=income, risk_tolerance=risk, investment_horizon_years=horizon)
+            for age, income, risk, horizon in [
+                (25, 40000, RiskTolerance.HIGH, 30), (45, 120000, RiskTolerance.MEDIUM, 15),
+                (70, 30000, RiskTolerance.LOW, 2), (30, 75000, RiskTolerance.MEDIUM, 10)
+            ]
+        ]
+        batch = ai_service.predict_batch(requests)
+        for single, batched in zip([ai_service.predict_investment_recommendation(r) for r in requests], batch):
+            assert single.model_dump(exclude={"created_at"}) == batched.model_dump(exclude={"created_at"})
+        print(f"   ✅ Batch prediction generated: {len(batch)} profiles")
+        
+        # Test repeated profiles are served from the prediction cache until the model changes
+        hits = ai_service.prediction_cache.hits
+        batch[0].created_at = datetime.utcnow() - timedelta(hours=1)
+        cached = ai_service.predict_batch(requests + requests[:1])
+        assert ai_service.prediction_cache.hits == hits + len(requests) + 1
+        assert cached[0] is not batch[0] and cached[0] is not cached[-1]
+        assert cached[0].created_at > batch[0].created_at
+        assert cached[0].model_dump(exclude={"created_at"}) == batch[0].model_dump(exclude={"created_at"})
+        ai_service._load_model()
+        ai_service.predict_batch(requests)
+        assert ai_service.prediction_cache.hits == hits + len(requests) + 1
+        print("   ✅ Prediction cache working")
+        
         return True
     except Exception as e:
         print(f"   ❌ AI Service test failed: {str(e)}")
         return False
 
 
+async def test_inference_scheduler():
+    """Test that concurrent predictions are micro-batched."""
+    print("🧺 Testing Inference Scheduler...")
+    
+    try:
+        from app.services.inference_scheduler import InferenceScheduler
+        
+        batch_sizes = []
+        
+        def predict_batch(requests):
+            batch_sizes.append(len(requests))
+            return ai_service.predict_batch(requests)
+        
+        scheduler = InferenceScheduler(predict_batch, max_batch_size=16, window_ms=20)
+        requests = [
+            PredictionRequest(age=20 + i, annual_income=40000 + 1000 * i,
+                              risk_tolerance=list(RiskTolerance)[i % 3], investment_horizon_years=1 + i % 30)
+            for i in range(40)
+        ]
+        responses = await asyncio.gather(*[scheduler.predict(r) for r in requests])
+        for request, response in zip(requests, responses):
+            expected = ai_service.predict_investment_recommendation(request)
+            assert response.recommendation_score == expected.recommendation_score
+        assert sum(batch_sizes) == 40 and max(batch_sizes) == 16 and len(batch_sizes) < 40
+        print(f"   ✅ 40 concurrent requests scored in {len(batch_sizes)} batches")
+        
+        stats = scheduler.stats()
+        assert stats["requests"] == 40 and stats["largest_batch"] == 16
+        assert stats["latency_ms"]["p99"] is not None
+        print(f"   ✅ Scheduler metrics working (p99 {stats['latency_ms']['p99']} ms)")
+        
+        await scheduler.close()
+        return True
+    except Exception as e:
+        print(f"   ❌ Inference scheduler test failed: {str(e)}")
+        return False
+
+
+def test_tree_scorer():
+    """Test the flattened tree scorer matches scikit-learn exactly."""
+    print("🌲 Testing Tree Scorer...")
+    
+    try:
+        import numpy as np
+        from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
+        from sklearn.linear_model import LinearRegression
+        from app.services.ai_service import AIService
+        from app.services.tree_scorer import FlatTreeEnsemble
+        
+        rng = np.random.default_rng(5)
+        X = np.round(rng.uniform(0, 1, (2000, 4)) * [80, 200000, 2, 30], 2)
+        y = 20 + X[:, 0] / 2 + X[:, 1] / 5000 + rng.normal(0, 3, len(X))
+        rows = np.round(rng.uniform(0, 1, (500, 4)) * [80, 200000, 2, 30], 2)
+        for model in [RandomForestRegressor(n_estimators=12, random_state=0), ExtraTreesRegressor(n_estimators=5)]:
+            model.fit(X, y)
+            tree = model.estimators_[0].tree_
+            rows[:20, tree.feature[0]] = tree.threshold[0]  # rows exactly on a split
+            scorer = FlatTreeEnsemble.from_model(model)
+            assert np.array_equal(scorer.predict(rows), model.predict(rows))
+            assert np.array_equal(scorer.predict(rows[:1]), model.predict(rows[:1]))
+        assert FlatTreeEnsemble.from_model(LinearRegression().fit(X, y)) is None
+        print("   ✅ Flattened scores identical to model.predict")
+        
+        service = AIService()
+        service._create_mock_model()
+        assert service.get_model_info()["fast_scorer"]
+        request = PredictionRequest(age=52, annual_income=88000.5, risk_tolerance=RiskTolerance.HIGH,
+                                    investment_horizon_years=12)
+        fast = service.predict_investment_recommendation(request)
+        service._fast_scorer = None
+        service.prediction_cache.invalidate()
+        slow = service.predict_investment_recommendation(request)
+        assert fast.model_dump(exclude={"created_at"}) == slow.model_dump(exclude={"created_at"})
+        print("   ✅ AIService serving through the fast scorer")
+        
+        return True
+    except Exception as e:
+        print(f"   ❌ Tree scorer test failed: {str(e)}")
+        return False
+
+
+def test_model_training():
+    """Test the offline training pipeline end to end on simulated history."""
+    print("🧠 Testing Model Training...")
+    
+    original_path = None
+    try:
+        import tempfile
+        from app.core.config import settings
+        from app.services import model_training
+        from app.services.ai_service import AIService
+        
+        workdir = Path(tempfile.mkdtemp())
+        model_training.write_simulated_history(str(workdir / "data"), 20000, files=2)
+        chunks = list(model_training.iter_training_chunks(str(workdir / "data"), 4000))
+        assert len(chunks) == 6 and chunks[0][0].shape == (4000, 4)
+        print("   ✅ Chunked history streaming working")
+        
+        model_path = str(workdir / "serving" / "fin_predictor.pkl")
+        result = model_training.run_pipeline(str(workdir / "data"), str(workdir / "models"), chunk_rows=4000,
+                                             trees_per_chunk=2, model_path=model_path, max_p99_ms=1000)
+        assert result["n_estimators"] == 12 and result["validation"]["r2"] > 0.5
+        assert result["promoted"] and not result["gate_failures"]
+        assert model_training.promotion_failures(result, max_p99_ms=0)
+        print(f"   ✅ Model trained (validation R² {result['validation']['r2']}) and promoted")
+        
+        original_path, settings.ml_model_path = settings.ml_model_path, model_path
+        info = AIService().get_model_info()
+        assert info["model_type"] == "RandomForestRegressor" and info["model_version"] == result["version"]
+        print("   ✅ Promoted artifact served with its metadata")
+        
+        return True
+    except Exception as e:
+        print(f"   ❌ Model training test failed: {str(e)}")
+        return False
+    finally:
+        if original_path is not None:
+            settings.ml_model_path = original_path
+
+
+def test_model_hot_swap():
+    """Test lazy, memory-mapped model loading and hot swap on file change."""
+    print("🔁 Testing Model Hot Swap...")
+    
+    original_path = None
+    try:
+        import tempfile
+        import time
+        import joblib
+        import numpy as np
+        from sklearn.linear_model import LinearRegression
+        from sklearn.tree import DecisionTreeRegressor
+        from app.core.config import settings
+        from app.services.ai_service import AIService
+        
+        X = np.random.default_rng(3).uniform(0, 1, (200, 4)) * [80, 200000, 2, 30]
+        y = 20 + X[:, 0] / 2
+        model_path = Path(tempfile.mkdtemp()) / "fin_predictor.pkl"
+        joblib.dump(LinearRegression().fit(X, y), model_path)
+        original_path, settings.ml_model_path = settings.ml_model_path, str(model_path)
+        
+        service = AIService()
+        assert service._model is None  # nothing loaded until first use
+        assert service.model_loaded and isinstance(service.model.coef_, np.memmap)
+        print("   ✅ Lazy memory-mapped load working")
+        
+        service.start_model_watcher(interval=0.05)
+        staging = model_path.with_suffix(".tmp")
+        joblib.dump(DecisionTreeRegressor(max_depth=3).fit(X, y), staging)
+        staging.replace(model_path)
+        deadline = time.time() + 5
+        while type(service.model).__name__ != "DecisionTreeRegressor" and time.time() < deadline:
+            time.sleep(0.05)
+        service.stop_model_watcher()
+        assert type(service.model).__name__ == "DecisionTreeRegressor"
+        print("   ✅ Model hot swap working")
+        
+        return True
+    except Exception as e:
+        print(f"   ❌ Model hot swap test failed: {str(e)}")
+        return False
+    finally:
+        if original_path is not None:
+            settings.ml_model_path = original_path
+
+
 async def test_blockchain_service():
     """Test blockchain service functionality."""
     print("⛓️  Testing Blockchain Service...")
@@ -132,6 +325,446 @@ def test_utilities():
         return False
 
 
+def test_order_book():
+    """Test order book price-time priority and stop triggers."""
+    print("📒 Testing Order Book...")
+    
+    try:
+        from app.services.order_book import OrderBook
+        
+        book = OrderBook("TEST")
+        book.add_order("b1", "buy", "limit", 10, limit_price=99.0)
+        book.add_order("b2", "buy", "limit", 10, limit_price=100.0)
+        book.add_order("b3", "buy", "limit", 10, limit_price=100.0)
+        book.add_order("s1", "sell", "stop", 5, stop_price=98.5)
+        assert book.best_bid() == 100.0
+        assert book.best_ask() is None
+        print("   ✅ Best bid tracking working")
+        
+        # Only 15 shares trade: best price first, then oldest order at that price
+        fills = book.on_price(100.0, volume=15)
+        assert [(f["order_id"], f["quantity"]) for f in fills] == [("b2", 10), ("b3", 5)]
+        assert fills[1]["done"] is False
+        print("   ✅ Price-time priority working")
+        
+        assert book.cancel_order("b3")
+        fills = book.on_price(98.0)
+        assert [f["order_id"] for f in fills] == ["s1", "b1"]
+        assert len(book) == 0
+        print("   ✅ Stop triggers and cancellation working")
+        
+        return True
+    except Exception as e:
+        print(f"   ❌ Order book test failed: {str(e)}")
+        return False
+
+
+def test_indicators():
+    """Test the vectorized indicator engine against per-symbol results."""
+    print("📈 Testing Indicator Engine...")
+    
+    try:
+        import numpy as np
+        from app.services import indicators
+        
+        close = 100 + np.cumsum(np.random.default_rng(1).normal(0, 1, (3, 120)), axis=1)
+        window = close[0, -20:]
+        assert np.isclose(indicators.sma(close, 20)[0, -1], window.mean())
+        assert np.isclose(indicators.rolling_std(close, 20)[0, -1], window.std())
+        print("   ✅ Rolling statistics working")
+        
+        # A batch of symbols must match computing each symbol on its own
+        batch = indicators.compute_all(close)
+        single = indicators.compute_all(close[2])
+        for name, series in single.items():
+            assert np.allclose(batch[name][2], series, equal_nan=True), name
+        assert 0 <= indicators.latest(batch["rsi"][0]) <= 100
+        assert indicators.latest(np.array([np.nan]), 50.0) == 50.0
+        print("   ✅ Multi-symbol indicators working")
+        
+        return True
+    except Exception as e:
+        print(f"   ❌ Indicator test failed: {str(e)}")
+        return False
+
+
+def test_streaming_indicators():
+    """Test streaming indicators against the vectorized engine."""
+    print("🌊 Testing Streaming Indicators...")
+    
+    try:
+        import numpy as np
+        from app.services import indicators
+        from app.services.streaming_indicators import IndicatorState
+        
+        close = 100 + np.cumsum(np.random.default_rng(2).normal(0, 1, 80))
+        high, low = close + 0.5, close - 0.5
+        state = IndicatorState("1h").warm(close, high, low)
+        values = state.snapshot()
+        for name, series in indicators.compute_all(close, high, low).items():
+            assert np.isclose(values[name], series[-1]), name
+        print("   ✅ Streaming values match full recompute")
+        
+        # Ticks build the current bar and close it once the hour rolls over
+        state.on_tick(150.0, timestamp=3600.0)
+        state.on_tick(90.0, timestamp=3700.0)
+        assert state.snapshot()["close"] == 90.0 and state.bars == 80
+        state.on_tick(95.0, timestamp=7200.0)
+        assert state.bars == 81 and state.recent[-1] == 90.0
+        print("   ✅ Tick aggregation working")
+        
+        return True
+    except Exception as e:
+        print(f"   ❌ Streaming indicator test failed: {str(e)}")
+        return False
+
+
+def _append_day_bars(root, offset):
+    """Append overlapping windows of bars whose close is the day number (run in a worker process)."""
+    import numpy as np
+    from app.services.bar_store import BarStore
+    
+    store = BarStore(root)
+    for start in range(offset, 400, 7):
+        days = np.arange(start, start + 20)
+        store.append("RACE", {"date": days.astype("datetime64[D]"), "open": days, "high": days,
+                              "low": days, "close": days.astype(float)})
+
+
+def test_bar_store():
+    """Test the memory-mapped bar store."""
+    print("🗄️  Testing Bar Store...")
+    
+    try:
+        import tempfile
+        import numpy as np
+        from app.services.bar_store import BarStore
+        
+        with tempfile.TemporaryDirectory() as root:
+            store = BarStore(root)
+            dates = np.arange("2024-01-01", "2024-01-11", dtype="datetime64[D]")
+            close = np.arange(10, dtype=float) + 100
+            bars = {"date": dates, "open": close, "high": close + 1, "low": close - 1, "close": close}
+            assert store.append("TEST", bars) == 10
+            # Overlapping refresh only adds the new tail
+            more = {field: np.concatenate([column[-2:], column[-1:] + (1 if field == "date" else 5)])
+                    for field, column in bars.items()}
+            assert store.append("TEST", more) == 1
+            print("   ✅ Append-only writes working")
+            
+            window = BarStore(root).range("TEST", "2024-01-03", "2024-01-05")
+            assert list(window["close"]) == [102.0, 103.0, 104.0]
+            assert not window["close"].flags.owndata  # a view into the mapped file
+            assert store.tail("TEST", 2)["close"].tolist() == [109.0, 114.0]
+            assert len(store.range("MISSING")["close"]) == 0
+            print("   ✅ Range queries working")
+            
+            # Several processes appending to one symbol leave its columns aligned
+            import multiprocessing
+            context = multiprocessing.get_context("fork")
+            workers = [context.Process(target=_append_day_bars, args=(root, offset)) for offset in range(4)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            race = store.range("RACE")
+            assert all(worker.exitcode == 0 for worker in workers)
+            assert race["date"].astype(np.int64).tolist() == list(range(419))
+            assert race["close"].tolist() == list(range(419))
+            print("   ✅ Appends from several processes stay aligned")
+        
+        return True
+    except Exception as e:
+        print(f"   ❌ Bar store test failed: {str(e)}")
+        return False
+
+
+async def test_market_simulator():
+    """Test the shared market simulator and its tick bus."""
+    print("📈 Testing Market Simulator...")
+    
+    try:
+        from app.services.market_simulator import DEFAULT_PRICE, MarketSimulator, market_simulator
+        from app.services.advanced_market_service import market_service
+        from app.services.trading_service import TradingService
+        
+        simulator = MarketSimulator(batch_size=5, load_symbols=100, seed=3)
+        received = []
+        unsubscribe = simulator.bus.subscribe(received.append)
+        simulator.bus.subscribe(lambda batch: 1 / 0)  # a failing subscriber doesn't stop the others
+        batch = simulator.step()
+        assert len(batch) == 5 and list(batch.indices) == sorted(batch.indices)
+        symbol, price = next(batch.items())
+        assert batch.get(symbol) == price == simulator.price(symbol)
+        assert received == [batch] and simulator.bus.errors == 1
+        unsubscribe()
+        simulator.step()
+        assert len(received) == 1
+        print("   ✅ Tick batches published and delivered")
+        
+        simulator.replay("test", [10.0, 11.0, 12.5])
+        assert simulator.price("TEST") == 10.0
+        assert [simulator.step().get("TEST") for _ in range(3)] == [11.0, 12.5, None]
+        history = simulator.history("TEST", 30)
+        assert len(history) == 30 and history[-1] == 12.5
+        assert list(simulator.history("TEST", 30)) == list(history)
+        print("   ✅ Replay and history working")
+        
+        # Reads of unknown symbols don't add them; resting orders do
+        trading = TradingService()
+        symbols = len(market_simulator)
+        assert await trading._get_current_price("ZZNEW") == DEFAULT_PRICE
+        assert len(market_simulator.history("ZZOLD", 30)) == 30 and len(market_simulator) == symbols
+        await trading.create_order("frank", "ZZNEW", "buy", 1, order_type="limit", limit_price=50.0)
+        assert len(market_simulator) == symbols + 1 and market_simulator.symbols[-1] == "ZZNEW"
+        print("   ✅ Only symbols with a consumer are simulated")
+        
+        market_simulator.step()
+        trading_price = await trading._get_current_price("AAPL")
+        realtime = await market_service.get_realtime_market_data(["AAPL"])
+        assert realtime["market_data"]["AAPL"]["price"] == trading_price == round(market_simulator.price("AAPL"), 2)
+        print("   ✅ Services agree on prices")
+        
+        return True
+    except Exception as e:
+        print(f"   ❌ Market simulator test failed: {str(e)}")
+        return False
+
+
+async def test_price_feed():
+    """Test that simulated ticks fill resting orders."""
+    print("🔌 Testing Price Feed...")
+    
+    try:
+        from app.services.advanced_market_service import AdvancedMarketService
+        from app.services.market_simulator import market_simulator
+        from app.services.price_feed import PriceFeed
+        from app.services.trading_service import TradingService
+        
+        trading = TradingService()
+        feed = PriceFeed(trading=trading, market=AdvancedMarketService())
+        subscribers = market_simulator.bus.subscriber_count
+        feed.start()
+        price = market_simulator.price("AAPL")
+        order = await trading.create_order("erin", "AAPL", "buy", 10, order_type="limit",
+                                           limit_price=round(price * 0.99, 2))
+        assert order["status"] == "pending"
+        market_simulator.replay("AAPL", [price, price * 0.98])
+        for _ in range(50):
+            market_simulator.step()
+            await asyncio.sleep(0.001)
+            if order["status"] == "filled":
+                break
+        assert order["status"] == "filled" and order["fill_price"] <= order["limit_price"]
+        assert feed.ticks > 0
+        print(f"   ✅ Resting limit filled after {feed.batches} fed batches")
+        
+        feed.stop()
+        assert market_simulator.bus.subscriber_count == subscribers
+        print("   ✅ Unsubscribed on stop")
+        
+        return True
+    except Exception as e:
+        print(f"   ❌ Price feed test failed: {str(e)}")
+        return False
+
+
+async def test_quote_stream():
+    """Test quote fan-out: shared encoding, coalescing for slow clients and cleanup."""
+    print("📡 Testing Quote Stream...")
+    
+    try:
+        from app.services.market_simulator import MarketSimulator
+        from app.services.quote_stream import QuoteHub, parse_symbols
+        
+        simulator = MarketSimulator(seed=5)
+        hub = QuoteHub(simulator)
+        fast = hub.stream(["aapl", "msft"])
+        slow = hub.stream("MSFT, AAPL")
+        first = await fast.__anext__()
+        assert await slow.__anext__() is first  # one group, encoded once
+        assert hub.stats()["groups"] == 1 and hub.stats()["clients"] == 2
+        assert simulator.bus.subscriber_count == 1
+        print("   ✅ Clients with the same symbols share one message")
+        
+        for _ in range(3):
+            simulator.step()
+            latest = await fast.__anext__()
+        assert json.loads(latest)["quotes"]["AAPL"]["price"] == round(simulator.price("AAPL"), 2)
+        assert await slow.__anext__() == latest
+        stats = hub.stats()
+        assert stats["coalesced"] == 2 and stats["encodes"] == 4 and stats["deliveries"] == 6
+        print("   ✅ Slow client skips to the latest quotes")
+        
+        await fast.aclose()
+        await slow.aclose()
+        assert hub.stats()["clients"] == 0 and hub.stats()["symbols"] == 0
+        assert simulator.bus.subscriber_count == 0
+        for bad in ("", " , ", [f"S{i}" for i in range(201)]):
+            try:
+                parse_symbols(bad)
+                assert False, f"accepted {bad!r}"
+            except ValueError:
+                pass
+        print("   ✅ Cleanup and validation working")
+        
+        return True
+    except Exception as e:
+        print(f"   ❌ Quote stream test failed: {str(e)}")
+        return False
+
+
+def test_bulk_analysis():
+    """Test bulk technical analysis over stacked price matrices."""
+    print("📊 Testing Bulk Analysis...")
+    
+    try:
+        import tempfile
+        import numpy as np
+        from app.services import indicators
+        from app.services.bar_store import BarStore
+        from app.services.bulk_analysis import BulkAnalyzer, INDICATOR_NAMES
+        from app.services.market_simulator import MarketSimulator
+        
+        with tempfile.TemporaryDirectory() as root:
+            store = BarStore(root)
+            dates = np.arange("2024-01-01", "2024-03-01", dtype="datetime64[D]")
+            close = 100 + np.sin(np.arange(len(dates)) / 5) * 10
+            store.append("STORED", {"date": dates, "open": close, "high": close + 1, "low": close - 1, "close": close})
+            simulator = MarketSimulator(seed=9)
+            analyzer = BulkAnalyzer(store, simulator, chunk_size=2)
+            
+            chunks = list(analyzer.analyze(["aapl", "MSFT", "TSLA", "stored", "AAPL"], ["1d", "1h"]))
+            results = [result for chunk in chunks for result in chunk]
+            assert [len(chunk) for chunk in chunks] == [2, 1, 1, 2, 2]  # stored history has its own length
+            assert len(results) == 8 and results[0]["symbol"] == "AAPL"
+            by_key = {(result["symbol"], result["timeframe"]): result for result in results}
+            expected = indicators.compute_all(simulator.history("MSFT", 100))
+            for name in INDICATOR_NAMES:
+                assert by_key[("MSFT", "1d")]["indicators"][name] == round(float(expected[name][-1]), 2)
+            print("   ✅ Stacked results match per-symbol indicators")
+            
+            stored = by_key[("STORED", "1d")]
+            expected = indicators.compute_all(close, close + 1, close - 1)
+            assert stored["bars"] == len(dates) and stored["indicators"]["atr"] == round(float(expected["atr"][-1]), 2)
+            short = list(analyzer.analyze(["AAPL"], ["1h"], ["rsi", "sma_50", "rsi"]))[0][0]
+            assert list(short["indicators"]) == ["rsi", "sma_50"]
+            simulated = len(simulator)
+            assert list(analyzer.analyze(["NEWCO"], ["1d"]))[0][0]["bars"] == 100 and len(simulator) == simulated
+            for bad in ((["AAPL"], ["5m"], None), (["AAPL"], ["1d"], ["nope"]), ([" "], ["1d"], None),
+                        (["AAPL", "DROP TABLE;"], ["1d"], None), (["X" * 13], ["1d"], None)):
+                try:
+                    analyzer.analyze(*bad)
+                    assert False, f"accepted {bad!r}"
+                except ValueError:
+                    pass
+            print("   ✅ Stored bars, indicator selection and validation working")
+        
+        return True
+    except Exception as e:
+        print(f"   ❌ Bulk analysis test failed: {str(e)}")
+        return False
+
+
+def test_portfolio_optimizer():
+    """Test shrinkage covariance, Black-Litterman and the efficient frontier."""
+    print("📐 Testing Portfolio Optimizer...")
+    
+    try:
+        import numpy as np
+        from app.services import portfolio_optimizer as po
+        from app.services.advanced_ai_service import AdvancedAIService
+        
+        rng = np.random.default_rng(7)
+        returns = rng.normal(0.0004, 0.01, (60, 40)) + rng.normal(0, 0.01, (60, 1))
+        cov, shrinkage = po.ledoit_wolf(returns)
+        assert 0 < shrinkage < 1 and np.linalg.eigvalsh(cov).min() > 0
+        prior = po.implied_returns(cov, np.full(40, 1 / 40))
+        posterior, _ = po.black_litterman(cov, prior, np.eye(40)[:1], [0.01], [1.0])
+        assert np.isclose(posterior[0], 0.01)  # a fully confident view holds exactly
+        print("   ✅ Shrinkage covariance and Black-Litterman working")
+        
+        frontier = po.efficient_frontier(posterior, cov, points=20, max_weight=0.1)
+        weights = frontier["weights"]
+        assert np.allclose(weights.sum(axis=1), 1)
+        assert weights.min() > -1e-12 and weights.max() < 0.1 + 1e-12
+        assert np.allclose(np.diff(frontier["returns"]), np.diff(frontier["returns"])[0])
+        assert np.all(np.diff(frontier["volatility"]) > -1e-12)
+        
+        # With bounds that don't bind, the optimum matches the closed form
+        inverse, ones, aversion = np.linalg.inv(cov), np.ones(40), 50.0
+        gamma = (ones @ inverse @ posterior - aversion) / (ones @ inverse @ ones)
+        expected = inverse @ (posterior - gamma) / aversion
+        assert np.allclose(po.optimal_weights(posterior, cov, aversion, -10, 10), expected)
+        print("   ✅ Efficient frontier working")
+        
+        result = AdvancedAIService().generate_advanced_portfolio_optimization({"risk_tolerance": "medium"})
+        assert abs(sum(item["percentage"] for item in result["optimized_allocation"]) - 100) < 0.5
+        print("   ✅ Portfolio optimization service working")
+        
+        return True
+    except Exception as e:
+        print(f"   ❌ Portfolio optimizer test failed: {str(e)}")
+        return False
+
+
+async def test_trading_accounts():
+    """Test per-user paper trading accounts under concurrent orders."""
+    print("💵 Testing Trading Accounts...")
+    
+    try:
+        from app.services.trading_service import TradingService
+        
+        trading = TradingService()
+        
+        # Ten concurrent $17k+ buys against a $100k account: only five can fit
+        orders = await asyncio.gather(*[
+            trading.create_order("alice", "AAPL", "buy", 100) for _ in range(10)
+        ])
+        filled = [o for o in orders if o["status"] == "filled"]
+        assert len(filled) == 5
+        alice = await trading.get_account("alice")
+        assert alice["cash_balance"] >= 0
+        print("   ✅ Concurrent buys respect buying power")
+        
+        # Another user's account is untouched, and open orders reserve cash
+        order = await trading.create_order("bob", "AAPL", "buy", 10, order_type="limit", limit_price=1.0)
+        bob = await trading.get_account("bob")
+        assert bob["cash_balance"] == 100000 and bob["reserved"] == 10.0
+        await trading.cancel_order(order["order_id"])
+        bob = await trading.get_account("bob")
+        assert bob["reserved"] == 0 and bob["ledger_entries"] == 3
+        print("   ✅ Reservations and ledger working")
+
+        # A buy stop that gaps past its reservation is cancelled rather than overdrawing cash
+        price = await trading._get_current_price("MSFT")
+        quantity = int(90000 / (price * (1 + trading.STOP_RESERVE_BUFFER)))
+        order = await trading.create_order("carol", "MSFT", "buy", quantity, order_type="stop",
+                                           stop_price=round(price * 1.01, 2))
+        assert order["status"] == "pending"
+        await trading.process_price_tick("MSFT", price * 1.5)
+        carol = await trading.get_account("carol")
+        assert order["status"] == "cancelled" and order["filled_quantity"] == 0
+        assert carol["cash_balance"] == 100000 and carol["reserved"] == 0
+        print("   ✅ Gapped stop fills capped by buying power")
+
+        # Sells are limited to shares held and not already committed to open sells
+        order = await trading.create_order("dave", "AAPL", "sell", 10)
+        dave = await trading.get_account("dave")
+        assert order["status"] == "rejected" and dave["cash_balance"] == 100000
+        await trading.create_order("alice", "AAPL", "sell", 400, order_type="limit", limit_price=10000.0)
+        order = await trading.create_order("alice", "AAPL", "sell", 200)
+        assert order["status"] == "rejected"
+        order = await trading.create_order("alice", "AAPL", "sell", 100)
+        assert order["status"] == "filled"
+        print("   ✅ Sells limited to held shares")
+
+        return True
+    except Exception as e:
+        print(f"   ❌ Trading accounts test failed: {str(e)}")
+        return False
+
+
 async def test_fastapi_app():
     """Test FastAPI application."""
     print("🚀 Testing FastAPI Application...")
@@ -175,7 +808,21 @@ async def main():
         ("Pydantic Models", test_models),
         ("Utility Functions", test_utilities),
         ("AI Service", test_ai_service),
+        ("Inference Scheduler", test_inference_scheduler),
+        ("Model Hot Swap", test_model_hot_swap),
+        ("Model Training", test_model_training),
+        ("Tree Scorer", test_tree_scorer),
         ("Blockchain Service", test_blockchain_service),
+        ("Order Book", test_order_book),
+        ("Trading Accounts", test_trading_accounts),
+        ("Indicator Engine", test_indicators),
+        ("Streaming Indicators", test_streaming_indicators),
+        ("Bar Store", test_bar_store),
+        ("Market Simulator", test_market_simulator),
+        ("Price Feed", test_price_feed),
+        ("Quote Stream", test_quote_stream),
+        ("Bulk Analysis", test_bulk_analysis),
+        ("Portfolio Optimizer", test_portfolio_optimizer),
         ("FastAPI Application", test_fastapi_app),
     ]
     
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+FinSage Model Training
+Trains the investment recommendation model offline and writes a versioned
+artifact (fin_predictor-<version>.pkl plus .json metadata).
+
+Training history is read in chunks from CSV files with the columns age,
+annual_income, risk_tolerance, investment_horizon_years and outcome_score.
+With --simulate, reproducible simulated history is written first so the
+pipeline can run end to end in development.
+
+A new model is promoted to ML_MODEL_PATH (where running servers hot-swap
+it in) only with --promote, and only if it passes the inference latency
+and validation gates.
+
+Usage: python train_model.py [--data ./data/training] [--simulate 500000] [--promote]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.config import settings
+from app.services import model_training
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the FinSage recommendation model")
+    parser.add_argument("--data", default=settings.training_data_path, help="Directory of CSV training history")
+    parser.add_argument("--simulate", type=int, default=0, metavar="ROWS",
+                        help="Write this many rows of simulated history to --data first")
+    parser.add_argument("--models-dir", default=str(Path(settings.ml_model_path).parent),
+                        help="Where versioned artifacts are written")
+    parser.add_argument("--chunk-rows", type=int, default=model_training.CHUNK_ROWS, help="Rows per training chunk")
+    parser.add_argument("--trees-per-chunk", type=int, default=model_training.TREES_PER_CHUNK,
+                        help="Trees grown for each chunk")
+    parser.add_argument("--seed", type=int, default=42, help="Training seed")
+    parser.add_argument("--max-p99-ms", type=float, default=model_training.MAX_P99_LATENCY_MS,
+                        help="Promotion gate: single-row p99 inference latency")
+    parser.add_argument("--min-r2", type=float, default=model_training.MIN_VALIDATION_R2,
+                        help="Promotion gate: validation R²")
+    parser.add_argument("--promote", action="store_true", help=f"Promote to {settings.ml_model_path} if the gates pass")
+    args = parser.parse_args()
+
+    print("🧠 FinSage Model Training")
+    print("=" * 50)
+
+    if args.simulate:
+        files = model_training.write_simulated_history(args.data, args.simulate, seed=args.seed)
+        print(f"Simulated {args.simulate:,} rows of history in {len(files)} files")
+
+    files = model_training.history_files(args.data)
+    if not files:
+        print(f"❌ No training history in {os.path.abspath(args.data)} (use --simulate ROWS to generate some)")
+        sys.exit(1)
+    print(f"History: {len(files)} files in {os.path.abspath(args.data)}\n")
+
+    start = time.perf_counter()
+    result = model_training.run_pipeline(
+        args.data, args.models_dir, args.chunk_rows, args.trees_per_chunk, args.seed,
+        args.max_p99_ms, args.min_r2, settings.ml_model_path if args.promote else None
+    )
+
+    latency = result["latency"]
+    print(f"Trained:    {result['n_estimators']} trees on {result['training_rows']:,} rows "
+          f"({result['chunks']} chunks) in {result['training_seconds']:.1f} s")
+    print(f"Validation: R² {result['validation']['r2']}, MAE {result['validation']['mae']} "
+          f"on {result['validation_rows']:,} held-out rows")
+    print(f"Latency:    single row p50 {latency['single_p50_ms']} ms, p99 {latency['single_p99_ms']} ms; "
+          f"batch {latency['batch_rows_per_second']:,.0f} rows/s")
+    print(f"Artifact:   {result['artifact']}")
+
+    for failure in result["gate_failures"]:
+        print(f"❌ Gate failed: {failure}")
+    if result["promoted"]:
+        print(f"✅ Promoted to {settings.ml_model_path}")
+    elif args.promote:
+        print("❌ Not promoted")
+    print(f"\nDone in {time.perf_counter() - start:.1f} s")
+    if args.promote and not result["promoted"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,23 @@
 """
 Utils module
 """
-from .api_utils import get_alpha_vantage_data, get_crypto_price_alphavantage, get_coingecko_price, get_yahoo_finance_quote
+from .api_utils import (
+    get_alpha_vantage_data,
+    get_crypto_price_alphavantage,
+    get_coingecko_price,
+    get_coingecko_prices,
+    get_yahoo_finance_quote,
+    get_yahoo_finance_quotes
+)
 from .auth_utils import verify_password, get_password_hash, create_access_token, decode_access_token
 
 __all__ = [
     "get_alpha_vantage_data",
     "get_crypto_price_alphavantage",
     "get_coingecko_price",
+    "get_coingecko_prices",
     "get_yahoo_finance_quote",
+    "get_yahoo_finance_quotes",
     "verify_password",
     "get_password_hash",
     "create_access_token",
@@ -2,22 +2,107 @@
 API utility functions for external API calls
 """
 import requests
-from typing import Optional, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List
 from config import settings
-import time
-from functools import lru_cache
+from utils.cache_utils import TTLCache, cached
+from utils.http_client import http_get
+from utils.rate_limiter import PRIORITY_BULK, PRIORITY_NORMAL, PRIORITY_REALTIME, get_rate_governor
+
+ALPHA_VANTAGE_API_URL = "https://www.alphavantage.co/query"
+COINGECKO_API_URL = "https://api.coingecko.com/api/v3"
+YAHOO_CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart"
+
+# Map common symbols to CoinGecko IDs
+COINGECKO_IDS = {
+    "BTC": "bitcoin",
+    "ETH": "ethereum",
+    "BNB": "binancecoin",
+    "SOL": "solana",
+    "ADA": "cardano",
+    "XRP": "ripple",
+    "DOT": "polkadot",
+    "DOGE": "dogecoin",
+    "MATIC": "matic-network",
+    "AVAX": "avalanche-2"
+}
+
+# Shared response cache in front of every provider call
+api_cache = TTLCache(max_entries=settings.CACHE_MAX_ENTRIES, stale_seconds=settings.CACHE_STALE_SECONDS)
+
+
+def _alpha_vantage_ttl(function: str, symbol: str, **kwargs) -> int:
+    """Quotes go stale quickly; daily series and fundamentals do not"""
+    return settings.QUOTE_CACHE_TTL_SECONDS if function == "GLOBAL_QUOTE" else settings.CACHE_TTL_SECONDS
+
+
+# Shared pool for fanning out per-symbol requests; threads are reused across calls
+QUOTE_FETCH_WORKERS = 16
+_quote_executor = ThreadPoolExecutor(max_workers=QUOTE_FETCH_WORKERS, thread_name_prefix="quote-fetch")
 
 class APIError(Exception):
     """Custom exception for API errors"""
     pass
 
-def get_alpha_vantage_data(function: str, symbol: str, **kwargs) -> Optional[Dict[str, Any]]:
+class RateLimitTimeout(APIError):
+    """A call waited longer than RATE_LIMIT_MAX_WAIT_SECONDS for provider quota"""
+    pass
+
+def _provider_get(provider: str, url: str, params: Optional[Dict[str, Any]] = None,
+                  priority: int = PRIORITY_NORMAL):
+    """
+    GET through the provider's rate governor and the pooled HTTP client
+    
+    Bulk calls wait for quota as long as it takes; anything else gives up
+    after RATE_LIMIT_MAX_WAIT_SECONDS so callers can fall back.
+    """
+    max_wait = None if priority >= PRIORITY_BULK else settings.RATE_LIMIT_MAX_WAIT_SECONDS
+    if not get_rate_governor(provider).acquire(priority, max_wait):
+        raise RateLimitTimeout(f"waited over {max_wait}s for {provider} quota")
+    return http_get(url, params=params)
+
+def _alpha_vantage_priority(function: str, priority: Optional[int] = None) -> int:
+    """
+    Priority for an Alpha Vantage call: the caller's if given, else by function
+    
+    Only offline jobs (like backfill_bars.py) should ask for PRIORITY_BULK,
+    since bulk calls wait for quota without a cap.
+    """
+    if priority is not None:
+        return priority
+    if function in ("GLOBAL_QUOTE", "CURRENCY_EXCHANGE_RATE"):
+        return PRIORITY_REALTIME
+    return PRIORITY_NORMAL
+
+def _alpha_vantage_throttled(data: Dict[str, Any]) -> bool:
+    """Alpha Vantage answers over-quota calls with HTTP 200 and a Note/Information message"""
+    return "Note" in data or "rate limit" in str(data.get("Information", "")).lower()
+
+def _alpha_vantage_request(params: Dict[str, Any], priority: int) -> Optional[Dict[str, Any]]:
+    """Call Alpha Vantage, backing off and retrying once if it reports throttling anyway"""
+    governor = get_rate_governor("alpha_vantage")
+    for _ in range(2):
+        response = _provider_get("alpha_vantage", ALPHA_VANTAGE_API_URL, params, priority)
+        response.raise_for_status()
+        data = response.json()
+        if not _alpha_vantage_throttled(data):
+            return data
+        # Someone else is spending the same key's quota; drain our bucket to match
+        governor.report_throttled()
+    print(f"Alpha Vantage API error: rate limited ({params['function']})")
+    return None
+
+@cached(api_cache, "alpha_vantage", ttl=_alpha_vantage_ttl,
+        key=lambda function, symbol, priority=None, **kwargs: (function, symbol.upper(), tuple(sorted(kwargs.items()))))
+def get_alpha_vantage_data(function: str, symbol: str, priority: Optional[int] = None,
+                           **kwargs) -> Optional[Dict[str, Any]]:
     """
     Get data from Alpha Vantage API
     
     Args:
         function: API function (e.g., 'TIME_SERIES_DAILY', 'GLOBAL_QUOTE')
         symbol: Stock symbol
+        priority: Rate-limit priority (defaults by function; never bulk unless asked)
         **kwargs: Additional parameters
     
     Returns:
@@ -26,7 +111,6 @@ def get_alpha_vantage_data(function: str, symbol: str, **kwargs) -> Optional[Dic
     if not settings.ALPHA_VANTAGE_API_KEY:
         return None
     
-    url = "https://www.alphavantage.co/query"
     params = {
         "function": function,
         "symbol": symbol,
@@ -35,19 +119,18 @@ def get_alpha_vantage_data(function: str, symbol: str, **kwargs) -> Optional[Dic
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = _alpha_vantage_request(params, _alpha_vantage_priority(function, priority))
         
         # Check for API errors
-        if "Error Message" in data or "Note" in data:
+        if data is None or "Error Message" in data:
             return None
         
         return data
-    except (requests.RequestException, ValueError) as e:
+    except (requests.RequestException, ValueError, APIError) as e:
         print(f"Alpha Vantage API error: {e}")
         return None
 
+@cached(api_cache, "alpha_vantage_crypto", ttl=settings.CRYPTO_CACHE_TTL_SECONDS, key=lambda symbol: symbol.upper())
 def get_crypto_price_alphavantage(symbol: str) -> Optional[Dict[str, Any]]:
     """
     Get crypto price from Alpha Vantage
@@ -61,7 +144,6 @@ def get_crypto_price_alphavantage(symbol: str) -> Optional[Dict[str, Any]]:
     if not settings.ALPHA_VANTAGE_API_KEY:
         return None
     
-    url = "https://www.alphavantage.co/query"
     params = {
         "function": "CURRENCY_EXCHANGE_RATE",
         "from_currency": symbol.upper(),
@@ -70,17 +152,16 @@ def get_crypto_price_alphavantage(symbol: str) -> Optional[Dict[str, Any]]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = _alpha_vantage_request(params, PRIORITY_REALTIME)
         
-        if "Realtime Currency Exchange Rate" in data:
+        if data and "Realtime Currency Exchange Rate" in data:
             return data["Realtime Currency Exchange Rate"]
         return None
-    except (requests.RequestException, ValueError) as e:
+    except (requests.RequestException, ValueError, APIError) as e:
         print(f"Crypto API error: {e}")
         return None
 
+@cached(api_cache, "coingecko_price", ttl=settings.CRYPTO_CACHE_TTL_SECONDS, key=lambda symbol: symbol.upper())
 def get_coingecko_price(symbol: str) -> Optional[Dict[str, Any]]:
     """
     Get crypto price from CoinGecko (free, no API key required)
@@ -91,23 +172,9 @@ def get_coingecko_price(symbol: str) -> Optional[Dict[str, Any]]:
     Returns:
         Price data or None
     """
-    # Map common symbols to CoinGecko IDs
-    symbol_map = {
-        "BTC": "bitcoin",
-        "ETH": "ethereum",
-        "BNB": "binancecoin",
-        "SOL": "solana",
-        "ADA": "cardano",
-        "XRP": "ripple",
-        "DOT": "polkadot",
-        "DOGE": "dogecoin",
-        "MATIC": "matic-network",
-        "AVAX": "avalanche-2"
-    }
-    
-    coin_id = symbol_map.get(symbol.upper(), symbol.lower())
+    coin_id = COINGECKO_IDS.get(symbol.upper(), symbol.lower())
     
-    url = f"https://api.coingecko.com/api/v3/simple/price"
+    url = f"{COINGECKO_API_URL}/simple/price"
     params = {
         "ids": coin_id,
         "vs_currencies": "usd",
@@ -117,7 +184,7 @@ def get_coingecko_price(symbol: str) -> Optional[Dict[str, Any]]:
     }
     
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = _provider_get("coingecko", url, params, PRIORITY_REALTIME)
         response.raise_for_status()
         data = response.json()
         
@@ -130,10 +197,102 @@ def get_coingecko_price(symbol: str) -> Optional[Dict[str, Any]]:
                 "volume_24h": data[coin_id].get("usd_24h_vol", 0)
             }
         return None
-    except (requests.RequestException, ValueError) as e:
+    except (requests.RequestException, ValueError, APIError) as e:
         print(f"CoinGecko API error: {e}")
         return None
 
+def get_coingecko_prices(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Get prices for many cryptos with at most one CoinGecko request
+    
+    Cached prices are shared with get_coingecko_price. Fresh ones are served
+    as is, stale ones are served while one background request refreshes
+    them, and only the misses are fetched before returning.
+    
+    Args:
+        symbols: Crypto symbols (e.g., ['BTC', 'ETH'])
+    
+    Returns:
+        Price data keyed by upper-case symbol; symbols CoinGecko doesn't know are omitted
+    """
+    prices, stale, missing = {}, [], []
+    for symbol in dict.fromkeys(s.upper() for s in symbols):
+        value, fresh = api_cache.peek(("coingecko_price", symbol))
+        if value is None:
+            missing.append(symbol)
+            continue
+        prices[symbol] = value
+        if not fresh:
+            stale.append(symbol)
+    
+    if stale:
+        api_cache.submit_refresh(("coingecko_prices", tuple(stale)), lambda: _refresh_coingecko_prices(stale))
+    if missing:
+        # Concurrent callers missing the same symbols share one request; empty results aren't cached
+        fetched = api_cache.get(("coingecko_prices", tuple(missing)),
+                                lambda: _refresh_coingecko_prices(missing) or None,
+                                settings.CRYPTO_CACHE_TTL_SECONDS)
+        prices.update(fetched or {})
+    return prices
+
+def _refresh_coingecko_prices(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch prices for ``symbols`` and store each in the per-symbol cache"""
+    fetched = _fetch_coingecko_prices(symbols)
+    for symbol, data in fetched.items():
+        api_cache.put(("coingecko_price", symbol), data, settings.CRYPTO_CACHE_TTL_SECONDS)
+    return fetched
+
+def _coingecko_ids(symbols: List[str]) -> Dict[str, List[str]]:
+    """Group upper-case symbols by CoinGecko coin ID"""
+    coin_ids = {}
+    for symbol in symbols:
+        coin_ids.setdefault(COINGECKO_IDS.get(symbol.upper(), symbol.lower()), []).append(symbol.upper())
+    return coin_ids
+
+def _coingecko_price_params(coin_ids) -> Dict[str, str]:
+    return {
+        "ids": ",".join(coin_ids),
+        "vs_currencies": "usd",
+        "include_24hr_change": "true",
+        "include_market_cap": "true",
+        "include_24hr_vol": "true"
+    }
+
+def _fetch_coingecko_prices(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch prices for many cryptos with a single CoinGecko simple/price request"""
+    coin_ids = _coingecko_ids(symbols)
+    if not coin_ids:
+        return {}
+    
+    url = f"{COINGECKO_API_URL}/simple/price"
+    
+    try:
+        response = _provider_get("coingecko", url, _coingecko_price_params(coin_ids), PRIORITY_REALTIME)
+        response.raise_for_status()
+        data = response.json()
+    except (requests.RequestException, ValueError, APIError) as e:
+        print(f"CoinGecko API error: {e}")
+        return {}
+    
+    return _parse_coingecko_prices(coin_ids, data)
+
+def _parse_coingecko_prices(coin_ids: Dict[str, List[str]], data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Turn a simple/price response into price data keyed by symbol"""
+    prices = {}
+    for coin_id, coin_symbols in coin_ids.items():
+        if coin_id not in data or "usd" not in data[coin_id]:
+            continue
+        for symbol in coin_symbols:
+            prices[symbol] = {
+                "symbol": symbol,
+                "usd_price": data[coin_id]["usd"],
+                "change_24h": data[coin_id].get("usd_24h_change", 0),
+                "market_cap": data[coin_id].get("usd_market_cap", 0),
+                "volume_24h": data[coin_id].get("usd_24h_vol", 0)
+            }
+    return prices
+
+@cached(api_cache, "yahoo_quote", ttl=settings.QUOTE_CACHE_TTL_SECONDS, key=lambda symbol: symbol.upper())
 def get_yahoo_finance_quote(symbol: str) -> Optional[Dict[str, Any]]:
     """
     Get stock quote using Yahoo Finance (free, no API key)
@@ -146,36 +305,65 @@ def get_yahoo_finance_quote(symbol: str) -> Optional[Dict[str, Any]]:
         Quote data or None
     """
     # Using a free API endpoint (alternative to yfinance)
-    url = f"https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+    url = f"{YAHOO_CHART_URL}/{symbol}"
     
     try:
-        response = requests.get(url, timeout=10)
+        response = _provider_get("yahoo", url, priority=PRIORITY_REALTIME)
         response.raise_for_status()
         data = response.json()
         
-        if "chart" in data and "result" in data["chart"]:
-            result = data["chart"]["result"][0]
-            meta = result.get("meta", {})
-            indicators = result.get("indicators", {})
-            quote = indicators.get("quote", [{}])[0]
-            
-            current_price = meta.get("regularMarketPrice", 0)
-            previous_close = meta.get("previousClose", 0)
-            change = current_price - previous_close
-            change_percent = (change / previous_close * 100) if previous_close else 0
-            
-            return {
-                "symbol": symbol.upper(),
-                "price": current_price,
-                "change": change,
-                "changePercent": change_percent,
-                "volume": meta.get("regularMarketVolume", 0),
-                "high": meta.get("regularMarketDayHigh", 0),
-                "low": meta.get("regularMarketDayLow", 0),
-                "open": meta.get("regularMarketOpen", 0),
-                "previousClose": previous_close
-            }
-        return None
-    except (requests.RequestException, ValueError) as e:
+        return _parse_yahoo_chart(symbol, data)
+    except (requests.RequestException, ValueError, APIError) as e:
         print(f"Yahoo Finance API error: {e}")
         return None
+
+def _parse_yahoo_chart(symbol: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Turn a chart response into quote data"""
+    if "chart" in data and "result" in data["chart"]:
+        result = data["chart"]["result"][0]
+        meta = result.get("meta", {})
+        
+        current_price = meta.get("regularMarketPrice", 0)
+        previous_close = meta.get("previousClose", 0)
+        change = current_price - previous_close
+        change_percent = (change / previous_close * 100) if previous_close else 0
+        
+        return {
+            "symbol": symbol.upper(),
+            "price": current_price,
+            "change": change,
+            "changePercent": change_percent,
+            "volume": meta.get("regularMarketVolume", 0),
+            "high": meta.get("regularMarketDayHigh", 0),
+            "low": meta.get("regularMarketDayLow", 0),
+            "open": meta.get("regularMarketOpen", 0),
+            "previousClose": previous_close
+        }
+    return None
+
+def get_yahoo_finance_quotes(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Get stock quotes for many symbols with concurrent Yahoo Finance requests
+    
+    Yahoo's chart endpoint takes one symbol per request, so the requests are
+    issued in parallel and the batch takes about as long as the slowest one.
+    
+    Args:
+        symbols: Stock symbols
+    
+    Returns:
+        Quote data keyed by upper-case symbol; failed lookups are omitted
+    """
+    unique = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+    futures = {symbol: _quote_executor.submit(get_yahoo_finance_quote, symbol) for symbol in unique}
+    quotes = {}
+    for symbol, future in futures.items():
+        data = future.result()
+        if data:
+            quotes[symbol] = data
+    return quotes
+
+
+def submit_quote_request(func, *args):
+    """Run a blocking quote request on the shared quote pool"""
+    return _quote_executor.submit(func, *args)
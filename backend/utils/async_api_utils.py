@@ -0,0 +1,257 @@
+"""
+Async adapters for external market data APIs
+
+Non-blocking counterparts of the api_utils functions for code running on the
+event loop. They share api_utils' response cache, rate governors and response
+parsing, so sync and async callers see the same data and spend the same quota.
+Misses are fetched on the loop and coalesced per key; stale entries are
+served immediately and refreshed on the cache's background pool.
+"""
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+import httpx
+
+from config import settings
+from utils import api_utils
+from utils.api_utils import (
+    APIError,
+    RateLimitTimeout,
+    _alpha_vantage_priority,
+    _alpha_vantage_throttled,
+    _alpha_vantage_ttl,
+    _coingecko_ids,
+    _coingecko_price_params,
+    _parse_coingecko_prices,
+    _parse_yahoo_chart,
+    api_cache,
+    get_alpha_vantage_data,
+    get_crypto_price_alphavantage,
+    get_yahoo_finance_quote
+)
+from utils.http_client import async_http_get
+from utils.rate_limiter import PRIORITY_BULK, PRIORITY_NORMAL, PRIORITY_REALTIME, get_rate_governor
+
+# In-flight fetches per event loop, so concurrent misses share one request
+_inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = weakref.WeakKeyDictionary()
+
+
+async def _cached(key: Hashable, ttl: float, fetch: Callable[[], Awaitable[Any]],
+                  refresh: Callable[[], Any]) -> Any:
+    """
+    Serve ``key`` from the shared cache, fetching it with ``fetch`` on a miss
+
+    Args:
+        key: Cache key, matching the one api_utils uses for the same data
+        ttl: Seconds a fetched value stays fresh
+        fetch: Coroutine function doing the upstream call
+        refresh: Blocking loader used to revalidate a stale entry in the background
+
+    Returns:
+        The cached or fetched value (None if the provider had nothing)
+    """
+    value, fresh = api_cache.peek(key)
+    if value is not None:
+        if not fresh:
+            api_cache.submit_refresh(key, lambda: _store(key, refresh(), ttl))
+        return value
+
+    tasks = _inflight.setdefault(asyncio.get_running_loop(), {})
+    task = tasks.get(key)
+    if task is None:
+        async def load():
+            try:
+                return _store(key, await fetch(), ttl)
+            finally:
+                tasks.pop(key, None)
+        task = tasks[key] = asyncio.ensure_future(load())
+    # A disconnecting caller must not cancel the fetch other callers are awaiting
+    return await asyncio.shield(task)
+
+
+def _store(key: Hashable, value: Any, ttl: float) -> Any:
+    api_cache.put(key, value, ttl)
+    return value
+
+
+async def _provider_get(provider: str, url: str, params: Optional[Dict[str, Any]] = None,
+                        priority: int = PRIORITY_NORMAL) -> httpx.Response:
+    """Async GET through the provider's rate governor and the pooled async client"""
+    max_wait = None if priority >= PRIORITY_BULK else settings.RATE_LIMIT_MAX_WAIT_SECONDS
+    if not await get_rate_governor(provider).acquire_async(priority, max_wait):
+        raise RateLimitTimeout(f"waited over {max_wait}s for {provider} quota")
+    return await async_http_get(url, params=params)
+
+
+async def _alpha_vantage_request(params: Dict[str, Any], priority: int) -> Optional[Dict[str, Any]]:
+    """Call Alpha Vantage, backing off and retrying once if it reports throttling anyway"""
+    governor = get_rate_governor("alpha_vantage")
+    for _ in range(2):
+        response = await _provider_get("alpha_vantage", api_utils.ALPHA_VANTAGE_API_URL, params, priority)
+        response.raise_for_status()
+        data = response.json()
+        if not _alpha_vantage_throttled(data):
+            return data
+        governor.report_throttled()
+    print(f"Alpha Vantage API error: rate limited ({params['function']})")
+    return None
+
+
+async def async_get_alpha_vantage_data(function: str, symbol: str, priority: Optional[int] = None,
+                                       **kwargs) -> Optional[Dict[str, Any]]:
+    """
+    Get data from Alpha Vantage API without blocking the event loop
+
+    Args:
+        function: API function (e.g., 'TIME_SERIES_DAILY', 'GLOBAL_QUOTE')
+        symbol: Stock symbol
+        priority: Rate-limit priority (defaults by function; never bulk unless asked)
+        **kwargs: Additional parameters
+
+    Returns:
+        API response data or None
+    """
+    if not settings.ALPHA_VANTAGE_API_KEY:
+        return None
+
+    async def fetch():
+        params = {
+            "function": function,
+            "symbol": symbol,
+            "apikey": settings.ALPHA_VANTAGE_API_KEY,
+            **kwargs
+        }
+        try:
+            data = await _alpha_vantage_request(params, _alpha_vantage_priority(function, priority))
+            if data is None or "Error Message" in data:
+                return None
+            return data
+        except (httpx.HTTPError, ValueError, APIError) as e:
+            print(f"Alpha Vantage API error: {e}")
+            return None
+
+    key = ("alpha_vantage", (function, symbol.upper(), tuple(sorted(kwargs.items()))))
+    return await _cached(key, _alpha_vantage_ttl(function, symbol, **kwargs), fetch,
+                         lambda: get_alpha_vantage_data.uncached(function, symbol, priority, **kwargs))
+
+
+async def async_get_crypto_price_alphavantage(symbol: str) -> Optional[Dict[str, Any]]:
+    """
+    Get crypto price from Alpha Vantage without blocking the event loop
+
+    Args:
+        symbol: Crypto symbol (e.g., 'BTC', 'ETH')
+
+    Returns:
+        Price data or None
+    """
+    if not settings.ALPHA_VANTAGE_API_KEY:
+        return None
+
+    async def fetch():
+        params = {
+            "function": "CURRENCY_EXCHANGE_RATE",
+            "from_currency": symbol.upper(),
+            "to_currency": "USD",
+            "apikey": settings.ALPHA_VANTAGE_API_KEY
+        }
+        try:
+            data = await _alpha_vantage_request(params, PRIORITY_REALTIME)
+            if data and "Realtime Currency Exchange Rate" in data:
+                return data["Realtime Currency Exchange Rate"]
+            return None
+        except (httpx.HTTPError, ValueError, APIError) as e:
+            print(f"Crypto API error: {e}")
+            return None
+
+    return await _cached(("alpha_vantage_crypto", symbol.upper()), settings.CRYPTO_CACHE_TTL_SECONDS, fetch,
+                         lambda: get_crypto_price_alphavantage.uncached(symbol))
+
+
+async def async_get_yahoo_finance_quote(symbol: str) -> Optional[Dict[str, Any]]:
+    """
+    Get stock quote from Yahoo Finance without blocking the event loop
+
+    Args:
+        symbol: Stock symbol
+
+    Returns:
+        Quote data or None
+    """
+    async def fetch():
+        try:
+            response = await _provider_get("yahoo", f"{api_utils.YAHOO_CHART_URL}/{symbol}", priority=PRIORITY_REALTIME)
+            response.raise_for_status()
+            return _parse_yahoo_chart(symbol, response.json())
+        except (httpx.HTTPError, ValueError, APIError) as e:
+            print(f"Yahoo Finance API error: {e}")
+            return None
+
+    return await _cached(("yahoo_quote", symbol.upper()), settings.QUOTE_CACHE_TTL_SECONDS, fetch,
+                         lambda: get_yahoo_finance_quote.uncached(symbol))
+
+
+async def async_get_yahoo_finance_quotes(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Get stock quotes for many symbols with concurrent Yahoo Finance requests
+
+    Args:
+        symbols: Stock symbols
+
+    Returns:
+        Quote data keyed by upper-case symbol; failed lookups are omitted
+    """
+    unique = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+    results = await asyncio.gather(*(async_get_yahoo_finance_quote(symbol) for symbol in unique))
+    return {symbol: data for symbol, data in zip(unique, results) if data}
+
+
+async def async_get_coingecko_prices(symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Get prices for many cryptos with at most one CoinGecko request
+
+    Shares the per-symbol cache with api_utils.get_coingecko_prices.
+
+    Args:
+        symbols: Crypto symbols (e.g., ['BTC', 'ETH'])
+
+    Returns:
+        Price data keyed by upper-case symbol; symbols CoinGecko doesn't know are omitted
+    """
+    prices, stale, missing = {}, [], []
+    for symbol in dict.fromkeys(s.upper() for s in symbols):
+        value, fresh = api_cache.peek(("coingecko_price", symbol))
+        if value is None:
+            missing.append(symbol)
+            continue
+        prices[symbol] = value
+        if not fresh:
+            stale.append(symbol)
+
+    if stale:
+        api_cache.submit_refresh(("coingecko_prices", tuple(stale)),
+                                 lambda: api_utils._refresh_coingecko_prices(stale))
+    if not missing:
+        return prices
+
+    async def fetch():
+        coin_ids = _coingecko_ids(missing)
+        try:
+            response = await _provider_get("coingecko", f"{api_utils.COINGECKO_API_URL}/simple/price",
+                                           _coingecko_price_params(coin_ids), PRIORITY_REALTIME)
+            response.raise_for_status()
+            fetched = _parse_coingecko_prices(coin_ids, response.json())
+        except (httpx.HTTPError, ValueError, APIError) as e:
+            print(f"CoinGecko API error: {e}")
+            return None
+
+        for symbol, data in fetched.items():
+            api_cache.put(("coingecko_price", symbol), data, settings.CRYPTO_CACHE_TTL_SECONDS)
+        return fetched or None
+
+    # Concurrent misses for the same symbols share one request, cached under api_utils' batch key
+    fetched = await _cached(("coingecko_prices", tuple(missing)), settings.CRYPTO_CACHE_TTL_SECONDS, fetch,
+                            lambda: api_utils._refresh_coingecko_prices(missing) or None)
+    prices.update(fetched or {})
+    return prices
@@ -0,0 +1,194 @@
+"""
+In-memory TTL cache for external API responses
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+
+class CacheEntry:
+    """A cached value with its freshness deadlines"""
+    __slots__ = ("value", "fresh_until", "stale_until")
+
+    def __init__(self, value: Any, fresh_until: float, stale_until: float):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class TTLCache:
+    """
+    Bounded TTL cache with request coalescing and stale-while-revalidate
+
+    - Entries are fresh for their TTL, then served stale for ``stale_seconds``
+      more while a single background refresh replaces them.
+    - Concurrent misses for the same key share one upstream call.
+    - The least recently used entry is evicted beyond ``max_entries``.
+    - ``None`` results (failed upstream calls) are never cached; a failed
+      refresh keeps serving the stale value until it expires.
+    """
+
+    def __init__(self, max_entries: int = 10000, stale_seconds: float = 600, refresh_workers: int = 4):
+        self.max_entries = max_entries
+        self.stale_seconds = stale_seconds
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._refresh_executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="cache-refresh")
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.upstream_calls = 0
+
+    def get(self, key: Hashable, loader: Callable[[], Any], ttl: float) -> Any:
+        """Return the cached value for ``key``, loading it with ``loader`` on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.stale_until:
+                self._entries.move_to_end(key)
+                if now < entry.fresh_until:
+                    self.hits += 1
+                    return entry.value
+                # Stale: answer now, refresh once in the background
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self._inflight[key] = future = Future()
+                    self._refresh_executor.submit(self._load, key, loader, ttl, future)
+                return entry.value
+
+            self.misses += 1
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                self._inflight[key] = future = Future()
+            else:
+                self.coalesced += 1
+
+        if owner:
+            self._load(key, loader, ttl, future)
+        return future.result()
+
+    def _load(self, key: Hashable, loader: Callable[[], Any], ttl: float, future: Future):
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            if value is not None:
+                self._store(key, value, ttl)
+            elif key in self._entries:
+                value = self._entries[key].value
+            self.upstream_calls += 1
+        future.set_result(value)
+
+    def _store(self, key: Hashable, value: Any, ttl: float):
+        now = time.monotonic()
+        self._entries[key] = CacheEntry(value, now + ttl, now + ttl + self.stale_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def peek(self, key: Hashable) -> Tuple[Any, bool]:
+        """
+        Return ``(value, fresh)`` without loading anything
+
+        ``value`` is None on a miss or after the stale window; ``fresh`` is
+        False for stale values. Counts toward the hit/miss statistics.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or now >= entry.stale_until:
+                self.misses += 1
+                return None, False
+            self._entries.move_to_end(key)
+            fresh = now < entry.fresh_until
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return entry.value, fresh
+
+    def put(self, key: Hashable, value: Any, ttl: float):
+        """Store a value fetched outside ``get`` (e.g. by a batch request)"""
+        if value is None:
+            return
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def submit_refresh(self, key: Hashable, refresh: Callable[[], Any]):
+        """
+        Run ``refresh`` in the background unless one is already running for ``key``
+
+        ``refresh`` stores what it fetches itself (with ``put``); its return
+        value is handed to any ``get`` that coalesces onto it.
+        """
+        with self._lock:
+            if key in self._inflight:
+                return
+            self._inflight[key] = future = Future()
+
+        def run():
+            value = None
+            try:
+                value = refresh()
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+                    self.upstream_calls += 1
+                future.set_result(value)
+
+        self._refresh_executor.submit(run)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "upstream_calls": self.upstream_calls,
+                "inflight": len(self._inflight),
+                "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0
+            }
+
+
+def cached(cache: TTLCache, endpoint: str, ttl: Union[float, Callable[..., float]],
+           key: Optional[Callable[..., Hashable]] = None):
+    """
+    Cache a function's results in ``cache`` under ``(endpoint, key(*args, **kwargs))``
+
+    ``ttl`` is either seconds or a function of the call arguments, for
+    endpoints whose freshness depends on what is requested. The undecorated
+    function stays available as ``.uncached``.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = (endpoint, key(*args, **kwargs) if key else (args, tuple(sorted(kwargs.items()))))
+            seconds = ttl(*args, **kwargs) if callable(ttl) else ttl
+            return cache.get(cache_key, lambda: func(*args, **kwargs), seconds)
+
+        wrapper.uncached = func
+        return wrapper
+    return decorator
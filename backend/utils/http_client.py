@@ -0,0 +1,157 @@
+"""
+Shared HTTP clients for upstream market data providers
+
+Every provider call goes through one process-wide client so TCP and TLS
+connections are kept alive and reused instead of being set up per request.
+The sync client is a ``requests.Session`` with a connection pool per host;
+the async client is an ``httpx.AsyncClient`` for code running on the FastAPI
+event loop, which negotiates HTTP/2 when the optional ``h2`` package is
+installed.
+"""
+import asyncio
+import threading
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import settings
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+    httpx = None
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+USER_AGENT = f"{settings.APP_NAME}/1.0"
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_async_clients: Dict[int, Any] = {}
+_async_host_slots: Dict[int, Dict[str, asyncio.Semaphore]] = {}
+
+
+def get_session() -> requests.Session:
+    """
+    Get the shared keep-alive session for blocking provider calls
+
+    Pools hold up to HTTP_POOL_MAXSIZE idle connections for each of
+    HTTP_POOL_CONNECTIONS hosts; requests beyond that still succeed but
+    their connections are closed instead of returned to the pool.
+
+    Returns:
+        The process-wide session
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=settings.HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+                    max_retries=settings.HTTP_RETRIES
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers["User-Agent"] = USER_AGENT
+                _session = session
+    return _session
+
+
+def http_get(url: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> requests.Response:
+    """
+    GET ``url`` over a pooled connection
+
+    Args:
+        url: Request URL
+        params: Query parameters
+        timeout: Seconds to wait (defaults to HTTP_TIMEOUT_SECONDS)
+
+    Returns:
+        The response; raises requests.RequestException like requests.get
+    """
+    return get_session().get(url, params=params, timeout=timeout or settings.HTTP_TIMEOUT_SECONDS)
+
+
+def get_async_client():
+    """
+    Get the shared async client for the running event loop
+
+    httpx connections belong to the loop that opened them, so there is one
+    client per loop (in practice, one for the FastAPI server). Prefer
+    ``async_http_get``, which also bounds the requests in flight per host.
+
+    Returns:
+        An httpx.AsyncClient
+    """
+    if not HTTPX_AVAILABLE:
+        raise RuntimeError("httpx is required for the async HTTP client")
+
+    loop_id = id(asyncio.get_running_loop())
+    client = _async_clients.get(loop_id)
+    if client is None or client.is_closed:
+        pool_size = settings.HTTP_POOL_CONNECTIONS * settings.HTTP_POOL_MAXSIZE
+        transport = httpx.AsyncHTTPTransport(
+            http2=settings.HTTP2_ENABLED and HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            retries=settings.HTTP_RETRIES
+        )
+        client = httpx.AsyncClient(
+            transport=transport,
+            timeout=settings.HTTP_TIMEOUT_SECONDS,
+            headers={"User-Agent": USER_AGENT}
+        )
+        _async_clients[loop_id] = client
+        _async_host_slots[loop_id] = {}
+    return client
+
+
+async def async_http_get(url: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None):
+    """
+    GET ``url`` over a pooled connection without blocking the event loop
+
+    Args:
+        url: Request URL
+        params: Query parameters
+        timeout: Seconds to wait (defaults to HTTP_TIMEOUT_SECONDS)
+
+    Returns:
+        An httpx.Response; raises httpx.HTTPError on failure
+    """
+    client = get_async_client()
+    # Like the sync pools, at most HTTP_POOL_MAXSIZE requests per host are in
+    # flight; the rest queue here. httpx's own pool queue costs CPU per queued
+    # request on every state change, which dominates with hundreds waiting.
+    slots = _async_host_slots[id(asyncio.get_running_loop())]
+    host = urlsplit(url).netloc
+    if host not in slots:
+        slots[host] = asyncio.Semaphore(settings.HTTP_POOL_MAXSIZE)
+    async with slots[host]:
+        return await client.get(url, params=params, timeout=timeout or settings.HTTP_TIMEOUT_SECONDS)
+
+
+async def close_async_client():
+    """Close the running loop's async client (call from the app's shutdown hook)"""
+    loop_id = id(asyncio.get_running_loop())
+    _async_host_slots.pop(loop_id, None)
+    client = _async_clients.pop(loop_id, None)
+    if client is not None:
+        await client.aclose()
+
+
+def close_session():
+    """Close every pooled connection held by the sync session"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
@@ -0,0 +1,251 @@
+"""
+Token-bucket rate governor for upstream market data providers
+
+Each provider gets a bucket that refills continuously at its quota rate, so
+bulk work is spread evenly across the quota window instead of bursting into
+throttling. A log of recent grants backs the bucket up, since a full bucket
+plus a window's refill would otherwise allow twice the quota in one window.
+
+Waiting callers are served in priority order: realtime quotes first, then
+ordinary lookups, then bulk backfills. Bulk calls also leave a few tokens in
+reserve so a realtime request never queues behind a backfill.
+"""
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from config import settings
+
+PRIORITY_REALTIME = 0
+PRIORITY_NORMAL = 1
+PRIORITY_BULK = 2
+
+PRIORITY_NAMES = {PRIORITY_REALTIME: "realtime", PRIORITY_NORMAL: "normal", PRIORITY_BULK: "bulk"}
+
+# Share of each bucket that bulk calls may not spend
+REALTIME_RESERVE_SHARE = 0.2
+
+# How often async waiters behind the head of the queue re-check it
+ASYNC_POLL_SECONDS = 0.05
+
+# Calls reach the provider a little later than we grant them, and not all
+# equally late, so the provider's window is treated as this much longer
+WINDOW_SLACK_SHARE = 0.02
+
+
+class RateGovernor:
+    """
+    Token bucket with a priority queue of waiting callers
+
+    ``calls`` per ``period`` seconds, with bursts of up to ``calls`` but
+    never more than ``calls`` in any ``period``. A governor with
+    ``calls <= 0`` is unlimited but still counts calls.
+    """
+
+    def __init__(self, name: str, calls: int, period: float = 60.0):
+        self.name = name
+        self.calls = calls
+        self.period = period
+        self.window = period * (1 + WINDOW_SLACK_SHARE)
+        self.rate = calls / period if calls > 0 else 0.0
+        self.capacity = float(max(calls, 0))
+        self.reserve = max(1, int(calls * REALTIME_RESERVE_SHARE)) if calls > 1 else 0
+        self.tokens = self.capacity
+        self._recent = deque()
+        self.paused_until = 0.0
+        self._updated = time.monotonic()
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self.granted = 0
+        self.timeouts = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.last_wait = 0.0
+
+    def acquire(self, priority: int = PRIORITY_NORMAL, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a call to the provider is allowed
+
+        Args:
+            priority: PRIORITY_REALTIME, PRIORITY_NORMAL or PRIORITY_BULK
+            timeout: Give up after this many seconds (None waits indefinitely)
+
+        Returns:
+            True when the call may proceed, False if the wait timed out
+        """
+        enqueued = time.monotonic()
+        if self.calls <= 0:
+            with self._cond:
+                self._record_grant(0.0)
+            return True
+
+        deadline = None if timeout is None else enqueued + timeout
+        with self._cond:
+            ticket = self._enqueue(priority)
+            while True:
+                granted, wait = self._poll(ticket, priority, enqueued, deadline)
+                if granted is not None:
+                    return granted
+                self._cond.wait(wait)
+
+    async def acquire_async(self, priority: int = PRIORITY_NORMAL, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for a call slot without blocking the event loop
+
+        Same queue and ordering as ``acquire``. Async waiters can't be woken
+        by the condition, so callers behind the head of the queue re-check
+        every ASYNC_POLL_SECONDS. Cancelling the awaiting task leaves the queue.
+        """
+        enqueued = time.monotonic()
+        if self.calls <= 0:
+            with self._cond:
+                self._record_grant(0.0)
+            return True
+
+        deadline = None if timeout is None else enqueued + timeout
+        with self._cond:
+            ticket = self._enqueue(priority)
+        try:
+            while True:
+                with self._cond:
+                    granted, wait = self._poll(ticket, priority, enqueued, deadline)
+                if granted is not None:
+                    return granted
+                await asyncio.sleep(ASYNC_POLL_SECONDS if wait is None else min(wait, ASYNC_POLL_SECONDS))
+        except asyncio.CancelledError:
+            with self._cond:
+                self._abandon(ticket)
+            raise
+
+    def _enqueue(self, priority: int) -> tuple:
+        ticket = (priority, next(self._sequence))
+        heapq.heappush(self._waiting, ticket)
+        return ticket
+
+    def _abandon(self, ticket: tuple):
+        if ticket in self._waiting:
+            self._waiting.remove(ticket)
+            heapq.heapify(self._waiting)
+            self._cond.notify_all()
+
+    def _poll(self, ticket: tuple, priority: int, enqueued: float, deadline: Optional[float]) -> tuple:
+        """
+        Try to grant ``ticket``; call with the condition held
+
+        Returns ``(True, None)`` when granted, ``(False, None)`` on timeout,
+        else ``(None, seconds)`` to wait before trying again (None: until
+        notified).
+        """
+        now = time.monotonic()
+        self._refill(now)
+        wait = None
+        if self._waiting[0] == ticket:
+            needed = 1 + (self.reserve if priority >= PRIORITY_BULK else 0)
+            ready_at = self._ready_at(now, needed)
+            if ready_at <= now:
+                heapq.heappop(self._waiting)
+                self.tokens -= 1.0
+                self._recent.append(now)
+                self._record_grant(now - enqueued)
+                self._cond.notify_all()
+                return True, None
+            wait = ready_at - now
+
+        if deadline is not None:
+            remaining = deadline - now
+            if remaining <= 0:
+                self._abandon(ticket)
+                self.timeouts += 1
+                return False, None
+            wait = remaining if wait is None else min(wait, remaining)
+        return None, wait
+
+    def report_throttled(self):
+        """
+        Record that the provider rejected a call for exceeding its quota
+
+        Our view of the quota was optimistic (other clients share the key, or
+        the window is aligned differently), so the bucket is drained and
+        calls pause for one refill interval.
+        """
+        with self._cond:
+            now = time.monotonic()
+            self.throttled += 1
+            self.tokens = 0.0
+            self._updated = now
+            if self.rate:
+                self.paused_until = max(self.paused_until, now + 1.0 / self.rate)
+            self._cond.notify_all()
+
+    def _refill(self, now: float):
+        if now > self._updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def _ready_at(self, now: float, needed: int) -> float:
+        if self.paused_until > now:
+            return self.paused_until
+        recent = self._recent
+        while recent and recent[0] <= now - self.window:
+            recent.popleft()
+        deficit = needed - self.tokens
+        ready = now + deficit / self.rate if deficit > 0 else now
+        excess = len(recent) + needed - self.calls
+        if excess > 0:
+            # Wait for enough grants to age out of the window
+            ready = max(ready, recent[excess - 1] + self.window)
+        return ready
+
+    def _record_grant(self, waited: float):
+        self.granted += 1
+        self.total_wait += waited
+        self.last_wait = waited
+        self.max_wait = max(self.max_wait, waited)
+
+    def queue_depth(self) -> int:
+        with self._cond:
+            return len(self._waiting)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            by_priority = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _ in self._waiting:
+                by_priority[PRIORITY_NAMES.get(priority, "normal")] += 1
+            return {
+                "provider": self.name,
+                "calls_per_minute": round(self.rate * 60, 2) if self.calls > 0 else None,
+                "tokens": round(self.tokens, 2),
+                "queue_depth": len(self._waiting),
+                "queued": by_priority,
+                "granted": self.granted,
+                "timeouts": self.timeouts,
+                "throttled": self.throttled,
+                "paused_for_seconds": round(max(0.0, self.paused_until - now), 2),
+                "avg_wait_ms": round(self.total_wait / self.granted * 1000, 2) if self.granted else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 2),
+                "last_wait_ms": round(self.last_wait * 1000, 2)
+            }
+
+
+rate_governors: Dict[str, RateGovernor] = {
+    "alpha_vantage": RateGovernor("alpha_vantage", settings.ALPHA_VANTAGE_CALLS_PER_MINUTE),
+    "coingecko": RateGovernor("coingecko", settings.COINGECKO_CALLS_PER_MINUTE),
+    "yahoo": RateGovernor("yahoo", settings.YAHOO_CALLS_PER_MINUTE),
+}
+
+
+def get_rate_governor(provider: str) -> RateGovernor:
+    """Get the governor for a provider ('alpha_vantage', 'coingecko' or 'yahoo')"""
+    return rate_governors[provider]
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: governor.stats() for name, governor in rate_governors.items()}
@@ -5,251 +5,465 @@ Compatible with older MacBook systems
 """
 
 import json
+import math
 import random
+import re
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from json.encoder import encode_basestring_ascii
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from http.server import HTTPServer, ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Investment tables, built once at startup. Explanations and advice are
+# str.format templates filled in with the user's age and risk tolerance.
+INVESTMENT_EXPLANATIONS = {
+    'Government Bonds': "Government bonds provide stable, guaranteed returns perfect for {age}-year-olds seeking capital preservation. They're backed by the full faith and credit of the government, making them the safest investment option.",
+    'Corporate Bonds': "Corporate bonds offer higher yields than government bonds while maintaining relatively low risk. For someone your age, they provide steady income with moderate risk exposure.",
+    'Blue Chip Stocks': "Blue chip stocks represent established, financially sound companies with a history of reliable performance. They're ideal for {risk_tolerance} investors seeking long-term growth with lower volatility.",
+    'Growth Stocks': "Growth stocks focus on companies with above-average growth potential. Perfect for younger investors like you who can weather short-term volatility for long-term gains.",
+    'Technology Stocks': "Tech stocks offer high growth potential in the digital economy. They're volatile but can provide exceptional returns for investors with a {risk_tolerance} risk profile.",
+    'S&P 500 Index Fund': "An S&P 500 index fund gives you instant diversification across 500 of America's largest companies. It's the foundation of most successful long-term investment strategies.",
+    'Total Bond Market': "Total bond market funds provide broad exposure to the entire bond market, offering stability and income generation for balanced portfolios.",
+    'International Stocks': "International stocks provide geographic diversification and access to global growth opportunities, reducing your portfolio's dependence on the US market.",
+    'REITs': "Real Estate Investment Trusts (REITs) give you exposure to real estate without owning property directly. They provide regular income and inflation protection.",
+    'Commodities': "Commodities like gold and oil provide inflation hedge and portfolio diversification. They often move independently of stock markets.",
+    'Cryptocurrency': "Crypto offers high growth potential but with significant volatility. Only suitable for {risk_tolerance} investors who can handle extreme price swings.",
+    'Small Cap Stocks': "Small cap stocks represent smaller companies with high growth potential. They're riskier but can provide exceptional returns for long-term investors.",
+    'High-Yield Savings': "High-yield savings accounts provide liquidity and safety for your emergency fund and short-term goals. They offer FDIC insurance up to $250,000.",
+    'Cash/CDs': "Cash and CDs provide maximum safety and liquidity. Essential for emergency funds and short-term financial goals."
+}
+DEFAULT_EXPLANATION = "{asset_type} provides diversification and growth potential for your investment portfolio."
+
+INVESTMENT_BENEFITS = {
+    'Government Bonds': ('Guaranteed principal repayment', 'Regular interest payments', 'Tax advantages', 'Liquidity'),
+    'Corporate Bonds': ('Higher yields than government bonds', 'Regular income', 'Lower risk than stocks', 'Diversification'),
+    'Blue Chip Stocks': ('Dividend income', 'Long-term growth potential', 'Lower volatility', 'Liquidity'),
+    'Growth Stocks': ('High growth potential', 'Capital appreciation', 'Innovation exposure', 'Long-term wealth building'),
+    'Technology Stocks': ('Sector growth exposure', 'Innovation leadership', 'High return potential', 'Future-focused'),
+    'S&P 500 Index Fund': ('Instant diversification', 'Low fees', 'Market performance', 'Professional management'),
+    'Total Bond Market': ('Broad bond exposure', 'Income generation', 'Risk reduction', 'Professional management'),
+    'International Stocks': ('Geographic diversification', 'Currency exposure', 'Global growth', 'Risk reduction'),
+    'REITs': ('Real estate exposure', 'Regular dividends', 'Inflation hedge', 'Professional management'),
+    'Commodities': ('Inflation protection', 'Portfolio diversification', 'Store of value', 'Global demand'),
+    'Cryptocurrency': ('High growth potential', 'Decentralized', '24/7 trading', 'Innovation exposure'),
+    'Small Cap Stocks': ('High growth potential', 'Undervalued opportunities', 'Market inefficiencies', 'Long-term gains'),
+    'High-Yield Savings': ('FDIC insurance', 'Liquidity', 'No risk', 'Easy access'),
+    'Cash/CDs': ('Maximum safety', 'Guaranteed returns', 'Liquidity', 'No risk')
+}
+DEFAULT_BENEFITS = ('Diversification', 'Growth potential', 'Professional management')
+
+INVESTMENT_RISKS = {
+    'Government Bonds': ('Interest rate risk', 'Inflation risk', 'Lower returns', 'Opportunity cost'),
+    'Corporate Bonds': ('Credit risk', 'Interest rate risk', 'Liquidity risk', 'Default risk'),
+    'Blue Chip Stocks': ('Market volatility', 'Company-specific risk', 'Economic downturns', 'Dividend cuts'),
+    'Growth Stocks': ('High volatility', 'Valuation risk', 'Market timing', 'Sector concentration'),
+    'Technology Stocks': ('Extreme volatility', 'Regulatory risk', 'Competition', 'Valuation bubbles'),
+    'S&P 500 Index Fund': ('Market risk', 'No downside protection', 'Index concentration', 'Tracking error'),
+    'Total Bond Market': ('Interest rate risk', 'Credit risk', 'Inflation risk', 'Liquidity risk'),
+    'International Stocks': ('Currency risk', 'Political risk', 'Regulatory differences', 'Liquidity issues'),
+    'REITs': ('Interest rate sensitivity', 'Real estate cycles', 'Liquidity risk', 'Management risk'),
+    'Commodities': ('High volatility', 'Storage costs', 'No income generation', 'Speculation risk'),
+    'Cryptocurrency': ('Extreme volatility', 'Regulatory uncertainty', 'Technology risk', 'No intrinsic value'),
+    'Small Cap Stocks': ('High volatility', 'Liquidity risk', 'Information asymmetry', 'Higher failure rates'),
+    'High-Yield Savings': ('Low returns', 'Inflation erosion', 'Opportunity cost', 'Rate changes'),
+    'Cash/CDs': ('Inflation risk', 'Low returns', 'Opportunity cost', 'Rate changes')
+}
+DEFAULT_RISKS = ('Market risk', 'Volatility', 'Economic factors')
+
+AGE_ADVICE = {
+    'young_professional': {
+        'title': 'Young Professional (Age {age}) - Build Your Foundation',
+        'description': 'At {age}, you have the most valuable asset: time. Your investments have decades to compound, making this the perfect time to take calculated risks and build wealth.',
+        'tips': (
+            'Start investing early - even small amounts compound significantly over time',
+            'Take advantage of employer 401(k) matching - it\'s free money',
+            'Consider a Roth IRA for tax-free growth over 30+ years',
+            'Don\'t be afraid of market volatility - you have time to recover',
+            'Focus on growth investments like index funds and growth stocks',
+            'Build an emergency fund of 3-6 months expenses',
+            'Consider real estate investment for diversification'
+        )
+    },
+    'early_career': {
+        'title': 'Early Career (Age {age}) - Accelerate Growth',
+        'description': 'You\'re in your prime earning years with {years_to_retirement} years until retirement. This is the time to maximize your investment contributions and take advantage of compound growth.',
+        'tips': (
+            'Maximize your 401(k) contributions - aim for 15-20% of income',
+            'Consider a Health Savings Account (HSA) for triple tax benefits',
+            'Diversify with international investments for global exposure',
+            'Consider real estate investment through REITs or direct ownership',
+            'Review and rebalance your portfolio annually',
+            'Increase emergency fund to 6 months of expenses',
+            'Consider starting a side business for additional income streams'
+        )
+    },
+    'mid_career': {
+        'title': 'Mid-Career (Age {age}) - Balance Growth and Stability',
+        'description': 'You\'re in your peak earning years with {years_to_retirement} years until retirement. Balance aggressive growth with some stability as you approach your financial goals.',
+        'tips': (
+            'Consider catch-up contributions to retirement accounts',
+            'Diversify with bonds and stable investments (20-30%)',
+            'Review your asset allocation - consider target-date funds',
+            'Maximize tax-advantaged accounts (401k, IRA, HSA)',
+            'Consider college savings plans if you have children',
+            'Evaluate life insurance needs for family protection',
+            'Start thinking about estate planning and wills'
+        )
+    },
+    'pre_retirement': {
+        'title': 'Pre-Retirement (Age {age}) - Preserve and Prepare',
+        'description': 'You\'re {years_to_retirement} years from retirement. Focus on capital preservation while maintaining some growth to outpace inflation.',
+        'tips': (
+            'Increase bond allocation to 40-50% for stability',
+            'Consider annuities for guaranteed income streams',
+            'Maximize catch-up contributions ($7,500 for 401k, $1,000 for IRA)',
+            'Review and update your retirement budget',
+            'Consider downsizing or relocating for lower costs',
+            'Evaluate long-term care insurance options',
+            'Create a detailed retirement income plan'
+        )
+    },
+    'retirement': {
+        'title': 'Retirement (Age {age}) - Income and Preservation',
+        'description': 'You\'re in retirement. Focus on generating reliable income while preserving capital for your remaining years.',
+        'tips': (
+            'Maintain 50-60% in bonds and stable investments',
+            'Consider dividend-paying stocks for regular income',
+            'Use the 4% rule for safe withdrawal rates',
+            'Keep 2-3 years of expenses in cash/CDs',
+            'Consider immediate annuities for guaranteed income',
+            'Review and adjust your portfolio annually',
+            'Consider charitable giving strategies for tax benefits'
+        )
+    }
+}
+
+# (title, description template, priority); None means the priority depends on the debt ratio
+ACTION_PLAN_STEPS = (
+    ('Emergency Fund Assessment', 'Evaluate your current emergency fund. You need ${emergency_fund} (6 months of expenses) for financial security.', 'high'),
+    ('Debt Management Review', 'Your debt-to-income ratio is {debt_ratio}%. Keep it under 36% for optimal financial health.', None),
+    ('Retirement Account Optimization', 'Maximize your 401(k) contributions, especially if your employer offers matching.', 'high'),
+    ('Investment Account Setup', 'Open a brokerage account or IRA for additional investment opportunities.', 'medium'),
+    ('Portfolio Rebalancing', 'Review and rebalance your portfolio to maintain your target asset allocation.', 'medium')
+)
+GOAL_ACTION_STEPS = {
+    'house': ('Home Buying Preparation', 'Research mortgage options, improve credit score, and save for down payment.', 'high'),
+    'education': ('Education Fund Setup', 'Open a 529 plan or Education Savings Account for tax-advantaged education savings.', 'high'),
+    'debt_payoff': ('Debt Payoff Strategy', 'Create a debt snowball or avalanche plan to eliminate high-interest debt quickly.', 'high')
+}
+# A tuple, so request values that can't be hashed are compared rather than raising
+PREDICTION_GOALS = tuple(GOAL_ACTION_STEPS)
+
+# Risk tolerance -> (expected return, confidence, [(asset type, percentage, share of invested income)])
+INVESTMENT_STRATEGIES = {
+    'conservative': (4.5, 90, (
+        ('Government Bonds', 40, 0.4), ('Corporate Bonds', 25, 0.25), ('Blue Chip Stocks', 20, 0.2),
+        ('High-Yield Savings', 10, 0.1), ('REITs', 5, 0.05)
+    )),
+    'aggressive': (11.5, 75, (
+        ('Growth Stocks', 45, 0.45), ('Technology Stocks', 25, 0.25), ('Cryptocurrency', 15, 0.15),
+        ('International Stocks', 10, 0.1), ('Small Cap Stocks', 5, 0.05)
+    )),
+    'moderate': (7.8, 85, (
+        ('S&P 500 Index Fund', 35, 0.35), ('Total Bond Market', 25, 0.25), ('International Stocks', 20, 0.2),
+        ('REITs', 10, 0.1), ('Commodities', 5, 0.05), ('Cash/CDs', 5, 0.05)
+    ))
+}
 
 # Helper functions for enhanced AI predictions
 def get_investment_explanation(asset_type, age, risk_tolerance):
-    explanations = {
-        'Government Bonds': f"Government bonds provide stable, guaranteed returns perfect for {age}-year-olds seeking capital preservation. They're backed by the full faith and credit of the government, making them the safest investment option.",
-        'Corporate Bonds': f"Corporate bonds offer higher yields than government bonds while maintaining relatively low risk. For someone your age, they provide steady income with moderate risk exposure.",
-        'Blue Chip Stocks': f"Blue chip stocks represent established, financially sound companies with a history of reliable performance. They're ideal for {risk_tolerance} investors seeking long-term growth with lower volatility.",
-        'Growth Stocks': f"Growth stocks focus on companies with above-average growth potential. Perfect for younger investors like you who can weather short-term volatility for long-term gains.",
-        'Technology Stocks': f"Tech stocks offer high growth potential in the digital economy. They're volatile but can provide exceptional returns for investors with a {risk_tolerance} risk profile.",
-        'S&P 500 Index Fund': f"An S&P 500 index fund gives you instant diversification across 500 of America's largest companies. It's the foundation of most successful long-term investment strategies.",
-        'Total Bond Market': f"Total bond market funds provide broad exposure to the entire bond market, offering stability and income generation for balanced portfolios.",
-        'International Stocks': f"International stocks provide geographic diversification and access to global growth opportunities, reducing your portfolio's dependence on the US market.",
-        'REITs': f"Real Estate Investment Trusts (REITs) give you exposure to real estate without owning property directly. They provide regular income and inflation protection.",
-        'Commodities': f"Commodities like gold and oil provide inflation hedge and portfolio diversification. They often move independently of stock markets.",
-        'Cryptocurrency': f"Crypto offers high growth potential but with significant volatility. Only suitable for {risk_tolerance} investors who can handle extreme price swings.",
-        'Small Cap Stocks': f"Small cap stocks represent smaller companies with high growth potential. They're riskier but can provide exceptional returns for long-term investors.",
-        'High-Yield Savings': f"High-yield savings accounts provide liquidity and safety for your emergency fund and short-term goals. They offer FDIC insurance up to $250,000.",
-        'Cash/CDs': f"Cash and CDs provide maximum safety and liquidity. Essential for emergency funds and short-term financial goals."
-    }
-    return explanations.get(asset_type, f"{asset_type} provides diversification and growth potential for your investment portfolio.")
+    return INVESTMENT_EXPLANATIONS.get(asset_type, DEFAULT_EXPLANATION).format(
+        age=age, risk_tolerance=risk_tolerance, asset_type=asset_type)
 
 def get_investment_benefits(asset_type):
-    benefits_map = {
-        'Government Bonds': ['Guaranteed principal repayment', 'Regular interest payments', 'Tax advantages', 'Liquidity'],
-        'Corporate Bonds': ['Higher yields than government bonds', 'Regular income', 'Lower risk than stocks', 'Diversification'],
-        'Blue Chip Stocks': ['Dividend income', 'Long-term growth potential', 'Lower volatility', 'Liquidity'],
-        'Growth Stocks': ['High growth potential', 'Capital appreciation', 'Innovation exposure', 'Long-term wealth building'],
-        'Technology Stocks': ['Sector growth exposure', 'Innovation leadership', 'High return potential', 'Future-focused'],
-        'S&P 500 Index Fund': ['Instant diversification', 'Low fees', 'Market performance', 'Professional management'],
-        'Total Bond Market': ['Broad bond exposure', 'Income generation', 'Risk reduction', 'Professional management'],
-        'International Stocks': ['Geographic diversification', 'Currency exposure', 'Global growth', 'Risk reduction'],
-        'REITs': ['Real estate exposure', 'Regular dividends', 'Inflation hedge', 'Professional management'],
-        'Commodities': ['Inflation protection', 'Portfolio diversification', 'Store of value', 'Global demand'],
-        'Cryptocurrency': ['High growth potential', 'Decentralized', '24/7 trading', 'Innovation exposure'],
-        'Small Cap Stocks': ['High growth potential', 'Undervalued opportunities', 'Market inefficiencies', 'Long-term gains'],
-        'High-Yield Savings': ['FDIC insurance', 'Liquidity', 'No risk', 'Easy access'],
-        'Cash/CDs': ['Maximum safety', 'Guaranteed returns', 'Liquidity', 'No risk']
-    }
-    return benefits_map.get(asset_type, ['Diversification', 'Growth potential', 'Professional management'])
+    return list(INVESTMENT_BENEFITS.get(asset_type, DEFAULT_BENEFITS))
 
 def get_investment_risks(asset_type):
-    risks_map = {
-        'Government Bonds': ['Interest rate risk', 'Inflation risk', 'Lower returns', 'Opportunity cost'],
-        'Corporate Bonds': ['Credit risk', 'Interest rate risk', 'Liquidity risk', 'Default risk'],
-        'Blue Chip Stocks': ['Market volatility', 'Company-specific risk', 'Economic downturns', 'Dividend cuts'],
-        'Growth Stocks': ['High volatility', 'Valuation risk', 'Market timing', 'Sector concentration'],
-        'Technology Stocks': ['Extreme volatility', 'Regulatory risk', 'Competition', 'Valuation bubbles'],
-        'S&P 500 Index Fund': ['Market risk', 'No downside protection', 'Index concentration', 'Tracking error'],
-        'Total Bond Market': ['Interest rate risk', 'Credit risk', 'Inflation risk', 'Liquidity risk'],
-        'International Stocks': ['Currency risk', 'Political risk', 'Regulatory differences', 'Liquidity issues'],
-        'REITs': ['Interest rate sensitivity', 'Real estate cycles', 'Liquidity risk', 'Management risk'],
-        'Commodities': ['High volatility', 'Storage costs', 'No income generation', 'Speculation risk'],
-        'Cryptocurrency': ['Extreme volatility', 'Regulatory uncertainty', 'Technology risk', 'No intrinsic value'],
-        'Small Cap Stocks': ['High volatility', 'Liquidity risk', 'Information asymmetry', 'Higher failure rates'],
-        'High-Yield Savings': ['Low returns', 'Inflation erosion', 'Opportunity cost', 'Rate changes'],
-        'Cash/CDs': ['Inflation risk', 'Low returns', 'Opportunity cost', 'Rate changes']
-    }
-    return risks_map.get(asset_type, ['Market risk', 'Volatility', 'Economic factors'])
+    return list(INVESTMENT_RISKS.get(asset_type, DEFAULT_RISKS))
+
+def get_age_bracket(age):
+    return 'young_professional' if age < 30 else 'early_career' if age < 40 else 'mid_career' if age < 50 else 'pre_retirement' if age < 60 else 'retirement'
 
 def get_age_specific_advice(age_bracket, age):
-    advice_map = {
-        'young_professional': {
-            'title': f'Young Professional (Age {age}) - Build Your Foundation',
-            'description': f'At {age}, you have the most valuable asset: time. Your investments have decades to compound, making this the perfect time to take calculated risks and build wealth.',
-            'tips': [
-                'Start investing early - even small amounts compound significantly over time',
-                'Take advantage of employer 401(k) matching - it\'s free money',
-                'Consider a Roth IRA for tax-free growth over 30+ years',
-                'Don\'t be afraid of market volatility - you have time to recover',
-                'Focus on growth investments like index funds and growth stocks',
-                'Build an emergency fund of 3-6 months expenses',
-                'Consider real estate investment for diversification'
-            ]
-        },
-        'early_career': {
-            'title': f'Early Career (Age {age}) - Accelerate Growth',
-            'description': f'You\'re in your prime earning years with {65-age} years until retirement. This is the time to maximize your investment contributions and take advantage of compound growth.',
-            'tips': [
-                'Maximize your 401(k) contributions - aim for 15-20% of income',
-                'Consider a Health Savings Account (HSA) for triple tax benefits',
-                'Diversify with international investments for global exposure',
-                'Consider real estate investment through REITs or direct ownership',
-                'Review and rebalance your portfolio annually',
-                'Increase emergency fund to 6 months of expenses',
-                'Consider starting a side business for additional income streams'
-            ]
-        },
-        'mid_career': {
-            'title': f'Mid-Career (Age {age}) - Balance Growth and Stability',
-            'description': f'You\'re in your peak earning years with {65-age} years until retirement. Balance aggressive growth with some stability as you approach your financial goals.',
-            'tips': [
-                'Consider catch-up contributions to retirement accounts',
-                'Diversify with bonds and stable investments (20-30%)',
-                'Review your asset allocation - consider target-date funds',
-                'Maximize tax-advantaged accounts (401k, IRA, HSA)',
-                'Consider college savings plans if you have children',
-                'Evaluate life insurance needs for family protection',
-                'Start thinking about estate planning and wills'
-            ]
-        },
-        'pre_retirement': {
-            'title': f'Pre-Retirement (Age {age}) - Preserve and Prepare',
-            'description': f'You\'re {65-age} years from retirement. Focus on capital preservation while maintaining some growth to outpace inflation.',
-            'tips': [
-                'Increase bond allocation to 40-50% for stability',
-                'Consider annuities for guaranteed income streams',
-                'Maximize catch-up contributions ($7,500 for 401k, $1,000 for IRA)',
-                'Review and update your retirement budget',
-                'Consider downsizing or relocating for lower costs',
-                'Evaluate long-term care insurance options',
-                'Create a detailed retirement income plan'
-            ]
-        },
-        'retirement': {
-            'title': f'Retirement (Age {age}) - Income and Preservation',
-            'description': f'You\'re in retirement. Focus on generating reliable income while preserving capital for your remaining years.',
-            'tips': [
-                'Maintain 50-60% in bonds and stable investments',
-                'Consider dividend-paying stocks for regular income',
-                'Use the 4% rule for safe withdrawal rates',
-                'Keep 2-3 years of expenses in cash/CDs',
-                'Consider immediate annuities for guaranteed income',
-                'Review and adjust your portfolio annually',
-                'Consider charitable giving strategies for tax benefits'
-            ]
-        }
+    advice = AGE_ADVICE.get(age_bracket, AGE_ADVICE['mid_career'])
+    return {
+        'title': advice['title'].format(age=age),
+        'description': advice['description'].format(age=age, years_to_retirement=65 - age),
+        'tips': list(advice['tips'])
     }
-    return advice_map.get(age_bracket, advice_map['mid_career'])
 
 def get_action_plan(age_bracket, financial_goals, debt_ratio, emergency_fund_needed):
-    base_plan = [
-        {
-            'title': 'Emergency Fund Assessment',
-            'description': f'Evaluate your current emergency fund. You need ${emergency_fund_needed:,.0f} (6 months of expenses) for financial security.',
-            'priority': 'high'
-        },
-        {
-            'title': 'Debt Management Review',
-            'description': f'Your debt-to-income ratio is {debt_ratio:.1f}%. Keep it under 36% for optimal financial health.',
-            'priority': 'high' if debt_ratio > 36 else 'medium'
-        },
-        {
-            'title': 'Retirement Account Optimization',
-            'description': 'Maximize your 401(k) contributions, especially if your employer offers matching.',
-            'priority': 'high'
-        },
-        {
-            'title': 'Investment Account Setup',
-            'description': 'Open a brokerage account or IRA for additional investment opportunities.',
-            'priority': 'medium'
-        },
+    steps = ACTION_PLAN_STEPS + ((GOAL_ACTION_STEPS[financial_goals],) if financial_goals in PREDICTION_GOALS else ())
+    emergency_fund = f'{emergency_fund_needed:,.0f}'
+    debt_priority = 'high' if debt_ratio > 36 else 'medium'
+    return [
         {
-            'title': 'Portfolio Rebalancing',
-            'description': 'Review and rebalance your portfolio to maintain your target asset allocation.',
-            'priority': 'medium'
+            'title': title,
+            'description': description.format(emergency_fund=emergency_fund, debt_ratio=f'{debt_ratio:.1f}'),
+            'priority': priority or debt_priority
         }
+        for title, description, priority in steps
     ]
+
+SLOT_PATTERN = re.compile(r'"@@(\w+)@@"|@@(\w+)@@')
+
+def _slot(name):
+    """Placeholder for a per-request value in a response template"""
+    return f'@@{name}@@'
+
+def _json_text(value):
+    """A value formatted as text, escaped for use inside a JSON string"""
+    return encode_basestring_ascii(f'{value}')[1:-1]
+
+def _json_number(value):
+    """A number encoded exactly as json.dumps would"""
+    if type(value) is int:
+        return int.__repr__(value)
+    if type(value) is float and value - value == 0:
+        return float.__repr__(value)
+    return json.dumps(value)
+
+class PredictionTemplate:
+    """
+    Pre-serialized /api/v1/prediction/predict response for one
+    (risk_tolerance, age_bracket, goal). All the text, benefits, risks, tips
+    and action steps are encoded once; per request only the numbers (and the
+    age and risk tolerance inside the text) are filled in.
+    """
+
+    def __init__(self, risk_tolerance, age_bracket, goal):
+        base_return, confidence, allocations = INVESTMENT_STRATEGIES[risk_tolerance]
+        self.shares = tuple(share for _, _, share in allocations)
+        text = {'age': _slot('age'), 'risk_tolerance': _slot('risk_text')}
+        advice = AGE_ADVICE[age_bracket]
+        steps = ACTION_PLAN_STEPS + ((GOAL_ACTION_STEPS[goal],) if goal else ())
+
+        response = {
+            "expected_return": round(base_return, 1),
+            "confidence_score": confidence,
+            "risk_level": _slot('risk_level'),
+            "investment_categories": [
+                {
+                    'name': asset_type,
+                    'allocation': percentage,
+                    'amount': _slot(f'amount_{i}'),
+                    'explanation': INVESTMENT_EXPLANATIONS[asset_type].format(asset_type=asset_type, **text),
+                    'benefits': list(INVESTMENT_BENEFITS[asset_type]),
+                    'risks': list(INVESTMENT_RISKS[asset_type])
+                }
+                for i, (asset_type, percentage, _) in enumerate(allocations)
+            ],
+            "age_advice": {
+                'title': advice['title'].format(**text),
+                'description': advice['description'].format(years_to_retirement=_slot('years_to_retirement'), **text),
+                'tips': list(advice['tips'])
+            },
+            "emergency_fund_status": _slot('emergency_fund_status'),
+            "emergency_fund_advice": f"You should have ${_slot('emergency_fund')} in emergency savings (6 months of expenses).",
+            "debt_ratio": _slot('debt_ratio'),
+            "debt_advice": _slot('debt_advice'),
+            "recommended_monthly_investment": _slot('recommended_monthly_investment'),
+            "investment_advice": f"Based on your income, aim to invest ${_slot('monthly_investment')} monthly for optimal growth.",
+            "action_plan": [
+                {
+                    'title': title,
+                    'description': description.format(emergency_fund=_slot('emergency_fund'), debt_ratio=_slot('debt_ratio_text')),
+                    'priority': priority or _slot('debt_priority')
+                }
+                for title, description, priority in steps
+            ],
+            "recommendation": f"Personalized {_slot('risk_text')} strategy optimized for your {age_bracket.replace('_', ' ')} profile with {len(allocations)} diversified investment categories.",
+            "timestamp": _slot('timestamp')
+        }
+
+        # Split the serialized response into static pieces around the slots
+        encoded = json.dumps(response)
+        self._pieces, position = [], 0
+        for match in SLOT_PATTERN.finditer(encoded):
+            self._pieces.append((encoded[position:match.start()], match.group(1) or match.group(2)))
+            position = match.end()
+        self._suffix = encoded[position:]
+
+    def render(self, values):
+        """Fill in the per-request values (already JSON-encoded) and return the response body"""
+        parts = []
+        for static, slot in self._pieces:
+            parts.append(static)
+            parts.append(values[slot])
+        parts.append(self._suffix)
+        return ''.join(parts).encode()
+
+PREDICTION_TEMPLATES = {
+    (risk_tolerance, age_bracket, goal): PredictionTemplate(risk_tolerance, age_bracket, goal)
+    for risk_tolerance in INVESTMENT_STRATEGIES
+    for age_bracket in AGE_ADVICE
+    for goal in (None,) + PREDICTION_GOALS
+}
+
+def render_prediction(data):
+    """Encode the /api/v1/prediction/predict response for a request body from its precompiled template"""
+    # Enhanced AI prediction with comprehensive analysis
+    age = data.get('age', 30)
+    income = data.get('annual_income', 75000)
+    risk_tolerance = data.get('risk_tolerance', 'moderate')
+    horizon = data.get('investment_horizon_years', 10)
+    financial_goals = data.get('financial_goals', 'retirement')
+    dependents = data.get('dependents', 0)
+    debt_amount = data.get('debt_amount', 0)
+    monthly_expenses = data.get('monthly_expenses', 3000)
+
+    # Calculate financial health metrics
+    debt_ratio = (debt_amount / income * 100) if income > 0 else 0
+    emergency_fund_needed = monthly_expenses * 6
+    recommended_monthly_investment = max(income * 0.15 / 12, 500)
+
+    # Age-based strategy, risk-adjusted allocations and goal-specific action plan
+    age_bracket = get_age_bracket(age)
+    strategy = risk_tolerance if risk_tolerance in ('conservative', 'aggressive') else 'moderate'
+    goal = financial_goals if financial_goals in PREDICTION_GOALS else None
+    template = PREDICTION_TEMPLATES[(strategy, age_bracket, goal)]
+
+    values = {f'amount_{i}': _json_number(income * 0.2 * share) for i, share in enumerate(template.shares)}
+    values['age'] = _json_text(age)
+    values['risk_text'] = _json_text(risk_tolerance)
+    values['years_to_retirement'] = _json_text(65 - age)
+
+    # Financial health assessment
+    values['emergency_fund_status'] = '"Excellent"' if emergency_fund_needed <= 10000 else '"Good"' if emergency_fund_needed <= 25000 else '"Needs Improvement"'
+    values['emergency_fund'] = f'{emergency_fund_needed:,.0f}'
+    values['debt_advice'] = '"Excellent debt management!"' if debt_ratio < 20 else '"Good debt level"' if debt_ratio < 36 else '"Consider debt reduction before investing heavily."'
+    values['monthly_investment'] = f'{recommended_monthly_investment:,.0f}'
+    values['debt_ratio_text'] = f'{debt_ratio:.1f}'
+    values['debt_priority'] = '"high"' if debt_ratio > 36 else '"medium"'
+
+    values['risk_level'] = encode_basestring_ascii(risk_tolerance.title())
+    values['debt_ratio'] = _json_number(round(debt_ratio, 1))
+    values['recommended_monthly_investment'] = _json_number(recommended_monthly_investment)
+    values['timestamp'] = _json_number(int(time.time()))
+    return template.render(values)
+from collections import namedtuple
+from urllib.parse import urlparse, parse_qs, urlsplit
+import threading
+import http.client
+import os
+import gzip
+import hashlib
+try:
+    import brotli  # optional: adds br variants to cached responses
+except ImportError:
+    brotli = None
+
+class KeepAliveHTTPClient:
+    """Reuses HTTP/1.1 connections per host so repeat fetches skip the TCP/TLS handshake"""
+
+    def __init__(self, max_per_host=4, timeout=10):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        """GET url and return the response body; raises OSError or http.client.HTTPException on failure"""
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = parts.path + ('?' + parts.query if parts.query else '')
+
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            conn = idle.pop() if idle else None
+        reused = conn is not None
+
+        while True:
+            if conn is None:
+                conn_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+                conn = conn_class(parts.netloc, timeout=self.timeout)
+            try:
+                conn.request('GET', path, headers={'Accept': 'application/json'})
+                response = conn.getresponse()
+                body = response.read()
+                break
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if not reused:
+                    raise
+                # The server closed an idle connection; retry once on a fresh one
+                conn, reused = None, False
+
+        if response.will_close:
+            conn.close()
+        else:
+            with self._lock:
+                idle = self._idle[key]
+                if len(idle) < self.max_per_host:
+                    idle.append(conn)
+                    conn = None
+            if conn is not None:
+                conn.close()
+
+        if response.status >= 400:
+            raise http.client.HTTPException(f"HTTP {response.status} from {parts.netloc}")
+        return body
+
+upstream_client = KeepAliveHTTPClient(max_per_host=int(os.environ.get('HTTP_POOL_MAXSIZE', 4)))
+COINGECKO_API_URL = os.environ.get('COINGECKO_API_URL', 'https://api.coingecko.com/api/v3')
+
+def fetch_live_crypto_data():
+    """Fetch cryptocurrency data from CoinGecko API (free, no API key required); raises on failure"""
+    # Use CoinGecko free API
+    url = f"{COINGECKO_API_URL}/simple/price?ids=bitcoin,ethereum,binancecoin,cardano,solana,polkadot,chainlink,avalanche-2,polygon,stellar&vs_currencies=usd&include_24hr_change=true&include_market_cap=true"
     
-    if financial_goals == 'house':
-        base_plan.append({
-            'title': 'Home Buying Preparation',
-            'description': 'Research mortgage options, improve credit score, and save for down payment.',
-            'priority': 'high'
-        })
-    elif financial_goals == 'education':
-        base_plan.append({
-            'title': 'Education Fund Setup',
-            'description': 'Open a 529 plan or Education Savings Account for tax-advantaged education savings.',
-            'priority': 'high'
-        })
-    elif financial_goals == 'debt_payoff':
-        base_plan.append({
-            'title': 'Debt Payoff Strategy',
-            'description': 'Create a debt snowball or avalanche plan to eliminate high-interest debt quickly.',
-            'priority': 'high'
+    data = json.loads(upstream_client.get(url).decode())
+    
+    # Transform data to our format
+    crypto_data = []
+    for coin_id, info in data.items():
+        crypto_data.append({
+            'id': coin_id,
+            'name': coin_id.replace('-', ' ').title(),
+            'symbol': coin_id.upper()[:3],
+            'price': info['usd'],
+            'change_24h': info.get('usd_24h_change', 0),
+            'market_cap': info.get('usd_market_cap', 0)
         })
     
-    return base_plan
-from urllib.parse import urlparse, parse_qs
-import threading
-import urllib.request
-import urllib.error
-
-# Cache for cryptocurrency data (simple in-memory cache)
-crypto_cache = {
-    'data': None,
-    'timestamp': 0,
-    'news': None,
-    'news_timestamp': 0
-}
+    return crypto_data
 
 def fetch_crypto_data():
     """Fetch cryptocurrency data from CoinGecko API (free, no API key required)"""
     try:
-        # Use CoinGecko free API
-        url = "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin,ethereum,binancecoin,cardano,solana,polkadot,chainlink,avalanche-2,polygon,stellar&vs_currencies=usd&include_24hr_change=true&include_market_cap=true"
-        
-        with urllib.request.urlopen(url, timeout=10) as response:
-            data = json.loads(response.read().decode())
-            
-            # Transform data to our format
-            crypto_data = []
-            for coin_id, info in data.items():
-                crypto_data.append({
-                    'id': coin_id,
-                    'name': coin_id.replace('-', ' ').title(),
-                    'symbol': coin_id.upper()[:3],
-                    'price': info['usd'],
-                    'change_24h': info.get('usd_24h_change', 0),
-                    'market_cap': info.get('usd_market_cap', 0)
-                })
-            
-            return crypto_data
+        return fetch_live_crypto_data()
     except Exception as e:
         print(f"Error fetching crypto data: {e}")
-        # Return mock data if API fails
-        return [
-            {
-                'id': 'bitcoin',
-                'name': 'Bitcoin',
-                'symbol': 'BTC',
-                'price': 45000 + random.randint(-5000, 5000),
-                'change_24h': round(random.uniform(-10, 10), 2),
-                'market_cap': 850000000000
-            },
-            {
-                'id': 'ethereum',
-                'name': 'Ethereum',
-                'symbol': 'ETH',
-                'price': 3000 + random.randint(-500, 500),
-                'change_24h': round(random.uniform(-8, 8), 2),
-                'market_cap': 360000000000
-            },
-            {
-                'id': 'binancecoin',
-                'name': 'Binance Coin',
-                'symbol': 'BNB',
-                'price': 300 + random.randint(-50, 50),
-                'change_24h': round(random.uniform(-5, 5), 2),
-                'market_cap': 45000000000
-            }
-        ]
+        return mock_crypto_data()
+
+def mock_crypto_data():
+    """Mock prices served while CoinGecko can't be reached"""
+    return [
+        {
+            'id': 'bitcoin',
+            'name': 'Bitcoin',
+            'symbol': 'BTC',
+            'price': 45000 + random.randint(-5000, 5000),
+            'change_24h': round(random.uniform(-10, 10), 2),
+            'market_cap': 850000000000
+        },
+        {
+            'id': 'ethereum',
+            'name': 'Ethereum',
+            'symbol': 'ETH',
+            'price': 3000 + random.randint(-500, 500),
+            'change_24h': round(random.uniform(-8, 8), 2),
+            'market_cap': 360000000000
+        },
+        {
+            'id': 'binancecoin',
+            'name': 'Binance Coin',
+            'symbol': 'BNB',
+            'price': 300 + random.randint(-50, 50),
+            'change_24h': round(random.uniform(-5, 5), 2),
+            'market_cap': 45000000000
+        }
+    ]
 
 def fetch_crypto_news():
     """Fetch cryptocurrency news (mock data for simplicity)"""
@@ -302,27 +516,362 @@ def fetch_crypto_news():
     ]
     return news_items
 
-def get_cached_crypto_data():
-    """Get cached crypto data or fetch new data if cache is expired"""
-    current_time = time.time()
-    
-    # Cache for 5 minutes
-    if crypto_cache['data'] is None or (current_time - crypto_cache['timestamp']) > 300:
-        crypto_cache['data'] = fetch_crypto_data()
-        crypto_cache['timestamp'] = current_time
-    
-    return crypto_cache['data']
+# A response encoded once: the JSON bytes plus compressed variants, each with its
+# own strong ETag, keyed by content coding ('identity', 'gzip', 'br')
+EncodedResponse = namedtuple('EncodedResponse', ['variants', 'etags'])
 
-def get_cached_crypto_news():
-    """Get cached crypto news or fetch new data if cache is expired"""
-    current_time = time.time()
-    
-    # Cache for 10 minutes
-    if crypto_cache['news'] is None or (current_time - crypto_cache['news_timestamp']) > 600:
-        crypto_cache['news'] = fetch_crypto_news()
-        crypto_cache['news_timestamp'] = current_time
-    
-    return crypto_cache['news']
+# Bodies smaller than this gain nothing from compression once headers are counted
+COMPRESS_MIN_BYTES = 256
+
+def encode_response(response):
+    """JSON-encode a response once and precompress it; variants that don't shrink are left out"""
+    body = json.dumps(response).encode()
+    variants = {'identity': body}
+    if len(body) >= COMPRESS_MIN_BYTES:
+        compressed = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed['br'] = brotli.compress(body)
+        variants.update((coding, data) for coding, data in compressed.items() if len(data) < len(body))
+    digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+    etags = {coding: f'"{digest}"' if coding == 'identity' else f'"{digest}-{coding}"' for coding in variants}
+    return EncodedResponse(variants, etags)
+
+def choose_encoding(encoded, accept_encoding):
+    """The smallest variant the Accept-Encoding header allows (identity if none is)"""
+    accepted = set()
+    for item in accept_encoding.lower().split(','):
+        coding, _, params = item.partition(';')
+        try:
+            q = float(params.split('=', 1)[1]) if params.strip().startswith('q=') else 1.0
+        except ValueError:
+            q = 1.0
+        if q > 0:
+            accepted.add(coding.strip())
+    candidates = [coding for coding in encoded.variants
+                  if coding != 'identity' and (coding in accepted or '*' in accepted)]
+    return min(candidates, key=lambda coding: len(encoded.variants[coding]), default='identity')
+
+def etag_matches(if_none_match, etag):
+    """If-None-Match check (weak comparison, as RFC 9110 requires for it)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    tags = (tag.strip() for tag in if_none_match.split(','))
+    return any((tag[2:] if tag.startswith('W/') else tag) == etag for tag in tags)
+
+# Pre-encoded response for an upstream-backed endpoint, swapped in whole by the refresher
+Snapshot = namedtuple('Snapshot', ['response', 'updated_at', 'max_age'])
+
+# name, paths served, fetch (raises on failure), fallback (used until a fetch succeeds, or None),
+# respond (data, updated_at) -> {path: response}, refresh interval in seconds
+SnapshotFeed = namedtuple('SnapshotFeed', ['name', 'paths', 'fetch', 'fallback', 'respond', 'interval'])
+
+class SnapshotRefresher:
+    """
+    Keeps pre-encoded JSON snapshots of upstream-backed responses current from
+    a background thread, so request handlers only read the latest snapshot and
+    never wait on upstream I/O. A failed refresh keeps serving the previous
+    snapshot (its Age header shows how stale it is) and retries with
+    exponential backoff and jitter.
+    """
+
+    def __init__(self, feeds, retry_seconds=5.0, first_fetch_timeout=15.0):
+        self.feeds = {feed.name: feed for feed in feeds}
+        self.retry_seconds = retry_seconds
+        self.first_fetch_timeout = first_fetch_timeout
+        self.refreshes = 0
+        self.failures = 0
+        self.paths = {path: feed.name for feed in feeds for path in feed.paths}
+        self._snapshots = {}
+        self._ready = {name: threading.Event() for name in self.feeds}
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the refresher thread (once); the first fetch of every feed begins immediately"""
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='snapshot-refresher', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+
+    def get(self, path):
+        """The current snapshot for path; only the very first request waits for the first fetch"""
+        snapshot = self._snapshots.get(path)
+        if snapshot is None:
+            self.start()
+            self._ready[self.paths[path]].wait(self.first_fetch_timeout)
+            snapshot = self._snapshots.get(path)
+        return snapshot
+
+    def refresh(self, name):
+        """Fetch one feed and publish its snapshots; returns False if the fetch failed"""
+        feed = self.feeds[name]
+        try:
+            data, ok = feed.fetch(), True
+        except Exception as e:
+            print(f"Error refreshing {name}: {e}")
+            self.failures += 1
+            if feed.fallback is None or self._ready[name].is_set():
+                return False
+            data, ok = feed.fallback(), False
+
+        updated_at = time.time()
+        encoded = {
+            path: Snapshot(encode_response(response), updated_at, feed.interval)
+            for path, response in feed.respond(data, int(updated_at)).items()
+        }
+        # One assignment, so readers see either the old or the new snapshots, never a mix
+        self._snapshots = {**self._snapshots, **encoded}
+        if ok:
+            self.refreshes += 1
+        self._ready[name].set()
+        return ok
+
+    def _run(self):
+        due = dict.fromkeys(self.feeds, 0.0)
+        failed = dict.fromkeys(self.feeds, 0)
+        while not self._stop.is_set():
+            for name, feed in self.feeds.items():
+                if due[name] > time.time():
+                    continue
+                if self.refresh(name):
+                    failed[name] = 0
+                    due[name] = time.time() + feed.interval
+                else:
+                    failed[name] += 1
+                    backoff = min(feed.interval, self.retry_seconds * 2 ** (failed[name] - 1))
+                    due[name] = time.time() + backoff * random.uniform(0.5, 1.5)
+            self._stop.wait(max(0.0, min(due.values()) - time.time()))
+
+def crypto_price_responses(crypto_data, updated_at):
+    ethereum_data = next((coin for coin in crypto_data if coin['id'] == 'ethereum'), None)
+    return {
+        '/api/v1/crypto/prices': {
+            "cryptocurrencies": crypto_data,
+            "last_updated": updated_at,
+            "count": len(crypto_data)
+        },
+        '/api/v1/crypto/ethereum': {
+            "ethereum": ethereum_data,
+            "last_updated": updated_at
+        } if ethereum_data else {
+            "error": "Ethereum data not found"
+        }
+    }
+
+def crypto_news_responses(news_data, updated_at):
+    return {
+        '/api/v1/crypto/news': {
+            "news": news_data,
+            "last_updated": updated_at,
+            "count": len(news_data)
+        }
+    }
+
+crypto_refresher = SnapshotRefresher([
+    SnapshotFeed('prices', ('/api/v1/crypto/prices', '/api/v1/crypto/ethereum'), fetch_live_crypto_data,
+                 mock_crypto_data, crypto_price_responses, float(os.environ.get('CRYPTO_PRICES_REFRESH_SECONDS', 300))),
+    SnapshotFeed('news', ('/api/v1/crypto/news',), fetch_crypto_news,
+                 None, crypto_news_responses, float(os.environ.get('CRYPTO_NEWS_REFRESH_SECONDS', 600)))
+])
+
+# Simulated market behind the portfolio routes, so every request sees the same prices
+MARKET_BASE_PRICES = {'AAPL': 175.0, 'TSLA': 250.0, 'MSFT': 350.0}
+PORTFOLIO_ASSETS = (('Apple Inc.', 'AAPL'), ('Tesla Inc.', 'TSLA'), ('Microsoft Corp.', 'MSFT'))
+TRADING_SECONDS_PER_YEAR = 252 * 6.5 * 3600
+
+class PriceTicker:
+    """
+    Geometric Brownian motion for a handful of symbols, advanced on demand:
+    the first read in a new tick moves every price over the ticks elapsed
+    (one exact GBM step), so all requests within a tick see the same prices.
+    """
+
+    def __init__(self, base_prices, volatility=0.3, tick_seconds=1.0):
+        self.prices = dict(base_prices)
+        self.volatility = volatility
+        self.tick_seconds = tick_seconds
+        self._tick = int(time.time() // tick_seconds)
+        self._lock = threading.Lock()
+
+    def price(self, symbol):
+        tick = int(time.time() // self.tick_seconds)
+        with self._lock:
+            if tick > self._tick:
+                dt = (tick - self._tick) * self.tick_seconds / TRADING_SECONDS_PER_YEAR
+                sigma = self.volatility
+                for name, price in self.prices.items():
+                    self.prices[name] = price * math.exp(-0.5 * sigma ** 2 * dt + sigma * math.sqrt(dt) * random.gauss(0, 1))
+                self._tick = tick
+            return self.prices.setdefault(symbol, 100.0)
+
+market_prices = PriceTicker(MARKET_BASE_PRICES, float(os.environ.get('MARKET_SIM_VOLATILITY', 0.3)),
+                            float(os.environ.get('MARKET_SIM_TICK_SECONDS', 1.0)))
+
+def portfolio_response(user_id):
+    """A user's holdings (fixed per user) valued at the current simulated prices"""
+    rng = random.Random(user_id)
+    assets, total_value, total_cost = [], 0.0, 0.0
+    for name, symbol in PORTFOLIO_ASSETS:
+        quantity = rng.randint(20, 500)
+        cost_price = MARKET_BASE_PRICES[symbol] * rng.uniform(0.8, 1.15)
+        price = market_prices.price(symbol)
+        assets.append({
+            "name": name,
+            "symbol": symbol,
+            "value": round(price * quantity, 2),
+            "return_percentage": round((price / cost_price - 1) * 100, 2),
+            "quantity": quantity
+        })
+        total_value += price * quantity
+        total_cost += cost_price * quantity
+    return {
+        "user_id": user_id,
+        "total_value": round(total_value, 2),
+        "total_return": round((total_value / total_cost - 1) * 100, 2),
+        "assets": assets
+    }
+
+# Routes whose response never changes: encoded and compressed once at startup
+STATIC_RESPONSES = {
+    '/api/v1/education/topics': encode_response({
+        "topics": [
+            {
+                "id": "beginner-basics",
+                "title": "Investment Basics",
+                "description": "Learn the fundamentals of investing",
+                "level": "beginner",
+                "duration": "15 min",
+                "lessons": 5
+            },
+            {
+                "id": "crypto-fundamentals",
+                "title": "Cryptocurrency Fundamentals",
+                "description": "Understanding digital currencies and blockchain",
+                "level": "beginner",
+                "duration": "20 min",
+                "lessons": 6
+            },
+            {
+                "id": "portfolio-management",
+                "title": "Portfolio Management",
+                "description": "How to build and manage a diversified portfolio",
+                "level": "intermediate",
+                "duration": "25 min",
+                "lessons": 8
+            },
+            {
+                "id": "risk-management",
+                "title": "Risk Management",
+                "description": "Protecting your investments from market volatility",
+                "level": "intermediate",
+                "duration": "18 min",
+                "lessons": 6
+            },
+            {
+                "id": "technical-analysis",
+                "title": "Technical Analysis",
+                "description": "Reading charts and market indicators",
+                "level": "advanced",
+                "duration": "30 min",
+                "lessons": 10
+            }
+        ]
+    }),
+    '/api/v1/education/glossary': encode_response({
+        "terms": [
+            {"term": "Asset Allocation", "definition": "The process of dividing investments among different asset categories like stocks, bonds, and cash."},
+            {"term": "Diversification", "definition": "Spreading investments across different assets to reduce risk."},
+            {"term": "ROI", "definition": "Return on Investment - a measure of investment profitability."},
+            {"term": "Volatility", "definition": "The degree of variation in trading prices over time."},
+            {"term": "Market Cap", "definition": "Total value of all shares of a company or cryptocurrency."},
+            {"term": "Liquidity", "definition": "How easily an asset can be bought or sold without affecting its price."},
+            {"term": "Bull Market", "definition": "A market condition where prices are rising or expected to rise."},
+            {"term": "Bear Market", "definition": "A market condition where prices are falling or expected to fall."},
+            {"term": "Compound Interest", "definition": "Interest calculated on the initial principal and accumulated interest."},
+            {"term": "Risk Tolerance", "definition": "An investor's ability to handle potential losses in their portfolio."}
+        ]
+    }),
+    '/api/v1/goals/user123': encode_response({
+        "goals": [
+            {
+                "id": 1,
+                "title": "Emergency Fund",
+                "target_amount": 10000,
+                "current_amount": 3500,
+                "target_date": "2024-12-31",
+                "priority": "high",
+                "status": "in_progress"
+            },
+            {
+                "id": 2,
+                "title": "Retirement Fund",
+                "target_amount": 500000,
+                "current_amount": 125000,
+                "target_date": "2045-12-31",
+                "priority": "high",
+                "status": "in_progress"
+            },
+            {
+                "id": 3,
+                "title": "House Down Payment",
+                "target_amount": 50000,
+                "current_amount": 15000,
+                "target_date": "2025-06-30",
+                "priority": "medium",
+                "status": "in_progress"
+            }
+        ]
+    }),
+    '/api/v1/analytics/portfolio': encode_response({
+        "analytics": {
+            "sharpe_ratio": 1.25,
+            "beta": 0.85,
+            "alpha": 0.12,
+            "volatility": 15.2,
+            "max_drawdown": -8.5,
+            "correlation_matrix": {
+                "stocks_bonds": 0.15,
+                "stocks_crypto": 0.45,
+                "bonds_crypto": 0.08
+            },
+            "sector_allocation": {
+                "Technology": 35,
+                "Healthcare": 20,
+                "Finance": 15,
+                "Energy": 10,
+                "Consumer": 20
+            },
+            "risk_metrics": {
+                "var_95": -2.5,
+                "expected_shortfall": -3.8,
+                "sortino_ratio": 1.45
+            }
+        }
+    })
+}
+
+INDEX_RESPONSE = encode_response({
+    "message": "FinSage API is running",
+    "version": "1.0.0",
+    "status": "running",
+    "endpoints": {
+        "health": "/api/v1/status/health",
+        "predictions": "/api/v1/prediction/predict",
+        "portfolio": "/api/v1/portfolio/{user_id}",
+        "blockchain": "/api/v1/blockchain/status"
+    }
+})
 
 class FinSageHandler(BaseHTTPRequestHandler):
     def do_OPTIONS(self):
@@ -331,6 +880,7 @@ class FinSageHandler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
         self.end_headers()
     
     def do_GET(self):
@@ -338,13 +888,21 @@ class FinSageHandler(BaseHTTPRequestHandler):
         parsed_path = urlparse(self.path)
         path = parsed_path.path
         
-        # CORS headers
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
+        if path in crypto_refresher.paths:
+            # Crypto data comes from the refresher's latest snapshot, never from upstream here
+            snapshot = crypto_refresher.get(path)
+            if snapshot is None:
+                self.send_json(json.dumps({"error": "Data not available yet, please retry"}).encode())
+            else:
+                self.send_cached(snapshot.response, {
+                    'Age': str(int(time.time() - snapshot.updated_at)),
+                    'Cache-Control': f'max-age={int(snapshot.max_age)}'
+                })
+            return
+        
+        if path in STATIC_RESPONSES:
+            self.send_cached(STATIC_RESPONSES[path])
+            return
         
         if path == '/api/v1/status/health':
             response = {
@@ -361,35 +919,7 @@ class FinSageHandler(BaseHTTPRequestHandler):
                 "gas_price": random.randint(20, 50)
             }
         elif path.startswith('/api/v1/portfolio/'):
-            user_id = path.split('/')[-1]
-            response = {
-                "user_id": user_id,
-                "total_value": random.randint(50000, 500000),
-                "total_return": round(random.uniform(-15, 25), 2),
-                "assets": [
-                    {
-                        "name": "Apple Inc.",
-                        "symbol": "AAPL",
-                        "value": random.randint(10000, 50000),
-                        "return_percentage": round(random.uniform(-10, 20), 2),
-                        "quantity": random.randint(50, 200)
-                    },
-                    {
-                        "name": "Tesla Inc.",
-                        "symbol": "TSLA",
-                        "value": random.randint(15000, 75000),
-                        "return_percentage": round(random.uniform(-20, 30), 2),
-                        "quantity": random.randint(20, 100)
-                    },
-                    {
-                        "name": "Microsoft Corp.",
-                        "symbol": "MSFT",
-                        "value": random.randint(20000, 100000),
-                        "return_percentage": round(random.uniform(-5, 15), 2),
-                        "quantity": random.randint(100, 500)
-                    }
-                ]
-            }
+            response = portfolio_response(path.split('/')[-1])
         elif path.startswith('/api/v1/blockchain/balance/'):
             wallet_address = path.split('/')[-1]
             response = {
@@ -397,158 +927,6 @@ class FinSageHandler(BaseHTTPRequestHandler):
                 "eth_balance": round(random.uniform(0.5, 10.0), 4),
                 "usd_value": round(random.uniform(1000, 20000), 2)
             }
-        elif path == '/api/v1/crypto/prices':
-            # Get live cryptocurrency prices
-            crypto_data = get_cached_crypto_data()
-            response = {
-                "cryptocurrencies": crypto_data,
-                "last_updated": int(time.time()),
-                "count": len(crypto_data)
-            }
-        elif path == '/api/v1/crypto/news':
-            # Get cryptocurrency news
-            news_data = get_cached_crypto_news()
-            response = {
-                "news": news_data,
-                "last_updated": int(time.time()),
-                "count": len(news_data)
-            }
-        elif path == '/api/v1/crypto/ethereum':
-            # Get specific Ethereum data
-            crypto_data = get_cached_crypto_data()
-            ethereum_data = next((coin for coin in crypto_data if coin['id'] == 'ethereum'), None)
-            if ethereum_data:
-                response = {
-                    "ethereum": ethereum_data,
-                    "last_updated": int(time.time())
-                }
-            else:
-                response = {
-                    "error": "Ethereum data not found"
-                }
-        elif path == '/api/v1/education/topics':
-            # Get educational topics
-            response = {
-                "topics": [
-                    {
-                        "id": "beginner-basics",
-                        "title": "Investment Basics",
-                        "description": "Learn the fundamentals of investing",
-                        "level": "beginner",
-                        "duration": "15 min",
-                        "lessons": 5
-                    },
-                    {
-                        "id": "crypto-fundamentals",
-                        "title": "Cryptocurrency Fundamentals",
-                        "description": "Understanding digital currencies and blockchain",
-                        "level": "beginner",
-                        "duration": "20 min",
-                        "lessons": 6
-                    },
-                    {
-                        "id": "portfolio-management",
-                        "title": "Portfolio Management",
-                        "description": "How to build and manage a diversified portfolio",
-                        "level": "intermediate",
-                        "duration": "25 min",
-                        "lessons": 8
-                    },
-                    {
-                        "id": "risk-management",
-                        "title": "Risk Management",
-                        "description": "Protecting your investments from market volatility",
-                        "level": "intermediate",
-                        "duration": "18 min",
-                        "lessons": 6
-                    },
-                    {
-                        "id": "technical-analysis",
-                        "title": "Technical Analysis",
-                        "description": "Reading charts and market indicators",
-                        "level": "advanced",
-                        "duration": "30 min",
-                        "lessons": 10
-                    }
-                ]
-            }
-        elif path == '/api/v1/education/glossary':
-            # Get financial glossary
-            response = {
-                "terms": [
-                    {"term": "Asset Allocation", "definition": "The process of dividing investments among different asset categories like stocks, bonds, and cash."},
-                    {"term": "Diversification", "definition": "Spreading investments across different assets to reduce risk."},
-                    {"term": "ROI", "definition": "Return on Investment - a measure of investment profitability."},
-                    {"term": "Volatility", "definition": "The degree of variation in trading prices over time."},
-                    {"term": "Market Cap", "definition": "Total value of all shares of a company or cryptocurrency."},
-                    {"term": "Liquidity", "definition": "How easily an asset can be bought or sold without affecting its price."},
-                    {"term": "Bull Market", "definition": "A market condition where prices are rising or expected to rise."},
-                    {"term": "Bear Market", "definition": "A market condition where prices are falling or expected to fall."},
-                    {"term": "Compound Interest", "definition": "Interest calculated on the initial principal and accumulated interest."},
-                    {"term": "Risk Tolerance", "definition": "An investor's ability to handle potential losses in their portfolio."}
-                ]
-            }
-        elif path == '/api/v1/goals/user123':
-            # Get user financial goals
-            response = {
-                "goals": [
-                    {
-                        "id": 1,
-                        "title": "Emergency Fund",
-                        "target_amount": 10000,
-                        "current_amount": 3500,
-                        "target_date": "2024-12-31",
-                        "priority": "high",
-                        "status": "in_progress"
-                    },
-                    {
-                        "id": 2,
-                        "title": "Retirement Fund",
-                        "target_amount": 500000,
-                        "current_amount": 125000,
-                        "target_date": "2045-12-31",
-                        "priority": "high",
-                        "status": "in_progress"
-                    },
-                    {
-                        "id": 3,
-                        "title": "House Down Payment",
-                        "target_amount": 50000,
-                        "current_amount": 15000,
-                        "target_date": "2025-06-30",
-                        "priority": "medium",
-                        "status": "in_progress"
-                    }
-                ]
-            }
-        elif path == '/api/v1/analytics/portfolio':
-            # Get advanced portfolio analytics
-            response = {
-                "analytics": {
-                    "sharpe_ratio": 1.25,
-                    "beta": 0.85,
-                    "alpha": 0.12,
-                    "volatility": 15.2,
-                    "max_drawdown": -8.5,
-                    "correlation_matrix": {
-                        "stocks_bonds": 0.15,
-                        "stocks_crypto": 0.45,
-                        "bonds_crypto": 0.08
-                    },
-                    "sector_allocation": {
-                        "Technology": 35,
-                        "Healthcare": 20,
-                        "Finance": 15,
-                        "Energy": 10,
-                        "Consumer": 20
-                    },
-                    "risk_metrics": {
-                        "var_95": -2.5,
-                        "expected_shortfall": -3.8,
-                        "sortino_ratio": 1.45
-                    }
-                }
-            }
         elif path == '/api/v1/alerts/user123':
             # Get user alerts
             response = {
@@ -583,136 +961,25 @@ class FinSageHandler(BaseHTTPRequestHandler):
                 ]
             }
         else:
-            response = {
-                "message": "FinSage API is running",
-                "version": "1.0.0",
-                "status": "running",
-                "endpoints": {
-                    "health": "/api/v1/status/health",
-                    "predictions": "/api/v1/prediction/predict",
-                    "portfolio": "/api/v1/portfolio/{user_id}",
-                    "blockchain": "/api/v1/blockchain/status"
-                }
-            }
+            self.send_cached(INDEX_RESPONSE)
+            return
         
-        self.wfile.write(json.dumps(response).encode())
+        self.send_json(json.dumps(response).encode())
     
     def do_POST(self):
         """Handle POST requests"""
         parsed_path = urlparse(self.path)
         path = parsed_path.path
         
-        # CORS headers
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
+        # Read request body (always, so a kept-alive connection stays in sync)
+        content_length = int(self.headers.get('Content-Length', 0))
+        post_data = self.rfile.read(content_length)
         
+        body = None
         if path == '/api/v1/prediction/predict':
-            # Read request body
-            content_length = int(self.headers['Content-Length'])
-            post_data = self.rfile.read(content_length)
-            
             try:
                 data = json.loads(post_data.decode('utf-8'))
-                
-                # Enhanced AI prediction with comprehensive analysis
-                age = data.get('age', 30)
-                income = data.get('annual_income', 75000)
-                risk_tolerance = data.get('risk_tolerance', 'moderate')
-                horizon = data.get('investment_horizon_years', 10)
-                financial_goals = data.get('financial_goals', 'retirement')
-                dependents = data.get('dependents', 0)
-                debt_amount = data.get('debt_amount', 0)
-                monthly_expenses = data.get('monthly_expenses', 3000)
-                
-                # Calculate financial health metrics
-                debt_ratio = (debt_amount / income * 100) if income > 0 else 0
-                emergency_fund_needed = monthly_expenses * 6
-                recommended_monthly_investment = max(income * 0.15 / 12, 500)
-                
-                # Age-based strategy
-                age_bracket = 'young_professional' if age < 30 else 'early_career' if age < 40 else 'mid_career' if age < 50 else 'pre_retirement' if age < 60 else 'retirement'
-                
-                # Risk-adjusted returns and allocations
-                if risk_tolerance == 'conservative':
-                    base_return = 4.5
-                    confidence = 90
-                    allocations = [
-                        {'asset_type': 'Government Bonds', 'percentage': 40, 'amount': income * 0.2 * 0.4},
-                        {'asset_type': 'Corporate Bonds', 'percentage': 25, 'amount': income * 0.2 * 0.25},
-                        {'asset_type': 'Blue Chip Stocks', 'percentage': 20, 'amount': income * 0.2 * 0.2},
-                        {'asset_type': 'High-Yield Savings', 'percentage': 10, 'amount': income * 0.2 * 0.1},
-                        {'asset_type': 'REITs', 'percentage': 5, 'amount': income * 0.2 * 0.05}
-                    ]
-                elif risk_tolerance == 'aggressive':
-                    base_return = 11.5
-                    confidence = 75
-                    allocations = [
-                        {'asset_type': 'Growth Stocks', 'percentage': 45, 'amount': income * 0.2 * 0.45},
-                        {'asset_type': 'Technology Stocks', 'percentage': 25, 'amount': income * 0.2 * 0.25},
-                        {'asset_type': 'Cryptocurrency', 'percentage': 15, 'amount': income * 0.2 * 0.15},
-                        {'asset_type': 'International Stocks', 'percentage': 10, 'amount': income * 0.2 * 0.1},
-                        {'asset_type': 'Small Cap Stocks', 'percentage': 5, 'amount': income * 0.2 * 0.05}
-                    ]
-                else:  # moderate
-                    base_return = 7.8
-                    confidence = 85
-                    allocations = [
-                        {'asset_type': 'S&P 500 Index Fund', 'percentage': 35, 'amount': income * 0.2 * 0.35},
-                        {'asset_type': 'Total Bond Market', 'percentage': 25, 'amount': income * 0.2 * 0.25},
-                        {'asset_type': 'International Stocks', 'percentage': 20, 'amount': income * 0.2 * 0.2},
-                        {'asset_type': 'REITs', 'percentage': 10, 'amount': income * 0.2 * 0.1},
-                        {'asset_type': 'Commodities', 'percentage': 5, 'amount': income * 0.2 * 0.05},
-                        {'asset_type': 'Cash/CDs', 'percentage': 5, 'amount': income * 0.2 * 0.05}
-                    ]
-                
-                # Create comprehensive investment categories with explanations
-                investment_categories = []
-                for allocation in allocations:
-                    category = {
-                        'name': allocation['asset_type'],
-                        'allocation': allocation['percentage'],
-                        'amount': allocation['amount'],
-                        'explanation': get_investment_explanation(allocation['asset_type'], age, risk_tolerance),
-                        'benefits': get_investment_benefits(allocation['asset_type']),
-                        'risks': get_investment_risks(allocation['asset_type'])
-                    }
-                    investment_categories.append(category)
-                
-                # Age-specific advice
-                age_advice = get_age_specific_advice(age_bracket, age)
-                
-                # Financial health assessment
-                emergency_fund_status = "Excellent" if emergency_fund_needed <= 10000 else "Good" if emergency_fund_needed <= 25000 else "Needs Improvement"
-                emergency_fund_advice = f"You should have ${emergency_fund_needed:,.0f} in emergency savings (6 months of expenses)."
-                
-                debt_advice = "Excellent debt management!" if debt_ratio < 20 else "Good debt level" if debt_ratio < 36 else "Consider debt reduction before investing heavily."
-                
-                investment_advice = f"Based on your income, aim to invest ${recommended_monthly_investment:,.0f} monthly for optimal growth."
-                
-                # 30-day action plan
-                action_plan = get_action_plan(age_bracket, financial_goals, debt_ratio, emergency_fund_needed)
-                
-                response = {
-                    "expected_return": round(base_return, 1),
-                    "confidence_score": confidence,
-                    "risk_level": risk_tolerance.title(),
-                    "investment_categories": investment_categories,
-                    "age_advice": age_advice,
-                    "emergency_fund_status": emergency_fund_status,
-                    "emergency_fund_advice": emergency_fund_advice,
-                    "debt_ratio": round(debt_ratio, 1),
-                    "debt_advice": debt_advice,
-                    "recommended_monthly_investment": recommended_monthly_investment,
-                    "investment_advice": investment_advice,
-                    "action_plan": action_plan,
-                    "recommendation": f"Personalized {risk_tolerance} strategy optimized for your {age_bracket.replace('_', ' ')} profile with {len(allocations)} diversified investment categories.",
-                    "timestamp": int(time.time())
-                }
-                
+                body = render_prediction(data)
             except Exception as e:
                 response = {
                     "error": "Invalid request data",
@@ -724,7 +991,37 @@ class FinSageHandler(BaseHTTPRequestHandler):
                 "message": f"POST {path} not implemented"
             }
         
-        self.wfile.write(json.dumps(response).encode())
+        self.send_json(body if body is not None else json.dumps(response).encode())
+    
+    def send_cached(self, encoded, headers=None):
+        """Send a pre-encoded response: 304 if the client already has it, else the best variant it accepts"""
+        coding = choose_encoding(encoded, self.headers.get('Accept-Encoding', ''))
+        headers = {'Cache-Control': 'no-cache', **(headers or {}),
+                   'ETag': encoded.etags[coding], 'Vary': 'Accept-Encoding'}
+        if etag_matches(self.headers.get('If-None-Match'), encoded.etags[coding]):
+            self.send_json(b'', headers, status=304)
+            return
+        if coding != 'identity':
+            headers['Content-Encoding'] = coding
+        self.send_json(encoded.variants[coding], headers)
+    
+    def send_json(self, body, headers=None, status=200):
+        """Send a JSON response with CORS headers; the length lets HTTP/1.1 clients keep the connection"""
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        if status != 304:  # a 304 has no body, and its length would describe the cached one
+            self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        if getattr(self.server, 'draining', False):
+            # Shutting down: finish this request, then close the connection
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
     
     def do_OPTIONS(self):
         """Handle preflight OPTIONS requests"""
@@ -732,8 +1029,40 @@ class FinSageHandler(BaseHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
         self.end_headers()
 
+class KeepAliveFinSageHandler(FinSageHandler):
+    """FinSageHandler over persistent HTTP/1.1 connections, for the pooled server"""
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # headers and body are separate writes on a kept-alive socket
+    timeout = float(os.environ.get('SERVER_KEEPALIVE_SECONDS', 5))  # idle connections give their worker back
+
+class PooledHTTPServer(ThreadingHTTPServer):
+    """
+    ThreadingHTTPServer that serves connections on a bounded pool of worker
+    threads instead of starting a thread per connection. Connections beyond
+    max_workers wait in the pool's queue until a worker is free.
+    """
+    request_queue_size = 1024  # the default of 5 drops bursts of concurrent connects
+
+    def __init__(self, server_address, handler_class, max_workers=128):
+        super().__init__(server_address, handler_class)
+        self.draining = False
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='finsage-http')
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self):
+        """Stop accepting connections and wait for the requests in flight"""
+        self.draining = True
+        super().server_close()
+        self._pool.shutdown(wait=True)
+
+def _stop_server(signum, frame):
+    raise KeyboardInterrupt
+
 def run_server():
     """Start the simple HTTP server"""
     import os
@@ -741,11 +1070,20 @@ def run_server():
     # Get port from environment variable (for AWS deployment)
     port = int(os.environ.get('PORT', 8000))
     host = os.environ.get('HOST', '0.0.0.0')
+    # Worker threads for concurrent clients; 0 serves one request at a time
+    workers = int(os.environ.get('SERVER_WORKERS', 128))
     
     server_address = (host, port)
-    httpd = HTTPServer(server_address, FinSageHandler)
+    if workers > 0:
+        httpd = PooledHTTPServer(server_address, KeepAliveFinSageHandler, max_workers=workers)
+        mode = f"{workers} worker threads, HTTP/1.1 keep-alive"
+    else:
+        httpd = HTTPServer(server_address, FinSageHandler)
+        mode = "single-threaded"
+    signal.signal(signal.SIGTERM, _stop_server)
+    crypto_refresher.start()
     print("🚀 FinSage Simple Backend Server starting...")
-    print(f"📡 Server running on http://{host}:{port}")
+    print(f"📡 Server running on http://{host}:{port} ({mode})")
     print("🔗 Available endpoints:")
     print("   GET  /api/v1/status/health")
     print("   GET  /api/v1/blockchain/status")
@@ -765,8 +1103,11 @@ def run_server():
     try:
         httpd.serve_forever()
     except KeyboardInterrupt:
-        print("\n🛑 Server stopped")
-        httpd.shutdown()
+        print("\n🛑 Stopping, waiting for requests in flight...")
+    finally:
+        httpd.server_close()
+        crypto_refresher.stop()
+        print("🛑 Server stopped")
 
 if __name__ == '__main__':
     run_server()